@@ -3,7 +3,7 @@ import { useState, useEffect, useRef } from 'react';
 import type { EncounterState } from '../types/campaign';
 
 export interface WebSocketMessage {
-    type: 'chat' | 'dice_roll' | 'user_join' | 'user_leave' | 'error' | 'encounter_update' | 'turn_update';
+    type: 'chat' | 'dice_roll' | 'user_join' | 'user_leave' | 'error' | 'encounter_update' | 'turn_update' | 'map_update' | 'movement_result' | 'hp_update' | 'monster_pool' | 'monster_pool_delta' | 'conditions' | 'condition_applied' | 'condition_expired' | 'condition_trigger' | 'resource_update';
     payload: any;
     sender: string;
     timestamp?: string;
@@ -19,6 +19,12 @@ const WEBSOCKET_URL = import.meta.env.VITE_WEBSOCKET_BASE_URL || 'ws://localhost
 export const useCampaignSocket = (campaignId: string | undefined, token: string | null) => {
     const [chatLogMessages, setChatLogMessages] = useState<WebSocketMessage[]>([]);
     const [encounterState, setEncounterState] = useState<EncounterState | null>(null);
+    const [mapState, setMapState] = useState<Record<string, any> | null>(null);
+    const [movementResult, setMovementResult] = useState<any | null>(null);
+    const [hitPointUpdate, setHitPointUpdate] = useState<any | null>(null);
+    const [monsterPool, setMonsterPool] = useState<Record<string, any> | null>(null);
+    const [activeConditions, setActiveConditions] = useState<any[]>([]);
+    const [characterResources, setCharacterResources] = useState<Record<number, any>>({});
     const [isConnected, setIsConnected] = useState(false);
     const websocket = useRef<WebSocket | null>(null);
 
@@ -42,6 +48,57 @@ export const useCampaignSocket = (campaignId: string | undefined, token: string
                     case 'turn_update':
                         setEncounterState(prev => prev ? { ...prev, active_entry_id: messageData.payload.active_entry_id, turn_index: messageData.payload.turn_index } : null);
                         break;
+                    case 'map_update':
+                        setMapState(messageData.payload);
+                        break;
+                    case 'movement_result':
+                        setMovementResult(messageData.payload);
+                        break;
+                    case 'monster_pool':
+                        setMonsterPool(messageData.payload);
+                        break;
+                    case 'monster_pool_delta':
+                        // Columnar delta: payload.ids plus the changed columns (hp, conditions, x, y) in the same order.
+                        setMonsterPool(prev => {
+                            if (!prev) return prev;
+                            const next = { ...prev };
+                            const slotById = new Map<number, number>(prev.ids.map((id: number, slot: number) => [id, slot]));
+                            for (const column of ['hp', 'conditions', 'x', 'y']) {
+                                const values = messageData.payload[column];
+                                if (!values) continue;
+                                next[column] = [...prev[column]];
+                                messageData.payload.ids.forEach((id: number, index: number) => {
+                                    const slot = slotById.get(id);
+                                    if (slot !== undefined) next[column][slot] = values[index];
+                                });
+                            }
+                            return next;
+                        });
+                        break;
+                    case 'hp_update':
+                        // One message per area effect: every target's new HP at once.
+                        setHitPointUpdate(messageData.payload);
+                        break;
+                    case 'resource_update':
+                        // A spend (one character) or a rest (the whole party): keyed by character id.
+                        setCharacterResources(prev => {
+                            const next = { ...prev };
+                            for (const sheet of messageData.payload.resources) next[sheet.character_id] = sheet;
+                            return next;
+                        });
+                        break;
+                    case 'conditions':
+                        setActiveConditions(messageData.payload.conditions);
+                        break;
+                    case 'condition_applied':
+                        setActiveConditions(prev => [...prev, ...messageData.payload.conditions]);
+                        break;
+                    case 'condition_expired': {
+                        // Expired, removed or ended with concentration (payload.conditions[].reason).
+                        const ended = new Set(messageData.payload.conditions.map((condition: any) => condition.id));
+                        setActiveConditions(prev => prev.filter(condition => !ended.has(condition.id)));
+                        break;
+                    }
                     default:
                         setChatLogMessages(prev => [...prev, messageData]);
                         break;
@@ -58,5 +115,5 @@ export const useCampaignSocket = (campaignId: string | undefined, token: string
         } else { console.error("WebSocket is not connected."); }
     };
 
-    return { chatLogMessages, encounterState, setEncounterState, isConnected, sendMessage };
+    return { chatLogMessages, encounterState, setEncounterState, mapState, movementResult, hitPointUpdate, monsterPool, activeConditions, characterResources, isConnected, sendMessage };
 };
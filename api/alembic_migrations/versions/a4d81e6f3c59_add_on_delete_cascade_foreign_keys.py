@@ -0,0 +1,70 @@
+"""add ON DELETE CASCADE / SET NULL to ownership foreign keys
+
+Revision ID: a4d81e6f3c59
+Revises: f2c9d04b7e61
+Create Date: 2026-10-19 17:35:46.120583
+
+"""
+from typing import Optional, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4d81e6f3c59'
+down_revision: Union[str, None] = 'f2c9d04b7e61'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, column, referenced table, ON DELETE action, constraint name to use).
+# Constraint names differ between databases built by create_all and by migrations,
+# so the existing constraint is looked up by column rather than by name.
+FOREIGN_KEYS = [
+    ('characters', 'user_id', 'users', 'CASCADE', 'characters_user_id_fkey'),
+    ('campaigns', 'dm_user_id', 'users', 'CASCADE', 'campaigns_dm_user_id_fkey'),
+    ('campaign_members', 'campaign_id', 'campaigns', 'CASCADE', 'campaign_members_campaign_id_fkey'),
+    ('campaign_members', 'user_id', 'users', 'CASCADE', 'campaign_members_user_id_fkey'),
+    ('campaign_members', 'character_id', 'characters', 'CASCADE', 'campaign_members_character_id_fkey'),
+    ('campaign_sessions', 'campaign_id', 'campaigns', 'CASCADE', 'campaign_sessions_campaign_id_fkey'),
+    ('campaign_sessions', 'active_initiative_entry_id', 'initiative_entries', 'SET NULL', 'fk_campaign_sessions_active_initiative_entry_id'),
+    ('initiative_entries', 'session_id', 'campaign_sessions', 'CASCADE', 'initiative_entries_session_id_fkey'),
+    ('initiative_entries', 'character_id', 'characters', 'SET NULL', 'initiative_entries_character_id_fkey'),
+    ('character_items', 'character_id', 'characters', 'CASCADE', 'character_items_character_id_fkey'),
+    ('character_skills', 'character_id', 'characters', 'CASCADE', 'character_skills_character_id_fkey'),
+    ('character_spells', 'character_id', 'characters', 'CASCADE', 'character_spells_character_id_fkey'),
+]
+
+
+def _existing_fk_name(table: str, column: str) -> Optional[str]:
+    inspector = sa.inspect(op.get_bind())
+    for fk in inspector.get_foreign_keys(table):
+        if fk['constrained_columns'] == [column]:
+            return fk['name']
+    return None
+
+
+def _replace_fk(table: str, column: str, referred_table: str, ondelete: Optional[str], name: str) -> None:
+    existing = _existing_fk_name(table, column)
+    if existing:
+        op.drop_constraint(existing, table, type_='foreignkey')
+    op.create_foreign_key(name, table, referred_table, [column], ['id'], ondelete=ondelete)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, column, referred_table, ondelete, name in FOREIGN_KEYS:
+        _replace_fk(table, column, referred_table, ondelete, name)
+    # Cascades look children up by these columns.
+    op.create_index('ix_campaign_members_character_id', 'campaign_members', ['character_id'], unique=False)
+    op.create_index('ix_campaigns_dm_user_id', 'campaigns', ['dm_user_id'], unique=False)
+    op.create_index(op.f('ix_initiative_entries_character_id'), 'initiative_entries', ['character_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_initiative_entries_character_id'), table_name='initiative_entries')
+    op.drop_index('ix_campaigns_dm_user_id', table_name='campaigns')
+    op.drop_index('ix_campaign_members_character_id', table_name='campaign_members')
+    for table, column, referred_table, _, name in FOREIGN_KEYS:
+        _replace_fk(table, column, referred_table, None, name)
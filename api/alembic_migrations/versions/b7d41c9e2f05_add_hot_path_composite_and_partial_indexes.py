@@ -0,0 +1,54 @@
+"""add hot path composite and partial indexes
+
+Revision ID: b7d41c9e2f05
+Revises: 253486e59afe
+Create Date: 2026-10-19 09:12:41.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d41c9e2f05'
+down_revision: Union[str, None] = '253486e59afe'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Member lists / pending join requests: WHERE campaign_id = ? AND status = ? ORDER BY joined_at
+    op.create_index('ix_campaign_members_campaign_status_joined', 'campaign_members',
+                    ['campaign_id', 'status', 'joined_at'], unique=False)
+    # "My campaigns" / "my memberships": WHERE user_id = ? AND status = ? ORDER BY joined_at
+    op.create_index('ix_campaign_members_user_status_joined', 'campaign_members',
+                    ['user_id', 'status', 'joined_at'], unique=False)
+
+    # At most one active session per campaign. Fails if duplicates already exist;
+    # deactivate the extras before upgrading. Also serves get_active_session_for_campaign
+    # (WHERE campaign_id = ? AND is_active).
+    op.create_index('uq_campaign_sessions_one_active_per_campaign', 'campaign_sessions',
+                    ['campaign_id'], unique=True, postgresql_where=sa.text('is_active'))
+
+    # Character list: WHERE user_id = ? ORDER BY name
+    op.create_index('ix_characters_user_id_name', 'characters', ['user_id', 'name'], unique=False)
+
+    # Discoverable campaigns: WHERE is_open_for_recruitment ORDER BY updated_at DESC
+    op.create_index('ix_campaigns_open_for_recruitment_updated_at', 'campaigns',
+                    [sa.text('updated_at DESC')], unique=False,
+                    postgresql_where=sa.text('is_open_for_recruitment'))
+
+    # character_items (character_id, item_id) and character_skills (character_id, skill_id)
+    # are already covered by the indexes behind _character_item_uc / _character_skill_uc.
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_campaigns_open_for_recruitment_updated_at', table_name='campaigns')
+    op.drop_index('ix_characters_user_id_name', table_name='characters')
+    op.drop_index('uq_campaign_sessions_one_active_per_campaign', table_name='campaign_sessions')
+    op.drop_index('ix_campaign_members_user_status_joined', table_name='campaign_members')
+    op.drop_index('ix_campaign_members_campaign_status_joined', table_name='campaign_members')
@@ -0,0 +1,46 @@
+"""create campaign catalog entries table
+
+Revision ID: b9e3f17a0c42
+Revises: a4d81e6f3c59
+Create Date: 2026-10-19 19:41:07.315824
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b9e3f17a0c42'
+down_revision: Union[str, None] = 'a4d81e6f3c59'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('campaign_catalog_entries',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('campaign_id', sa.Integer(), nullable=False),
+    sa.Column('catalog', sa.String(length=20), nullable=False),
+    sa.Column('action', sa.String(length=20), nullable=False),
+    sa.Column('base_id', sa.Integer(), nullable=True),
+    sa.Column('data', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['campaign_id'], ['campaigns.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_campaign_catalog_entries_id'), 'campaign_catalog_entries', ['id'], unique=False)
+    op.create_index('ix_campaign_catalog_entries_campaign_id', 'campaign_catalog_entries', ['campaign_id', 'catalog'], unique=False)
+    op.create_index('uq_campaign_catalog_entries_base', 'campaign_catalog_entries', ['campaign_id', 'catalog', 'base_id'], unique=True, postgresql_where=sa.text('base_id IS NOT NULL'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('uq_campaign_catalog_entries_base', table_name='campaign_catalog_entries', postgresql_where=sa.text('base_id IS NOT NULL'))
+    op.drop_index('ix_campaign_catalog_entries_campaign_id', table_name='campaign_catalog_entries')
+    op.drop_index(op.f('ix_campaign_catalog_entries_id'), table_name='campaign_catalog_entries')
+    op.drop_table('campaign_catalog_entries')
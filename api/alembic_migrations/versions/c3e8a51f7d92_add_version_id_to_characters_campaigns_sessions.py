@@ -0,0 +1,33 @@
+"""add version_id to characters, campaigns and campaign sessions
+
+Revision ID: c3e8a51f7d92
+Revises: b7d41c9e2f05
+Create Date: 2026-10-19 11:04:27.552918
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3e8a51f7d92'
+down_revision: Union[str, None] = 'b7d41c9e2f05'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Optimistic concurrency counters (SQLAlchemy version_id_col); existing rows start at 1.
+    op.add_column('characters', sa.Column('version_id', sa.Integer(), server_default=sa.text('1'), nullable=False))
+    op.add_column('campaigns', sa.Column('version_id', sa.Integer(), server_default=sa.text('1'), nullable=False))
+    op.add_column('campaign_sessions', sa.Column('version_id', sa.Integer(), server_default=sa.text('1'), nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('campaign_sessions', 'version_id')
+    op.drop_column('campaigns', 'version_id')
+    op.drop_column('characters', 'version_id')
@@ -0,0 +1,34 @@
+"""add monster hit points to initiative entries
+
+Revision ID: c6f2a9d84e13
+Revises: b9e3f17a0c42
+Create Date: 2026-10-19 20:26:48.550193
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c6f2a9d84e13'
+down_revision: Union[str, None] = 'b9e3f17a0c42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('initiative_entries', sa.Column('monster_id', sa.Integer(), nullable=True))
+    op.add_column('initiative_entries', sa.Column('hit_points_current', sa.Integer(), nullable=True))
+    op.add_column('initiative_entries', sa.Column('hit_points_max', sa.Integer(), nullable=True))
+    op.create_foreign_key('initiative_entries_monster_id_fkey', 'initiative_entries', 'monsters', ['monster_id'], ['id'], ondelete='SET NULL')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('initiative_entries_monster_id_fkey', 'initiative_entries', type_='foreignkey')
+    op.drop_column('initiative_entries', 'hit_points_max')
+    op.drop_column('initiative_entries', 'hit_points_current')
+    op.drop_column('initiative_entries', 'monster_id')
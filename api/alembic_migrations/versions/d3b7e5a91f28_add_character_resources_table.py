@@ -0,0 +1,38 @@
+"""add character resources table
+
+Revision ID: d3b7e5a91f28
+Revises: c6f2a9d84e13
+Create Date: 2026-10-19 21:12:05.318764
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd3b7e5a91f28'
+down_revision: Union[str, None] = 'c6f2a9d84e13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('character_resources',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('character_id', sa.Integer(), nullable=False),
+    sa.Column('resource', sa.String(length=50), nullable=False),
+    sa.Column('used', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['character_id'], ['characters.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('character_id', 'resource', name='uq_character_resources_character_resource')
+    )
+    op.create_index(op.f('ix_character_resources_id'), 'character_resources', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_character_resources_id'), table_name='character_resources')
+    op.drop_table('character_resources')
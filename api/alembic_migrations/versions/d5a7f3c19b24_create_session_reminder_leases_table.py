@@ -0,0 +1,40 @@
+"""create session_reminder_leases table
+
+Revision ID: d5a7f3c19b24
+Revises: b8e2d6a4c190
+Create Date: 2026-10-19 14:22:08.316574
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5a7f3c19b24'
+down_revision: Union[str, None] = 'b8e2d6a4c190'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('session_reminder_leases',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('campaign_id', sa.Integer(), nullable=False),
+    sa.Column('session_utc', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('offset_minutes', sa.Integer(), nullable=False),
+    sa.Column('claimed_by', sa.String(length=255), nullable=False),
+    sa.Column('claimed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['campaign_id'], ['campaigns.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('campaign_id', 'session_utc', 'offset_minutes', name='uq_session_reminder_leases_reminder')
+    )
+    op.create_index(op.f('ix_session_reminder_leases_id'), 'session_reminder_leases', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_session_reminder_leases_id'), table_name='session_reminder_leases')
+    op.drop_table('session_reminder_leases')
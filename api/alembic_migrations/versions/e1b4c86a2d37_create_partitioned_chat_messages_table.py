@@ -0,0 +1,51 @@
+"""create partitioned chat_messages table
+
+Revision ID: e1b4c86a2d37
+Revises: d5a7f3c19b24
+Create Date: 2026-10-19 15:40:51.208734
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1b4c86a2d37'
+down_revision: Union[str, None] = 'd5a7f3c19b24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(sa.schema.CreateSequence(sa.Sequence('chat_messages_id_seq')))
+    # Monthly range partitions (chat_messages_yYYYYmMM) are created by the app's chat
+    # writer at startup and as months roll over; see crud_chat_message.ensure_partitions.
+    op.create_table('chat_messages',
+    sa.Column('id', sa.BigInteger(), server_default=sa.text("nextval('chat_messages_id_seq')"), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('campaign_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('sender_name', sa.String(length=255), nullable=False),
+    sa.Column('message_type', sa.String(length=20), nullable=False),
+    sa.Column('text', sa.Text(), server_default='', nullable=False),
+    sa.Column('payload', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.Column('search_vector', postgresql.TSVECTOR(), sa.Computed("to_tsvector('english', text)", persisted=True), nullable=True),
+    sa.ForeignKeyConstraint(['campaign_id'], ['campaigns.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id', 'created_at'),
+    postgresql_partition_by='RANGE (created_at)'
+    )
+    op.create_index('ix_chat_messages_campaign_id_id', 'chat_messages', ['campaign_id', sa.text('id DESC')], unique=False)
+    op.create_index('ix_chat_messages_search_vector', 'chat_messages', ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_chat_messages_search_vector', table_name='chat_messages')
+    op.drop_index('ix_chat_messages_campaign_id_id', table_name='chat_messages')
+    op.drop_table('chat_messages') # Drops every partition with it
+    op.execute(sa.schema.DropSequence(sa.Sequence('chat_messages_id_seq')))
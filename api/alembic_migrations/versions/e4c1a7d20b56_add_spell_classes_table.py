@@ -0,0 +1,41 @@
+"""add spell classes table
+
+Revision ID: e4c1a7d20b56
+Revises: d3b7e5a91f28
+Create Date: 2026-10-19 21:48:37.902215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4c1a7d20b56'
+down_revision: Union[str, None] = 'd3b7e5a91f28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('spell_classes',
+    sa.Column('class_name', sa.String(length=50), nullable=False),
+    sa.Column('spell_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['spell_id'], ['spells.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('class_name', 'spell_id')
+    )
+    op.create_index('ix_spell_classes_spell_id', 'spell_classes', ['spell_id'], unique=False)
+    # Backfill from the JSON lists of the spells already seeded.
+    op.execute(
+        "INSERT INTO spell_classes (class_name, spell_id) "
+        "SELECT DISTINCT lower(class_name), spells.id FROM spells CROSS JOIN LATERAL json_array_elements_text("
+        "CASE WHEN json_typeof(spells.dnd_classes) = 'array' THEN spells.dnd_classes ELSE '[]'::json END) AS class_name"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_spell_classes_spell_id', table_name='spell_classes')
+    op.drop_table('spell_classes')
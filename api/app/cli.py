@@ -0,0 +1,156 @@
+# Path: api/app/cli.py
+# Operational commands that don't belong in the web process.
+#
+#   python -m app.cli seed                      # seed every catalog
+#   python -m app.cli seed --only spells items  # seed a subset
+#   python -m app.cli import-times --top 20     # slowest modules when importing app.main
+#   python -m app.cli prune-chat                # drop chat partitions past CHAT_RETENTION_DAYS
+#   python -m app.cli worker --concurrency 4    # run background jobs outside the API process
+#   python -m app.cli bulk-import monsters library.ndjson [--update-existing]
+#   python -m app.cli bulk-import characters party.csv --user-id 7
+import argparse
+import asyncio
+import json
+import subprocess
+import sys
+from typing import List, Optional, Tuple
+
+SEEDER_NAMES = ["skills", "items", "spells", "monsters", "classes", "races", "backgrounds", "conditions"]
+
+
+async def _seed(only: Optional[List[str]]) -> None:
+    # The catalogs are large; only import them for this command.
+    from app.db.database import AsyncSessionLocal, engine
+    from app.db.init_db import init_db
+
+    async with AsyncSessionLocal() as db_session:
+        await init_db(db_session, only=only)
+    await engine.dispose()
+
+
+async def _prune_chat() -> None:
+    from app.db.database import AsyncSessionLocal, engine
+    from app.services.chat_history import prune_expired_partitions
+
+    async with AsyncSessionLocal() as db_session:
+        dropped = await prune_expired_partitions(db_session)
+    if not dropped:
+        print("No chat partitions past retention.")
+    await engine.dispose()
+
+
+async def _run_worker(concurrency: int) -> None:
+    from app.db.database import engine
+    from app.services.jobs import JobWorker
+    from app.core.config import settings
+
+    worker = JobWorker(concurrency=concurrency, poll_interval_seconds=settings.JOB_POLL_INTERVAL_SECONDS,
+                       heartbeat_seconds=settings.JOB_HEARTBEAT_SECONDS)
+    await worker.start()
+    try:
+        await asyncio.Event().wait() # Until Ctrl+C / SIGTERM cancels the run
+    finally:
+        await worker.stop()
+        await engine.dispose()
+
+
+async def _bulk_import(kind: str, path: str, fmt: Optional[str], update_existing: bool, user_id: Optional[int]) -> int:
+    from app.db.database import AsyncSessionLocal, engine
+    from app.services import bulk_import
+
+    fmt = fmt or bulk_import.format_for(path)
+    with open(path, encoding="utf-8-sig", newline="") as lines:
+        async with AsyncSessionLocal() as db_session:
+            if kind == "monsters":
+                report = await bulk_import.import_monsters(db_session, lines, fmt, update_existing=update_existing)
+            else:
+                report = await bulk_import.import_characters(db_session, lines, fmt, user_id=user_id)
+    await engine.dispose()
+    for error in report["errors"]:
+        label = f" ({error['name']})" if error["name"] else ""
+        print(f"line {error['line']}{label}: {error['error']}", file=sys.stderr)
+    summary = {key: value for key, value in report.items() if key != "errors"}
+    print(json.dumps(summary))
+    return 0 if not report["failed"] else 2
+
+
+def _parse_importtime(stderr: str) -> List[Tuple[int, int, str]]:
+    """Parses `python -X importtime` output into (self_us, cumulative_us, module) rows."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|", 2)
+        rows.append((int(self_us), int(cumulative_us), module.strip()))
+    return rows
+
+
+def _import_times(target: str, top: int, app_only: bool) -> int:
+    # Run in a fresh interpreter so nothing is already in sys.modules.
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        capture_output=True, text=True
+    )
+    if completed.returncode != 0:
+        print(completed.stderr, file=sys.stderr)
+        return completed.returncode
+
+    rows = _parse_importtime(completed.stderr)
+    total_us = next((row[1] for row in rows if row[2] == target), 0)
+    if app_only:
+        rows = [row for row in rows if row[2] == "app" or row[2].startswith("app.")]
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for self_us, cumulative_us, module in sorted(rows, key=lambda row: row[1], reverse=True)[:top]:
+        print(f"{cumulative_us / 1000:>14.1f} {self_us / 1000:>9.1f}  {module}")
+    print(f"Importing {target} took {total_us / 1000:.1f} ms in total.")
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="Aethoria's Chronicle API commands")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    seed_parser = subparsers.add_parser("seed", help="Seed the predefined game catalogs (idempotent)")
+    seed_parser.add_argument("--only", nargs="+", choices=SEEDER_NAMES, help="Seed only these catalogs")
+
+    times_parser = subparsers.add_parser("import-times", help="Measure per-module import time of the app")
+    times_parser.add_argument("--target", default="app.main", help="Module to import (default: app.main)")
+    times_parser.add_argument("--top", type=int, default=25, help="Number of modules to list")
+    times_parser.add_argument("--all-modules", action="store_true", help="Include third-party modules")
+
+    subparsers.add_parser("prune-chat", help="Drop monthly chat history partitions past CHAT_RETENTION_DAYS")
+
+    worker_parser = subparsers.add_parser("worker", help="Run background job workers until interrupted")
+    worker_parser.add_argument("--concurrency", type=int, default=2, help="Jobs run at the same time (default 2)")
+
+    import_parser = subparsers.add_parser("bulk-import", help="Import monsters or characters from an NDJSON or CSV file")
+    import_parser.add_argument("kind", choices=["monsters", "characters"])
+    import_parser.add_argument("path", help="File to import; one record per line (NDJSON) or row (CSV with a header)")
+    import_parser.add_argument("--format", choices=["ndjson", "csv"], help="Default: from the file extension")
+    import_parser.add_argument("--update-existing", action="store_true", help="Monsters: overwrite same-named monsters instead of skipping them")
+    import_parser.add_argument("--user-id", type=int, help="Characters: the owning user (required)")
+
+    args = parser.parse_args(argv)
+    if args.command == "seed":
+        asyncio.run(_seed(args.only))
+        return 0
+    if args.command == "worker":
+        try:
+            asyncio.run(_run_worker(args.concurrency))
+        except KeyboardInterrupt:
+            pass
+        return 0
+    if args.command == "bulk-import":
+        if args.kind == "characters" and args.user_id is None:
+            parser.error("bulk-import characters requires --user-id")
+        return asyncio.run(_bulk_import(args.kind, args.path, args.format, args.update_existing, args.user_id))
+    if args.command == "prune-chat":
+        asyncio.run(_prune_chat())
+        return 0
+    if args.command == "import-times":
+        return _import_times(args.target, args.top, app_only=not args.all_modules)
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
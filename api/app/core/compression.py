@@ -0,0 +1,221 @@
+# Path: api/app/core/compression.py
+# Negotiated response compression.
+#
+# CompressionMiddleware compresses HTTP responses with zstd (when the `zstandard`
+# package is installed and the client accepts it) or gzip. Bodies under the minimum
+# size, non-text content types and responses that already carry a Content-Encoding
+# are sent as-is. Only "http" scopes are touched, so WebSocket upgrades and their
+# frames pass straight through. Streaming responses are compressed chunk by chunk.
+#
+# CatalogBlobCache serves the reference catalogs (spells, items, monsters...) from
+# bytes that were serialized and compressed once per catalog version, so a catalog
+# request costs a dict lookup instead of a query, a serialization and a compression.
+import gzip
+import hashlib
+import zlib
+from typing import Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from fastapi import Request, Response
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import zstandard
+except ImportError: # Optional; gzip only without it
+    zstandard = None
+
+COMPRESSIBLE_CONTENT_TYPES = (
+    "application/json", "application/x-ndjson", "application/javascript",
+    "application/xml", "image/svg+xml", "text/",
+)
+
+
+def supported_encodings() -> Tuple[str, ...]:
+    """In order of preference when the client rates them equally."""
+    return ("zstd", "gzip") if zstandard is not None else ("gzip",)
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Picks the best encoding we support from an Accept-Encoding header, or None for identity."""
+    if not accept_encoding:
+        return None
+    qualities: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        qualities[name] = quality
+    best, best_quality = None, 0.0
+    for encoding in supported_encodings():
+        quality = qualities.get(encoding, qualities.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress(data: bytes, encoding: str, gzip_level: int = 6, zstd_level: int = 3) -> bytes:
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=zstd_level).compress(data)
+    return gzip.compress(data, compresslevel=gzip_level, mtime=0)
+
+
+def _is_compressible(content_type: Optional[str]) -> bool:
+    return bool(content_type) and content_type.lower().startswith(COMPRESSIBLE_CONTENT_TYPES)
+
+
+class _StreamCompressor:
+    """Incremental compressor that flushes after every chunk so streamed lines arrive promptly."""
+
+    def __init__(self, encoding: str, gzip_level: int, zstd_level: int):
+        if encoding == "zstd":
+            self._compressor = zstandard.ZstdCompressor(level=zstd_level).compressobj()
+            self._sync_flush = zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        else:
+            self._compressor = zlib.compressobj(gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+            self._sync_flush = zlib.Z_SYNC_FLUSH
+
+    def chunk(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(self._sync_flush)
+
+    def finish(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush()
+
+
+class CompressionMiddleware:
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, gzip_level: int = 6, zstd_level: int = 3):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.zstd_level = zstd_level
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await self.app(scope, receive, _CompressingSend(send, encoding, self).send)
+
+
+class _CompressingSend:
+    def __init__(self, send: Send, encoding: str, middleware: CompressionMiddleware):
+        self._send = send
+        self.encoding = encoding
+        self.middleware = middleware
+        self._start: Optional[Message] = None
+        self._mode: Optional[str] = None # "passthrough", "stream"; None until the first body message
+        self._stream: Optional[_StreamCompressor] = None
+
+    def _set_encoding_headers(self, headers: MutableHeaders) -> None:
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+
+    async def send(self, message: Message) -> None:
+        message_type = message["type"]
+        if message_type == "http.response.start":
+            self._start = message # Held back until we know whether the body gets compressed
+            return
+        if message_type != "http.response.body":
+            await self._send(message)
+            return
+
+        if self._mode == "passthrough":
+            await self._send(message)
+            return
+        if self._mode == "stream":
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            data = self._stream.chunk(body) if more_body else self._stream.finish(body)
+            await self._send({"type": "http.response.body", "body": data, "more_body": more_body})
+            return
+
+        # First body message: decide.
+        start = self._start
+        headers = MutableHeaders(raw=start["headers"])
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if (
+            "content-encoding" in headers
+            or start["status"] < 200 or start["status"] in (204, 304)
+            or not _is_compressible(headers.get("content-type"))
+            or (not more_body and len(body) < self.middleware.minimum_size)
+        ):
+            self._mode = "passthrough"
+            await self._send(start)
+            await self._send(message)
+            return
+
+        self._set_encoding_headers(headers)
+        if not more_body:
+            data = compress(body, self.encoding, self.middleware.gzip_level, self.middleware.zstd_level)
+            headers["Content-Length"] = str(len(data))
+            self._mode = "passthrough"
+            await self._send(start)
+            await self._send({"type": "http.response.body", "body": data})
+            return
+
+        # Streaming body: length unknown up front.
+        if "content-length" in headers:
+            del headers["Content-Length"]
+        self._mode = "stream"
+        self._stream = _StreamCompressor(self.encoding, self.middleware.gzip_level, self.middleware.zstd_level)
+        await self._send(start)
+        await self._send({"type": "http.response.body", "body": self._stream.chunk(body), "more_body": True})
+
+
+class _CompressedBlob:
+    def __init__(self, version: Hashable, body: bytes, gzip_level: int, zstd_level: int):
+        self.version = version
+        self.etag = '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+        self.variants: Dict[Optional[str], bytes] = {None: body}
+        for encoding in supported_encodings():
+            self.variants[encoding] = compress(body, encoding, gzip_level, zstd_level)
+
+
+class CatalogBlobCache:
+    """
+    JSON bodies of catalog listings, with every supported compression of each, per catalog version.
+    Entries built for an older version are rebuilt on the next request after the version moves.
+    Empty listings (e.g. built before the catalogs were seeded) are served but not kept.
+    """
+
+    def __init__(self, gzip_level: int = 9, zstd_level: int = 19, max_entries: int = 64):
+        self.gzip_level = gzip_level # Compressed once per version, so spend the CPU on a smaller body
+        self.zstd_level = zstd_level
+        self.max_entries = max_entries
+        self._blobs: Dict[Hashable, _CompressedBlob] = {}
+
+    async def response(self, request: Request, key: Hashable, version: Hashable,
+                       build: Callable[[], Awaitable[bytes]]) -> Response:
+        blob = self._blobs.get(key)
+        if blob is None or blob.version != version:
+            body = await build()
+            blob = _CompressedBlob(version, body, self.gzip_level, self.zstd_level)
+            if body.strip() != b"[]":
+                if key not in self._blobs and len(self._blobs) >= self.max_entries:
+                    self._blobs.pop(next(iter(self._blobs)))
+                self._blobs[key] = blob
+
+        headers = {"ETag": blob.etag, "Vary": "Accept-Encoding", "Cache-Control": "private, no-cache"}
+        if blob.etag in (request.headers.get("if-none-match") or ""):
+            return Response(status_code=304, headers=headers)
+        encoding = negotiate_encoding(request.headers.get("accept-encoding"))
+        if encoding is not None:
+            headers["Content-Encoding"] = encoding
+        return Response(content=blob.variants[encoding], headers=headers, media_type="application/json")
+
+    def clear(self) -> None:
+        self._blobs.clear()
+
+
+catalog_blobs = CatalogBlobCache()
@@ -0,0 +1,39 @@
+# Path: api/app/core/concurrency.py
+# Helpers for optimistic concurrency on versioned rows (Character, Campaign, CampaignSession).
+#
+# Those models map a version_id column as SQLAlchemy's version_id_col, so every ORM UPDATE
+# is a compare-and-swap: "... WHERE id = :id AND version_id = :loaded_version". If another
+# writer got there first, no row matches and the flush raises StaleDataError, which
+# main.py turns into a 409. The ETag is that version; a client that sends it back in
+# If-Match gets a 409 instead of overwriting someone else's edit.
+from typing import Optional
+
+from fastapi import HTTPException, Response, status
+
+
+def etag_for(version_id: int) -> str:
+    return f'"{version_id}"'
+
+
+def set_etag(response: Response, version_id: int) -> None:
+    response.headers["ETag"] = etag_for(version_id)
+
+
+def check_if_match(if_match: Optional[str], current_version: int) -> None:
+    """
+    Raises 409 unless the If-Match header is absent, "*", or names the current version.
+    Accepts strong or weak tags ("3", W/"3") and bare numbers.
+    """
+    if if_match is None or if_match.strip() == "*":
+        return
+    for tag in if_match.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag.strip('"') == str(current_version):
+            return
+    raise HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail=f"This record has been modified (current version {current_version}). Reload and try again.",
+        headers={"ETag": etag_for(current_version)}
+    )
@@ -0,0 +1,178 @@
+# Path: api/app/core/fieldsets.py
+# Sparse fieldsets: `?fields=hit_points_current,armor_class,skills.skill_definition.name`.
+#
+# The requested field tree drives both sides of a response:
+#   - loader_options() turns it into load_only()/selectinload() options, so columns and
+#     relationships nobody asked for are never SELECTed;
+#   - partial_schema() builds (and caches) a Pydantic model with just those fields, so
+#     serialization never touches an attribute that wasn't loaded.
+# Field names are the response schema's field names, which match the ORM attribute names.
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Type, Union, get_args, get_origin
+
+from fastapi import HTTPException, Query, Response, status
+from pydantic import BaseModel, ConfigDict, create_model
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.orm import load_only, selectinload
+
+from app.core.responses import model_response
+
+# {"name": None, "skills": {"skill_definition": {"name": None}}}; None means "the whole field".
+FieldTree = Dict[str, Optional["FieldTree"]]
+
+FIELDS_QUERY_DESCRIPTION = (
+    "Comma-separated list of fields to return; use dots for nested fields "
+    "(e.g. id,name,hit_points_current,skills.skill_definition.name). Omit for the full response."
+)
+
+
+def parse_fields(fields: str) -> FieldTree:
+    tree: FieldTree = {}
+    for path in fields.split(","):
+        path = path.strip()
+        if not path:
+            continue
+        node = tree
+        parts = path.split(".")
+        for depth, part in enumerate(parts):
+            if not part:
+                raise ValueError(f"Invalid field path '{path}'.")
+            if depth == len(parts) - 1:
+                node[part] = None # A whole field wins over any nested selection of it
+                break
+            if part in node and node[part] is None:
+                break
+            node = node.setdefault(part, {})
+    if not tree:
+        raise ValueError("'fields' must name at least one field.")
+    return tree
+
+
+def _nested_schema(annotation: Any) -> Tuple[Optional[Type[BaseModel]], bool]:
+    """Returns (nested Pydantic model, is_list) for annotations like Foo, Optional[Foo], List[Foo]."""
+    origin = get_origin(annotation)
+    if origin in (list, List):
+        nested, _ = _nested_schema(get_args(annotation)[0])
+        return nested, True
+    if origin is Union:
+        for arg in get_args(annotation):
+            if arg is not type(None):
+                return _nested_schema(arg)
+        return None, False
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation, False
+    return None, False
+
+
+def _selected_fields(schema: Type[BaseModel], tree: Optional[FieldTree]) -> FieldTree:
+    if tree is None:
+        return {name: None for name in schema.model_fields}
+    unknown = [name for name in tree if name not in schema.model_fields]
+    if unknown:
+        raise ValueError(
+            f"Unknown field(s) for {schema.__name__}: {', '.join(sorted(unknown))}. "
+            f"Available: {', '.join(schema.model_fields)}."
+        )
+    selected = dict(tree)
+    if "id" in schema.model_fields:
+        selected.setdefault("id", None) # Always identify the object
+    for name, subtree in selected.items():
+        if subtree is not None:
+            nested, _ = _nested_schema(schema.model_fields[name].annotation)
+            if nested is None:
+                raise ValueError(f"Field '{name}' of {schema.__name__} has no nested fields.")
+            _selected_fields(nested, subtree)
+    return selected
+
+
+def validate_fields(schema: Type[BaseModel], tree: FieldTree) -> None:
+    _selected_fields(schema, tree)
+
+
+def _freeze(tree: Optional[FieldTree]) -> Any:
+    if tree is None:
+        return None
+    return tuple(sorted((name, _freeze(subtree)) for name, subtree in tree.items()))
+
+
+def _thaw(frozen: Any) -> Optional[FieldTree]:
+    if frozen is None:
+        return None
+    return {name: _thaw(subtree) for name, subtree in frozen}
+
+
+@lru_cache(maxsize=512)
+def _partial_schema(schema: Type[BaseModel], frozen_tree: Any) -> Type[BaseModel]:
+    tree = _thaw(frozen_tree)
+    field_definitions: Dict[str, Any] = {}
+    for name, subtree in _selected_fields(schema, tree).items():
+        field = schema.model_fields[name]
+        annotation = field.annotation
+        if subtree is not None:
+            nested, is_list = _nested_schema(annotation)
+            partial_nested = _partial_schema(nested, _freeze(subtree))
+            annotation = List[partial_nested] if is_list else Optional[partial_nested]
+        default = ... if field.is_required() else field.get_default(call_default_factory=True)
+        field_definitions[name] = (annotation, default)
+    return create_model(
+        f"{schema.__name__}Partial",
+        __config__=ConfigDict(from_attributes=True),
+        **field_definitions
+    )
+
+
+def partial_schema(schema: Type[BaseModel], tree: Optional[FieldTree]) -> Type[BaseModel]:
+    """The schema restricted to the selected fields (the schema itself when tree is None)."""
+    if tree is None:
+        return schema
+    return _partial_schema(schema, _freeze(tree))
+
+
+def loader_options(model: Type[Any], schema: Type[BaseModel], tree: Optional[FieldTree],
+                   always: Sequence[str] = (), _required: Sequence[Any] = ()) -> List[Any]:
+    """
+    ORM loader options that load exactly what `schema` restricted to `tree` will read.
+    `always` names extra columns the endpoint itself needs (e.g. "user_id" for an ownership check).
+    With tree=None every relationship in the schema is selectin-loaded and all columns are loaded.
+    """
+    mapper = sa_inspect(model)
+    columns = [getattr(model, name) for name in always]
+    columns.extend(getattr(model, mapper.get_property_by_column(column).key) for column in _required)
+    options: List[Any] = []
+    for name, subtree in _selected_fields(schema, tree).items():
+        if name in mapper.relationships:
+            relationship = mapper.relationships[name]
+            # The parent's join columns (FK for many-to-one) must be loaded for selectinload to work,
+            # and the child's (FK for one-to-many) to group the rows back onto their parents.
+            columns.extend(getattr(model, mapper.get_property_by_column(column).key) for column in relationship.local_columns)
+            loader = selectinload(getattr(model, name))
+            nested, _ = _nested_schema(schema.model_fields[name].annotation)
+            if nested is not None:
+                loader = loader.options(*loader_options(
+                    relationship.mapper.class_, nested, subtree, _required=list(relationship.remote_side)
+                ))
+            options.append(loader)
+        elif name in mapper.column_attrs and tree is not None:
+            columns.append(getattr(model, name))
+    if tree is not None and columns:
+        options.insert(0, load_only(*columns))
+    return options
+
+
+def sparse_response(objects: Any, schema: Type[BaseModel], tree: Optional[FieldTree], **response_kwargs: Any) -> Response:
+    """JSON response of ORM object(s) through the partial schema (the full schema when tree is None)."""
+    return model_response(objects, partial_schema(schema, tree), **response_kwargs)
+
+
+def sparse_fields(schema: Type[BaseModel]) -> Callable[..., Optional[FieldTree]]:
+    """Dependency factory: parses and validates `?fields=` against the response schema (400 if invalid)."""
+    def dependency(fields: Optional[str] = Query(None, description=FIELDS_QUERY_DESCRIPTION)) -> Optional[FieldTree]:
+        if fields is None:
+            return None
+        try:
+            tree = parse_fields(fields)
+            validate_fields(schema, tree)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        return tree
+    return dependency
@@ -0,0 +1,72 @@
+# Path: api/app/core/responses.py
+# JSON responses without FastAPI's dict round trip.
+#
+# With response_model, FastAPI validates the returned ORM object, dumps it to Python
+# dicts/lists (mode="json") and then json.dumps() those. model_response() does the
+# validation once and lets pydantic-core write the JSON bytes directly, which skips the
+# intermediate object graph. FastJSONResponse is the app-wide default for everything
+# that still returns plain data; it uses orjson when installed and compact json otherwise.
+#
+# Routes that return model_response() keep their response_model for the OpenAPI docs;
+# FastAPI passes a Response instance through untouched.
+import enum
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Type
+
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, TypeAdapter
+
+try:
+    import orjson
+except ImportError: # Optional; the stdlib encoder is used without it
+    orjson = None
+
+
+def json_default(value: Any) -> Any:
+    """Encodes the non-JSON types our schemas use; the `default` hook for json, orjson and msgpack."""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def json_bytes(content: Any) -> bytes:
+    """Compact JSON; datetimes, enums and decimals are encoded like the response schemas do."""
+    if orjson is not None:
+        return orjson.dumps(content, default=json_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":"), default=json_default).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return json_bytes(content)
+
+
+@lru_cache(maxsize=256)
+def _adapter(schema: Type[BaseModel], many: bool) -> TypeAdapter:
+    return TypeAdapter(List[schema] if many else schema)
+
+
+def dump_json(objects: Any, schema: Type[BaseModel]) -> bytes:
+    """Validates ORM object(s) (or dicts) against `schema` and returns the JSON bytes."""
+    many = isinstance(objects, (list, tuple))
+    adapter = _adapter(schema, many)
+    return adapter.dump_json(adapter.validate_python(objects, from_attributes=True))
+
+
+def model_response(objects: Any, schema: Type[BaseModel], status_code: int = 200,
+                   headers: Optional[Dict[str, str]] = None) -> Response:
+    return Response(content=dump_json(objects, schema), status_code=status_code,
+                    headers=headers, media_type="application/json")
+
+
+def trusted_response(content: Any, status_code: int = 200, headers: Optional[Dict[str, str]] = None) -> Response:
+    """For data the server built itself in the response shape (e.g. cached derived sheets): no validation."""
+    return FastJSONResponse(content=content, status_code=status_code, headers=headers)
@@ -0,0 +1,144 @@
+# Path: api/app/core/ws_protocol.py
+# WebSocket subprotocols for the campaign socket.
+#
+# A client picks its framing in the Sec-WebSocket-Protocol header:
+#   aethoria.msgpack.v1  binary MessagePack frames: [code, payload] or [code, payload, sender],
+#                        where code is the small integer from MESSAGE_TYPE_CODES (a type
+#                        without a code is sent as its name instead);
+#   aethoria.json.v1     text frames of {"type", "payload", "sender"} JSON, as before.
+# A client that offers neither gets JSON. msgpack is in requirements.txt; should it be
+# missing from an install, aethoria.msgpack.v1 simply isn't offered and those clients get
+# JSON too. broadcast encodes a message once per codec in use and sends the same frame
+# to every subscriber using that codec. A frame that can't be decoded raises FrameError,
+# which the socket answers with an error message instead of disconnecting.
+#
+# Codes are part of the protocol: append new types, never renumber existing ones.
+import json
+from typing import Any, Dict, List, Optional, Union
+
+from fastapi import WebSocket, WebSocketDisconnect
+
+from app.core.responses import json_default, json_bytes
+
+try:
+    import msgpack
+except ImportError: # Optional; without it only JSON is offered
+    msgpack = None
+
+SUBPROTOCOL_JSON = "aethoria.json.v1"
+SUBPROTOCOL_MSGPACK = "aethoria.msgpack.v1"
+
+MESSAGE_TYPES = [
+    # Chat and presence
+    "chat", "dice_roll", "user_join", "user_leave", "error",
+    # Encounter and map
+    "start_encounter", "encounter_update", "next_turn", "turn_update", "end_encounter",
+    "map_patch", "map_update", "movement_query", "movement_result",
+    # Combat
+    "apply_hit_points", "hp_update",
+    "spawn_monsters", "remove_monsters", "monster_area_effect", "monster_conditions", "move_monsters",
+    "monster_pool", "monster_pool_delta",
+    "apply_condition", "remove_condition", "end_concentration",
+    "conditions", "condition_applied", "condition_expired", "condition_trigger",
+    # Resources
+    "spend_resource", "resource_update",
+]
+MESSAGE_TYPE_CODES: Dict[str, int] = {name: code for code, name in enumerate(MESSAGE_TYPES, start=1)}
+
+Frame = Union[str, bytes]
+
+
+class FrameError(ValueError):
+    """A received frame isn't a valid message for the socket's codec."""
+
+
+def _message(data: Any) -> Dict[str, Any]:
+    if not isinstance(data, dict) or not isinstance(data.get("type"), str):
+        raise FrameError("A message must be an object with a string 'type'.")
+    return data
+
+
+class JSONCodec:
+    subprotocol = SUBPROTOCOL_JSON
+    binary = False
+
+    def encode(self, message: Dict[str, Any]) -> Frame:
+        return json_bytes(message).decode("utf-8")
+
+    def decode(self, frame: Frame) -> Dict[str, Any]:
+        try:
+            data = json.loads(frame)
+        except (ValueError, TypeError) as e: # JSONDecodeError and UnicodeDecodeError are ValueErrors
+            raise FrameError(f"Invalid JSON frame: {e}")
+        return _message(data)
+
+
+class MessagePackCodec:
+    subprotocol = SUBPROTOCOL_MSGPACK
+    binary = True
+
+    def encode(self, message: Dict[str, Any]) -> Frame:
+        message_type = message.get("type")
+        frame: List[Any] = [MESSAGE_TYPE_CODES.get(message_type, message_type), message.get("payload")]
+        if message.get("sender") is not None:
+            frame.append(message["sender"])
+        return msgpack.packb(frame, use_bin_type=True, default=json_default)
+
+    def decode(self, frame: Frame) -> Dict[str, Any]:
+        try:
+            data = msgpack.unpackb(frame, raw=False, strict_map_key=False)
+        except (ValueError, TypeError, msgpack.UnpackException) as e: # ExtraData, FormatError, StackError, OutOfData...
+            raise FrameError(f"Invalid MessagePack frame: {e}")
+        if not isinstance(data, list) or not data:
+            raise FrameError("A MessagePack frame must be a [type, payload] array.")
+        message_type = data[0]
+        if isinstance(message_type, int) and not isinstance(message_type, bool):
+            if not 1 <= message_type <= len(MESSAGE_TYPES):
+                raise FrameError(f"Unknown message type code {message_type}.")
+            message_type = MESSAGE_TYPES[message_type - 1]
+        return _message({"type": message_type, "payload": data[1] if len(data) > 1 else None})
+
+
+JSON_CODEC = JSONCodec()
+CODECS = {JSON_CODEC.subprotocol: JSON_CODEC}
+if msgpack is not None:
+    CODECS[SUBPROTOCOL_MSGPACK] = MessagePackCodec()
+
+
+def negotiate(websocket: WebSocket) -> Optional[str]:
+    """The first subprotocol the client offered that this server speaks, or None (plain JSON)."""
+    for offered in websocket.scope.get("subprotocols") or []:
+        if offered in CODECS:
+            return offered
+    return None
+
+
+def codec_for(websocket: WebSocket) -> Any:
+    return getattr(websocket.state, "codec", JSON_CODEC)
+
+
+async def accept(websocket: WebSocket) -> None:
+    subprotocol = negotiate(websocket)
+    websocket.state.codec = CODECS.get(subprotocol, JSON_CODEC)
+    await websocket.accept(subprotocol=subprotocol)
+
+
+async def send_frame(websocket: WebSocket, frame: Frame) -> None:
+    if isinstance(frame, bytes):
+        await websocket.send_bytes(frame)
+    else:
+        await websocket.send_text(frame)
+
+
+async def send(websocket: WebSocket, message: Dict[str, Any]) -> None:
+    await send_frame(websocket, codec_for(websocket).encode(message))
+
+
+async def receive(websocket: WebSocket) -> Dict[str, Any]:
+    """The next message, decoded with the socket's codec (text frames are always JSON). Raises FrameError."""
+    event = await websocket.receive()
+    if event["type"] == "websocket.disconnect":
+        raise WebSocketDisconnect(event.get("code", 1000), event.get("reason"))
+    if event.get("bytes") is not None:
+        return codec_for(websocket).decode(event["bytes"])
+    return JSON_CODEC.decode(event["text"])
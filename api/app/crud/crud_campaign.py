@@ -1,8 +1,8 @@
 # Path: api/app/crud/crud_campaign.py
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, delete
 from sqlalchemy.orm import selectinload, aliased # aliased might be useful for complex queries later
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 from fastapi import HTTPException
 from app.models.campaign import Campaign as CampaignModel
@@ -18,14 +18,15 @@ from app.models.character_spell import CharacterSpell as CharacterSpellModel # A
 
 from app.schemas.campaign import CampaignCreate as CampaignCreateSchema
 from app.schemas.campaign import CampaignUpdate as CampaignUpdateSchema
-from app.crud import crud_character
+from app.crud import crud_character, crud_session_reminder
 
 async def award_xp_to_characters(
-    db: AsyncSession, *, campaign: CampaignModel, character_ids: List[int], xp_to_add: int
+    db: AsyncSession, *, campaign: CampaignModel, character_ids: List[int], xp_to_add: int, commit: bool = True
 ) -> List[CharacterModel]:
     """
-    Awards a specified amount of XP to a list of characters within a campaign.
+    Awards a specified amount of XP to a list of characters within a campaign, in one transaction.
     Verifies that each character is an active member of the campaign.
+    With commit=False the caller commits (or rolls back) the whole award.
     """
     if xp_to_add <= 0:
         raise ValueError("XP to award must be a positive number.")
@@ -47,10 +48,11 @@ async def award_xp_to_characters(
         character_to_award = await crud_character.get_character(db=db, character_id=char_id)
         if character_to_award:
             updated_char = await crud_character.award_xp_to_character(
-                db=db, character=character_to_award, xp_to_add=xp_to_add
+                db=db, character=character_to_award, xp_to_add=xp_to_add, commit=False
             )
             updated_characters.append(updated_char)
-    
+    if commit:
+        await db.commit()
     return updated_characters
 
 # Helper function to consistently load CampaignMember with all details for schemas
@@ -84,47 +86,57 @@ async def create_campaign(
     campaign_data = campaign_in.model_dump() 
     db_campaign_for_creation = CampaignModel(**campaign_data, dm_user_id=dm_user_id)
     db.add(db_campaign_for_creation)
+    if db_campaign_for_creation.next_session_utc is not None:
+        await db.flush() # Assigns the id the reminder schedulers are told about
+        await crud_session_reminder.notify_schedule_changed(db, campaign_id=db_campaign_for_creation.id)
     await db.commit()
     created_campaign = await get_campaign(db=db, campaign_id=db_campaign_for_creation.id)
     if not created_campaign:
         raise Exception("Failed to retrieve campaign after creation for response.") 
     return created_campaign
 
-async def get_campaign(db: AsyncSession, campaign_id: int) -> Optional[CampaignModel]:
-    result = await db.execute(
-        select(CampaignModel)
-        .options(
-            selectinload(CampaignModel.dm), 
-            selectinload(CampaignModel.members).options( # Eager load members AND their nested details
-                selectinload(CampaignMemberModel.user),
-                selectinload(CampaignMemberModel.campaign),
-                selectinload(CampaignMemberModel.character).options(
-                    selectinload(CharacterModel.skills).selectinload(CharacterSkillModel.skill_definition),
-                    selectinload(CharacterModel.inventory_items).selectinload(CharacterItemModel.item_definition),
-                    selectinload(CharacterModel.known_spells).selectinload(CharacterSpellModel.spell_definition)
-                )
+async def get_campaign(db: AsyncSession, campaign_id: int, load_options: Optional[List[Any]] = None) -> Optional[CampaignModel]:
+    options = load_options if load_options is not None else [
+        selectinload(CampaignModel.dm),
+        selectinload(CampaignModel.members).options( # Eager load members AND their nested details
+            selectinload(CampaignMemberModel.user),
+            selectinload(CampaignMemberModel.campaign),
+            selectinload(CampaignMemberModel.character).options(
+                selectinload(CharacterModel.skills).selectinload(CharacterSkillModel.skill_definition),
+                selectinload(CharacterModel.inventory_items).selectinload(CharacterItemModel.item_definition),
+                selectinload(CharacterModel.known_spells).selectinload(CharacterSpellModel.spell_definition)
             )
         )
+    ]
+    result = await db.execute(
+        select(CampaignModel)
+        .options(*options)
         .filter(CampaignModel.id == campaign_id)
     )
     return result.scalars().first()
 
+async def get_campaign_summary(db: AsyncSession, campaign_id: int) -> Optional[CampaignModel]:
+    """The campaign row alone, for permission checks that don't need members or characters."""
+    result = await db.execute(select(CampaignModel).filter(CampaignModel.id == campaign_id))
+    return result.scalars().first()
+
 async def get_campaigns_by_dm(
-    db: AsyncSession, *, dm_user_id: int, skip: int = 0, limit: int = 100
+    db: AsyncSession, *, dm_user_id: int, skip: int = 0, limit: int = 100, load_options: Optional[List[Any]] = None
 ) -> List[CampaignModel]:
-    result = await db.execute(
-        select(CampaignModel)
-        .options(
-            selectinload(CampaignModel.dm), 
-            selectinload(CampaignModel.members).options(
-                selectinload(CampaignMemberModel.user),
-                selectinload(CampaignMemberModel.character).options(
-                    selectinload(CharacterModel.skills).selectinload(CharacterSkillModel.skill_definition),
-                    selectinload(CharacterModel.inventory_items).selectinload(CharacterItemModel.item_definition),
-                    selectinload(CharacterModel.known_spells).selectinload(CharacterSpellModel.spell_definition)
-                )
+    options = load_options if load_options is not None else [
+        selectinload(CampaignModel.dm),
+        selectinload(CampaignModel.members).options(
+            selectinload(CampaignMemberModel.user),
+            selectinload(CampaignMemberModel.character).options(
+                selectinload(CharacterModel.skills).selectinload(CharacterSkillModel.skill_definition),
+                selectinload(CharacterModel.inventory_items).selectinload(CharacterItemModel.item_definition),
+                selectinload(CharacterModel.known_spells).selectinload(CharacterSpellModel.spell_definition)
             )
         )
+    ]
+    result = await db.execute(
+        select(CampaignModel)
+        .options(*options)
         .filter(CampaignModel.dm_user_id == dm_user_id)
         .order_by(CampaignModel.created_at.desc())
         .offset(skip)
@@ -133,22 +145,23 @@ async def get_campaigns_by_dm(
     return result.scalars().all()
 
 async def get_campaigns_for_user_as_member(
-    db: AsyncSession, *, user_id: int, skip: int = 0, limit: int = 100
+    db: AsyncSession, *, user_id: int, skip: int = 0, limit: int = 100, load_options: Optional[List[Any]] = None
 ) -> List[CampaignModel]:
+    options = load_options if load_options is not None else [
+        selectinload(CampaignModel.dm),
+        selectinload(CampaignModel.members).options(
+            selectinload(CampaignMemberModel.user),
+            selectinload(CampaignMemberModel.character).options(
+                selectinload(CharacterModel.skills).selectinload(CharacterSkillModel.skill_definition),
+                selectinload(CharacterModel.inventory_items).selectinload(CharacterItemModel.item_definition),
+                selectinload(CharacterModel.known_spells).selectinload(CharacterSpellModel.spell_definition)
+            )
+        )
+    ]
     result = await db.execute(
         select(CampaignModel)
         .join(CampaignModel.members)
-        .options(
-            selectinload(CampaignModel.dm),
-            selectinload(CampaignModel.members).options(
-                selectinload(CampaignMemberModel.user),
-                selectinload(CampaignMemberModel.character).options(
-                    selectinload(CharacterModel.skills).selectinload(CharacterSkillModel.skill_definition),
-                    selectinload(CharacterModel.inventory_items).selectinload(CharacterItemModel.item_definition),
-                    selectinload(CharacterModel.known_spells).selectinload(CharacterSpellModel.spell_definition)
-                )
-            )
-        )
+        .options(*options)
         .filter(CampaignMemberModel.user_id == user_id)
         .filter(CampaignMemberModel.status == CampaignMemberStatusEnum.ACTIVE)
         .order_by(CampaignModel.created_at.desc()) 
@@ -159,21 +172,22 @@ async def get_campaigns_for_user_as_member(
     return result.scalars().all()
 
 async def get_discoverable_campaigns(
-    db: AsyncSession, *, skip: int = 0, limit: int = 100
+    db: AsyncSession, *, skip: int = 0, limit: int = 100, load_options: Optional[List[Any]] = None
 ) -> List[CampaignModel]:
-    result = await db.execute(
-        select(CampaignModel)
-        .options(
-            selectinload(CampaignModel.dm), 
-            selectinload(CampaignModel.members).options( # Also load members for discoverable campaigns
-                selectinload(CampaignMemberModel.user),
-                selectinload(CampaignMemberModel.character).options(
-                    selectinload(CharacterModel.skills).selectinload(CharacterSkillModel.skill_definition),
-                    selectinload(CharacterModel.inventory_items).selectinload(CharacterItemModel.item_definition),
-                    selectinload(CharacterModel.known_spells).selectinload(CharacterSpellModel.spell_definition)
-                )
+    options = load_options if load_options is not None else [
+        selectinload(CampaignModel.dm),
+        selectinload(CampaignModel.members).options( # Also load members for discoverable campaigns
+            selectinload(CampaignMemberModel.user),
+            selectinload(CampaignMemberModel.character).options(
+                selectinload(CharacterModel.skills).selectinload(CharacterSkillModel.skill_definition),
+                selectinload(CharacterModel.inventory_items).selectinload(CharacterItemModel.item_definition),
+                selectinload(CharacterModel.known_spells).selectinload(CharacterSpellModel.spell_definition)
             )
         )
+    ]
+    result = await db.execute(
+        select(CampaignModel)
+        .options(*options)
         .filter(CampaignModel.is_open_for_recruitment == True)
         .order_by(CampaignModel.updated_at.desc())
         .offset(skip)
@@ -188,19 +202,32 @@ async def update_campaign(
     for field, value in update_data.items():
         setattr(campaign, field, value)
     db.add(campaign)
+    if "next_session_utc" in update_data:
+        await crud_session_reminder.notify_schedule_changed(db, campaign_id=campaign.id)
     await db.commit()
     await db.refresh(campaign)
     return await get_campaign(db=db, campaign_id=campaign.id) # Re-fetch fully loaded
 
 async def delete_campaign(
-    db: AsyncSession, *, campaign_id: int, dm_user_id: int
-) -> Optional[CampaignModel]:
-    db_campaign = await get_campaign(db=db, campaign_id=campaign_id) # Fetch with relationships
-    if not db_campaign or db_campaign.dm_user_id != dm_user_id:
-        return None
-    await db.delete(db_campaign)
-    await db.commit()
-    return db_campaign
+    db: AsyncSession, *, campaign_id: int, dm_user_id: int, commit: bool = True
+) -> Optional[Dict[str, Any]]:
+    """
+    Deletes the campaign in one statement; sessions, initiative entries, members and
+    chat go with it through ON DELETE CASCADE. Returns the deleted campaign's columns
+    (no relationships), or None if it doesn't exist or isn't this DM's.
+    With commit=False the caller commits.
+    """
+    result = await db.execute(
+        delete(CampaignModel)
+        .where(CampaignModel.id == campaign_id, CampaignModel.dm_user_id == dm_user_id)
+        .returning(*CampaignModel.__table__.columns)
+    )
+    deleted = result.mappings().first()
+    if deleted and deleted["next_session_utc"] is not None:
+        await crud_session_reminder.notify_schedule_changed(db, campaign_id=campaign_id)
+    if commit:
+        await db.commit()
+    return dict(deleted) if deleted else None
 
 # --- Campaign Member CRUD Functions ---
 
@@ -215,6 +242,18 @@ async def get_campaign_member_by_user_id(
     )
     return result.scalars().first()
 
+async def get_active_party_character_ids(db: AsyncSession, *, campaign_id: int) -> List[int]:
+    """Character ids of the campaign's ACTIVE members that have a character assigned."""
+    result = await db.execute(
+        select(CampaignMemberModel.character_id)
+        .filter(
+            CampaignMemberModel.campaign_id == campaign_id,
+            CampaignMemberModel.status == CampaignMemberStatusEnum.ACTIVE,
+            CampaignMemberModel.character_id.is_not(None)
+        )
+    )
+    return list(result.scalars().all())
+
 async def add_member_to_campaign( # DM direct add
     db: AsyncSession, *, campaign_id: int, user_id: int, character_id: Optional[int] = None, 
     initial_status: CampaignMemberStatusEnum = CampaignMemberStatusEnum.ACTIVE
@@ -311,9 +350,9 @@ async def update_campaign_member_status(
     return await _get_fully_loaded_campaign_member(db, member_to_update.id)
 
 async def get_campaign_members( # MODIFIED FOR EAGER LOADING
-    db: AsyncSession, *, campaign_id: int, status_filter: Optional[CampaignMemberStatusEnum] = None
+    db: AsyncSession, *, campaign_id: int, status_filter: Optional[CampaignMemberStatusEnum] = None, load_options: Optional[List[Any]] = None
 ) -> List[CampaignMemberModel]:
-    query = select(CampaignMemberModel).options(
+    options = load_options if load_options is not None else [
         selectinload(CampaignMemberModel.user),
          # --- ADDED EAGER LOADING FOR CAMPAIGN ---
             selectinload(CampaignMemberModel.campaign).options(
@@ -325,7 +364,8 @@ async def get_campaign_members( # MODIFIED FOR EAGER LOADING
             selectinload(CharacterModel.inventory_items).selectinload(CharacterItemModel.item_definition),
             selectinload(CharacterModel.known_spells).selectinload(CharacterSpellModel.spell_definition)
         )
-    ).filter(CampaignMemberModel.campaign_id == campaign_id)
+    ]
+    query = select(CampaignMemberModel).options(*options).filter(CampaignMemberModel.campaign_id == campaign_id)
 
     if status_filter:
         query = query.filter(CampaignMemberModel.status == status_filter)
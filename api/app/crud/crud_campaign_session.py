@@ -1,12 +1,20 @@
 # Path: api/app/crud/crud_campaign_session.py
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy import update, bindparam, case
 from sqlalchemy.orm import selectinload
-from typing import List, Optional
+from sqlalchemy.orm.util import identity_key
+from sqlalchemy.orm.attributes import set_committed_value
+from typing import List, Optional, Dict, Any, Iterable, Tuple
 
 from app.models.campaign_session import CampaignSession
 from app.models.initiative_entry import InitiativeEntry
+from app.models.character import Character as CharacterModel
+from app.models.monster import Monster as MonsterModel
 from app.schemas.initiative_entry import InitiativeEntryCreate
+from app.schemas.movement import MovementResult as MovementResultSchema, MovementPath, ReachableCell
+from app.crud import crud_race, crud_catalog
+from app.services import movement
 
 async def get_active_session_for_campaign(db: AsyncSession, campaign_id: int) -> Optional[CampaignSession]:
     """Fetches the currently active session for a given campaign, if one exists."""
@@ -52,7 +60,17 @@ async def add_initiative_entry(db: AsyncSession, session_id: int, entry_in: Init
     if not session or not session.is_active:
         raise ValueError("No active session found to add initiative to.")
 
-    new_entry = InitiativeEntry(**entry_in.model_dump(), session_id=session_id)
+    entry_data = entry_in.model_dump()
+    if entry_in.monster_id is not None:
+        monster = await db.get(MonsterModel, entry_in.monster_id)
+        if not monster:
+            raise ValueError(f"Monster {entry_in.monster_id} not found.")
+        if entry_data["character_id"] is None:
+            entry_data["monster_name"] = entry_data["monster_name"] or monster.name
+        entry_data["hit_points_max"] = entry_data["hit_points_max"] or monster.hit_points
+        if entry_data["hit_points_current"] is None:
+            entry_data["hit_points_current"] = entry_data["hit_points_max"]
+    new_entry = InitiativeEntry(**entry_data, session_id=session_id)
     db.add(new_entry)
     await db.commit()
     await db.refresh(new_entry)
@@ -80,12 +98,94 @@ async def clear_initiative(db: AsyncSession, session_id: int):
     await db.commit()
     return {"message": "Initiative cleared successfully."}
 
+async def get_combatants_for_update(
+    db: AsyncSession, *, session_id: int, entry_ids: Iterable[int]
+) -> Dict[int, InitiativeEntry]:
+    """
+    Locks the session's given initiative entries and their characters (FOR UPDATE, in id order)
+    and returns {entry_id: entry} with .character and .monster (from the catalog cache) attached.
+    """
+    result = await db.execute(
+        select(InitiativeEntry)
+        .filter(InitiativeEntry.session_id == session_id, InitiativeEntry.id.in_(list(entry_ids)))
+        .order_by(InitiativeEntry.id)
+        .with_for_update()
+        .execution_options(populate_existing=True)
+    )
+    entries = result.scalars().all()
+    character_ids = sorted({entry.character_id for entry in entries if entry.character_id is not None})
+    characters: Dict[int, CharacterModel] = {}
+    if character_ids:
+        result = await db.execute(
+            select(CharacterModel)
+            .filter(CharacterModel.id.in_(character_ids))
+            .order_by(CharacterModel.id)
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        )
+        characters = {character.id: character for character in result.scalars().all()}
+    monsters = await crud_catalog.monsters.get_many({entry.monster_id for entry in entries if entry.monster_id is not None})
+    for entry in entries:
+        set_committed_value(entry, "character", characters.get(entry.character_id))
+        set_committed_value(entry, "monster", monsters.get(entry.monster_id))
+    return {entry.id: entry for entry in entries}
+
+async def write_hit_points(
+    db: AsyncSession, *, character_hp: Dict[int, Tuple[int, bool]], entry_hp: Dict[int, int]
+) -> None:
+    """
+    Stores new hit points in one transaction: one executemany per table.
+    character_hp is {character_id: (hit_points_current, revived)}; revived (healed up from 0)
+    also clears the death saves. Character updates bump version_id like ORM updates do.
+    The rows are expected to be locked by the caller (get_combatants_for_update); copies of
+    them already in the session are brought in line with what was written, so a later ORM
+    flush neither reads old hit points nor fails the version check.
+    """
+    characters = CharacterModel.__table__
+    entries = InitiativeEntry.__table__
+    if character_hp:
+        revived = bindparam("b_revived")
+        await db.execute(
+            update(characters)
+            .where(characters.c.id == bindparam("b_id"))
+            .values(
+                hit_points_current=bindparam("b_hp"),
+                death_save_successes=case((revived, 0), else_=characters.c.death_save_successes),
+                death_save_failures=case((revived, 0), else_=characters.c.death_save_failures),
+                version_id=characters.c.version_id + 1,
+            ),
+            [{"b_id": character_id, "b_hp": hp, "b_revived": was_revived} for character_id, (hp, was_revived) in character_hp.items()]
+        )
+    if entry_hp:
+        await db.execute(
+            update(entries).where(entries.c.id == bindparam("b_id")).values(hit_points_current=bindparam("b_hp")),
+            [{"b_id": entry_id, "b_hp": hp} for entry_id, hp in entry_hp.items()]
+        )
+    identity_map = db.sync_session.identity_map
+    for character_id, (hp, was_revived) in character_hp.items():
+        character = identity_map.get(identity_key(CharacterModel, character_id))
+        if character is None:
+            continue
+        set_committed_value(character, "hit_points_current", hp)
+        set_committed_value(character, "version_id", character.version_id + 1)
+        if was_revived:
+            set_committed_value(character, "death_save_successes", 0)
+            set_committed_value(character, "death_save_failures", 0)
+    for entry_id, hp in entry_hp.items():
+        entry = identity_map.get(identity_key(InitiativeEntry, entry_id))
+        if entry is not None:
+            set_committed_value(entry, "hit_points_current", hp)
+    await db.commit()
+
 async def advance_turn(db: AsyncSession, session_id: int) -> Optional[InitiativeEntry]:
     """
     Advances the turn to the next combatant in the initiative order.
     Returns the new active entry, or None if combat ends.
     """
-    session = await db.get(CampaignSession, session_id)
+    # populate_existing: a long-lived (websocket) session may hold an old copy of the row.
+    # The UPDATE below is versioned, so a concurrent advance makes it fail with StaleDataError
+    # instead of both callers moving the turn.
+    session = await db.get(CampaignSession, session_id, populate_existing=True)
     if not session or not session.is_active:
         raise ValueError("No active session found.")
 
@@ -116,3 +216,67 @@ async def advance_turn(db: AsyncSession, session_id: int) -> Optional[Initiative
     await db.commit()
     
     return next_entry
+
+# --- Battle map: patches and movement ---
+
+async def patch_map_state(db: AsyncSession, session: CampaignSession, patch: Dict[str, Any]) -> CampaignSession:
+    """Merges a patch into the session's map_state, bumps its version and drops cached movement."""
+    return await save_map_state(db, session, movement.apply_map_patch(session.map_state, patch))
+
+async def save_map_state(db: AsyncSession, session: CampaignSession, map_state: Dict[str, Any]) -> CampaignSession:
+    """Stores an already merged map_state (one versioned UPDATE) and drops cached movement."""
+    session.map_state = map_state
+    db.add(session)
+    await db.commit()
+    movement.movement_cache.invalidate_session(session.id, session.map_state)
+    return session
+
+async def get_token_speed_ft(db: AsyncSession, token: Dict[str, Any]) -> int:
+    """
+    Resolves a token's walking speed: an explicit "speed" on the token wins, then the
+    linked Monster.speed, then the speed of the linked character's race.
+    """
+    if token.get("speed") is not None:
+        return movement.parse_speed_ft(token["speed"])
+    if token.get("monster_id") is not None:
+        monster = await db.get(MonsterModel, int(token["monster_id"]))
+        if monster:
+            return movement.parse_speed_ft(monster.speed)
+    if token.get("character_id") is not None:
+        character = await db.get(CharacterModel, int(token["character_id"]))
+        if character and character.race:
+            race = await crud_race.get_race_by_name(db, name=character.race)
+            if race:
+                return movement.parse_speed_ft(race.speed)
+    return movement.DEFAULT_WALKING_SPEED_FT
+
+async def compute_token_movement(
+    db: AsyncSession, session: CampaignSession, *, token_id: str, targets: Optional[List[List[int]]] = None
+) -> MovementResultSchema:
+    """Reachable cells and optional shortest paths for a token, served from the movement cache when possible."""
+    battle_map = movement.BattleMap(movement.movement_cache.remember_map(session.id, session.map_state))
+    battle_map.token_position(token_id) # ValueError for a missing or malformed token, before any lookups
+    if targets is not None and not isinstance(targets, list):
+        raise ValueError("targets must be a list of [x, y] pairs.")
+    target_cells = [movement.parse_target_cell(target) for target in targets or []]
+    speed_ft = await get_token_speed_ft(db, battle_map.tokens[token_id])
+    result = movement.movement_cache.get_or_compute(session.id, battle_map, token_id, speed_ft)
+
+    paths = []
+    for target_cell in target_cells:
+        path = result.path_to(target_cell)
+        paths.append(MovementPath(
+            target=list(target_cell),
+            reachable=path is not None,
+            cost_ft=result.costs.get(target_cell) if path is not None else None,
+            path=[list(cell) for cell in path] if path is not None else None,
+        ))
+
+    return MovementResultSchema(
+        token_id=token_id,
+        map_version=battle_map.version,
+        origin=list(result.origin),
+        speed_ft=speed_ft,
+        reachable=[ReachableCell(x=cell[0], y=cell[1], cost_ft=cost) for cell, cost in result.reachable_cells()],
+        paths=paths,
+    )
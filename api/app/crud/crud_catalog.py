@@ -0,0 +1,130 @@
+# Path: api/app/crud/crud_catalog.py
+# Process-local cache of the predefined catalogs (items, skills, spells, classes, races, monsters).
+#
+# These tables are read far more often than they change, so each one is read with
+# a single SELECT the first time it's needed and kept as detached ORM instances.
+# They are shared between requests: read them, never modify them or add them to a
+# session. To put one on a new row, set the foreign key and attach the cached
+# instance with set_committed_value.
+#
+# They do change: the seeders fill them, and the API writes monsters (one at a time
+# and through the bulk import), classes and races. Every such write calls
+# invalidate_catalogs(db), which bumps the shared counter in catalog_state and drops
+# this process's caches. Other workers notice through current_version, which re-reads
+# the counter at most every CATALOG_VERSION_CHECK_SECONDS and drops their caches when
+# it moved, so a write made through any worker or the CLI seeder reaches all of them.
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Type
+
+from sqlalchemy import select, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.core.config import settings
+from app.db.database import ReadSessionLocal
+from app.models.catalog_state import CatalogState
+from app.models.dnd_class import DndClass as DndClassModel
+from app.models.item import Item as ItemModel
+from app.models.monster import Monster as MonsterModel
+from app.models.race import Race as RaceModel
+from app.models.skill import Skill as SkillModel
+from app.models.spell import Spell as SpellModel
+
+# catalog_state.version as last seen by this process; derived caches (derived stats, class
+# resource tables, the precompressed catalog responses) key on it. Read it through
+# current_version() so it's kept in step with the database.
+catalog_version: int = 0
+_version_checked_at: Optional[float] = None
+
+
+class CatalogCache:
+    def __init__(self, model: Type[Any], options: Sequence[Any] = ()):
+        self.model = model
+        self.options = list(options) # Loader options, so relationships are loaded before detaching
+        self._by_id: Optional[Dict[int, Any]] = None
+        self._id_by_name: Dict[str, int] = {}
+
+    async def _load(self) -> Dict[int, Any]:
+        await current_version()
+        if self._by_id is None:
+            # Own session: the rows must not end up in (and be expired by) a request's session.
+            async with ReadSessionLocal() as session:
+                rows = (await session.execute(select(self.model).options(*self.options))).scalars().all()
+            by_id = {row.id: row for row in rows}
+            if not rows:
+                # Not seeded yet (e.g. `python -m app.cli seed` still to run); try again next time.
+                return by_id
+            self._id_by_name = {row.name: row.id for row in rows}
+            self._by_id = by_id
+        return self._by_id
+
+    async def get(self, entry_id: int) -> Optional[Any]:
+        return (await self._load()).get(entry_id)
+
+    async def get_by_name(self, name: str) -> Optional[Any]:
+        by_id = await self._load()
+        entry_id = self._id_by_name.get(name)
+        return by_id.get(entry_id) if entry_id is not None else None
+
+    async def all(self) -> List[Any]:
+        return list((await self._load()).values())
+
+    async def get_many(self, entry_ids: Iterable[int]) -> Dict[int, Any]:
+        """Returns {id: instance} for the ids that exist; unknown ids are left out."""
+        by_id = await self._load()
+        return {entry_id: by_id[entry_id] for entry_id in entry_ids if entry_id in by_id}
+
+    async def ids_by_name(self, names: Iterable[str]) -> Dict[str, int]:
+        """Returns {name: id} for the names that exist; unknown names are left out."""
+        await self._load()
+        return {name: self._id_by_name[name] for name in names if name in self._id_by_name}
+
+    def invalidate(self) -> None:
+        self._by_id = None
+        self._id_by_name = {}
+
+
+items = CatalogCache(ItemModel)
+skills = CatalogCache(SkillModel)
+spells = CatalogCache(SpellModel)
+dnd_classes = CatalogCache(DndClassModel, options=[selectinload(DndClassModel.levels)])
+races = CatalogCache(RaceModel)
+monsters = CatalogCache(MonsterModel)
+
+
+def _drop_caches() -> None:
+    for cache in (items, skills, spells, dnd_classes, races, monsters):
+        cache.invalidate()
+
+
+async def current_version() -> int:
+    """
+    The shared catalog version, re-read from catalog_state at most every
+    CATALOG_VERSION_CHECK_SECONDS; this process's caches are dropped when it moved.
+    """
+    global catalog_version, _version_checked_at
+    now = time.monotonic()
+    if _version_checked_at is None or now - _version_checked_at >= settings.CATALOG_VERSION_CHECK_SECONDS:
+        _version_checked_at = now
+        async with ReadSessionLocal() as session:
+            version = (await session.execute(select(CatalogState.version).where(CatalogState.id == 1))).scalar() or 0
+        # The counter only goes up; a lagging replica must not move this process back.
+        if version > catalog_version:
+            _drop_caches()
+            catalog_version = version
+    return catalog_version
+
+
+async def invalidate_catalogs(db: AsyncSession) -> None:
+    """Bumps the shared catalog version and drops this process's caches; call after writing to a catalog table."""
+    global catalog_version
+    table = CatalogState.__table__
+    statement = pg_insert(table).values(id=1, version=1)
+    statement = statement.on_conflict_do_update(
+        index_elements=["id"], set_={"version": table.c.version + 1, "updated_at": func.now()}
+    ).returning(table.c.version)
+    version = (await db.execute(statement)).scalar_one()
+    await db.commit()
+    _drop_caches()
+    catalog_version = max(catalog_version, version)
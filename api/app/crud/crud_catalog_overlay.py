@@ -0,0 +1,57 @@
+# Path: api/app/crud/crud_catalog_overlay.py
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import select, delete, func, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.campaign_catalog_entry import CampaignCatalogEntry as CampaignCatalogEntryModel, CatalogOverlayActionEnum
+
+async def get_overlay_entries(
+    db: AsyncSession, *, campaign_id: int, catalog: Optional[str] = None
+) -> List[CampaignCatalogEntryModel]:
+    query = select(CampaignCatalogEntryModel).where(CampaignCatalogEntryModel.campaign_id == campaign_id)
+    if catalog is not None:
+        query = query.where(CampaignCatalogEntryModel.catalog == catalog)
+    result = await db.execute(query.order_by(CampaignCatalogEntryModel.id))
+    return result.scalars().all()
+
+async def put_overlay_entry(
+    db: AsyncSession, *, campaign_id: int, catalog: str, action: CatalogOverlayActionEnum,
+    base_id: Optional[int], data: Optional[Dict[str, Any]]
+) -> CampaignCatalogEntryModel:
+    """
+    Adds an entry, or sets the override/hide for (campaign, catalog, base_id), replacing
+    whichever of the two was there before.
+    """
+    values = {"campaign_id": campaign_id, "catalog": catalog, "action": action.value, "base_id": base_id, "data": data}
+    statement = pg_insert(CampaignCatalogEntryModel).values(**values)
+    if base_id is not None:
+        statement = statement.on_conflict_do_update(
+            index_elements=["campaign_id", "catalog", "base_id"],
+            index_where=text("base_id IS NOT NULL"),
+            set_={"action": statement.excluded.action, "data": statement.excluded.data, "updated_at": func.now()},
+        )
+    result = await db.execute(
+        statement.returning(CampaignCatalogEntryModel),
+        execution_options={"populate_existing": True}
+    )
+    entry = result.scalars().one()
+    await db.commit()
+    return entry
+
+async def delete_overlay_entry(
+    db: AsyncSession, *, campaign_id: int, catalog: str, entry_id: int
+) -> Optional[Dict[str, Any]]:
+    result = await db.execute(
+        delete(CampaignCatalogEntryModel)
+        .where(
+            CampaignCatalogEntryModel.id == entry_id,
+            CampaignCatalogEntryModel.campaign_id == campaign_id,
+            CampaignCatalogEntryModel.catalog == catalog,
+        )
+        .returning(*CampaignCatalogEntryModel.__table__.columns)
+    )
+    row = result.mappings().first()
+    await db.commit()
+    return dict(row) if row is not None else None
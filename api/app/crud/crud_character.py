@@ -1,8 +1,9 @@
 # Path: api/app/crud/crud_character.py
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func 
+from sqlalchemy import select, func, delete
 from sqlalchemy.orm import selectinload
-from typing import List, Optional, Tuple, Dict
+from sqlalchemy.orm.attributes import set_committed_value
+from typing import Any, List, Optional, Tuple, Dict
 import random
 
 from app.models.character import Character as CharacterModel
@@ -27,7 +28,9 @@ from app.schemas.item import CharacterItemCreate as CharacterItemCreateSchema, C
 from app.schemas.character_spell import CharacterSpellCreate, CharacterSpellUpdate 
 from app.schemas.admin import AdminCharacterProgressionUpdate
 
-from app.crud import crud_dnd_class, crud_item, crud_skill
+from app.crud import crud_dnd_class, crud_skill, crud_catalog, crud_spell
+from app.services import derived_stats
+from app.services.resources import resource_ledger, class_tables, MAX_LEVEL
 from app.game_data.rogue_data import RoguishArchetypeEnum, AVAILABLE_ROGUE_ARCHETYPES
 
 # --- Data Constants ---
@@ -54,27 +57,45 @@ def calculate_ability_modifier(score: Optional[int]) -> int:
 
 # --- GENERIC LEVEL-UP LOGIC ---
 
-async def _character_gains_spells_at_level(character: CharacterModel, level_data: Dict, db: AsyncSession) -> bool:
+async def _character_gains_spells_at_level(
+    character: CharacterModel, level_data: Dict, db: AsyncSession,
+    known_spell_counts: Optional[Tuple[int, int]] = None
+) -> bool:
+    """known_spell_counts is (cantrips, leveled spells); when given, the COUNT queries are skipped."""
     if not hasattr(level_data, 'spellcasting') or not level_data.spellcasting: return False
     
     spellcasting_info = level_data.spellcasting
     
     target_cantrips = spellcasting_info.get("cantrips_known", 0)
     if target_cantrips > 0:
-        current_cantrips_q = await db.execute(select(func.count(CharacterSpellModel.id)).join(SpellModel).filter(CharacterSpellModel.character_id == character.id, CharacterSpellModel.is_known == True, SpellModel.level == 0))
-        if target_cantrips > current_cantrips_q.scalar_one(): return True
+        if known_spell_counts is not None:
+            current_cantrips = known_spell_counts[0]
+        else:
+            current_cantrips_q = await db.execute(select(func.count(CharacterSpellModel.id)).join(SpellModel).filter(CharacterSpellModel.character_id == character.id, CharacterSpellModel.is_known == True, SpellModel.level == 0))
+            current_cantrips = current_cantrips_q.scalar_one()
+        if target_cantrips > current_cantrips: return True
 
     if "spells_known" in spellcasting_info:
         target_spells_known = spellcasting_info.get("spells_known", 0)
-        current_spells_q = await db.execute(select(func.count(CharacterSpellModel.id)).join(SpellModel).filter(CharacterSpellModel.character_id == character.id, CharacterSpellModel.is_known == True, SpellModel.level > 0))
-        if target_spells_known > current_spells_q.scalar_one(): return True
+        if known_spell_counts is not None:
+            current_spells = known_spell_counts[1]
+        else:
+            current_spells_q = await db.execute(select(func.count(CharacterSpellModel.id)).join(SpellModel).filter(CharacterSpellModel.character_id == character.id, CharacterSpellModel.is_known == True, SpellModel.level > 0))
+            current_spells = current_spells_q.scalar_one()
+        if target_spells_known > current_spells: return True
             
     return False
 
-async def _get_next_level_up_status(character: CharacterModel, db: AsyncSession) -> Optional[str]:
+async def _get_next_level_up_status(
+    character: CharacterModel, db: AsyncSession,
+    dnd_class: Optional[DndClassModel] = None,
+    known_spell_counts: Optional[Tuple[int, int]] = None
+) -> Optional[str]:
+    """Pass an already-loaded dnd_class and/or known_spell_counts to avoid the corresponding queries."""
     if not character.character_class: return None
 
-    dnd_class = await crud_dnd_class.get_dnd_class_by_name(db, name=character.character_class)
+    if dnd_class is None:
+        dnd_class = await crud_dnd_class.get_dnd_class_by_name(db, name=character.character_class)
     if not dnd_class or not dnd_class.levels: return None
 
     level_data = next((lvl for lvl in dnd_class.levels if lvl.level == character.level), None)
@@ -95,33 +116,35 @@ async def _get_next_level_up_status(character: CharacterModel, db: AsyncSession)
             if "archetype" in feature_name and character.roguish_archetype is None: return "pending_archetype_selection"
     
     if hasattr(level_data, 'spellcasting') and level_data.spellcasting and not choice_done("spells"):
-        if await _character_gains_spells_at_level(character, level_data, db):
+        if await _character_gains_spells_at_level(character, level_data, db, known_spell_counts):
             return "pending_spells"
 
     return None
 
 # --- CHARACTER CORE CRUD ---
 
-async def get_character(db: AsyncSession, character_id: int) -> Optional[CharacterModel]:
+async def get_character(db: AsyncSession, character_id: int, load_options: Optional[List[Any]] = None) -> Optional[CharacterModel]:
+    options = load_options if load_options is not None else [
+        selectinload(CharacterModel.skills).selectinload(CharacterSkillModel.skill_definition),
+        selectinload(CharacterModel.inventory_items).selectinload(CharacterItemModel.item_definition),
+        selectinload(CharacterModel.known_spells).selectinload(CharacterSpellModel.spell_definition)
+    ]
     result = await db.execute(
         select(CharacterModel)
-        .options(
-            selectinload(CharacterModel.skills).selectinload(CharacterSkillModel.skill_definition),
-            selectinload(CharacterModel.inventory_items).selectinload(CharacterItemModel.item_definition),
-            selectinload(CharacterModel.known_spells).selectinload(CharacterSpellModel.spell_definition)
-        )
+        .options(*options)
         .filter(CharacterModel.id == character_id)
     )
     return result.scalars().first()
 
-async def get_characters_by_user(db: AsyncSession, user_id: int, skip: int = 0, limit: int = 100) -> List[CharacterModel]:
+async def get_characters_by_user(db: AsyncSession, user_id: int, skip: int = 0, limit: int = 100, load_options: Optional[List[Any]] = None) -> List[CharacterModel]:
+    options = load_options if load_options is not None else [
+        selectinload(CharacterModel.skills).selectinload(CharacterSkillModel.skill_definition),
+        selectinload(CharacterModel.inventory_items).selectinload(CharacterItemModel.item_definition),
+        selectinload(CharacterModel.known_spells).selectinload(CharacterSpellModel.spell_definition)
+    ]
     result = await db.execute(
         select(CharacterModel)
-        .options(
-            selectinload(CharacterModel.skills).selectinload(CharacterSkillModel.skill_definition),
-            selectinload(CharacterModel.inventory_items).selectinload(CharacterItemModel.item_definition),
-            selectinload(CharacterModel.known_spells).selectinload(CharacterSpellModel.spell_definition)
-        )
+        .options(*options)
         .filter(CharacterModel.user_id == user_id)
         .order_by(CharacterModel.name)
         .offset(skip)
@@ -129,13 +152,57 @@ async def get_characters_by_user(db: AsyncSession, user_id: int, skip: int = 0,
     )
     return result.scalars().all()
 
-async def create_character_for_user( db: AsyncSession, character_in: CharacterCreateSchema, user_id: int ) -> CharacterModel:
+async def get_characters_for_derived_stats(db: AsyncSession, character_ids: List[int]) -> List[CharacterModel]:
+    """Loads characters with only what the derived-stats engine reads (skills and inventory items)."""
+    if not character_ids:
+        return []
+    result = await db.execute(
+        select(CharacterModel)
+        .options(
+            selectinload(CharacterModel.skills),
+            selectinload(CharacterModel.inventory_items).selectinload(CharacterItemModel.item_definition)
+        )
+        .filter(CharacterModel.id.in_(character_ids))
+        .order_by(CharacterModel.name)
+    )
+    return result.scalars().all()
+
+async def get_derived_stats(character: CharacterModel) -> Dict:
+    """
+    Returns the derived sheet for a character (skills and inventory items loaded),
+    reusing the memoized result while the character's version stamp is unchanged.
+    """
+    stamp = derived_stats.character_version_stamp(character, await crud_catalog.current_version())
+    cached = derived_stats.derived_stats_cache.get(character.id, stamp)
+    if cached is not None:
+        return cached
+
+    dnd_class = await crud_catalog.dnd_classes.get_by_name(character.character_class) if character.character_class else None
+    race = await crud_catalog.races.get_by_name(character.race) if character.race else None
+    skill_catalog = await crud_catalog.skills.all()
+    derived = derived_stats.compute_derived_stats(character, dnd_class, race, skill_catalog)
+    derived_stats.derived_stats_cache.put(character.id, stamp, derived)
+    return derived
+
+async def _build_character(
+    db: AsyncSession, character_in: CharacterCreateSchema, user_id: int,
+    dnd_classes: Optional[Dict[str, Optional[DndClassModel]]] = None
+) -> Tuple[CharacterModel, Dict[int, Any], Dict[int, Any], Dict[int, Any]]:
+    """
+    The new, unsaved character with its starting child rows, plus the cached item, skill and
+    spell definitions it references. `dnd_classes` memoizes class lookups across calls.
+    """
     character_data = character_in.model_dump(exclude={"chosen_cantrip_ids", "chosen_initial_spell_ids", "chosen_skill_proficiencies"})
     
     char_class_name = character_data.get("character_class")
     if not char_class_name: raise ValueError("A character class must be selected.")
         
-    dnd_class = await crud_dnd_class.get_dnd_class_by_name(db, name=char_class_name)
+    if dnd_classes is not None and char_class_name in dnd_classes:
+        dnd_class = dnd_classes[char_class_name]
+    else:
+        dnd_class = await crud_dnd_class.get_dnd_class_by_name(db, name=char_class_name)
+        if dnd_classes is not None:
+            dnd_classes[char_class_name] = dnd_class
     if not dnd_class: raise ValueError(f"Class '{char_class_name}' not found in database.")
 
     character_data["hit_die_type"] = dnd_class.hit_die
@@ -155,34 +222,84 @@ async def create_character_for_user( db: AsyncSession, character_in: CharacterCr
         field_name = f"st_prof_{prof}"
         character_data[field_name] = True
 
-    db_character = CharacterModel(**character_data, user_id=user_id)
-    db.add(db_character)
-    
-    await db.flush()
-
-    for item_name, quantity in DEFAULT_STARTING_EQUIPMENT_PACK:
-        item_model = await crud_item.get_item_by_name(db, name=item_name)
-        if item_model:
-            db.add(CharacterItemModel(character_id=db_character.id, item_id=item_model.id, quantity=quantity))
+    # Resolve every referenced catalog row from the in-process catalog cache
+    # instead of one query per starting item.
+    starting_item_ids = await crud_catalog.items.ids_by_name(name for name, _ in DEFAULT_STARTING_EQUIPMENT_PACK)
+    starting_items = await crud_catalog.items.get_many(starting_item_ids.values())
+
+    chosen_skill_ids = set(character_in.chosen_skill_proficiencies or [])
+    chosen_skills = await crud_catalog.skills.get_many(chosen_skill_ids)
+    if len(chosen_skills) != len(chosen_skill_ids):
+        raise ValueError(f"Unknown skill id(s): {sorted(chosen_skill_ids - chosen_skills.keys())}.")
+
+    # Cantrips and initial spells become the same kind of row; a spell chosen in both lists is added once.
+    chosen_spell_ids = set(character_in.chosen_cantrip_ids or []) | set(character_in.chosen_initial_spell_ids or [])
+    chosen_spells = await crud_catalog.spells.get_many(chosen_spell_ids)
+    if len(chosen_spells) != len(chosen_spell_ids):
+        raise ValueError(f"Unknown spell id(s): {sorted(chosen_spell_ids - chosen_spells.keys())}.")
+
+    # Child rows hang off the relationships so one flush inserts the character and then
+    # each child table in a single batched INSERT.
+    db_character = CharacterModel(
+        **character_data,
+        user_id=user_id,
+        inventory_items=[
+            CharacterItemModel(item_id=starting_item_ids[item_name], quantity=quantity)
+            for item_name, quantity in DEFAULT_STARTING_EQUIPMENT_PACK if item_name in starting_item_ids
+        ],
+        skills=[
+            CharacterSkillModel(skill_id=skill_id, is_proficient=True, has_expertise=False)
+            for skill_id in chosen_skill_ids
+        ],
+        known_spells=[
+            CharacterSpellModel(spell_id=spell_id, is_known=True, is_prepared=True)
+            for spell_id in chosen_spell_ids
+        ]
+    )
 
-    if character_in.chosen_skill_proficiencies:
-        for skill_id in set(character_in.chosen_skill_proficiencies):
-            db.add(CharacterSkillModel(character_id=db_character.id, skill_id=skill_id, is_proficient=True))
-    
-    # Add initial spells if any were chosen
-    if character_in.chosen_cantrip_ids:
-        for spell_id in set(character_in.chosen_cantrip_ids):
-            db.add(CharacterSpellModel(character_id=db_character.id, spell_id=spell_id, is_known=True, is_prepared=True))
-    
-    if character_in.chosen_initial_spell_ids:
-        for spell_id in set(character_in.chosen_initial_spell_ids):
-            db.add(CharacterSpellModel(character_id=db_character.id, spell_id=spell_id, is_known=True, is_prepared=True))
+    known_cantrips = sum(1 for spell in chosen_spells.values() if spell.level == 0)
+    db_character.level_up_status = await _get_next_level_up_status(
+        db_character, db, dnd_class=dnd_class,
+        known_spell_counts=(known_cantrips, len(chosen_spells) - known_cantrips)
+    )
+    return db_character, starting_items, chosen_skills, chosen_spells
 
-    db_character.level_up_status = await _get_next_level_up_status(db_character, db)
-    
+async def create_character_for_user( db: AsyncSession, character_in: CharacterCreateSchema, user_id: int ) -> CharacterModel:
+    db_character, starting_items, chosen_skills, chosen_spells = await _build_character(db, character_in, user_id)
+    db.add(db_character)
     await db.commit()
-    await db.refresh(db_character)
-    return await get_character(db, db_character.id)
+
+    # Server defaults came back through RETURNING (eager_defaults on the model), so the graph
+    # only lacks the catalog definitions; attach the cached ones without loading or tracking them.
+    for character_item in db_character.inventory_items:
+        set_committed_value(character_item, "item_definition", starting_items[character_item.item_id])
+    for character_skill in db_character.skills:
+        set_committed_value(character_skill, "skill_definition", chosen_skills[character_skill.skill_id])
+    for character_spell in db_character.known_spells:
+        set_committed_value(character_spell, "spell_definition", chosen_spells[character_spell.spell_id])
+    return db_character
+
+async def bulk_create_characters_for_user(
+    db: AsyncSession, *, characters_in: List[Tuple[int, CharacterCreateSchema]], user_id: int,
+    dnd_classes: Optional[Dict[str, Optional[DndClassModel]]] = None
+) -> Tuple[int, List[Tuple[int, str]]]:
+    """
+    Builds each (line, character) exactly like create_character_for_user and saves the batch with
+    one flush and one commit. Rows that fail to build are reported as (line, error) and skipped.
+    """
+    characters, errors = [], []
+    for line, character_in in characters_in:
+        try:
+            db_character, _, _, _ = await _build_character(db, character_in, user_id, dnd_classes=dnd_classes)
+        except ValueError as e:
+            errors.append((line, str(e)))
+            continue
+        characters.append(db_character)
+    if characters:
+        db.add_all(characters)
+        await db.commit()
+        db.expunge_all() # Nothing reads them back; keep the identity map from growing batch after batch
+    return len(characters), errors
 
 async def update_character(db: AsyncSession, character: CharacterModel, character_in: CharacterUpdateSchema) -> CharacterModel:
     update_data = character_in.model_dump(exclude_unset=True)
@@ -192,17 +309,29 @@ async def update_character(db: AsyncSession, character: CharacterModel, characte
     db.add(character); await db.commit(); await db.refresh(character)
     return await get_character(db, character.id)
 
-async def delete_character(db: AsyncSession, character_id: int, user_id: int) -> Optional[CharacterModel]:
-    character_to_delete = await get_character(db=db, character_id=character_id) 
-    if character_to_delete and character_to_delete.user_id == user_id:
-        await db.delete(character_to_delete); await db.commit()
-        return character_to_delete
-    return None
+async def delete_character(db: AsyncSession, character_id: int, user_id: int) -> Optional[Dict]:
+    """
+    Deletes the character in one statement; skills, items, spells and campaign memberships
+    go with it through ON DELETE CASCADE. Returns the deleted row's columns, or None.
+    """
+    result = await db.execute(
+        delete(CharacterModel)
+        .where(CharacterModel.id == character_id, CharacterModel.user_id == user_id)
+        .returning(*CharacterModel.__table__.columns)
+    )
+    deleted = result.mappings().first()
+    await db.commit()
+    if not deleted:
+        return None
+    derived_stats.derived_stats_cache.invalidate(character_id)
+    resource_ledger.forget(character_id)
+    return dict(deleted)
 
 
 # --- All your other functions are preserved below ---
 
-async def award_xp_to_character(db: AsyncSession, *, character: CharacterModel, xp_to_add: int) -> CharacterModel:
+async def award_xp_to_character(db: AsyncSession, *, character: CharacterModel, xp_to_add: int, commit: bool = True) -> CharacterModel:
+    """With commit=False the change is only flushed, so several awards can share the caller's transaction."""
     if xp_to_add <= 0: raise ValueError("XP to award must be a positive integer.")
     current_xp = character.experience_points or 0
     character.experience_points = current_xp + xp_to_add
@@ -213,7 +342,11 @@ async def award_xp_to_character(db: AsyncSession, *, character: CharacterModel,
         character.hit_dice_remaining = new_level
         character.completed_level_up_choices = [] 
         character.level_up_status = "pending_hp"
-    db.add(character); await db.commit()
+    db.add(character)
+    if commit:
+        await db.commit()
+    else:
+        await db.flush()
     return await get_character(db, character.id)
 
 async def confirm_level_up_hp_increase(db: AsyncSession, *, character: CharacterModel, method: str = "average") -> Tuple[CharacterModel, int]:
@@ -248,9 +381,48 @@ async def apply_character_asi(db: AsyncSession, *, character: CharacterModel, as
     db.add(character); await db.commit()
     return await get_character(db, character.id)
 
+async def get_eligible_spells(db: AsyncSession, *, character: CharacterModel) -> Dict[str, Any]:
+    """
+    The cantrips and leveled spells the character may learn: on its class list, castable at its
+    class level and not already known, with the picks it has left. Limits come from the compiled
+    class tables; the spells from one indexed query.
+    """
+    table = await class_tables.get(character.character_class)
+    level = min(max(character.level or 1, 1), MAX_LEVEL)
+    max_spell_level = table.max_spell_level[level] if table else 0
+    cantrips_known = table.cantrips_known[level] if table else 0
+    spells_known = table.spells_known[level] if table else 0
+    if not character.character_class or (max_spell_level == 0 and cantrips_known == 0):
+        return {"character_id": character.id, "max_spell_level": 0, "cantrips_remaining": 0,
+                "spells_remaining": 0, "cantrips": [], "spells": []}
+
+    spells, known_cantrips, known_leveled = await crud_spell.get_eligible_spells(
+        db, character_id=character.id, class_name=character.character_class,
+        max_spell_level=max_spell_level, include_cantrips=cantrips_known > 0
+    )
+    return {
+        "character_id": character.id,
+        "max_spell_level": max_spell_level,
+        "cantrips_remaining": max(cantrips_known - known_cantrips, 0),
+        "spells_remaining": None if spells_known is None else max(spells_known - known_leveled, 0),
+        "cantrips": [spell for spell in spells if spell.level == 0],
+        "spells": [spell for spell in spells if spell.level > 0],
+    }
+
 async def apply_spell_selections(db: AsyncSession, *, character: CharacterModel, spell_selection: SpellSelectionRequest) -> CharacterModel:
     if character.level_up_status != "pending_spells": 
         raise ValueError(f"Character is not pending spell selection.")
+    eligible = await get_eligible_spells(db, character=character)
+    chosen_cantrips = set(spell_selection.chosen_cantrip_ids_on_level_up or [])
+    chosen_spells = set(spell_selection.new_leveled_spell_ids or [])
+    if not chosen_cantrips <= {spell.id for spell in eligible["cantrips"]}:
+        raise ValueError(f"Not eligible cantrip(s): {sorted(chosen_cantrips - {spell.id for spell in eligible['cantrips']})}.")
+    if not chosen_spells <= {spell.id for spell in eligible["spells"]}:
+        raise ValueError(f"Not eligible spell(s): {sorted(chosen_spells - {spell.id for spell in eligible['spells']})}.")
+    if len(chosen_cantrips) > eligible["cantrips_remaining"]:
+        raise ValueError(f"Only {eligible['cantrips_remaining']} more cantrip(s) can be learned.")
+    if eligible["spells_remaining"] is not None and len(chosen_spells) > eligible["spells_remaining"]:
+        raise ValueError(f"Only {eligible['spells_remaining']} more spell(s) can be learned.")
     for spell_id in spell_selection.chosen_cantrip_ids_on_level_up or []:
         await add_spell_to_character(db, character_id=character.id, spell_association_in=CharacterSpellCreate(spell_id=spell_id, is_known=True))
     for spell_id in spell_selection.new_leveled_spell_ids or []:
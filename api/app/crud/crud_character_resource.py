@@ -0,0 +1,97 @@
+# Path: api/app/crud/crud_character_resource.py
+from typing import Dict, Iterable, List, Tuple
+
+from sqlalchemy import select, delete, update, func, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.character import Character as CharacterModel
+from app.models.character_resource import CharacterResource as CharacterResourceModel
+
+async def get_characters(db: AsyncSession, *, character_ids: List[int]) -> List[CharacterModel]:
+    """Plain character rows (no relationships): what the resource tables need."""
+    result = await db.execute(
+        select(CharacterModel).where(CharacterModel.id.in_(character_ids)).order_by(CharacterModel.id)
+        .execution_options(populate_existing=True) # Long-lived (websocket) sessions may hold old copies
+    )
+    return result.scalars().all()
+
+async def get_used(db: AsyncSession, *, character_ids: List[int]) -> Dict[int, Dict[str, int]]:
+    """{character_id: {resource: used}} for the given characters; characters with nothing spent map to {}."""
+    table = CharacterResourceModel.__table__
+    used: Dict[int, Dict[str, int]] = {character_id: {} for character_id in character_ids}
+    result = await db.execute(
+        select(table.c.character_id, table.c.resource, table.c.used).where(table.c.character_id.in_(character_ids))
+    )
+    for character_id, resource, count in result.all():
+        used[character_id][resource] = count
+    return used
+
+async def add_used(db: AsyncSession, *, deltas: Dict[Tuple[int, str], int]) -> Dict[Tuple[int, str], int]:
+    """
+    Adds {(character_id, resource): change in used} to the stored counts in one transaction:
+    one upsert of used = GREATEST(used + change, 0), then a delete of the rows that reached 0.
+    Adding rather than overwriting keeps spends made through other workers (and rests) intact.
+    Returns the new counts.
+    """
+    deltas = {key: delta for key, delta in deltas.items() if delta}
+    if not deltas:
+        return {}
+    table = CharacterResourceModel.__table__
+    statement = pg_insert(table).values([
+        {"character_id": character_id, "resource": resource, "used": delta}
+        for (character_id, resource), delta in deltas.items()
+    ])
+    statement = statement.on_conflict_do_update(
+        index_elements=["character_id", "resource"],
+        set_={"used": func.greatest(table.c.used + statement.excluded.used, 0)},
+    ).returning(table.c.character_id, table.c.resource, table.c.used)
+    result = await db.execute(statement)
+    counts = {(character_id, resource): max(count, 0) for character_id, resource, count in result.all()}
+    restored = [key for key, count in counts.items() if count == 0]
+    if restored:
+        await db.execute(
+            delete(table).where(tuple_(table.c.character_id, table.c.resource).in_(restored), table.c.used <= 0)
+        )
+    await db.commit()
+    return counts
+
+async def short_rest(db: AsyncSession, *, recovered: Iterable[Tuple[int, str]]) -> None:
+    """Clears the given (character_id, resource) pairs with one DELETE."""
+    recovered = list(recovered)
+    if recovered:
+        table = CharacterResourceModel.__table__
+        await db.execute(delete(table).where(tuple_(table.c.character_id, table.c.resource).in_(recovered)))
+    await db.commit()
+
+async def long_rest(db: AsyncSession, *, character_ids: List[int]) -> Dict[int, Tuple[int, int]]:
+    """
+    Restores every resource, full hit points and half the hit dice (at least one) for the given
+    characters, and clears their death saves, in a single statement (the DELETE runs as a CTE).
+    Returns {character_id: (hit_points_current, hit_dice_remaining)}.
+    """
+    resources, characters = CharacterResourceModel.__table__, CharacterModel.__table__
+    cleared = (
+        delete(resources).where(resources.c.character_id.in_(character_ids))
+        .returning(resources.c.character_id).cte("cleared_resources")
+    )
+    statement = (
+        update(characters)
+        .where(characters.c.id.in_(character_ids))
+        .values(
+            hit_points_current=func.coalesce(characters.c.hit_points_max, characters.c.hit_points_current),
+            hit_dice_remaining=func.least(
+                characters.c.hit_dice_total,
+                characters.c.hit_dice_remaining + func.greatest(characters.c.hit_dice_total // 2, 1)
+            ),
+            death_save_successes=0,
+            death_save_failures=0,
+            version_id=characters.c.version_id + 1,
+        )
+        .returning(characters.c.id, characters.c.hit_points_current, characters.c.hit_dice_remaining)
+        .add_cte(cleared)
+    )
+    result = await db.execute(statement)
+    restored = {character_id: (hit_points, hit_dice) for character_id, hit_points, hit_dice in result.all()}
+    await db.commit()
+    return restored
@@ -0,0 +1,100 @@
+# Path: api/app/crud/crud_chat_message.py
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+import re
+
+from sqlalchemy import select, insert, text, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.chat_message import ChatMessage as ChatMessageModel
+
+PARTITION_NAME_RE = re.compile(r"^chat_messages_y(\d{4})m(\d{2})$")
+SEARCH_CONFIG = "english" # Must match the text search config of ChatMessage.search_vector
+
+def _month_start(moment: datetime) -> datetime:
+    return datetime(moment.year, moment.month, 1, tzinfo=timezone.utc)
+
+def _add_months(month_start: datetime, months: int) -> datetime:
+    month_index = month_start.year * 12 + month_start.month - 1 + months
+    return datetime(month_index // 12, month_index % 12 + 1, 1, tzinfo=timezone.utc)
+
+def partition_name(month_start: datetime) -> str:
+    return f"chat_messages_y{month_start.year:04d}m{month_start.month:02d}"
+
+async def ensure_partitions(db: AsyncSession, *, start: datetime, months: int) -> List[str]:
+    """Creates the monthly partitions covering `months` months from start's month (idempotent)."""
+    names = []
+    month = _month_start(start)
+    for _ in range(months):
+        next_month = _add_months(month, 1)
+        name = partition_name(month)
+        await db.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF chat_messages "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{next_month.isoformat()}')"
+        ))
+        names.append(name)
+        month = next_month
+    await db.commit()
+    return names
+
+async def drop_partitions_before(db: AsyncSession, *, before: datetime) -> List[str]:
+    """Drops every monthly partition whose whole month is earlier than `before`. Returns their names."""
+    result = await db.execute(text(
+        "SELECT child.relname FROM pg_inherits "
+        "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+        "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+        "WHERE parent.relname = 'chat_messages'"
+    ))
+    cutoff = _month_start(before)
+    dropped = []
+    for (name,) in result.all():
+        match = PARTITION_NAME_RE.match(name)
+        if not match:
+            continue
+        month = datetime(int(match.group(1)), int(match.group(2)), 1, tzinfo=timezone.utc)
+        if _add_months(month, 1) <= cutoff:
+            await db.execute(text(f"DROP TABLE IF EXISTS {name}"))
+            dropped.append(name)
+    await db.commit()
+    return dropped
+
+async def add_messages(db: AsyncSession, *, messages: List[Dict[str, Any]]) -> None:
+    """Bulk-inserts message rows (dicts of ChatMessage columns) in one executemany."""
+    if not messages:
+        return
+    await db.execute(insert(ChatMessageModel), messages)
+    await db.commit()
+
+def _page(rows: List[ChatMessageModel], limit: int) -> Tuple[List[ChatMessageModel], Optional[int]]:
+    if len(rows) > limit:
+        rows = rows[:limit]
+        return rows, rows[-1].id
+    return rows, None
+
+async def get_messages(
+    db: AsyncSession, *, campaign_id: int, before_id: Optional[int] = None, limit: int = 50
+) -> Tuple[List[ChatMessageModel], Optional[int]]:
+    """
+    One page of a campaign's history, newest first, keyset-paginated on id.
+    Returns (messages, next_before_id); next_before_id is None on the last page.
+    """
+    query = select(ChatMessageModel).filter(ChatMessageModel.campaign_id == campaign_id)
+    if before_id is not None:
+        query = query.filter(ChatMessageModel.id < before_id)
+    result = await db.execute(query.order_by(ChatMessageModel.id.desc()).limit(limit + 1))
+    return _page(list(result.scalars().all()), limit)
+
+async def search_messages(
+    db: AsyncSession, *, campaign_id: int, query_text: str, before_id: Optional[int] = None, limit: int = 50
+) -> Tuple[List[ChatMessageModel], Optional[int]]:
+    """Full-text search (web search syntax: words, "phrases", -exclusions) within one campaign, newest first."""
+    ts_query = func.websearch_to_tsquery(SEARCH_CONFIG, query_text)
+    query = (
+        select(ChatMessageModel)
+        .filter(ChatMessageModel.campaign_id == campaign_id)
+        .filter(ChatMessageModel.search_vector.op("@@")(ts_query))
+    )
+    if before_id is not None:
+        query = query.filter(ChatMessageModel.id < before_id)
+    result = await db.execute(query.order_by(ChatMessageModel.id.desc()).limit(limit + 1))
+    return _page(list(result.scalars().all()), limit)
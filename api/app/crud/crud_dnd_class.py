@@ -6,6 +6,7 @@ from typing import List, Optional
 
 from app.models.dnd_class import DndClass as DndClassModel, ClassLevel as ClassLevelModel
 from app.schemas.dnd_class import DndClassCreate as DndClassCreateSchema
+from app.crud import crud_catalog
 
 async def get_dnd_class_by_name(db: AsyncSession, *, name: str) -> Optional[DndClassModel]:
     """
@@ -39,6 +40,7 @@ async def create_dnd_class(db: AsyncSession, *, dnd_class_in: DndClassCreateSche
     # The refresh automatically loads relationships thanks to how we configured them,
     # but calling get_dnd_class_by_name is a surefire way to get the fully loaded object.
     await db.refresh(db_dnd_class)
+    await crud_catalog.invalidate_catalogs(db)
     
     # Return the fully loaded object to ensure it matches the response schema
     created_class = await get_dnd_class_by_name(db=db, name=db_dnd_class.name)
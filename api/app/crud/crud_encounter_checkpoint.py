@@ -0,0 +1,42 @@
+# Path: api/app/crud/crud_encounter_checkpoint.py
+from typing import Any, Dict, Optional
+
+from sqlalchemy import select, delete, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.encounter_checkpoint import EncounterCheckpoint
+
+async def get_checkpoint(db: AsyncSession, *, campaign_id: int) -> Optional[EncounterCheckpoint]:
+    result = await db.execute(select(EncounterCheckpoint).where(EncounterCheckpoint.campaign_id == campaign_id))
+    return result.scalars().first()
+
+async def write_checkpoint(
+    db: AsyncSession, *, campaign_id: int, expected_version: int, state: Dict[str, Any]
+) -> Optional[int]:
+    """
+    Stores the campaign's checkpoint if the stored version is still expected_version (0: no row),
+    with the database incrementing the version. Returns the new version, or None on a conflict:
+    someone else (e.g. another worker that took the campaign over) wrote in between.
+    """
+    table = EncounterCheckpoint.__table__
+    statement = pg_insert(table).values(campaign_id=campaign_id, version=1, state=state)
+    statement = statement.on_conflict_do_update(
+        index_elements=["campaign_id"],
+        set_={"version": table.c.version + 1, "state": statement.excluded.state, "updated_at": func.now()},
+        where=table.c.version == expected_version,
+    ).returning(table.c.version)
+    version = (await db.execute(statement)).scalar()
+    await db.commit()
+    return version
+
+async def delete_checkpoint(db: AsyncSession, *, campaign_id: int, expected_version: int) -> bool:
+    """Removes the checkpoint of a finished encounter if it is still expected_version. False on a conflict."""
+    result = await db.execute(
+        delete(EncounterCheckpoint)
+        .where(EncounterCheckpoint.campaign_id == campaign_id, EncounterCheckpoint.version == expected_version)
+        .returning(EncounterCheckpoint.campaign_id)
+    )
+    deleted = result.first() is not None
+    await db.commit()
+    return deleted
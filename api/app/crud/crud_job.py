@@ -0,0 +1,111 @@
+# Path: api/app/crud/crud_job.py
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+from sqlalchemy import select, update, or_, and_, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.job import Job as JobModel, JobStatusEnum
+
+async def enqueue_job(
+    db: AsyncSession, *, kind: str, payload: Dict[str, Any], created_by_user_id: Optional[int] = None,
+    max_attempts: int = 5, commit: bool = True
+) -> JobModel:
+    db_job = JobModel(kind=kind, payload=payload, created_by_user_id=created_by_user_id, max_attempts=max_attempts)
+    db.add(db_job)
+    if commit:
+        await db.commit()
+        await db.refresh(db_job)
+    return db_job
+
+async def get_job(db: AsyncSession, job_id: int) -> Optional[JobModel]:
+    return await db.get(JobModel, job_id)
+
+async def claim_next_job(db: AsyncSession, *, worker_id: str, stale_after: timedelta) -> Optional[JobModel]:
+    """
+    Locks and marks running the oldest due job, skipping rows other workers hold locked,
+    so concurrent workers never wait on or double-claim a job. A running job whose lock
+    is older than stale_after (its worker died) is claimable again.
+    """
+    now = datetime.now(timezone.utc)
+    result = await db.execute(
+        select(JobModel)
+        .filter(or_(
+            and_(JobModel.status == JobStatusEnum.QUEUED.value, JobModel.run_after <= now),
+            and_(JobModel.status == JobStatusEnum.RUNNING.value, JobModel.locked_at < now - stale_after),
+        ))
+        .order_by(JobModel.run_after, JobModel.id)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+    )
+    job = result.scalars().first()
+    if job is None:
+        await db.rollback()
+        return None
+    job.status = JobStatusEnum.RUNNING.value
+    job.attempts += 1
+    job.locked_by = worker_id
+    job.locked_at = now
+    await db.commit()
+    return job
+
+async def heartbeat_job(db: AsyncSession, *, job_id: int, worker_id: str, attempts: int) -> bool:
+    """Refreshes locked_at for a job this claim still holds, so it isn't reclaimed as stale. False if the claim was lost."""
+    result = await db.execute(
+        update(JobModel)
+        .where(JobModel.id == job_id, JobModel.status == JobStatusEnum.RUNNING.value,
+               JobModel.locked_by == worker_id, JobModel.attempts == attempts)
+        .values(locked_at=func.now())
+        .returning(JobModel.id)
+    )
+    held = result.first() is not None
+    await db.commit()
+    return held
+
+async def get_claimed_job(db: AsyncSession, *, job_id: int, worker_id: str, attempts: int) -> Optional[JobModel]:
+    """
+    Locks the job if it is still running under this claim (same worker, same attempt);
+    None when another worker has re-claimed it since, in which case its outcome is theirs to record.
+    """
+    result = await db.execute(
+        select(JobModel)
+        .where(JobModel.id == job_id, JobModel.status == JobStatusEnum.RUNNING.value,
+               JobModel.locked_by == worker_id, JobModel.attempts == attempts)
+        .with_for_update()
+    )
+    return result.scalars().first()
+
+async def mark_job_applied(db: AsyncSession, *, job_id: int) -> bool:
+    """
+    Records that the job's effects are being committed, in the caller's transaction (no commit).
+    False when an earlier attempt already applied them: the caller should roll back its writes.
+    """
+    result = await db.execute(
+        update(JobModel)
+        .where(JobModel.id == job_id, JobModel.applied_at.is_(None))
+        .values(applied_at=func.now())
+        .returning(JobModel.id)
+    )
+    return result.first() is not None
+
+async def mark_job_succeeded(db: AsyncSession, *, job: JobModel, result: Optional[Dict[str, Any]]) -> JobModel:
+    job.status = JobStatusEnum.SUCCEEDED.value
+    job.result = result
+    job.last_error = None
+    job.locked_by = None
+    job.locked_at = None
+    await db.commit()
+    return job
+
+async def mark_job_failed(db: AsyncSession, *, job: JobModel, error: str, retry_delay: Optional[timedelta]) -> JobModel:
+    """Requeues the job after retry_delay, or fails it for good when retry_delay is None or attempts are used up."""
+    job.last_error = error
+    job.locked_by = None
+    job.locked_at = None
+    if retry_delay is not None and job.attempts < job.max_attempts:
+        job.status = JobStatusEnum.QUEUED.value
+        job.run_after = datetime.now(timezone.utc) + retry_delay
+    else:
+        job.status = JobStatusEnum.FAILED.value
+    await db.commit()
+    return job
@@ -1,10 +1,12 @@
 # Path: api/app/crud/crud_monster.py
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from typing import List, Optional
+from sqlalchemy import select, text, JSON
+from typing import Any, Dict, List, Optional, Tuple
+import json
 
 from app.models.monster import Monster as MonsterModel
 from app.schemas.monster import MonsterCreate as MonsterCreateSchema
+from app.crud import crud_catalog
 
 async def get_monster_by_name(db: AsyncSession, *, name: str) -> Optional[MonsterModel]:
     """
@@ -25,8 +27,74 @@ async def create_monster(db: AsyncSession, *, monster_in: MonsterCreateSchema) -
     db.add(db_monster)
     await db.commit()
     await db.refresh(db_monster)
+    await crud_catalog.invalidate_catalogs(db)
     return db_monster
 
+# Every column but the serial id, in table order.
+MONSTER_IMPORT_COLUMNS = [column.name for column in MonsterModel.__table__.columns if column.name != "id"]
+_JSON_COLUMNS = {column.name for column in MonsterModel.__table__.columns if isinstance(column.type, JSON)}
+
+async def bulk_merge_monsters(
+    db: AsyncSession, *, monsters_in: List[Tuple[int, MonsterCreateSchema]], update_existing: bool = False
+) -> Dict[str, Any]:
+    """
+    COPYs validated rows (tagged with their source line) into a temporary staging table and
+    merges them into monsters with one INSERT ... SELECT ... ON CONFLICT (name).
+    The first row wins when a name repeats within the batch; rows that weren't merged come back
+    as errors. Commits once. Returns {"inserted": n, "updated": n, "errors": [(line, name, error)]}.
+    """
+    if not monsters_in:
+        return {"inserted": 0, "updated": 0, "errors": []}
+    columns = ", ".join(MONSTER_IMPORT_COLUMNS)
+    await db.execute(text("CREATE TEMPORARY TABLE monster_import (LIKE monsters) ON COMMIT DROP"))
+    await db.execute(text("ALTER TABLE monster_import DROP COLUMN id, ADD COLUMN line integer NOT NULL"))
+
+    records = []
+    for line, monster_in in monsters_in:
+        data = monster_in.model_dump()
+        records.append(tuple(
+            json.dumps(data[name]) if name in _JSON_COLUMNS and data[name] is not None else data[name]
+            for name in MONSTER_IMPORT_COLUMNS
+        ) + (line,))
+    connection = await db.connection()
+    raw_connection = await connection.get_raw_connection()
+    await raw_connection.driver_connection.copy_records_to_table(
+        "monster_import", records=records, columns=[*MONSTER_IMPORT_COLUMNS, "line"]
+    )
+
+    if update_existing:
+        assignments = ", ".join(f"{name} = EXCLUDED.{name}" for name in MONSTER_IMPORT_COLUMNS if name != "name")
+        on_conflict = f"DO UPDATE SET {assignments}"
+    else:
+        on_conflict = "DO NOTHING"
+    result = await db.execute(text(f"""
+        WITH ranked AS (
+            SELECT *, row_number() OVER (PARTITION BY name ORDER BY line) AS rank FROM monster_import
+        ), merged AS (
+            INSERT INTO monsters ({columns})
+            SELECT {columns} FROM ranked WHERE rank = 1
+            ON CONFLICT (name) {on_conflict}
+            RETURNING name, (xmax = 0) AS inserted
+        )
+        SELECT ranked.line, ranked.name, ranked.rank, merged.inserted
+        FROM ranked LEFT JOIN merged ON merged.name = ranked.name
+        ORDER BY ranked.line
+    """))
+    report = {"inserted": 0, "updated": 0, "errors": []}
+    for line, name, rank, inserted in result.all():
+        if rank > 1:
+            report["errors"].append((line, name, "Duplicate name; an earlier row in this import was used."))
+        elif inserted is None:
+            report["errors"].append((line, name, f"A monster with the name '{name}' already exists."))
+        elif inserted:
+            report["inserted"] += 1
+        else:
+            report["updated"] += 1
+    await db.commit()
+    if report["inserted"] or report["updated"]:
+        await crud_catalog.invalidate_catalogs(db)
+    return report
+
 async def get_monsters(db: AsyncSession, *, skip: int = 0, limit: int = 100) -> List[MonsterModel]:
     """
     Retrieves a list of monsters with pagination.
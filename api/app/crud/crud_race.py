@@ -5,6 +5,7 @@ from typing import List, Optional
 
 from app.models.race import Race as RaceModel
 from app.schemas.race import RaceCreate as RaceCreateSchema
+from app.crud import crud_catalog
 
 async def get_race_by_name(db: AsyncSession, *, name: str) -> Optional[RaceModel]:
     """
@@ -22,6 +23,7 @@ async def create_race(db: AsyncSession, *, race_in: RaceCreateSchema) -> RaceMod
     db.add(db_race)
     await db.commit()
     await db.refresh(db_race)
+    await crud_catalog.invalidate_catalogs(db)
     return db_race
 
 async def get_races(db: AsyncSession, *, skip: int = 0, limit: int = 100) -> List[RaceModel]:
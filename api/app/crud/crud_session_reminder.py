@@ -0,0 +1,82 @@
+# Path: api/app/crud/crud_session_reminder.py
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select, delete, func, or_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.campaign import Campaign as CampaignModel
+from app.models.campaign_member import CampaignMember as CampaignMemberModel, CampaignMemberStatusEnum
+from app.models.session_reminder_lease import SessionReminderLease as SessionReminderLeaseModel
+from app.models.user import User as UserModel
+
+# NOTIFY channel carrying the id of a campaign whose next_session_utc may have changed.
+SCHEDULE_CHANNEL = "session_schedule_changed"
+
+async def notify_schedule_changed(db: AsyncSession, *, campaign_id: int) -> None:
+    """
+    Queues a notification for every listening scheduler. Postgres delivers it when the
+    caller's transaction commits (and drops it on rollback), so this never commits itself.
+    """
+    await db.execute(select(func.pg_notify(SCHEDULE_CHANNEL, str(campaign_id))))
+
+async def get_session_times(db: AsyncSession, *, campaign_ids: Sequence[int]) -> Dict[int, Optional[datetime]]:
+    """next_session_utc per campaign; deleted campaigns are missing from the result."""
+    result = await db.execute(
+        select(CampaignModel.id, CampaignModel.next_session_utc).filter(CampaignModel.id.in_(campaign_ids))
+    )
+    return {campaign_id: session_utc for campaign_id, session_utc in result.all()}
+
+async def get_upcoming_sessions(db: AsyncSession, *, after: datetime) -> List[Tuple[int, datetime]]:
+    """(campaign_id, next_session_utc) for every campaign with a session scheduled after `after`."""
+    result = await db.execute(
+        select(CampaignModel.id, CampaignModel.next_session_utc)
+        .filter(CampaignModel.next_session_utc > after)
+    )
+    return [(campaign_id, session_utc) for campaign_id, session_utc in result.all()]
+
+async def claim_reminder(
+    db: AsyncSession, *, campaign_id: int, session_utc: datetime, offset_minutes: int, worker_id: str
+) -> bool:
+    """
+    Inserts the lease row for this reminder. Returns True for the one worker whose
+    insert succeeded; every other worker hits the unique constraint and gets False.
+    """
+    result = await db.execute(
+        insert(SessionReminderLeaseModel)
+        .values(campaign_id=campaign_id, session_utc=session_utc, offset_minutes=offset_minutes, claimed_by=worker_id)
+        .on_conflict_do_nothing(constraint="uq_session_reminder_leases_reminder")
+        .returning(SessionReminderLeaseModel.id)
+    )
+    claimed = result.scalar_one_or_none() is not None
+    await db.commit()
+    return claimed
+
+async def delete_reminder_leases_before(db: AsyncSession, *, before: datetime) -> int:
+    """Drops leases for sessions that are long past; returns how many were removed."""
+    result = await db.execute(
+        delete(SessionReminderLeaseModel).where(SessionReminderLeaseModel.session_utc < before)
+    )
+    await db.commit()
+    return result.rowcount
+
+async def get_reminder_recipients(db: AsyncSession, *, campaign_id: int) -> List[Dict]:
+    """The DM and every ACTIVE member of the campaign, with what a notifier needs to reach them."""
+    result = await db.execute(
+        select(UserModel.id, UserModel.username, UserModel.email, UserModel.preferred_timezone)
+        .join(CampaignModel, CampaignModel.id == campaign_id)
+        .outerjoin(
+            CampaignMemberModel,
+            (CampaignMemberModel.campaign_id == CampaignModel.id)
+            & (CampaignMemberModel.user_id == UserModel.id)
+            & (CampaignMemberModel.status == CampaignMemberStatusEnum.ACTIVE)
+        )
+        .filter(or_(UserModel.id == CampaignModel.dm_user_id, CampaignMemberModel.id.is_not(None)))
+        .filter(UserModel.is_active.is_(True))
+        .distinct()
+    )
+    return [
+        {"user_id": user_id, "username": username, "email": email, "timezone": timezone or "UTC"}
+        for user_id, username, email, timezone in result.all()
+    ]
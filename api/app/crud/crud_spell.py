@@ -1,9 +1,11 @@
 # Path: api/app/crud/crud_spell.py
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from typing import List, Optional
+from sqlalchemy import select, delete, func, exists, text
+from typing import List, Optional, Tuple
 
 from app.models.spell import Spell as SpellModel
+from app.models.spell_class import SpellClass as SpellClassModel
+from app.models.character_spell import CharacterSpell as CharacterSpellModel
 # from app.schemas.spell import SpellCreate as SpellCreateSchema # For if we allowed API creation
 
 async def get_spells(db: AsyncSession, skip: int = 0, limit: int = 1000) -> List[SpellModel]:
@@ -33,6 +35,48 @@ async def get_spell_by_name(db: AsyncSession, name: str) -> Optional[SpellModel]
     result = await db.execute(select(SpellModel).filter(SpellModel.name == name))
     return result.scalars().first()
 
+async def sync_spell_classes(db: AsyncSession) -> None:
+    """Rebuilds spell_classes from every spell's dnd_classes JSON (two statements, one transaction)."""
+    await db.execute(delete(SpellClassModel))
+    await db.execute(text(
+        "INSERT INTO spell_classes (class_name, spell_id) "
+        "SELECT DISTINCT lower(class_name), spells.id FROM spells CROSS JOIN LATERAL json_array_elements_text("
+        "CASE WHEN json_typeof(spells.dnd_classes) = 'array' THEN spells.dnd_classes ELSE '[]'::json END) AS class_name"
+    ))
+    await db.commit()
+
+async def get_eligible_spells(
+    db: AsyncSession, *, character_id: int, class_name: str, max_spell_level: int, include_cantrips: bool
+) -> Tuple[List[SpellModel], int, int]:
+    """
+    Spells on the class's list up to max_spell_level that the character doesn't have yet, ordered
+    by level and name, plus how many cantrips and leveled spells the character already knows.
+    One query: the list is a spell_classes index lookup, the counts are uncorrelated
+    subqueries Postgres runs once.
+    """
+    known = select(func.count(CharacterSpellModel.id)).join(SpellModel, SpellModel.id == CharacterSpellModel.spell_id).where(
+        CharacterSpellModel.character_id == character_id, CharacterSpellModel.is_known == True
+    )
+    known_cantrips = known.where(SpellModel.level == 0).scalar_subquery()
+    known_leveled = known.where(SpellModel.level > 0).scalar_subquery()
+    query = (
+        select(SpellModel, known_cantrips, known_leveled)
+        .join(SpellClassModel, SpellClassModel.spell_id == SpellModel.id)
+        .where(
+            SpellClassModel.class_name == class_name.lower(),
+            SpellModel.level <= max_spell_level,
+            SpellModel.level >= (0 if include_cantrips else 1),
+            ~exists().where(CharacterSpellModel.character_id == character_id, CharacterSpellModel.spell_id == SpellModel.id),
+        )
+        .order_by(SpellModel.level, SpellModel.name)
+    )
+    rows = (await db.execute(query)).all()
+    if rows:
+        return [row[0] for row in rows], rows[0][1], rows[0][2]
+    # Nothing left to pick; the counts still matter for the remaining picks.
+    counts = (await db.execute(select(known_cantrips, known_leveled))).one()
+    return [], counts[0], counts[1]
+
 # Note: Creating new SRD-like spells via API might not be a primary user feature,
 # as they are predefined. Homebrew spells might be a different system later.
 # If spell creation via API was needed:
@@ -2,7 +2,7 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, update
 from sqlalchemy.orm import selectinload 
-from typing import Optional, List
+from typing import Any, Optional, List
 
 from app.models.user import User as UserModel
 from app.models.campaign_member import CampaignMember as CampaignMemberModel
@@ -61,7 +61,7 @@ async def update_user_password(
     return user_to_update
 
 async def get_user_campaign_memberships(
-    db: AsyncSession, *, user_id: int, skip: int = 0, limit: int = 100
+    db: AsyncSession, *, user_id: int, skip: int = 0, limit: int = 100, load_options: Optional[List[Any]] = None
 ) -> List[CampaignMemberModel]:
     """
     Retrieves all campaign memberships for a given user.
@@ -69,19 +69,20 @@ async def get_user_campaign_memberships(
     (including character's skills, inventory items, and known spells).
     """
     print(f"--- ENTERING get_user_campaign_memberships for user_id: {user_id} ---") # Entry print
+    options = load_options if load_options is not None else [
+        selectinload(CampaignMemberModel.campaign).options(
+            selectinload(CampaignModel.dm)
+        ),
+        selectinload(CampaignMemberModel.user),
+        selectinload(CampaignMemberModel.character).options(
+            selectinload(CharacterModel.skills).selectinload(CharacterSkillModel.skill_definition),
+            selectinload(CharacterModel.inventory_items).selectinload(CharacterItemModel.item_definition),
+            selectinload(CharacterModel.known_spells).selectinload(CharacterSpellModel.spell_definition)
+        )
+    ]
     result = await db.execute(
        select(CampaignMemberModel)
-       .options(
-           selectinload(CampaignMemberModel.campaign).options(
-           selectinload(CampaignModel.dm) 
-          ),
-           selectinload(CampaignMemberModel.user), 
-           selectinload(CampaignMemberModel.character).options(
-               selectinload(CharacterModel.skills).selectinload(CharacterSkillModel.skill_definition),
-               selectinload(CharacterModel.inventory_items).selectinload(CharacterItemModel.item_definition),
-               selectinload(CharacterModel.known_spells).selectinload(CharacterSpellModel.spell_definition)
-          )
-        )
+       .options(*options)
         .filter(CampaignMemberModel.user_id == user_id)
         .order_by(CampaignMemberModel.joined_at.desc())
         .offset(skip)
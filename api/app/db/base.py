@@ -17,5 +17,15 @@ from app.models.dnd_class import DndClass, ClassLevel
 from app.models.race import Race 
 from app.models.background import Background
 from app.models.condition import Condition
+from app.models.campaign_session import CampaignSession
+from app.models.initiative_entry import InitiativeEntry
+from app.models.catalog_state import CatalogState
+from app.models.session_reminder_lease import SessionReminderLease
+from app.models.chat_message import ChatMessage
+from app.models.job import Job
+from app.models.campaign_catalog_entry import CampaignCatalogEntry
+from app.models.character_resource import CharacterResource
+from app.models.spell_class import SpellClass
+from app.models.encounter_checkpoint import EncounterCheckpoint
 
 target_metadata = Base.metadata
@@ -1,14 +1,39 @@
-from typing import AsyncGenerator
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from typing import AsyncGenerator, Dict, Any
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, AsyncEngine
 from sqlalchemy.orm import sessionmaker, declarative_base
 from app.core.config import settings # Import settings from our config file
 
+def _create_engine(database_url: str) -> AsyncEngine:
+    """Creates an async engine with the pool and asyncpg settings from config."""
+    url = make_url(database_url)
+    if url.get_backend_name() == "postgresql" and url.get_driver_name() == "asyncpg":
+        # SQLAlchemy's own prepared statement cache is configured through the URL query.
+        url = url.update_query_dict({"prepared_statement_cache_size": str(settings.DB_PREPARED_STATEMENT_CACHE_SIZE)})
+
+    connect_args: Dict[str, Any] = {"statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE}
+    if settings.DB_STATEMENT_TIMEOUT_MS:
+        connect_args["server_settings"] = {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)}
+
+    return create_async_engine(
+        url,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args=connect_args,
+        # echo=True # Set to True to see SQL queries in console (good for debugging)
+    )
+
 # Create the SQLAlchemy async engine
 # For async, we use 'postgresql+asyncpg://...'
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    # echo=True # Set to True to see SQL queries in console (good for debugging)
-)
+engine = _create_engine(settings.DATABASE_URL)
+
+# The replica engine is only created when a replica is configured;
+# otherwise reads share the primary engine (and its pool).
+read_engine = _create_engine(settings.DATABASE_READ_REPLICA_URL) if settings.DATABASE_READ_REPLICA_URL else engine
 
 # Create a sessionmaker to generate AsyncSession instances
 # expire_on_commit=False is often recommended for FastAPI background tasks
@@ -18,7 +43,13 @@ AsyncSessionLocal = sessionmaker(
     expire_on_commit=False
 )
 
-# Base class for our SQLAlchemy models to inherit from
+ReadSessionLocal = sessionmaker(
+    bind=read_engine,
+    class_=AsyncSession,
+    expire_on_commit=False
+)
+
+# Base class for our SQLAlchemy models to inherit
 Base = declarative_base()
 
 # Dependency to get a DB session in path operations
@@ -38,4 +69,30 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]: # <--- MODIFIED RETURN
             raise e # Re-raise the exception
         finally:
             await session.close()
-            
\ No newline at end of file
+
+async def _get_replica_db() -> AsyncGenerator[AsyncSession, None]:
+    async with ReadSessionLocal() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
+
+# Dependency for read-only path operations. Without a replica this *is* get_db,
+# so FastAPI's per-request dependency cache hands out the same session the auth
+# dependency already opened instead of checking out a second pooled connection.
+get_read_db = _get_replica_db if settings.DATABASE_READ_REPLICA_URL else get_db
+
+async def check_database_health() -> Dict[str, str]:
+    """Runs a trivial query against the primary (and the replica, if configured)."""
+    engines = {"primary": engine}
+    if read_engine is not engine:
+        engines["replica"] = read_engine
+    results = {}
+    for name, target_engine in engines.items():
+        try:
+            async with target_engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+            results[name] = "ok"
+        except Exception as e:
+            results[name] = f"error: {e.__class__.__name__}"
+    return results
@@ -1,9 +1,10 @@
 # Path: api/app/db/init_db.py
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from typing import List, Optional
 
 # Import CRUD modules
-from app.crud import crud_skill, crud_item, crud_spell, crud_monster, crud_dnd_class, crud_race, crud_background, crud_condition
+from app.crud import crud_catalog, crud_skill, crud_item, crud_spell, crud_monster, crud_dnd_class, crud_race, crud_background, crud_condition
 
 
 # Import models
@@ -65,6 +66,7 @@ async def seed_spells(db: AsyncSession) -> None:
             db.add(SpellModel(**spell_data.model_dump()))
             print(f"Adding spell: {spell_data.name}")
     await db.commit()
+    await crud_spell.sync_spell_classes(db)
     print("Spell seeding process complete.")
 
 async def seed_monsters(db: AsyncSession) -> None:
@@ -117,15 +119,22 @@ async def seed_conditions(db: AsyncSession) -> None:
             print(f"Adding condition: {data['name']}")
     print("Condition seeding process complete.")
 
-async def init_db(db: AsyncSession) -> None:
-    print("Application startup: Seeding initial data...")
-    await seed_skills(db)
-    await seed_items(db)
-    await seed_spells(db)
-    await seed_monsters(db)
-    await seed_dnd_classes(db)
-    await seed_races(db)
-    await seed_backgrounds(db)
-    await seed_conditions(db)
+# Seeders in dependency order, keyed by the name used on the command line (`python -m app.cli seed`).
+SEEDERS = {
+    "skills": seed_skills,
+    "items": seed_items,
+    "spells": seed_spells,
+    "monsters": seed_monsters,
+    "classes": seed_dnd_classes,
+    "races": seed_races,
+    "backgrounds": seed_backgrounds,
+    "conditions": seed_conditions,
+}
+
+async def init_db(db: AsyncSession, only: Optional[List[str]] = None) -> None:
+    print("Seeding initial data...")
+    for name, seeder in SEEDERS.items():
+        if only is None or name in only:
+            await seeder(db)
+    await crud_catalog.invalidate_catalogs(db)
     print("Initial data seeding complete.")
-
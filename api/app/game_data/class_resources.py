@@ -0,0 +1,42 @@
+# Path: api/app/game_data/class_resources.py
+
+# Limited-use class features (D&D 5e PHB), other than spell slots.
+# "uses" maps a class level to the number of uses from that level on; like the spellcasting
+# deltas in classes_data, a level that isn't listed keeps the previous value.
+# "ability" adds that ability's modifier to the uses (minimum 1 in total).
+# "short_rest_from_level" is the level from which a long-rest feature also recovers on a short rest.
+UNLIMITED = -1
+
+CLASS_RESOURCES = {
+    "Barbarian": [
+        {"resource": "rage", "recovery": "long", "uses": {1: 2, 3: 3, 6: 4, 12: 5, 17: 6, 20: UNLIMITED}},
+    ],
+    "Bard": [
+        {"resource": "bardic_inspiration", "recovery": "long", "short_rest_from_level": 5, "ability": "charisma", "uses": {1: 0}},
+    ],
+    "Cleric": [
+        {"resource": "channel_divinity", "recovery": "short", "uses": {2: 1, 6: 2, 18: 3}},
+    ],
+    "Druid": [
+        {"resource": "wild_shape", "recovery": "short", "uses": {2: 2, 20: UNLIMITED}},
+    ],
+    "Fighter": [
+        {"resource": "second_wind", "recovery": "short", "uses": {1: 1}},
+        {"resource": "action_surge", "recovery": "short", "uses": {2: 1, 17: 2}},
+        {"resource": "indomitable", "recovery": "long", "uses": {9: 1, 13: 2, 17: 3}},
+    ],
+    "Monk": [
+        {"resource": "ki", "recovery": "short", "uses": {level: level for level in range(2, 21)}},
+    ],
+    "Paladin": [
+        {"resource": "divine_sense", "recovery": "long", "ability": "charisma", "uses": {1: 1}},
+        {"resource": "lay_on_hands", "recovery": "long", "uses": {level: 5 * level for level in range(1, 21)}},
+        {"resource": "channel_divinity", "recovery": "short", "uses": {3: 1}},
+    ],
+    "Sorcerer": [
+        {"resource": "sorcery_points", "recovery": "long", "uses": {level: level for level in range(2, 21)}},
+    ],
+    "Wizard": [
+        {"resource": "arcane_recovery", "recovery": "long", "uses": {1: 1}},
+    ],
+}
@@ -1,61 +1,117 @@
 # Path: api/app/main.py
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+from sqlalchemy.orm.exc import StaleDataError
+
+import importlib
+import time
+from typing import Dict, List, Optional, Tuple
 
 from app.core.config import settings
-from app.db.database import engine, AsyncSessionLocal 
-from app.db import base 
-from app.db.init_db import seed_skills, seed_items, seed_spells, seed_monsters, seed_dnd_classes, seed_races, seed_backgrounds, seed_conditions
-
-
-# Import all routers
-from app.routers import users as user_router 
-from app.routers import auth as auth_router
-from app.routers import characters as character_router
-from app.routers import campaigns as campaign_router
-from app.routers import campaign_members as campaign_member_router
-from app.routers import skills as skill_router
-from app.routers import items as item_router
-from app.routers import spells as spell_router
-from app.routers import monsters as monster_router
-from app.routers import dnd_classes as dnd_class_router
-from app.routers import races as race_router
-from app.routers import backgrounds as background_router
-from app.routers import conditions as condition_router
-from app.routers import admin as admin_router
-from app.routers import websockets
-from app.routers import campaign_sessions
+from app.core.responses import FastJSONResponse
+from app.core.compression import CompressionMiddleware
+from app.db.database import engine, AsyncSessionLocal, check_database_health
+from app.db import base # Registers every model on Base.metadata so relationships resolve
+from app.services.session_reminders import reminder_scheduler
+from app.services.chat_history import chat_writer
+from app.services.jobs import job_worker
+from app.services.conditions import condition_tracker
+from app.services.resources import resource_ledger
+from app.services.campaign_actors import campaign_actors
+
+# (module under app.routers, URL prefix). Imported through importlib in this order
+# so each module's import cost can be measured.
+ROUTER_MODULES: List[Tuple[str, Optional[str]]] = [
+    ("auth", settings.API_V1_STR),
+    ("users", settings.API_V1_STR),
+    ("characters", settings.API_V1_STR),
+    ("campaigns", settings.API_V1_STR),
+    ("campaign_members", settings.API_V1_STR),
+    ("skills", settings.API_V1_STR),
+    ("items", settings.API_V1_STR),
+    ("spells", settings.API_V1_STR),
+    ("monsters", settings.API_V1_STR),
+    ("dnd_classes", settings.API_V1_STR),
+    ("races", settings.API_V1_STR),
+    ("backgrounds", settings.API_V1_STR),
+    ("conditions", settings.API_V1_STR),
+    ("admin", settings.API_V1_STR),
+    ("websockets", None),
+    ("campaign_sessions", settings.API_V1_STR),
+    ("chat", settings.API_V1_STR),
+    ("jobs", settings.API_V1_STR),
+    ("catalog_overlays", settings.API_V1_STR),
+]
+
+# Seconds spent importing each router module (including anything it pulled in first).
+router_import_times: Dict[str, float] = {}
+
+def _import_routers():
+    routers = []
+    for module_name, prefix in ROUTER_MODULES:
+        started = time.perf_counter()
+        module = importlib.import_module(f"app.routers.{module_name}")
+        router_import_times[module_name] = time.perf_counter() - started
+        routers.append((module.router, prefix))
+    if settings.LOG_IMPORT_TIMES:
+        for module_name, seconds in sorted(router_import_times.items(), key=lambda item: item[1], reverse=True):
+            print(f"Imported app.routers.{module_name} in {seconds * 1000:.1f} ms")
+    return routers
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    print("Application startup: Ensuring database tables exist via Alembic (manual step) or create_all (dev)...")
-    async with engine.begin() as conn:
-        await conn.run_sync(base.Base.metadata.create_all) 
-    
-    print("Application startup: Seeding initial data...")
-    async with AsyncSessionLocal() as db_session:
-        await seed_skills(db_session)
-        await seed_items(db_session)
-        await seed_spells(db_session)
-        await seed_monsters(db_session)
-        await seed_dnd_classes(db_session)
-        await seed_races(db_session)
-        await seed_backgrounds(db_session)
-        await seed_conditions(db_session) # <--- ADDED call to seed races
+    if settings.run_ddl_on_startup:
+        print("Application startup: Creating missing tables with create_all (development mode)...")
+        async with engine.begin() as conn:
+            await conn.run_sync(base.Base.metadata.create_all)
+    else:
+        print("Application startup: Skipping create_all; schema is managed by Alembic.")
+
+    if settings.seed_on_startup:
+        # Imported here so the game_data catalogs are only loaded when seeding.
+        from app.db.init_db import init_db
+        async with AsyncSessionLocal() as db_session:
+            await init_db(db_session)
+    else:
+        print("Application startup: Skipping seeding; run `python -m app.cli seed` to load the catalogs.")
+
+    if settings.SESSION_REMINDERS_ENABLED:
+        await reminder_scheduler.start()
+    await chat_writer.start()
+    await condition_tracker.start()
+    await resource_ledger.start()
+    if settings.JOB_WORKERS_IN_PROCESS:
+        await job_worker.start()
 
     print("Application startup complete.")
     
     yield
     
+    await job_worker.stop()
+    await campaign_actors.stop_all()
+    await reminder_scheduler.stop()
+    await chat_writer.stop()
+    await condition_tracker.stop()
+    await resource_ledger.stop()
     print("Application shutdown.")
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version="0.0.1",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse
 )
 
+# A versioned UPDATE matched no row: someone else changed the record after it was loaded.
+@app.exception_handler(StaleDataError)
+async def stale_data_exception_handler(request: Request, exc: StaleDataError):
+    return JSONResponse(
+        status_code=status.HTTP_409_CONFLICT,
+        content={"detail": "This record was modified by someone else. Reload and try again."}
+    )
+
 # CORS Middleware setup
 origins = [
     "http://localhost:5173", 
@@ -70,23 +126,20 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compresses HTTP responses only; WebSocket traffic passes through untouched.
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+    gzip_level=settings.GZIP_COMPRESSION_LEVEL,
+    zstd_level=settings.ZSTD_COMPRESSION_LEVEL,
+)
+
 # Include all routers
-app.include_router(auth_router.router, prefix=settings.API_V1_STR)
-app.include_router(user_router.router, prefix=settings.API_V1_STR) 
-app.include_router(character_router.router, prefix=settings.API_V1_STR)
-app.include_router(campaign_router.router, prefix=settings.API_V1_STR)
-app.include_router(campaign_member_router.router, prefix=settings.API_V1_STR)
-app.include_router(skill_router.router, prefix=settings.API_V1_STR)
-app.include_router(item_router.router, prefix=settings.API_V1_STR)
-app.include_router(spell_router.router, prefix=settings.API_V1_STR)
-app.include_router(monster_router.router, prefix=settings.API_V1_STR)
-app.include_router(dnd_class_router.router, prefix=settings.API_V1_STR)
-app.include_router(race_router.router, prefix=settings.API_V1_STR)
-app.include_router(background_router.router, prefix=settings.API_V1_STR)
-app.include_router(condition_router.router, prefix=settings.API_V1_STR)
-app.include_router(admin_router.router, prefix=settings.API_V1_STR)
-app.include_router(websockets.router)
-app.include_router(campaign_sessions.router, prefix=settings.API_V1_STR)
+for router, prefix in _import_routers():
+    if prefix:
+        app.include_router(router, prefix=prefix)
+    else:
+        app.include_router(router)
 
 @app.get("/")
 async def read_root():
@@ -96,3 +149,13 @@ async def read_root():
 async def health_check():
     return {"status": "API is healthy and running"}
 
+@app.get("/health/db")
+async def database_health_check():
+    """Checks that the primary (and read replica, if configured) accept queries."""
+    databases = await check_database_health()
+    healthy = all(state == "ok" for state in databases.values())
+    return JSONResponse(
+        status_code=200 if healthy else 503,
+        content={"status": "ok" if healthy else "degraded", "databases": databases}
+    )
+
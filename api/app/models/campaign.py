@@ -1,5 +1,5 @@
 # Path: api/app/models/campaign.py
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, func, Boolean
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, func, Boolean, Index
 from sqlalchemy.orm import relationship
 from app.db.base_class import Base
 from typing import TYPE_CHECKING
@@ -17,13 +17,15 @@ class Campaign(Base):
     title = Column(String(255), nullable=False, index=True)
     description = Column(Text, nullable=True)
 
-    dm_user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    dm_user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
 
     banner_image_url = Column(String(512), nullable=True)
     max_players = Column(Integer, nullable=True)
     next_session_utc = Column(DateTime(timezone=True), nullable=True)
     house_rules = Column(Text, nullable=True)
-    sessions = relationship("CampaignSession", back_populates="campaign", cascade="all, delete-orphan")
+    # passive_deletes: the child FKs are ON DELETE CASCADE, so deleting a campaign is a single
+    # DELETE and the database removes sessions, initiative entries and members with it.
+    sessions = relationship("CampaignSession", back_populates="campaign", cascade="all, delete-orphan", passive_deletes=True)
 
     # --- NEW FIELD for Session Notes ---
     session_notes = Column(Text, nullable=True)
@@ -31,6 +33,9 @@ class Campaign(Base):
 
     is_open_for_recruitment = Column(Boolean, default=False, nullable=False, server_default=sa.text('false'))
 
+    # Optimistic concurrency: every UPDATE is "WHERE id = ? AND version_id = ?" and bumps it.
+    version_id = Column(Integer, nullable=False, default=1, server_default=sa.text('1'))
+
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
 
@@ -38,7 +43,17 @@ class Campaign(Base):
     members = relationship(
         "CampaignMember", 
         back_populates="campaign", 
-        cascade="all, delete-orphan"
+        cascade="all, delete-orphan",
+        passive_deletes=True
+    )
+
+    __table_args__ = (
+        # Discoverable campaigns list: open ones, most recently updated first.
+        Index('ix_campaigns_open_for_recruitment_updated_at', updated_at.desc(),
+              postgresql_where=is_open_for_recruitment),
+        # DM's campaigns, and ON DELETE CASCADE from users.
+        Index('ix_campaigns_dm_user_id', 'dm_user_id'),
     )
+    __mapper_args__ = {"version_id_col": version_id}
 
     
\ No newline at end of file
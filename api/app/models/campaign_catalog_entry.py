@@ -0,0 +1,31 @@
+# Path: api/app/models/campaign_catalog_entry.py
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Index, func, text
+from sqlalchemy.dialects.postgresql import JSONB
+from app.db.base_class import Base
+import enum
+
+class CatalogOverlayActionEnum(str, enum.Enum):
+    ADD = "add"           # A campaign-only entry; exposed with id -<row id> so it can't collide with global ids
+    OVERRIDE = "override" # Replaces some fields of global entry base_id inside the campaign
+    HIDE = "hide"         # Removes global entry base_id from the campaign's view
+
+class CampaignCatalogEntry(Base):
+    """One row of a campaign's homebrew delta over a global catalog (spells, items, monsters)."""
+    __tablename__ = "campaign_catalog_entries"
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    campaign_id = Column(Integer, ForeignKey("campaigns.id", ondelete="CASCADE"), nullable=False)
+    catalog = Column(String(20), nullable=False) # "spells", "items" or "monsters"
+    action = Column(String(20), nullable=False)
+    base_id = Column(Integer, nullable=True) # Global entry id for override/hide; NULL for add
+    data = Column(JSONB, nullable=True) # Full entry for add, changed fields for override
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+    __table_args__ = (
+        # One override or hide per global entry per campaign; also the campaign's delta lookup.
+        Index('uq_campaign_catalog_entries_base', 'campaign_id', 'catalog', 'base_id', unique=True,
+              postgresql_where=text('base_id IS NOT NULL')),
+        Index('ix_campaign_catalog_entries_campaign_id', 'campaign_id', 'catalog'),
+    )
@@ -1,5 +1,5 @@
 # Path: api/app/models/campaign_member.py
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, func, UniqueConstraint, Enum as SQLAlchemyEnum # <--- ADD SQLAlchemyEnum
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, func, UniqueConstraint, Index, Enum as SQLAlchemyEnum # <--- ADD SQLAlchemyEnum
 from sqlalchemy.orm import relationship
 from app.db.base_class import Base
 from typing import TYPE_CHECKING
@@ -24,9 +24,9 @@ class CampaignMember(Base):
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
 
-    campaign_id = Column(Integer, ForeignKey("campaigns.id"), nullable=False)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False) # The user who is a player
-    character_id = Column(Integer, ForeignKey("characters.id"), nullable=True)
+    campaign_id = Column(Integer, ForeignKey("campaigns.id", ondelete="CASCADE"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False) # The user who is a player
+    character_id = Column(Integer, ForeignKey("characters.id", ondelete="CASCADE"), nullable=True)
 
     status = Column(SQLAlchemyEnum(CampaignMemberStatusEnum, name="campaignmemberstatusenum"), 
                     nullable=False, 
@@ -38,7 +38,13 @@ class CampaignMember(Base):
     user = relationship("User", back_populates="campaign_memberships")
     character = relationship("Character", back_populates="campaign_participations")
 
-    __table_args__ = (UniqueConstraint('campaign_id', 'user_id', name='_campaign_user_uc'),)
+    __table_args__ = (
+        UniqueConstraint('campaign_id', 'user_id', name='_campaign_user_uc'),
+        Index('ix_campaign_members_campaign_status_joined', 'campaign_id', 'status', 'joined_at'),
+        Index('ix_campaign_members_user_status_joined', 'user_id', 'status', 'joined_at'),
+        # Lets ON DELETE CASCADE from characters find the memberships without a scan.
+        Index('ix_campaign_members_character_id', 'character_id'),
+    )
 
 
     
\ No newline at end of file
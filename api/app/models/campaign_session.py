@@ -1,5 +1,5 @@
 # Path: api/app/models/campaign_session.py
-from sqlalchemy import Column, Integer, Boolean, ForeignKey, JSON
+from sqlalchemy import Column, Integer, Boolean, ForeignKey, JSON, Index
 from sqlalchemy.orm import relationship
 import sqlalchemy as sa
 
@@ -15,15 +15,38 @@ class CampaignSession(Base):
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     
-    campaign_id = Column(Integer, ForeignKey("campaigns.id"), nullable=False, index=True)
+    campaign_id = Column(Integer, ForeignKey("campaigns.id", ondelete="CASCADE"), nullable=False, index=True)
     is_active = Column(Boolean, default=True, nullable=False)
     
     # This JSON field will store flexible data like the current map URL,
     # token positions, fog of war data, etc.
     map_state = Column(JSON, nullable=True, server_default=sa.text("'{}'::jsonb"))
 
+    # Whose turn it is (added by migration 253486e59afe). use_alter breaks the
+    # campaign_sessions <-> initiative_entries FK cycle for create_all.
+    active_initiative_entry_id = Column(
+        Integer,
+        ForeignKey("initiative_entries.id", use_alter=True, name="fk_campaign_sessions_active_initiative_entry_id", ondelete="SET NULL"),
+        nullable=True
+    )
+
+    # Optimistic concurrency: every UPDATE is "WHERE id = ? AND version_id = ?" and bumps it.
+    version_id = Column(Integer, nullable=False, default=1, server_default=sa.text('1'))
+
     # Relationships
     campaign = relationship("Campaign", back_populates="sessions")
-    initiative_entries = relationship("InitiativeEntry", back_populates="session", cascade="all, delete-orphan")
+    # foreign_keys is needed now that active_initiative_entry_id also links the two tables.
+    initiative_entries = relationship(
+        "InitiativeEntry", back_populates="session", cascade="all, delete-orphan",
+        foreign_keys="InitiativeEntry.session_id", passive_deletes=True
+    )
+
+    __table_args__ = (
+        # Only one active session per campaign. Also serves get_active_session_for_campaign
+        # (WHERE campaign_id = ? AND is_active); other lookups use ix_campaign_sessions_campaign_id.
+        Index('uq_campaign_sessions_one_active_per_campaign', 'campaign_id', unique=True,
+              postgresql_where=sa.text('is_active')),
+    )
+    __mapper_args__ = {"version_id_col": version_id}
     
 
@@ -0,0 +1,16 @@
+# Path: api/app/models/catalog_state.py
+from sqlalchemy import Column, Integer, DateTime, func
+from app.db.base_class import Base
+
+class CatalogState(Base):
+    """
+    A single row (id 1) whose version is bumped whenever a catalog table is written.
+    Every worker compares it with the version its catalog caches were built from
+    (crud_catalog.current_version), so a write through one worker or the CLI seeder
+    reaches the others.
+    """
+    __tablename__ = "catalog_state"
+
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
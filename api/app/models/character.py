@@ -1,5 +1,5 @@
 # Path: api/app/models/character.py
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, func, JSON, Boolean, Enum as SQLAlchemyEnum
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, func, JSON, Boolean, Index, Enum as SQLAlchemyEnum
 import sqlalchemy as sa
 from sqlalchemy.orm import relationship
 # from sqlalchemy.sql import expression # No longer needed if sa.text('false') is used
@@ -20,7 +20,7 @@ class Character(Base):
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     name = Column(String(100), nullable=False, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
 
     race = Column(String(50), nullable=True)
     character_class = Column(String(50), nullable=True)
@@ -69,14 +69,23 @@ class Character(Base):
     st_prof_charisma = Column(Boolean, default=False, nullable=False, server_default=sa.text('false'))
     # --- END NEW FIELDS ---
 
-    inventory_items = relationship("CharacterItem", back_populates="character_owner", cascade="all, delete-orphan")
-    skills = relationship("CharacterSkill", back_populates="character_owner", cascade="all, delete-orphan")
-    known_spells = relationship("CharacterSpell", back_populates="character_owner", cascade="all, delete-orphan")
+    # passive_deletes: the child FKs are ON DELETE CASCADE; the database removes the rows.
+    inventory_items = relationship("CharacterItem", back_populates="character_owner", cascade="all, delete-orphan", passive_deletes=True)
+    skills = relationship("CharacterSkill", back_populates="character_owner", cascade="all, delete-orphan", passive_deletes=True)
+    known_spells = relationship("CharacterSpell", back_populates="character_owner", cascade="all, delete-orphan", passive_deletes=True)
+
+    # Optimistic concurrency: every UPDATE is "WHERE id = ? AND version_id = ?" and bumps it.
+    version_id = Column(Integer, nullable=False, default=1, server_default=sa.text('1'))
 
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
 
     owner = relationship("User", back_populates="characters")
-    campaign_participations = relationship("CampaignMember", back_populates="character", cascade="all, delete-orphan")
+    campaign_participations = relationship("CampaignMember", back_populates="character", cascade="all, delete-orphan", passive_deletes=True)
+
+    __table_args__ = (Index('ix_characters_user_id_name', 'user_id', 'name'),)
+    # Fetch server-generated values (timestamps, currency/proficiency defaults) with
+    # RETURNING on INSERT/UPDATE so callers don't need a refresh before serializing.
+    __mapper_args__ = {"eager_defaults": True, "version_id_col": version_id}
 
     
\ No newline at end of file
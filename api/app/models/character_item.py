@@ -13,7 +13,7 @@ class CharacterItem(Base):
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
 
-    character_id = Column(Integer, ForeignKey("characters.id"), nullable=False)
+    character_id = Column(Integer, ForeignKey("characters.id", ondelete="CASCADE"), nullable=False)
     item_id = Column(Integer, ForeignKey("items.id"), nullable=False)
 
     quantity = Column(Integer, default=1, nullable=False)
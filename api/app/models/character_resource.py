@@ -0,0 +1,21 @@
+# Path: api/app/models/character_resource.py
+from sqlalchemy import Column, Integer, String, ForeignKey, UniqueConstraint
+from sqlalchemy.orm import relationship
+from app.db.base_class import Base
+
+class CharacterResource(Base):
+    """
+    Expended uses of one limited resource ("spell_slot_3", "ki", "rage", ...).
+    Only resources with uses spent have a row; maxima come from the class tables
+    (services/resources.py), so a rest is a DELETE and a level-up needs no write.
+    """
+    __tablename__ = "character_resources"
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    character_id = Column(Integer, ForeignKey("characters.id", ondelete="CASCADE"), nullable=False)
+    resource = Column(String(50), nullable=False)
+    used = Column(Integer, nullable=False, default=0)
+
+    character = relationship("Character")
+
+    __table_args__ = (UniqueConstraint('character_id', 'resource', name='uq_character_resources_character_resource'),)
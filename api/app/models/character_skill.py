@@ -14,7 +14,7 @@ class CharacterSkill(Base):
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
 
-    character_id = Column(Integer, ForeignKey("characters.id"), nullable=False)
+    character_id = Column(Integer, ForeignKey("characters.id", ondelete="CASCADE"), nullable=False)
     skill_id = Column(Integer, ForeignKey("skills.id"), nullable=False)
 
     is_proficient = Column(Boolean, default=False, nullable=False)
@@ -13,7 +13,7 @@ class CharacterSpell(Base):
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
 
-    character_id = Column(Integer, ForeignKey("characters.id"), nullable=False, index=True)
+    character_id = Column(Integer, ForeignKey("characters.id", ondelete="CASCADE"), nullable=False, index=True)
     spell_id = Column(Integer, ForeignKey("spells.id"), nullable=False, index=True)
 
     # Additional attributes for the association
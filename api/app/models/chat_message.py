@@ -0,0 +1,36 @@
+# Path: api/app/models/chat_message.py
+from sqlalchemy import Column, BigInteger, Integer, String, Text, ForeignKey, DateTime, Computed, Index, Sequence, func
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
+from app.db.base_class import Base
+
+CHAT_MESSAGE_ID_SEQUENCE = Sequence("chat_messages_id_seq")
+
+class ChatMessage(Base):
+    """
+    Append-only log of campaign chat and dice rolls.
+
+    Range-partitioned by month on created_at (one chat_messages_yYYYYmMM table per
+    month, created ahead of time by app.crud.crud_chat_message.ensure_partitions), so
+    retention drops whole partitions instead of DELETE-scanning. Every index leads
+    with campaign_id, so per-campaign reads touch only that campaign's rows.
+    """
+    __tablename__ = "chat_messages"
+
+    id = Column(BigInteger, CHAT_MESSAGE_ID_SEQUENCE, server_default=CHAT_MESSAGE_ID_SEQUENCE.next_value(), primary_key=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, primary_key=True) # Partition key
+
+    campaign_id = Column(Integer, ForeignKey("campaigns.id", ondelete="CASCADE"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    sender_name = Column(String(255), nullable=False)
+    message_type = Column(String(20), nullable=False) # "chat" or "dice_roll"
+    text = Column(Text, nullable=False, server_default="") # Chat text, or the roll summary for dice rolls
+    payload = Column(JSONB, nullable=True) # The message payload as broadcast
+
+    search_vector = Column(TSVECTOR, Computed("to_tsvector('english', text)", persisted=True))
+
+    __table_args__ = (
+        # Keyset pagination: newest first within a campaign.
+        Index('ix_chat_messages_campaign_id_id', 'campaign_id', id.desc()),
+        Index('ix_chat_messages_search_vector', 'search_vector', postgresql_using='gin'),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
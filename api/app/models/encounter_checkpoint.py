@@ -0,0 +1,19 @@
+# Path: api/app/models/encounter_checkpoint.py
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, JSON, func
+
+from app.db.base_class import Base
+
+class EncounterCheckpoint(Base):
+    """
+    The last saved realtime encounter state of a campaign (initiative, monster pool,
+    active conditions), written by its campaign actor at most every
+    ENCOUNTER_CHECKPOINT_INTERVAL_SECONDS (and when it retires), and read back when the
+    campaign's first socket connects to a (re)started worker.
+    """
+    __tablename__ = "encounter_checkpoints"
+
+    campaign_id = Column(Integer, ForeignKey("campaigns.id", ondelete="CASCADE"), primary_key=True)
+    # Incremented by the database on every write; a writer must name the version it last saw.
+    version = Column(Integer, nullable=False)
+    state = Column(JSON, nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
@@ -14,15 +14,20 @@ class InitiativeEntry(Base):
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     
-    session_id = Column(Integer, ForeignKey("campaign_sessions.id"), nullable=False, index=True)
+    session_id = Column(Integer, ForeignKey("campaign_sessions.id", ondelete="CASCADE"), nullable=False, index=True)
     
     # An entry can be a player character OR a manually added monster/NPC
-    character_id = Column(Integer, ForeignKey("characters.id"), nullable=True) 
+    character_id = Column(Integer, ForeignKey("characters.id", ondelete="SET NULL"), nullable=True, index=True) # Entry outlives a deleted character
     monster_name = Column(String(100), nullable=True) # For manually added combatants
+    monster_id = Column(Integer, ForeignKey("monsters.id", ondelete="SET NULL"), nullable=True) # Stat block, for saves and resistances
+    # Monster hit points live on the entry (each goblin is its own combatant); characters use their own row.
+    hit_points_current = Column(Integer, nullable=True)
+    hit_points_max = Column(Integer, nullable=True)
     
     initiative_roll = Column(Integer, nullable=False, index=True)
 
     # Relationships
-    session = relationship("CampaignSession", back_populates="initiative_entries")
+    session = relationship("CampaignSession", back_populates="initiative_entries", foreign_keys=[session_id])
     character = relationship("Character")
+    monster = relationship("Monster")
 
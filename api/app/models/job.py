@@ -0,0 +1,41 @@
+# Path: api/app/models/job.py
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Index, func, text
+from sqlalchemy.dialects.postgresql import JSONB
+from app.db.base_class import Base
+import enum
+
+class JobStatusEnum(str, enum.Enum):
+    QUEUED = "queued"         # Waiting for a worker (possibly until run_after, when retrying)
+    RUNNING = "running"       # Claimed by a worker
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"         # Out of attempts; last_error says why
+
+class Job(Base):
+    """A unit of background work, claimed by workers with SELECT ... FOR UPDATE SKIP LOCKED."""
+    __tablename__ = "jobs"
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    kind = Column(String(100), nullable=False) # Handler name, e.g. "campaign.delete"
+    payload = Column(JSONB, nullable=False, server_default=text("'{}'::jsonb"))
+    status = Column(String(20), nullable=False, default=JobStatusEnum.QUEUED.value, server_default=JobStatusEnum.QUEUED.value)
+    attempts = Column(Integer, nullable=False, default=0, server_default=text('0'))
+    max_attempts = Column(Integer, nullable=False, default=5, server_default=text('5'))
+    run_after = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    locked_by = Column(String(255), nullable=True)
+    locked_at = Column(DateTime(timezone=True), nullable=True) # Refreshed by the worker's heartbeat while it runs
+    # Set in the same transaction as a handler's writes (crud_job.mark_job_applied), so a
+    # retried or re-claimed job can tell that its effects are already committed.
+    applied_at = Column(DateTime(timezone=True), nullable=True)
+    result = Column(JSONB, nullable=True)
+    last_error = Column(Text, nullable=True)
+
+    created_by_user_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+    __table_args__ = (
+        # The claim query: due queued jobs, oldest first.
+        Index('ix_jobs_queued_run_after', 'run_after', 'id', postgresql_where=text("status = 'queued'")),
+        # Reclaiming jobs whose worker died mid-run.
+        Index('ix_jobs_running_locked_at', 'locked_at', postgresql_where=text("status = 'running'")),
+    )
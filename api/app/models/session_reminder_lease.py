@@ -0,0 +1,21 @@
+# Path: api/app/models/session_reminder_lease.py
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, func, UniqueConstraint
+from app.db.base_class import Base
+
+class SessionReminderLease(Base):
+    """
+    One row per reminder that has been sent. Workers race to insert it; the unique
+    constraint means exactly one of them wins and dispatches the reminder.
+    """
+    __tablename__ = "session_reminder_leases"
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    campaign_id = Column(Integer, ForeignKey("campaigns.id", ondelete="CASCADE"), nullable=False)
+    session_utc = Column(DateTime(timezone=True), nullable=False)
+    offset_minutes = Column(Integer, nullable=False) # How long before session_utc the reminder fires
+    claimed_by = Column(String(255), nullable=False) # Worker id (host-pid)
+    claimed_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint('campaign_id', 'session_utc', 'offset_minutes', name='uq_session_reminder_leases_reminder'),
+    )
@@ -0,0 +1,16 @@
+# Path: api/app/models/spell_class.py
+from sqlalchemy import Column, Integer, String, ForeignKey, Index
+from app.db.base_class import Base
+
+class SpellClass(Base):
+    """
+    One row per (spell, class) in Spell.dnd_classes, so "the spells on a class's list" is an
+    index lookup instead of a scan over the JSON. Rebuilt from the JSON by
+    crud_spell.sync_spell_classes whenever the spells are seeded.
+    """
+    __tablename__ = "spell_classes"
+
+    class_name = Column(String(50), primary_key=True) # Lower-case, e.g. "wizard"
+    spell_id = Column(Integer, ForeignKey("spells.id", ondelete="CASCADE"), primary_key=True)
+
+    __table_args__ = (Index('ix_spell_classes_spell_id', 'spell_id'),)
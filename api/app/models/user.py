@@ -29,19 +29,22 @@ class User(Base):
     characters = relationship(
         "Character", 
         back_populates="owner", 
-        cascade="all, delete-orphan"
+        cascade="all, delete-orphan",
+        passive_deletes=True # characters.user_id is ON DELETE CASCADE
     ) 
 
     # Relationship to Campaigns where this user is the DM
     campaigns_as_dm = relationship(
         "Campaign", 
         back_populates="dm", 
-        cascade="all, delete-orphan" # If DM user is deleted, their campaigns are deleted
+        cascade="all, delete-orphan", # If DM user is deleted, their campaigns are deleted
+        passive_deletes=True
     ) # <--- ADD THIS RELATIONSHIP
 
     # Relationship to CampaignMember (campaigns this user is a player in)
     campaign_memberships = relationship(
         "CampaignMember", 
         back_populates="user", 
-        cascade="all, delete-orphan" # If user is deleted, their memberships are removed
+        cascade="all, delete-orphan", # If user is deleted, their memberships are removed
+        passive_deletes=True
     ) # <--- ADD THIS RELATIONSHIP
\ No newline at end of file
@@ -1,7 +1,7 @@
 # Path: api/app/routers/admin.py
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List # Keep List if other admin endpoints might return lists
+from typing import Any, Dict, List # Keep List if other admin endpoints might return lists
 
 from app.db.database import get_db
 from app.schemas.character import Character as CharacterSchema # For response
@@ -9,6 +9,7 @@ from app.schemas.admin import AdminCharacterProgressionUpdate # Request body sch
 from app.crud import crud_character
 from app.models.user import User as UserModel
 from app.routers.auth import get_current_active_user # Base authentication
+from app.services.campaign_actors import campaign_actors
 
 # --- Dependency to ensure user is a superuser ---
 async def get_current_active_superuser(
@@ -51,6 +52,11 @@ async def admin_set_character_progression(
     except ValueError as e: # Catch validation errors from CRUD (e.g., level out of range for tier)
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
+@router.get("/campaign-actors", response_model=List[Dict[str, Any]])
+async def admin_campaign_actor_stats():
+    """Inbox depth, batch sizes and per-command timings for each live campaign actor in this process."""
+    return campaign_actors.stats()
+
 # Add other admin-specific endpoints here later if needed
 # For example:
 # - List all users
@@ -3,7 +3,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
-from app.db.database import get_db
+from app.db.database import get_db, get_read_db
 from app.schemas.background import BackgroundCreate, Background as BackgroundSchema
 from app.crud import crud_background
 from app.models.user import User as UserModel
@@ -43,7 +43,7 @@ async def create_new_background(
 async def read_all_backgrounds(
     skip: int = 0,
     limit: int = 100,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Retrieve a list of all available backgrounds.
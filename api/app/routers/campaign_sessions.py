@@ -1,17 +1,27 @@
 # Path: api/app/routers/campaign_sessions.py
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Header, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
-from typing import List
+from pydantic import ValidationError
+from typing import Any, Dict, List, Optional
 
 from app.db.database import get_db
+from app.core.concurrency import check_if_match, set_etag
 from app.models.user import User as UserModel
 from app.models.campaign import Campaign as CampaignModel
+from app.models.campaign_member import CampaignMemberStatusEnum
 from app.models.campaign_session import CampaignSession
 from app.routers.auth import get_current_active_user
 from app.crud import crud_campaign_session
 from app.schemas.campaign_session import CampaignSession as CampaignSessionSchema
 from app.schemas.initiative_entry import InitiativeEntry as InitiativeEntrySchema, InitiativeEntryCreate
+from app.schemas.movement import MovementQuery, MovementResult, MapStatePatch
+from app.schemas.combat import DamageApplication, HitPointUpdate
+from app.schemas.resources import RestRequest, RestResult
+from app.crud import crud_campaign, crud_character_resource
+from app.services.campaign_actors import ActorBusyError, campaign_actors
+from app.services.resources import resource_ledger
+from app.routers.websockets import manager
 
 router = APIRouter(
     prefix="/sessions",
@@ -42,6 +52,27 @@ async def start_new_session(
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
+@router.post("/rest/{campaign_id}", response_model=RestResult)
+async def party_rest(
+    rest_in: RestRequest,
+    campaign: CampaignModel = Depends(get_campaign_and_verify_dm),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Short or long rest for the party (or the given members' characters). A short rest recovers
+    short-rest resources; a long rest recovers everything, hit points and half the hit dice.
+    Either is one statement for the whole party. Only the DM can perform this action.
+    """
+    party_ids = await crud_campaign.get_active_party_character_ids(db=db, campaign_id=campaign.id)
+    party = set(party_ids)
+    character_ids = party_ids if rest_in.character_ids is None else [cid for cid in rest_in.character_ids if cid in party]
+    if not character_ids:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No party characters to rest.")
+    characters = await crud_character_resource.get_characters(db, character_ids=character_ids)
+    result = await resource_ledger.rest(db, characters, rest_in.kind)
+    await manager.broadcast_json({"type": "resource_update", "payload": result.model_dump()}, campaign.id)
+    return result
+
 @router.post("/{session_id}/end", response_model=CampaignSessionSchema)
 async def end_active_session(
     session_id: int,
@@ -109,10 +140,109 @@ async def clear_all_initiative(
 
 # --- NEW ENDPOINT ---
 @router.get("/campaign/{campaign_id}/active", response_model=CampaignSessionSchema)
-async def get_active_session(campaign_id: int, db: AsyncSession = Depends(get_db)):
+async def get_active_session(campaign_id: int, response: Response, db: AsyncSession = Depends(get_db)):
     """Get the currently active session for a campaign, if one exists."""
     active_session = await crud_campaign_session.get_active_session_for_campaign(db, campaign_id=campaign_id)
     if not active_session:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No active session found for this campaign.")
+    set_etag(response, active_session.version_id)
     return active_session
-# --- END NEW ENDPOINT ---
\ No newline at end of file
+# --- END NEW ENDPOINT ---
+
+async def run_on_campaign_actor(campaign_id: int, command_type: str, payload: Dict[str, Any],
+                                expected_version: Optional[int] = None) -> Any:
+    """
+    Runs a command on the campaign's actor, in order with its WebSocket commands, and returns
+    its result. The actor publishes the resulting update itself.
+    """
+    actor = campaign_actors.get_or_start(campaign_id)
+    try:
+        return await actor.call(command_type, payload, expected_version=expected_version)
+    except ActorBusyError as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
+    except (ValidationError, ValueError, KeyError, TypeError) as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    finally:
+        if not manager.active_connections.get(campaign_id):
+            campaign_actors.retire(campaign_id) # Started for this call alone
+
+# --- Battle map endpoints ---
+@router.patch("/{session_id}/map", response_model=CampaignSessionSchema)
+async def patch_session_map(
+    session_id: int,
+    patch_in: MapStatePatch,
+    response: Response,
+    if_match: Optional[str] = Header(None, description="ETag from a previous read; 409 if the session changed since"),
+    db: AsyncSession = Depends(get_db),
+    current_user: UserModel = Depends(get_current_active_user)
+):
+    """
+    Merges a patch into the session's battle map and broadcasts it to the campaign.
+    Only the DM of the campaign can perform this action.
+    """
+    session = await db.get(CampaignSession, session_id, options=[selectinload(CampaignSession.campaign), selectinload(CampaignSession.initiative_entries)])
+    if not session:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Session not found")
+    if session.campaign.dm_user_id != current_user.id and not current_user.is_superuser:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only the Dungeon Master can change the map.")
+    if not session.is_active:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Only the active session's map can be changed.")
+    check_if_match(if_match, session.version_id)
+
+    # The campaign's actor merges it with any WebSocket patches queued alongside and re-checks
+    # If-Match against the version it writes over (a StaleDataError becomes a 409).
+    await run_on_campaign_actor(
+        session.campaign_id, "map_patch", patch_in.model_dump(exclude_unset=True),
+        expected_version=session.version_id if if_match is not None and if_match.strip() != "*" else None
+    )
+    await db.refresh(session, attribute_names=["map_state", "version_id", "is_active", "active_initiative_entry_id"])
+    set_etag(response, session.version_id)
+    return session
+
+@router.post("/{session_id}/hit-points", response_model=HitPointUpdate)
+async def apply_hit_points(
+    session_id: int,
+    application: DamageApplication,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserModel = Depends(get_current_active_user)
+):
+    """
+    Applies damage (with an optional saving throw) or healing to several combatants at once and
+    broadcasts all the changes as one hp_update. Only the DM of the campaign can perform this action.
+    """
+    session = await db.get(CampaignSession, session_id, options=[selectinload(CampaignSession.campaign)])
+    if not session:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Session not found")
+    if session.campaign.dm_user_id != current_user.id and not current_user.is_superuser:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only the Dungeon Master can apply damage or healing.")
+
+    if not session.is_active:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="The session is not active.")
+
+    # Run by the campaign's actor, which also broadcasts the hp_update.
+    return await run_on_campaign_actor(session.campaign_id, "apply_hit_points", application.model_dump())
+
+@router.post("/{session_id}/movement", response_model=MovementResult)
+async def get_token_movement(
+    session_id: int,
+    query_in: MovementQuery,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserModel = Depends(get_current_active_user)
+):
+    """
+    Returns the cells a token can reach with its walking speed, plus shortest paths to any requested targets.
+    Available to the DM and active members of the campaign.
+    """
+    session = await db.get(CampaignSession, session_id, options=[selectinload(CampaignSession.campaign).selectinload(CampaignModel.members)])
+    if not session:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Session not found")
+    is_active_member = any(m.user_id == current_user.id and m.status == CampaignMemberStatusEnum.ACTIVE for m in session.campaign.members)
+    if session.campaign.dm_user_id != current_user.id and not is_active_member and not current_user.is_superuser:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to view this session's map.")
+
+    try:
+        return await crud_campaign_session.compute_token_movement(
+            db, session, token_id=query_in.token_id, targets=query_in.targets
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
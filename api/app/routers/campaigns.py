@@ -1,11 +1,17 @@
 # Path: api/app/routers/campaigns.py
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Header, Response
+from fastapi.responses import StreamingResponse
+from starlette.status import HTTP_403_FORBIDDEN, HTTP_404_NOT_FOUND # For handlers whose `status` query param shadows the module
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select # For direct queries if needed
 from sqlalchemy.orm import selectinload # For eager loading
 from typing import List, Optional
 
-from app.db.database import get_db
+from app.db.database import get_db, get_read_db
+from app.core.concurrency import check_if_match, set_etag, etag_for
+from app.core.fieldsets import FieldTree, sparse_fields, loader_options, sparse_response
+from app.core.responses import trusted_response, model_response
+from app.core.config import settings
 from app.schemas.campaign import (
     CampaignCreate, CampaignUpdate, Campaign as CampaignSchema,
     CampaignMember as CampaignMemberSchema, CampaignMemberAdd, CampaignMemberUpdateCharacter,
@@ -13,28 +19,53 @@ from app.schemas.campaign import (
 )
 from app.schemas.character import Character as CharacterSchema # For response of XP award
 from app.schemas.xp import XPAwardRequest # <--- NEW IMPORT FOR XP AWARD
+from app.schemas.derived_stats import DerivedStats as DerivedStatsSchema
+from app.schemas.job import Job as JobSchema
 from app.crud import crud_campaign, crud_user, crud_character # crud_character for fetching character
 from app.models.user import User as UserModel
+from app.models.campaign import Campaign as CampaignModel
 from app.models.campaign_member import CampaignMember as CampaignMemberModel # For fetching member
 from app.routers.auth import get_current_active_user
+from app.services.session_reminders import reminder_scheduler
+from app.services import jobs, exports
 
 
+BACKGROUND_QUERY_DESCRIPTION = "Run as a background job: answers 202 with the job (poll GET /jobs/{id}) instead of waiting"
+
+def job_accepted_response(job) -> Response:
+    return model_response(job, JobSchema, status_code=status.HTTP_202_ACCEPTED,
+                          headers={"Location": f"{settings.API_V1_STR}/jobs/{job.id}"})
+
 router = APIRouter(
     prefix="/campaigns", 
     tags=["Campaigns"],
     dependencies=[Depends(get_current_active_user)]
 )
 
-@router.post("/{campaign_id}/award-xp", response_model=List[CharacterSchema])
+@router.post("/{campaign_id}/award-xp", response_model=List[CharacterSchema], responses={202: {"model": JobSchema}})
 async def dm_award_xp_to_characters(
     campaign_id: int,
     xp_award: XPAwardRequest,
+    background: bool = Query(False, description=BACKGROUND_QUERY_DESCRIPTION),
     db: AsyncSession = Depends(get_db),
     current_user: UserModel = Depends(get_current_active_user)
 ):
     """
     Allows the DM of a campaign to award XP to a list of characters in that campaign.
     """
+    if background:
+        campaign = await crud_campaign.get_campaign_summary(db=db, campaign_id=campaign_id)
+        if not campaign:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Campaign not found")
+        if campaign.dm_user_id != current_user.id:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only the DM can award XP in this campaign.")
+        if xp_award.amount <= 0:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="XP to award must be a positive number.")
+        job = await jobs.enqueue(db, "campaign.award_xp", {
+            "campaign_id": campaign_id, "character_ids": xp_award.character_ids, "amount": xp_award.amount
+        }, created_by_user_id=current_user.id)
+        return job_accepted_response(job)
+
     # 1. Verify current_user is the DM of this campaign
     campaign = await crud_campaign.get_campaign(db=db, campaign_id=campaign_id)
     if not campaign:
@@ -63,59 +94,98 @@ async def create_new_campaign(
     db: AsyncSession = Depends(get_db),
     current_user: UserModel = Depends(get_current_active_user)
 ):
-    return await crud_campaign.create_campaign(
+    created_campaign = await crud_campaign.create_campaign(
         db=db, campaign_in=campaign_in, dm_user_id=current_user.id
     )
+    reminder_scheduler.schedule_campaign(created_campaign.id, created_campaign.next_session_utc)
+    return created_campaign
 
 @router.get("/", response_model=List[CampaignSchema])
 async def read_user_campaigns(
     view_as_dm: Optional[bool] = False, 
     skip: int = 0,
     limit: int = 100,
-    db: AsyncSession = Depends(get_db),
-    current_user: UserModel = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_read_db),
+    current_user: UserModel = Depends(get_current_active_user),
+    fields: Optional[FieldTree] = Depends(sparse_fields(CampaignSchema))
 ):
+    load_options = loader_options(CampaignModel, CampaignSchema, fields) if fields is not None else None
     if view_as_dm:
         campaigns = await crud_campaign.get_campaigns_by_dm(
-            db=db, dm_user_id=current_user.id, skip=skip, limit=limit
+            db=db, dm_user_id=current_user.id, skip=skip, limit=limit, load_options=load_options
         )
     else:
         campaigns = await crud_campaign.get_campaigns_for_user_as_member(
-            db=db, user_id=current_user.id, skip=skip, limit=limit
+            db=db, user_id=current_user.id, skip=skip, limit=limit, load_options=load_options
         )
-    return campaigns
+    return sparse_response(campaigns, CampaignSchema, fields)
 
 @router.get("/discoverable", response_model=List[CampaignSchema])
 async def read_discoverable_campaigns(
     skip: int = 0,
     limit: int = 100,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db),
+    fields: Optional[FieldTree] = Depends(sparse_fields(CampaignSchema))
 ):
-    campaigns = await crud_campaign.get_discoverable_campaigns(db=db, skip=skip, limit=limit)
-    return campaigns
+    load_options = loader_options(CampaignModel, CampaignSchema, fields) if fields is not None else None
+    campaigns = await crud_campaign.get_discoverable_campaigns(db=db, skip=skip, limit=limit, load_options=load_options)
+    return sparse_response(campaigns, CampaignSchema, fields)
 
 @router.get("/{campaign_id}/", response_model=CampaignSchema)
 async def read_single_campaign(
     campaign_id: int,
-    db: AsyncSession = Depends(get_db),
-    current_user: UserModel = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_read_db),
+    current_user: UserModel = Depends(get_current_active_user),
+    fields: Optional[FieldTree] = Depends(sparse_fields(CampaignSchema))
 ):
-    campaign = await crud_campaign.get_campaign(db=db, campaign_id=campaign_id)
+    load_options = None
+    if fields is not None:
+        load_options = loader_options(CampaignModel, CampaignSchema, fields, always=["dm_user_id", "version_id"])
+    campaign = await crud_campaign.get_campaign(db=db, campaign_id=campaign_id, load_options=load_options)
     if not campaign:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Campaign not found")
     
-    is_member = any(member.user_id == current_user.id for member in campaign.members)
+    if fields is None:
+        is_member = any(member.user_id == current_user.id for member in campaign.members)
+    else:
+        # Members may not have been requested (and so not loaded); check the membership row instead.
+        is_member = await crud_campaign.get_campaign_member_by_user_id(
+            db=db, campaign_id=campaign_id, user_id=current_user.id
+        ) is not None
     if campaign.dm_user_id != current_user.id and not is_member:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not authorized to access this campaign"
         )
-    return campaign
+    return sparse_response(campaign, CampaignSchema, fields, headers={"ETag": etag_for(campaign.version_id)})
+
+@router.get("/{campaign_id}/export", response_class=StreamingResponse)
+async def export_campaign(
+    campaign_id: int,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: UserModel = Depends(get_current_active_user)
+):
+    """
+    The campaign, its members, their characters (with inventory, skills and spells), sessions
+    and initiative entries, streamed as NDJSON. DM or superuser only.
+    """
+    campaign = await crud_campaign.get_campaign_summary(db=db, campaign_id=campaign_id)
+    if campaign is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Campaign not found")
+    if campaign.dm_user_id != current_user.id and not current_user.is_superuser:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only the DM can export this campaign")
+    return StreamingResponse(
+        exports.stream_ndjson({"kind": "campaign", "campaign_id": campaign_id}, exports.campaign_export_sections(campaign_id)),
+        media_type=exports.NDJSON_MEDIA_TYPE,
+        headers={"Content-Disposition": f'attachment; filename="campaign-{campaign_id}.ndjson"'}
+    )
 
 @router.put("/{campaign_id}", response_model=CampaignSchema)
 async def update_existing_campaign(
     campaign_id: int,
     campaign_in: CampaignUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None, description="ETag from a previous read; 409 if the campaign changed since"),
     db: AsyncSession = Depends(get_db),
     current_user: UserModel = Depends(get_current_active_user)
 ):
@@ -127,14 +197,30 @@ async def update_existing_campaign(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not authorized to update this campaign"
         )
-    return await crud_campaign.update_campaign(db=db, campaign=db_campaign, campaign_in=campaign_in)
+    check_if_match(if_match, db_campaign.version_id)
+    updated_campaign = await crud_campaign.update_campaign(db=db, campaign=db_campaign, campaign_in=campaign_in)
+    reminder_scheduler.schedule_campaign(updated_campaign.id, updated_campaign.next_session_utc)
+    set_etag(response, updated_campaign.version_id)
+    return updated_campaign
 
-@router.delete("/{campaign_id}", response_model=CampaignSchema)
+@router.delete("/{campaign_id}", response_model=CampaignSchema, responses={202: {"model": JobSchema}})
 async def delete_existing_campaign(
     campaign_id: int,
+    background: bool = Query(False, description=BACKGROUND_QUERY_DESCRIPTION),
     db: AsyncSession = Depends(get_db),
     current_user: UserModel = Depends(get_current_active_user)
 ):
+    if background:
+        campaign = await crud_campaign.get_campaign_summary(db=db, campaign_id=campaign_id)
+        if not campaign or campaign.dm_user_id != current_user.id:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Campaign not found or not authorized to delete"
+            )
+        job = await jobs.enqueue(db, "campaign.delete", {
+            "campaign_id": campaign_id, "dm_user_id": current_user.id
+        }, created_by_user_id=current_user.id)
+        return job_accepted_response(job)
     deleted_campaign = await crud_campaign.delete_campaign(
         db=db, campaign_id=campaign_id, dm_user_id=current_user.id
     )
@@ -143,6 +229,7 @@ async def delete_existing_campaign(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Campaign not found or not authorized to delete"
         )
+    reminder_scheduler.unschedule_campaign(campaign_id)
     return deleted_campaign
 
 # --- Campaign Member & Join Request Endpoints ---
@@ -302,9 +389,25 @@ async def add_player_to_campaign_by_dm( # Renamed for clarity from generic "add_
 async def list_campaign_members(
     campaign_id: int,
     status: Optional[CampaignMemberStatusEnum] = Query(None, description="Filter members by status (e.g., ACTIVE, PENDING_APPROVAL)"),
-    db: AsyncSession = Depends(get_db),
-    current_user: UserModel = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_read_db),
+    current_user: UserModel = Depends(get_current_active_user),
+    fields: Optional[FieldTree] = Depends(sparse_fields(CampaignMemberSchema))
 ):
+    if fields is not None:
+        # Sparse path: check access with two narrow queries, then load only the requested member fields.
+        campaign = await crud_campaign.get_campaign_summary(db=db, campaign_id=campaign_id)
+        if not campaign:
+            raise HTTPException(status_code=HTTP_404_NOT_FOUND, detail="Campaign not found")
+        if campaign.dm_user_id != current_user.id:
+            membership = await crud_campaign.get_campaign_member_by_user_id(db=db, campaign_id=campaign_id, user_id=current_user.id)
+            if not membership or membership.status != CampaignMemberStatusEnum.ACTIVE:
+                raise HTTPException(status_code=HTTP_403_FORBIDDEN, detail="Not authorized to view members of this campaign.")
+        members = await crud_campaign.get_campaign_members(
+            db=db, campaign_id=campaign_id, status_filter=status,
+            load_options=loader_options(CampaignMemberModel, CampaignMemberSchema, fields)
+        )
+        return sparse_response(members, CampaignMemberSchema, fields)
+
     # Authorization: Ensure current_user is DM or an ACTIVE member of this campaign
     campaign = await crud_campaign.get_campaign(db=db, campaign_id=campaign_id)
     if not campaign:
@@ -319,8 +422,34 @@ async def list_campaign_members(
     
     # If we want to return based on the filter from campaign.members (already eager loaded by get_campaign)
     if status:
-        return [member for member in campaign.members if member.status == status]
-    return campaign.members # Returns all members if no status filter
+        return sparse_response([member for member in campaign.members if member.status == status], CampaignMemberSchema, None)
+    return sparse_response(campaign.members, CampaignMemberSchema, None) # Returns all members if no status filter
+
+@router.get("/{campaign_id}/party/derived", response_model=List[DerivedStatsSchema])
+async def read_party_derived_stats(
+    campaign_id: int,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: UserModel = Depends(get_current_active_user)
+):
+    """
+    Derived sheets for every active member's character, for the DM dashboard.
+    Characters are loaded in one query; unchanged characters come from the memo cache.
+    """
+    campaign = await crud_campaign.get_campaign_summary(db=db, campaign_id=campaign_id)
+    if not campaign:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Campaign not found")
+
+    if campaign.dm_user_id != current_user.id and not current_user.is_superuser:
+        member = await crud_campaign.get_campaign_member_by_user_id(db=db, campaign_id=campaign_id, user_id=current_user.id)
+        if not member or member.status != CampaignMemberStatusEnum.ACTIVE:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not authorized to view this campaign's party."
+            )
+
+    character_ids = await crud_campaign.get_active_party_character_ids(db=db, campaign_id=campaign_id)
+    characters = await crud_character.get_characters_for_derived_stats(db=db, character_ids=character_ids)
+    return trusted_response([await crud_character.get_derived_stats(character) for character in characters])
 
 @router.delete("/{campaign_id}/members/{user_id_to_remove}", response_model=CampaignMemberSchema)
 async def remove_player_from_campaign_by_dm( # Renamed for clarity
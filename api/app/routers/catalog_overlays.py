@@ -0,0 +1,116 @@
+# Path: api/app/routers/catalog_overlays.py
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Path
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List
+
+from app.db.database import get_db, get_read_db
+from app.core.responses import model_response
+from app.schemas.catalog_overlay import CatalogOverlayEntry as CatalogOverlayEntrySchema, CatalogOverlayEntryCreate
+from app.crud import crud_campaign, crud_catalog_overlay
+from app.models.user import User as UserModel
+from app.models.campaign_member import CampaignMemberStatusEnum
+from app.routers.auth import get_current_active_user
+from app.services import catalog_overlays
+
+router = APIRouter(
+    prefix="/campaigns/{campaign_id}/catalogs",
+    tags=["Campaign Catalogs"],
+    dependencies=[Depends(get_current_active_user)]
+)
+
+CATALOG_PATH = Path(..., pattern="^(spells|items|monsters)$", description="spells, items or monsters")
+
+async def verify_campaign_participant(
+    campaign_id: int,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: UserModel = Depends(get_current_active_user)
+) -> None:
+    campaign = await crud_campaign.get_campaign_summary(db=db, campaign_id=campaign_id)
+    if not campaign:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Campaign not found")
+    if campaign.dm_user_id == current_user.id or current_user.is_superuser:
+        return
+    member = await crud_campaign.get_campaign_member_by_user_id(db=db, campaign_id=campaign_id, user_id=current_user.id)
+    if not member or member.status != CampaignMemberStatusEnum.ACTIVE:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to view this campaign's catalogs.")
+
+async def verify_campaign_dm(
+    campaign_id: int,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: UserModel = Depends(get_current_active_user)
+) -> None:
+    campaign = await crud_campaign.get_campaign_summary(db=db, campaign_id=campaign_id)
+    if not campaign:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Campaign not found")
+    if campaign.dm_user_id != current_user.id and not current_user.is_superuser:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only the DM can change this campaign's catalogs.")
+
+@router.get("/{catalog}", dependencies=[Depends(verify_campaign_participant)])
+async def read_campaign_catalog(
+    request: Request,
+    campaign_id: int,
+    catalog: str = CATALOG_PATH
+):
+    """
+    The global catalog as this campaign sees it: homebrew entries added, overrides applied,
+    hidden entries left out. Homebrew entries have negative ids.
+    """
+    return await catalog_overlays.list_response(request, campaign_id, catalog)
+
+@router.get("/{catalog}/overlay", response_model=List[CatalogOverlayEntrySchema], dependencies=[Depends(verify_campaign_dm)])
+async def read_campaign_catalog_overlay(
+    campaign_id: int,
+    catalog: str = CATALOG_PATH,
+    db: AsyncSession = Depends(get_read_db)
+):
+    """The campaign's own additions, overrides and hidden entries for one catalog. DM only."""
+    return await crud_catalog_overlay.get_overlay_entries(db, campaign_id=campaign_id, catalog=catalog)
+
+@router.post("/{catalog}/overlay", response_model=CatalogOverlayEntrySchema, status_code=status.HTTP_201_CREATED,
+             dependencies=[Depends(verify_campaign_dm)])
+async def put_campaign_catalog_overlay_entry(
+    campaign_id: int,
+    entry_in: CatalogOverlayEntryCreate,
+    catalog: str = CATALOG_PATH,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Adds a homebrew entry, or overrides/hides a global one (replacing any earlier override or
+    hide of the same entry). DM only.
+    """
+    try:
+        data = await catalog_overlays.validate_overlay_entry(catalog, entry_in)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    entry = await crud_catalog_overlay.put_overlay_entry(
+        db, campaign_id=campaign_id, catalog=catalog, action=entry_in.action, base_id=entry_in.base_id, data=data
+    )
+    catalog_overlays.overlay_cache.invalidate(campaign_id)
+    return entry
+
+@router.delete("/{catalog}/overlay/{entry_id}", response_model=CatalogOverlayEntrySchema, dependencies=[Depends(verify_campaign_dm)])
+async def delete_campaign_catalog_overlay_entry(
+    campaign_id: int,
+    entry_id: int,
+    catalog: str = CATALOG_PATH,
+    db: AsyncSession = Depends(get_db)
+):
+    """Removes one overlay entry; the global entry (if any) shows through again. DM only."""
+    deleted = await crud_catalog_overlay.delete_overlay_entry(db, campaign_id=campaign_id, catalog=catalog, entry_id=entry_id)
+    if deleted is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Overlay entry not found")
+    catalog_overlays.overlay_cache.invalidate(campaign_id)
+    return deleted
+
+@router.get("/{catalog}/{entry_id}", dependencies=[Depends(verify_campaign_participant)])
+async def read_campaign_catalog_entry(
+    campaign_id: int,
+    entry_id: int,
+    catalog: str = CATALOG_PATH
+):
+    """One entry as this campaign sees it (negative ids are the campaign's homebrew)."""
+    view = await catalog_overlays.campaign_catalog(campaign_id, catalog)
+    entry = await view.get(entry_id)
+    if entry is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Entry not found in this campaign's catalog")
+    return model_response(entry, view.catalog.public_schema)
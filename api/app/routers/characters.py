@@ -1,9 +1,13 @@
 # Path: api/app/routers/characters.py
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Header, Response, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 
-from app.db.database import get_db
+from app.db.database import get_db, get_read_db
+from app.core.concurrency import check_if_match, set_etag, etag_for
+from app.core.fieldsets import FieldTree, sparse_fields, loader_options, sparse_response
+from app.core.responses import trusted_response, model_response
 from app.schemas.character import (
     CharacterCreate, CharacterUpdate, Character as CharacterSchema,
     CharacterBase, 
@@ -21,11 +25,17 @@ from app.schemas.item import (
     CharacterItemCreate, 
     CharacterItemUpdate
 )
-from app.schemas.character_spell import CharacterSpell as CharacterSpellSchema 
+from app.schemas.character_spell import CharacterSpell as CharacterSpellSchema, EligibleSpells
+from app.schemas.derived_stats import DerivedStats as DerivedStatsSchema
+from app.schemas.resources import CharacterResources, ResourceSpend
 
 from app.crud import crud_character, crud_skill, crud_item 
 from app.models.user import User as UserModel
 from app.routers.auth import get_current_active_user
+from app.services import exports, bulk_import
+from app.services.resources import resource_ledger
+from app.schemas.bulk_import import BulkImportReport
+from app.models.character import Character as CharacterModel
 from app.models.character_skill import CharacterSkill as CharacterSkillModel 
 from app.models.character_item import CharacterItem as CharacterItemModel
 from app.models.character_spell import CharacterSpell as CharacterSpellModel
@@ -53,33 +63,88 @@ async def create_character(
 
 @router.get("/", response_model=List[CharacterSchema])
 async def read_characters_for_user(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: UserModel = Depends(get_current_active_user),
     skip: int = 0,
-    limit: int = 1000
+    limit: int = 1000,
+    fields: Optional[FieldTree] = Depends(sparse_fields(CharacterSchema))
 ):
+    load_options = loader_options(CharacterModel, CharacterSchema, fields) if fields is not None else None
     characters = await crud_character.get_characters_by_user(
-        db=db, user_id=current_user.id, skip=skip, limit=limit
+        db=db, user_id=current_user.id, skip=skip, limit=limit, load_options=load_options
+    )
+    return sparse_response(characters, CharacterSchema, fields)
+
+@router.post("/import", response_model=BulkImportReport)
+async def import_characters_for_user(
+    request: Request,
+    format: Optional[str] = Query(None, pattern="^(ndjson|csv)$", description="Default: csv for a text/csv body, otherwise ndjson"),
+    db: AsyncSession = Depends(get_db),
+    current_user: UserModel = Depends(get_current_active_user)
+):
+    """
+    Creates characters for the current user from an NDJSON or CSV body of CharacterCreate rows.
+    Invalid rows are reported by line and skipped; the rest are imported.
+    """
+    lines = await bulk_import.spool_request_body(request)
+    with lines:
+        return await bulk_import.import_characters(
+            db, lines, format or bulk_import.format_for(request.headers.get("content-type")), user_id=current_user.id
+        )
+
+# Declared before /{character_id} so "export" isn't taken for an id.
+@router.get("/export", response_class=StreamingResponse)
+async def export_characters_for_user(
+    current_user: UserModel = Depends(get_current_active_user)
+):
+    """All of the user's characters with their inventory, skills and spells, streamed as NDJSON."""
+    return StreamingResponse(
+        exports.stream_ndjson({"kind": "user", "user_id": current_user.id}, exports.user_export_sections(current_user.id)),
+        media_type=exports.NDJSON_MEDIA_TYPE,
+        headers={"Content-Disposition": f'attachment; filename="characters-user-{current_user.id}.ndjson"'}
     )
-    return characters
 
 @router.get("/{character_id}", response_model=CharacterSchema)
 async def read_character(
     character_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: UserModel = Depends(get_current_active_user)
+    current_user: UserModel = Depends(get_current_active_user),
+    fields: Optional[FieldTree] = Depends(sparse_fields(CharacterSchema))
 ):
-    db_character = await crud_character.get_character(db=db, character_id=character_id)
+    load_options = None
+    if fields is not None:
+        load_options = loader_options(CharacterModel, CharacterSchema, fields, always=["user_id", "version_id"])
+    db_character = await crud_character.get_character(db=db, character_id=character_id, load_options=load_options)
     if db_character is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Character not found")
     if db_character.user_id != current_user.id and not current_user.is_superuser:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to access this character")
-    return db_character
+    return sparse_response(db_character, CharacterSchema, fields, headers={"ETag": etag_for(db_character.version_id)})
+
+@router.get("/{character_id}/derived", response_model=DerivedStatsSchema)
+async def read_character_derived_stats(
+    character_id: int,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: UserModel = Depends(get_current_active_user)
+):
+    """
+    Derived sheet: modifiers, saving throws, skill bonuses, passive perception,
+    spell save DC / attack bonus, weapon attacks, AC and carried weight.
+    """
+    characters = await crud_character.get_characters_for_derived_stats(db=db, character_ids=[character_id])
+    if not characters:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Character not found")
+    db_character = characters[0]
+    if db_character.user_id != current_user.id and not current_user.is_superuser:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to access this character")
+    return trusted_response(await crud_character.get_derived_stats(db_character))
 
 @router.put("/{character_id}", response_model=CharacterSchema)
 async def update_existing_character_endpoint(
     character_id: int,
     character_update_payload: CharacterUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None, description="ETag from a previous read; 409 if the character changed since"),
     db: AsyncSession = Depends(get_db),
     current_user: UserModel = Depends(get_current_active_user)
 ):
@@ -91,10 +156,12 @@ async def update_existing_character_endpoint(
        character_update_payload.is_ascended_tier != db_character.is_ascended_tier:
         if not current_user.is_superuser:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only a superuser can change the ascended tier status.")
+    check_if_match(if_match, db_character.version_id)
     
     updated_character_orm = await crud_character.update_character(
         db=db, character=db_character, character_in=character_update_payload
     )
+    set_etag(response, updated_character_orm.version_id)
     return updated_character_orm
     
 @router.delete("/{character_id}", response_model=CharacterSchema) 
@@ -245,6 +312,21 @@ async def select_character_asi_on_level_up(
 
 # --- NEW: Spell Selection Endpoint for Sorcerers ---
 # --- GENERIC SPELL SELECTION ENDPOINT ---
+@router.get("/{character_id}/level-up/eligible-spells", response_model=EligibleSpells)
+async def read_eligible_spells(
+    character_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserModel = Depends(get_current_active_user)
+):
+    """
+    Exactly the cantrips and spells the character may pick (class list, castable level, not yet
+    known) and how many of each it has left, so the client doesn't need the whole spell list.
+    """
+    db_character = await crud_character.get_character(db=db, character_id=character_id)
+    if not db_character or db_character.user_id != current_user.id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND if not db_character else status.HTTP_403_FORBIDDEN, detail="Character not found or not authorized")
+    return model_response(await crud_character.get_eligible_spells(db, character=db_character), EligibleSpells)
+
 @router.post("/{character_id}/level-up/select-spells", response_model=CharacterSchema)
 async def select_spells_on_level_up(
     character_id: int,
@@ -356,4 +438,36 @@ async def reset_character_death_saves_endpoint(
     updated_character = await crud_character.reset_death_saves(db=db, character=db_character)
     return updated_character
 
+@router.get("/{character_id}/resources", response_model=CharacterResources)
+async def read_character_resources(
+    character_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserModel = Depends(get_current_active_user)
+):
+    """Spell slots and limited-use class features: maximum, used and what a short rest recovers."""
+    db_character = await crud_character.get_character(db=db, character_id=character_id)
+    if db_character is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Character not found")
+    if db_character.user_id != current_user.id and not current_user.is_superuser:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to access this character")
+    sheet, = await resource_ledger.load(db, [db_character])
+    return sheet.state()
 
+@router.post("/{character_id}/resources/spend", response_model=CharacterResources)
+async def spend_character_resource(
+    character_id: int,
+    spend_in: ResourceSpend,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserModel = Depends(get_current_active_user)
+):
+    """Spends (or regains, with a negative amount) uses of one resource, e.g. {"resource": "spell_slot_2"}."""
+    db_character = await crud_character.get_character(db=db, character_id=character_id)
+    if not db_character or db_character.user_id != current_user.id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND if not db_character else status.HTTP_403_FORBIDDEN,
+                                detail="Character not found or not authorized")
+    await resource_ledger.load(db, [db_character])
+    try:
+        sheet = resource_ledger.spend(character_id, spend_in.resource, spend_in.amount)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return sheet.state()
@@ -0,0 +1,63 @@
+# Path: api/app/routers/chat.py
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+
+from app.db.database import get_read_db
+from app.schemas.chat_message import ChatHistoryPage
+from app.crud import crud_campaign, crud_chat_message
+from app.models.user import User as UserModel
+from app.models.campaign_member import CampaignMemberStatusEnum
+from app.routers.auth import get_current_active_user
+
+router = APIRouter(
+    prefix="/campaigns/{campaign_id}/chat",
+    tags=["Chat"],
+    dependencies=[Depends(get_current_active_user)]
+)
+
+async def verify_campaign_participant(
+    campaign_id: int,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: UserModel = Depends(get_current_active_user)
+) -> None:
+    campaign = await crud_campaign.get_campaign_summary(db=db, campaign_id=campaign_id)
+    if not campaign:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Campaign not found")
+    if campaign.dm_user_id == current_user.id or current_user.is_superuser:
+        return
+    member = await crud_campaign.get_campaign_member_by_user_id(db=db, campaign_id=campaign_id, user_id=current_user.id)
+    if not member or member.status != CampaignMemberStatusEnum.ACTIVE:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to view this campaign's chat.")
+
+@router.get("/", response_model=ChatHistoryPage, dependencies=[Depends(verify_campaign_participant)])
+async def read_chat_history(
+    campaign_id: int,
+    before_id: Optional[int] = Query(None, description="Return messages older than this id (next_before_id of the previous page)"),
+    limit: int = Query(50, ge=1, le=200),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Chat and dice roll history for a campaign, newest first.
+    Messages reach the history within about a second of being sent.
+    """
+    messages, next_before_id = await crud_chat_message.get_messages(
+        db, campaign_id=campaign_id, before_id=before_id, limit=limit
+    )
+    return ChatHistoryPage(messages=messages, next_before_id=next_before_id)
+
+@router.get("/search", response_model=ChatHistoryPage, dependencies=[Depends(verify_campaign_participant)])
+async def search_chat_history(
+    campaign_id: int,
+    q: str = Query(..., min_length=1, max_length=200, description='Search terms; supports "quoted phrases" and -exclusions'),
+    before_id: Optional[int] = Query(None),
+    limit: int = Query(50, ge=1, le=200),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Full-text search over a campaign's chat and roll messages, newest first.
+    """
+    messages, next_before_id = await crud_chat_message.search_messages(
+        db, campaign_id=campaign_id, query_text=q, before_id=before_id, limit=limit
+    )
+    return ChatHistoryPage(messages=messages, next_before_id=next_before_id)
@@ -3,7 +3,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
-from app.db.database import get_db
+from app.db.database import get_db, get_read_db
 from app.schemas.condition import ConditionCreate, Condition as ConditionSchema
 from app.crud import crud_condition
 from app.models.user import User as UserModel
@@ -43,7 +43,7 @@ async def create_new_condition(
 async def read_all_conditions(
     skip: int = 0,
     limit: int = 100,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Retrieve a list of all available D&D game conditions.
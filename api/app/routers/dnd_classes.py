@@ -1,11 +1,13 @@
 # Path: api/app/routers/dnd_classes.py
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
-from app.db.database import get_db
+from app.db.database import get_db, get_read_db
+from app.core.compression import catalog_blobs
+from app.core.responses import dump_json
 from app.schemas.dnd_class import DndClassCreate, DndClass as DndClassSchema
-from app.crud import crud_dnd_class
+from app.crud import crud_dnd_class, crud_catalog
 from app.models.user import User as UserModel
 # --- MODIFICATION: Removed the incorrect import ---
 from app.routers.auth import get_current_active_user
@@ -44,20 +46,23 @@ async def create_new_dnd_class(
 
 @router.get("/", response_model=List[DndClassSchema])
 async def read_all_dnd_classes(
+    request: Request,
     skip: int = 0,
     limit: int = 20,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Retrieve a list of all available D&D classes.
     """
-    dnd_classes = await crud_dnd_class.get_dnd_classes(db=db, skip=skip, limit=limit)
-    return dnd_classes
+    async def build() -> bytes:
+        dnd_classes = await crud_dnd_class.get_dnd_classes(db=db, skip=skip, limit=limit)
+        return dump_json(dnd_classes, DndClassSchema)
+    return await catalog_blobs.response(request, ("dnd_classes", skip, limit), await crud_catalog.current_version(), build)
 
 @router.get("/{class_name}", response_model=DndClassSchema)
 async def read_single_dnd_class(
     class_name: str,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Retrieve details for a single D&D class by name.
@@ -1,11 +1,13 @@
 # Path: api/app/routers/items.py
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
-from app.db.database import get_db
+from app.db.database import get_read_db
+from app.core.compression import catalog_blobs
+from app.core.responses import dump_json
 from app.schemas.item import Item as ItemSchema # Pydantic schema for Item response
-from app.crud import crud_item # CRUD functions for items
+from app.crud import crud_item, crud_catalog # CRUD functions for items
 from app.models.user import User as UserModel # For current_user dependency
 from app.routers.auth import get_current_active_user # For authentication
 
@@ -19,20 +21,23 @@ router = APIRouter(
 
 @router.get("/", response_model=List[ItemSchema])
 async def read_items(
+    request: Request,
     skip: int = 0,
     limit: int = 1000, # Default to fetching up to 100 items
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Retrieve a list of all predefined D&D items available in the system.
     """
-    items = await crud_item.get_items(db=db, skip=skip, limit=limit)
-    return items
+    async def build() -> bytes:
+        items = await crud_item.get_items(db=db, skip=skip, limit=limit)
+        return dump_json(items, ItemSchema)
+    return await catalog_blobs.response(request, ("items", skip, limit), await crud_catalog.current_version(), build)
 
 @router.get("/{item_id}", response_model=ItemSchema)
 async def read_item(
     item_id: int, 
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Retrieve a specific predefined D&D item by its ID.
@@ -0,0 +1,32 @@
+# Path: api/app/routers/jobs.py
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.database import get_db
+from app.schemas.job import Job as JobSchema
+from app.crud import crud_job
+from app.models.user import User as UserModel
+from app.routers.auth import get_current_active_user
+
+router = APIRouter(
+    prefix="/jobs",
+    tags=["Jobs"],
+    dependencies=[Depends(get_current_active_user)]
+)
+
+@router.get("/{job_id}", response_model=JobSchema)
+async def read_job_status(
+    job_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserModel = Depends(get_current_active_user)
+):
+    """
+    Status of a background job started by one of your requests (they answer 202 with the job).
+    Poll until status is "succeeded" (see result) or "failed" (see last_error).
+    """
+    job = await crud_job.get_job(db, job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    if job.created_by_user_id != current_user.id and not current_user.is_superuser:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to view this job")
+    return job
@@ -1,11 +1,15 @@
 # Path: api/app/routers/monsters.py
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import List, Optional
 
-from app.db.database import get_db
+from app.db.database import get_db, get_read_db
+from app.core.compression import catalog_blobs
+from app.core.responses import dump_json
 from app.schemas.monster import MonsterCreate, Monster as MonsterSchema, MonsterPublic
-from app.crud import crud_monster
+from app.schemas.bulk_import import BulkImportReport
+from app.services import bulk_import
+from app.crud import crud_monster, crud_catalog
 from app.models.user import User as UserModel
 # --- MODIFICATION: Removed the incorrect import ---
 from app.routers.auth import get_current_active_user
@@ -42,14 +46,41 @@ async def create_new_monster(
     return await crud_monster.create_monster(db=db, monster_in=monster_in)
 
 
+@router.post("/import", response_model=BulkImportReport)
+async def import_monsters(
+    request: Request,
+    format: Optional[str] = Query(None, pattern="^(ndjson|csv)$", description="Default: csv for a text/csv body, otherwise ndjson"),
+    update_existing: bool = Query(False, description="Overwrite monsters with the same name instead of reporting them"),
+    db: AsyncSession = Depends(get_db),
+    current_user: UserModel = Depends(get_current_active_user)
+):
+    """
+    Bulk-create monster templates from an NDJSON or CSV body. (Superuser only)
+    Invalid or conflicting rows are reported by line and skipped; the rest are imported.
+    """
+    if not current_user.is_superuser:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You do not have permission to import monsters."
+        )
+    lines = await bulk_import.spool_request_body(request)
+    with lines:
+        return await bulk_import.import_monsters(
+            db, lines, format or bulk_import.format_for(request.headers.get("content-type")), update_existing=update_existing
+        )
+
+
 @router.get("/", response_model=List[MonsterPublic])
 async def read_all_monsters(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Retrieve a list of all available monsters with public-safe information.
     """
-    monsters = await crud_monster.get_monsters(db=db, skip=skip, limit=limit)
-    return monsters
+    async def build() -> bytes:
+        monsters = await crud_monster.get_monsters(db=db, skip=skip, limit=limit)
+        return dump_json(monsters, MonsterPublic)
+    return await catalog_blobs.response(request, ("monsters", skip, limit), await crud_catalog.current_version(), build)
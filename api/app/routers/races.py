@@ -1,11 +1,13 @@
 # Path: api/app/routers/races.py
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
-from app.db.database import get_db
+from app.db.database import get_db, get_read_db
+from app.core.compression import catalog_blobs
+from app.core.responses import dump_json
 from app.schemas.race import RaceCreate, Race as RaceSchema
-from app.crud import crud_race
+from app.crud import crud_race, crud_catalog
 from app.models.user import User as UserModel
 from app.routers.auth import get_current_active_user
 
@@ -43,12 +45,15 @@ async def create_new_race(
 
 @router.get("/", response_model=List[RaceSchema], summary="Get a list of all races")
 async def read_all_races(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Retrieve a list of all available races.
     """
-    races = await crud_race.get_races(db=db, skip=skip, limit=limit)
-    return races
\ No newline at end of file
+    async def build() -> bytes:
+        races = await crud_race.get_races(db=db, skip=skip, limit=limit)
+        return dump_json(races, RaceSchema)
+    return await catalog_blobs.response(request, ("races", skip, limit), await crud_catalog.current_version(), build)
\ No newline at end of file
@@ -1,11 +1,13 @@
 # Path: api/app/routers/skills.py
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
-from app.db.database import get_db
+from app.db.database import get_read_db
+from app.core.compression import catalog_blobs
+from app.core.responses import dump_json
 from app.schemas.skill import Skill as SkillSchema
-from app.crud import crud_skill
+from app.crud import crud_skill, crud_catalog
 from app.models.user import User as UserModel # For current_user dependency if routes are protected
 from app.routers.auth import get_current_active_user # For authentication
 
@@ -19,15 +21,18 @@ router = APIRouter(
 
 @router.get("/", response_model=List[SkillSchema])
 async def read_skills(
+    request: Request,
     skip: int = 0,
     limit: int = 100, # Default to fetching up to 100 skills
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Retrieve a list of all predefined D&D skills available in the system.
     """
-    skills = await crud_skill.get_skills(db=db, skip=skip, limit=limit)
-    return skills
+    async def build() -> bytes:
+        skills = await crud_skill.get_skills(db=db, skip=skip, limit=limit)
+        return dump_json(skills, SkillSchema)
+    return await catalog_blobs.response(request, ("skills", skip, limit), await crud_catalog.current_version(), build)
 
 # Potential future endpoint:
 # @router.get("/{skill_id}", response_model=SkillSchema)
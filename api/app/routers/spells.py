@@ -1,11 +1,13 @@
 # Path: api/app/routers/spells.py
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
-from app.db.database import get_db
+from app.db.database import get_read_db
+from app.core.compression import catalog_blobs
+from app.core.responses import dump_json
 from app.schemas.spell import Spell as SpellSchema # Pydantic schema for Spell response
-from app.crud import crud_spell # Importing the crud_spell module
+from app.crud import crud_spell, crud_catalog # Importing the crud_spell module
 from app.models.user import User as UserModel # For current_user dependency
 from app.routers.auth import get_current_active_user # For authentication
 
@@ -18,22 +20,25 @@ router = APIRouter(
 
 @router.get("/", response_model=List[SpellSchema])
 async def read_spells_list(
+    request: Request,
     skip: int = 0,
      # Default to fetching up to 100 spells
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
     # current_user: UserModel = Depends(get_current_active_user) # Already in router dependencies
     ):
     """
     Retrieve a list of all predefined D&D spells available in the system.
     Spells are ordered by level, then by name.
     """
-    spells = await crud_spell.get_spells(db=db, skip=skip, limit=1000)
-    return spells
+    async def build() -> bytes:
+        spells = await crud_spell.get_spells(db=db, skip=skip, limit=1000)
+        return dump_json(spells, SpellSchema)
+    return await catalog_blobs.response(request, ("spells", skip), await crud_catalog.current_version(), build)
 
 @router.get("/{spell_id}", response_model=SpellSchema)
 async def read_single_spell(
     spell_id: int, 
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
     # current_user: UserModel = Depends(get_current_active_user) # Already in router dependencies
     ):
     """
@@ -1,13 +1,15 @@
 # Path: api/app/routers/users.py
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List 
+from typing import List, Optional
 
 from app.db.database import get_db
+from app.core.fieldsets import FieldTree, sparse_fields, loader_options, sparse_response
 from app.schemas.user import UserCreate, User as UserSchema, UserPasswordChange
 from app.schemas.campaign import CampaignMember as CampaignMemberSchema
 from app.crud import crud_user
 from app.models.user import User as UserModel
+from app.models.campaign_member import CampaignMember as CampaignMemberModel
 from app.routers.auth import get_current_active_user
 
 router = APIRouter(
@@ -56,15 +58,17 @@ async def read_my_campaign_memberships(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
     db: AsyncSession = Depends(get_db),
-    current_user: UserModel = Depends(get_current_active_user)
+    current_user: UserModel = Depends(get_current_active_user),
+    fields: Optional[FieldTree] = Depends(sparse_fields(CampaignMemberSchema))
 ):
     """
     Retrieve all campaign memberships (pending, active, rejected, etc.) for the current user.
     """
+    load_options = loader_options(CampaignMemberModel, CampaignMemberSchema, fields) if fields is not None else None
     memberships = await crud_user.get_user_campaign_memberships(
-        db=db, user_id=current_user.id, skip=skip, limit=limit
+        db=db, user_id=current_user.id, skip=skip, limit=limit, load_options=load_options
     )
-    return memberships
+    return sparse_response(memberships, CampaignMemberSchema, fields)
 # --- END NEW ENDPOINT ---
 
 
@@ -3,29 +3,35 @@ from fastapi import APIRouter, Depends, WebSocket, WebSocketDisconnect, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 from typing import List, Dict, Any, Optional
-import json
+from functools import partial
 import random
-from app.crud import crud_campaign_session
+from app.crud import crud_campaign, crud_campaign_session
 from app.db.database import AsyncSession
 from app.models.initiative_entry import InitiativeEntry
 from fastapi import Depends
 
 
 from app.db.database import get_db
+from app.core import ws_protocol
 from app.models.user import User as UserModel
 from app.models.campaign import Campaign as CampaignModel
 from app.models.campaign_member import CampaignMember
 from app.routers.auth import get_user_from_websocket_token
+from app.services.chat_history import chat_writer
+from app.services.conditions import condition_tracker
+from app.services.resources import resource_ledger
+from app.crud import crud_character_resource
+from app.services.encounter_pool import encounter_pools
+from app.services.campaign_actors import campaign_actors, build_encounter_payload
 
 router = APIRouter()
 
 class ConnectionManager:
     def __init__(self):
         self.active_connections: Dict[int, Dict[int, WebSocket]] = {}
-        self.encounter_states: Dict[int, Dict[str, Any]] = {}
 
     async def connect(self, websocket: WebSocket, campaign_id: int, user: UserModel):
-        await websocket.accept()
+        await ws_protocol.accept(websocket)
         if campaign_id not in self.active_connections:
             self.active_connections[campaign_id] = {}
         self.active_connections[campaign_id][user.id] = websocket
@@ -35,43 +41,28 @@ class ConnectionManager:
         if campaign_id in self.active_connections and user.id in self.active_connections[campaign_id]:
             del self.active_connections[campaign_id][user.id]
             if not self.active_connections.get(campaign_id):
-                if campaign_id in self.encounter_states:
-                    del self.encounter_states[campaign_id]
+                campaign_actors.retire(campaign_id)
                 if campaign_id in self.active_connections:
                     del self.active_connections[campaign_id]
         print(f"User '{user.username}' disconnected from campaign {campaign_id}.")
 
     async def broadcast_json(self, data: dict, campaign_id: int):
+        # Encoded once per codec in use, not once per recipient.
         if campaign_id in self.active_connections:
-            for connection in self.active_connections[campaign_id].values():
-                await connection.send_json(data)
+            frames: Dict[str, ws_protocol.Frame] = {}
+            for connection in list(self.active_connections[campaign_id].values()):
+                codec = ws_protocol.codec_for(connection)
+                frame = frames.get(codec.subprotocol)
+                if frame is None:
+                    frame = frames[codec.subprotocol] = codec.encode(data)
+                await ws_protocol.send_frame(connection, frame)
 
-manager = ConnectionManager()
+    async def send(self, websocket: WebSocket, data: dict):
+        await ws_protocol.send(websocket, data)
 
-# --- START FIX: Helper to build the correct encounter payload ---
-def build_encounter_payload(encounter_state: Dict[str, Any]) -> Dict[str, Any]:
-    """Safely builds the encounter payload for the frontend."""
-    if not encounter_state or not encounter_state.get('is_active'):
-        return {"is_active": False, "order": [], "active_entry_id": None}
-
-    # The order is already sorted when it's created
-    order_with_names = []
-    for entry in encounter_state.get('order', []):
-        is_character = entry.get('id', '').startswith('char_')
-        name = entry.get('name', 'Unknown')
-        order_with_names.append({
-            "id": entry.get('id'),
-            "name": name,
-            "roll": entry.get('roll')
-        })
-
-    return {
-        "is_active": True,
-        "turn_index": encounter_state.get('turn_index', 0),
-        "order": order_with_names,
-        "active_entry_id": encounter_state.get('active_entry_id')
-    }
-# --- END FIX ---
+manager = ConnectionManager()
+condition_tracker.publish = manager.broadcast_json
+campaign_actors.publish = manager.broadcast_json
 
 @router.websocket("/ws/campaign/{campaign_id}")
 async def websocket_endpoint(
@@ -94,6 +85,7 @@ async def websocket_endpoint(
             my_member_record = next((m for m in campaign.members if m.user_id == user.id), None)
             if my_member_record and my_member_record.character:
                 sender_name = my_member_record.character.name
+        active_session = await crud_campaign_session.get_active_session_for_campaign(db, campaign_id=campaign_id)
     except Exception as e:
         print(f"Error fetching initial campaign data: {e}")
         await manager.disconnect(campaign_id, user)
@@ -102,14 +94,23 @@ async def websocket_endpoint(
     
     await manager.broadcast_json({"type": "user_join", "sender": "System", "payload": {"text": f"'{sender_name}' has joined."}}, campaign_id)
 
-    if campaign_id in manager.encounter_states:
-        payload = build_encounter_payload(manager.encounter_states[campaign_id])
-        await websocket.send_json({"type": "encounter_update", "payload": payload})
+    actor = campaign_actors.get_or_start(campaign_id)
+    await actor.restored.wait() # A restarted worker picks the encounter up from its checkpoint first
+    if actor.encounter_state:
+        payload = build_encounter_payload(actor.encounter_state)
+        await manager.send(websocket, {"type": "encounter_update", "payload": payload})
+    if encounter_pools.get(campaign_id) is not None:
+        await manager.send(websocket, {"type": "monster_pool", "payload": encounter_pools.get(campaign_id).snapshot()})
+    if condition_tracker.snapshot(campaign_id):
+        await manager.send(websocket, {"type": "conditions", "payload": {"conditions": condition_tracker.snapshot(campaign_id)}})
 
     try:
         while True:
-            data = await websocket.receive_text()
-            message_data = json.loads(data)
+            try:
+                message_data = await ws_protocol.receive(websocket)
+            except ws_protocol.FrameError as e:
+                await manager.send(websocket, {"type": "error", "payload": str(e)})
+                continue
             message_data['sender'] = sender_name
 
             if message_data['type'] in ['chat', 'dice_roll']:
@@ -121,39 +122,54 @@ async def websocket_endpoint(
                     payload['rolls'] = rolls
                     payload['total'] = sum(rolls)
                 await manager.broadcast_json(message_data, campaign_id)
+                chat_writer.record(
+                    campaign_id=campaign_id, user_id=user.id, sender_name=sender_name,
+                    message_type=message_data['type'], payload=message_data.get('payload') or {}
+                )
+
+            elif message_data['type'] == 'movement_query':
+                # Hover previews: answer only the asking client, straight from the movement cache.
+                if not active_session:
+                    active_session = await crud_campaign_session.get_active_session_for_campaign(db, campaign_id=campaign_id)
+                if not active_session:
+                    await manager.send(websocket, {"type": "error", "payload": "No active session for this campaign."})
+                    continue
+                try:
+                    payload = message_data.get('payload', {})
+                    result = await crud_campaign_session.compute_token_movement(
+                        db, active_session, token_id=payload.get('token_id'), targets=payload.get('targets')
+                    )
+                    await manager.send(websocket, {"type": "movement_result", "payload": result.model_dump()})
+                except ValueError as e:
+                    await manager.send(websocket, {"type": "error", "payload": str(e)})
+
+            elif message_data['type'] == 'spend_resource':
+                # Players spend their own character's slots and uses; the DM any party member's.
+                payload = message_data.get('payload') or {}
+                try:
+                    character_id = int(payload['character_id'])
+                    # The cached sheet serves a run of spends; a missing or stale one goes through load,
+                    # which re-reads the counts and refreshes the maxima after a level-up.
+                    sheet = resource_ledger.fresh_sheet(character_id)
+                    if sheet is None:
+                        characters = await crud_character_resource.get_characters(db, character_ids=[character_id])
+                        if not characters:
+                            raise ValueError("Character not found.")
+                        sheet, = await resource_ledger.load(db, characters)
+                    if sheet.user_id != user.id:
+                        # Membership changes while the socket is open, so the DM's party is read now.
+                        if not is_dm or character_id not in await crud_campaign.get_active_party_character_ids(db, campaign_id=campaign_id):
+                            raise ValueError("Not authorized to spend this character's resources.")
+                    resource_ledger.spend(character_id, str(payload.get('resource', '')), int(payload.get('amount', 1)))
+                except (ValueError, KeyError, TypeError) as e:
+                    await manager.send(websocket, {"type": "error", "payload": str(e)})
+                    continue
+                await manager.broadcast_json({"type": "resource_update", "payload": {"resources": [sheet.state().model_dump()]}}, campaign_id)
 
             elif is_dm:
-                current_encounter = manager.encounter_states.get(campaign_id, {})
-                
-                if message_data['type'] == 'start_encounter':
-                    initiative_list = message_data.get('payload', [])
-                    sorted_list = sorted(initiative_list, key=lambda x: x.get('roll', 0), reverse=True)
-                    active_entry = sorted_list[0] if sorted_list else None
-                    
-                    # --- START FIX: Use 'initiative_entries' to match the frontend type ---
-                    current_encounter = {
-                        "is_active": True,
-                        "turn_index": 0,
-                        "initiative_entries": sorted_list,
-                        "active_initiative_entry_id": active_entry['id'] if active_entry else None
-                    }
-                    # --- END FIX ---
-                    manager.encounter_states[campaign_id] = current_encounter
-                    await manager.broadcast_json({"type": "encounter_update", "payload": current_encounter}, campaign_id)
-
-                elif message_data['type'] == 'next_turn':
-                    try:
-                        next_active_entry = await crud_campaign_session.advance_turn(db, session_id=active_session.id)
-                        await manager.broadcast_json({
-                            "type": "turn_update",
-                            "payload": {"active_entry_id": next_active_entry.id if next_active_entry else None}
-                        }, campaign_id)
-                    except Exception as e:
-                        await websocket.send_json({"type": "error", "payload": f"Failed to advance turn: {e}"})
-                
-                elif message_data['type'] == 'end_encounter':
-                    manager.encounter_states[campaign_id] = {"is_active": False, "order": [], "turn_index": -1, "active_entry_id": None}
-                    await manager.broadcast_json({"type": "encounter_update", "payload": manager.encounter_states[campaign_id]}, campaign_id)
+                # Encounter, turn, map and combat changes are run in order by the campaign's actor.
+                if not actor.submit(message_data['type'], message_data.get('payload') or {}, reply=partial(manager.send, websocket)):
+                    await manager.send(websocket, {"type": "error", "payload": "The campaign is busy; please retry."})
     
     except WebSocketDisconnect:
         pass
@@ -0,0 +1,16 @@
+# Path: api/app/schemas/bulk_import.py
+from pydantic import BaseModel
+from typing import List, Optional
+
+class BulkImportRowError(BaseModel):
+    line: int # Line (NDJSON) or record-ending line (CSV) in the uploaded file
+    name: Optional[str] = None
+    error: str
+
+class BulkImportReport(BaseModel):
+    rows: int
+    inserted: int
+    updated: int = 0
+    failed: int
+    errors: List[BulkImportRowError] # The first MAX_REPORTED_ERRORS of `failed`
+    errors_truncated: bool = False
@@ -77,6 +77,7 @@ class CampaignUpdate(BaseModel):
 class CampaignInDBBase(CampaignBase):
     id: int
     dm_user_id: int
+    version_id: int = 1 # Also sent as the ETag; echo it in If-Match to detect concurrent edits
     created_at: datetime
     updated_at: datetime
 
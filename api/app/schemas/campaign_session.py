@@ -18,6 +18,8 @@ class CampaignSessionUpdate(CampaignSessionBase):
 class CampaignSession(CampaignSessionBase):
     id: int
     campaign_id: int
+    active_initiative_entry_id: Optional[int] = None
+    version_id: int = 1 # Also sent as the ETag; echo it in If-Match to detect concurrent edits
     initiative_entries: List[InitiativeEntry] = []
 
     class Config:
@@ -0,0 +1,23 @@
+# Path: api/app/schemas/catalog_overlay.py
+from pydantic import BaseModel
+from typing import Optional, Dict, Any
+from datetime import datetime
+from app.models.campaign_catalog_entry import CatalogOverlayActionEnum
+
+class CatalogOverlayEntryCreate(BaseModel):
+    action: CatalogOverlayActionEnum
+    base_id: Optional[int] = None # Required for override and hide
+    data: Optional[Dict[str, Any]] = None # add: the whole entry; override: only the fields to change
+
+class CatalogOverlayEntry(BaseModel):
+    id: int
+    campaign_id: int
+    catalog: str
+    action: CatalogOverlayActionEnum
+    base_id: Optional[int] = None
+    data: Optional[Dict[str, Any]] = None
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
@@ -210,6 +210,7 @@ class CharacterUpdate(BaseModel):
 class CharacterInDBBase(CharacterBase):
     id: int
     user_id: int 
+    version_id: int = 1 # Also sent as the ETag; echo it in If-Match to detect concurrent edits
     created_at: datetime
     updated_at: datetime
     skills: List[CharacterSkillSchema] = []
@@ -1,6 +1,6 @@
 # Path: api/app/schemas/character_spell.py
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Optional, List
 
 # Import the base Spell schema for nesting in responses
 from .spell import Spell as SpellSchema # Assuming your Spell response schema is named Spell
@@ -27,6 +27,10 @@ class CharacterSpell(CharacterSpellBase): # For API responses
     class Config:
         from_attributes = True
 
-
-
-        
\ No newline at end of file
+class EligibleSpells(BaseModel): # What a character may pick right now (level-up or otherwise)
+    character_id: int
+    max_spell_level: int
+    cantrips_remaining: int
+    spells_remaining: Optional[int] = None # None: the class prepares spells instead of knowing a fixed number
+    cantrips: List[SpellSchema]
+    spells: List[SpellSchema]
@@ -0,0 +1,21 @@
+# Path: api/app/schemas/chat_message.py
+from pydantic import BaseModel
+from typing import Optional, List, Dict, Any
+from datetime import datetime
+
+class ChatMessage(BaseModel):
+    id: int
+    campaign_id: int
+    user_id: Optional[int] = None
+    sender_name: str
+    message_type: str
+    text: str
+    payload: Optional[Dict[str, Any]] = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class ChatHistoryPage(BaseModel):
+    messages: List[ChatMessage] = [] # Newest first
+    next_before_id: Optional[int] = None # Pass as before_id to get the next (older) page; null at the end
@@ -0,0 +1,42 @@
+# Path: api/app/schemas/combat.py
+from pydantic import BaseModel, Field
+from typing import Optional, List, Literal
+
+AbilityName = Literal["strength", "dexterity", "constitution", "intelligence", "wisdom", "charisma"]
+
+class SavingThrow(BaseModel):
+    ability: AbilityName
+    dc: int = Field(..., ge=1, le=40)
+    on_success: Literal["half", "none"] = "half" # Damage taken on a successful save
+
+class DamageTarget(BaseModel):
+    entry_id: int # Initiative entry of the character or monster
+    amount: Optional[int] = Field(None, ge=0, description="Overrides the application's amount for this target")
+
+class DamageApplication(BaseModel):
+    kind: Literal["damage", "healing"] = "damage"
+    amount: int = Field(..., ge=0)
+    damage_type: Optional[str] = Field(None, max_length=50, description="e.g. fire; checked against monster resistances, immunities and vulnerabilities")
+    save: Optional[SavingThrow] = None # Damage only
+    targets: List[DamageTarget] = Field(..., min_length=1, max_length=100)
+
+class SaveResult(BaseModel):
+    roll: int
+    total: int
+    success: bool
+
+class HitPointChange(BaseModel):
+    entry_id: int
+    character_id: Optional[int] = None
+    name: Optional[str] = None
+    amount: int # HP actually lost (negative) or gained (positive)
+    hit_points_current: Optional[int] = None
+    hit_points_max: Optional[int] = None
+    save: Optional[SaveResult] = None
+    modifier: Optional[Literal["immune", "resistant", "vulnerable"]] = None
+
+class HitPointUpdate(BaseModel):
+    session_id: int
+    kind: str
+    damage_type: Optional[str] = None
+    changes: List[HitPointChange]
@@ -0,0 +1,56 @@
+# Path: api/app/schemas/derived_stats.py
+from pydantic import BaseModel
+from typing import Optional, List, Dict
+
+class AbilityScoreDerived(BaseModel):
+    score: int
+    modifier: int
+
+class SavingThrowDerived(BaseModel):
+    bonus: int
+    proficient: bool
+
+class SkillDerived(BaseModel):
+    skill_id: int
+    name: str
+    ability: str
+    bonus: int
+    proficient: bool
+    expertise: bool
+
+class SpellcastingDerived(BaseModel):
+    ability: str
+    spell_save_dc: int
+    spell_attack_bonus: int
+
+class WeaponAttackDerived(BaseModel):
+    character_item_id: int
+    name: str
+    ability: str
+    attack_bonus: int
+    damage: Optional[str] = None
+    damage_bonus: int
+    is_equipped: bool
+
+class CarryingDerived(BaseModel):
+    carried_weight_lb: float
+    carrying_capacity_lb: float
+    encumbered: bool
+
+class DerivedStats(BaseModel):
+    character_id: int
+    name: str
+    level: int
+    proficiency_bonus: int
+    abilities: Dict[str, AbilityScoreDerived]
+    saving_throws: Dict[str, SavingThrowDerived]
+    skills: List[SkillDerived] = []
+    passive_perception: int
+    initiative: int
+    armor_class: int # Computed from equipped armor, shield and magic items
+    speed_ft: int
+    hit_points_current: Optional[int] = None
+    hit_points_max: Optional[int] = None
+    spellcasting: Optional[SpellcastingDerived] = None
+    attacks: List[WeaponAttackDerived] = []
+    carrying: CarryingDerived
@@ -6,6 +6,9 @@ class InitiativeEntryBase(BaseModel):
     initiative_roll: int
     character_id: Optional[int] = None
     monster_name: Optional[str] = None
+    monster_id: Optional[int] = None # Catalog monster; its name and hit points are used unless given
+    hit_points_current: Optional[int] = None
+    hit_points_max: Optional[int] = None
 
     @field_validator('monster_name')
     def character_or_monster(cls, v, values):
@@ -0,0 +1,19 @@
+# Path: api/app/schemas/job.py
+from pydantic import BaseModel
+from typing import Optional, Dict, Any
+from datetime import datetime
+
+class Job(BaseModel):
+    id: int
+    kind: str
+    status: str # queued, running, succeeded, failed
+    attempts: int
+    max_attempts: int
+    run_after: datetime
+    result: Optional[Dict[str, Any]] = None
+    last_error: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,36 @@
+# Path: api/app/schemas/movement.py
+from pydantic import BaseModel, Field
+from typing import Optional, List, Dict, Any
+
+class MovementQuery(BaseModel):
+    token_id: str = Field(..., description="Key of the token in map_state['tokens']")
+    targets: Optional[List[List[int]]] = Field(None, description="Optional [x, y] cells to return shortest paths for")
+
+class ReachableCell(BaseModel):
+    x: int
+    y: int
+    cost_ft: int
+
+class MovementPath(BaseModel):
+    target: List[int]
+    reachable: bool
+    cost_ft: Optional[int] = None
+    path: Optional[List[List[int]]] = None
+
+class MovementResult(BaseModel):
+    token_id: str
+    map_version: int
+    origin: List[int]
+    speed_ft: int
+    reachable: List[ReachableCell] = []
+    paths: List[MovementPath] = []
+
+class MapStatePatch(BaseModel):
+    # "terrain" and "tokens" are merged key by key (null removes an entry);
+    # any other top-level key replaces the stored value.
+    grid: Optional[Dict[str, Any]] = None
+    terrain: Optional[Dict[str, Any]] = None
+    tokens: Optional[Dict[str, Optional[Dict[str, Any]]]] = None
+
+    class Config:
+        extra = "allow"
@@ -0,0 +1,32 @@
+# Path: api/app/schemas/resources.py
+from pydantic import BaseModel, Field
+from typing import Optional, List, Literal
+
+class ResourceState(BaseModel):
+    resource: str # "spell_slot_1".."spell_slot_9", "pact_slot", "ki", "rage", ...
+    maximum: Optional[int] = None # None: unlimited
+    used: int
+    remaining: Optional[int] = None
+    recovery: Literal["short", "long"]
+
+class CharacterResources(BaseModel):
+    character_id: int
+    resources: List[ResourceState]
+
+class ResourceSpend(BaseModel):
+    resource: str = Field(..., max_length=50)
+    amount: int = Field(1, ge=-100, le=100, description="Uses to spend; negative to regain some (e.g. Arcane Recovery)")
+
+class RestRequest(BaseModel):
+    kind: Literal["short", "long"]
+    character_ids: Optional[List[int]] = Field(None, description="Defaults to every active party member's character")
+
+class RestedCharacter(BaseModel):
+    character_id: int
+    hit_points_current: Optional[int] = None
+    hit_dice_remaining: Optional[int] = None
+
+class RestResult(BaseModel):
+    kind: Literal["short", "long"]
+    resources: List[CharacterResources]
+    restored: List[RestedCharacter] = [] # Long rest only
@@ -0,0 +1,154 @@
+# Path: api/app/services/bulk_import.py
+# Bulk import of homebrew monsters and characters from NDJSON or CSV.
+#
+# Records are parsed lazily from a text stream, validated against the create schema a
+# chunk at a time and handed to the crud bulk functions, which commit once per chunk.
+# A bad row is reported with its line number and skipped; it never aborts the import,
+# and chunks already committed stay committed if a later one fails.
+#
+# Monsters go through asyncpg COPY into a staging table and a set-based merge
+# (crud_monster.bulk_merge_monsters). Characters need the per-row creation logic
+# (class hit die, saving throws, starting equipment...), so they are built in Python and
+# inserted with one batched flush per chunk instead.
+#
+# CSV cells that look like JSON arrays or objects are decoded (speed, senses, actions...);
+# empty cells are left out so schema defaults apply.
+import csv
+import io
+import json
+import tempfile
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Tuple, Type
+
+from pydantic import BaseModel, ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud import crud_character, crud_monster
+from app.schemas.character import CharacterCreate
+from app.schemas.monster import MonsterCreate
+
+IMPORT_FORMATS = ("ndjson", "csv")
+IMPORT_CHUNK_SIZE = 1000
+MAX_REPORTED_ERRORS = 1000
+
+# (line, parsed record or None, parse error or None)
+ParsedRecord = Tuple[int, Optional[Dict[str, Any]], Optional[str]]
+
+
+def _csv_value(raw: str) -> Any:
+    stripped = raw.strip()
+    if stripped[:1] in ("[", "{"):
+        try:
+            return json.loads(stripped)
+        except ValueError:
+            pass
+    return raw
+
+
+def iter_records(lines: Iterable[str], fmt: str) -> Iterator[ParsedRecord]:
+    if fmt == "ndjson":
+        for line_number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                yield line_number, None, f"Invalid JSON: {e}"
+                continue
+            if isinstance(record, dict):
+                yield line_number, record, None
+            else:
+                yield line_number, None, "Each line must be a JSON object."
+    elif fmt == "csv":
+        reader = csv.DictReader(lines)
+        for row in reader:
+            if None in row:
+                yield reader.line_num, None, "Row has more cells than the header."
+                continue
+            yield reader.line_num, {key: _csv_value(value) for key, value in row.items() if value not in (None, "")}, None
+    else:
+        raise ValueError(f"Unknown import format '{fmt}'; expected one of {', '.join(IMPORT_FORMATS)}.")
+
+
+def format_for(content_type_or_filename: Optional[str]) -> str:
+    """csv for text/csv or *.csv, otherwise ndjson."""
+    value = (content_type_or_filename or "").lower()
+    return "csv" if value.startswith("text/csv") or value.endswith(".csv") else "ndjson"
+
+
+async def spool_request_body(request) -> IO[str]:
+    """Writes an upload to a temporary file as it arrives and returns it rewound, as text."""
+    spool = tempfile.TemporaryFile()
+    async for chunk in request.stream():
+        spool.write(chunk)
+    spool.seek(0)
+    return io.TextIOWrapper(spool, encoding="utf-8-sig", newline="")
+
+
+def _validation_message(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in item['loc']) or 'row'}: {item['msg']}" for item in error.errors()
+    )
+
+
+class _Report:
+    def __init__(self):
+        self.rows = self.inserted = self.updated = self.failed = 0
+        self.errors: List[Dict[str, Any]] = []
+
+    def error(self, line: int, error: str, name: Optional[str] = None) -> None:
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line, "name": name, "error": error})
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "rows": self.rows, "inserted": self.inserted, "updated": self.updated, "failed": self.failed,
+            "errors": self.errors, "errors_truncated": self.failed > len(self.errors),
+        }
+
+
+def _validated_chunks(records: Iterable[ParsedRecord], schema: Type[BaseModel], report: _Report,
+                      chunk_size: int) -> Iterator[List[Tuple[int, BaseModel]]]:
+    chunk: List[Tuple[int, BaseModel]] = []
+    for line, record, parse_error in records:
+        report.rows += 1
+        if parse_error is not None:
+            report.error(line, parse_error)
+            continue
+        try:
+            chunk.append((line, schema.model_validate(record)))
+        except ValidationError as e:
+            report.error(line, _validation_message(e), name=record.get("name") if isinstance(record.get("name"), str) else None)
+            continue
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+async def import_monsters(db: AsyncSession, lines: Iterable[str], fmt: str, update_existing: bool = False,
+                          chunk_size: int = IMPORT_CHUNK_SIZE) -> Dict[str, Any]:
+    report = _Report()
+    for chunk in _validated_chunks(iter_records(lines, fmt), MonsterCreate, report, chunk_size):
+        merged = await crud_monster.bulk_merge_monsters(db, monsters_in=chunk, update_existing=update_existing)
+        report.inserted += merged["inserted"]
+        report.updated += merged["updated"]
+        for line, name, error in merged["errors"]:
+            report.error(line, error, name=name)
+    return report.as_dict()
+
+
+async def import_characters(db: AsyncSession, lines: Iterable[str], fmt: str, user_id: int,
+                            chunk_size: int = IMPORT_CHUNK_SIZE) -> Dict[str, Any]:
+    report = _Report()
+    dnd_classes: Dict[str, Any] = {}
+    for chunk in _validated_chunks(iter_records(lines, fmt), CharacterCreate, report, chunk_size):
+        names = {line: character_in.name for line, character_in in chunk}
+        created, errors = await crud_character.bulk_create_characters_for_user(
+            db, characters_in=chunk, user_id=user_id, dnd_classes=dnd_classes
+        )
+        report.inserted += created
+        for line, error in errors:
+            report.error(line, error, name=names[line])
+    return report.as_dict()
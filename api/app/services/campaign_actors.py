@@ -0,0 +1,636 @@
+# Path: api/app/services/campaign_actors.py
+# One asyncio task ("actor") per active campaign owns its realtime state.
+#
+# WebSocket receive loops don't change encounter, turn, map or combat state themselves:
+# they put a Command in the campaign actor's inbox and go back to reading. The HTTP map
+# and hit point routes do the same through call(), which waits for the command's result.
+# The actor takes commands one batch at a time (whatever is queued, up to
+# CAMPAIGN_ACTOR_MAX_BATCH) and runs them in order on its own database session, so two DM
+# tabs or a DM and an HTTP call can't interleave half-applied changes. Map patches in a
+# batch are merged in memory and written once at the end of it. Results are published to
+# the campaign; errors go back to the sender only.
+#
+# A handler is an async function (actor, batch, payload) -> messages to publish,
+# registered under a command type with @command("type"). Each actor keeps per-command
+# timings (see stats()), so one busy campaign can be spotted without profiling the rest.
+# Actors are per process, like the connections they serve.
+#
+# Checkpoints: once a batch has changed the encounter (commands registered with
+# checkpoint=True), the actor saves the initiative state, monster pool and active
+# conditions as one row in encounter_checkpoints, at most every
+# ENCOUNTER_CHECKPOINT_INTERVAL_SECONDS and once more when it retires, so a burst of
+# moves costs one write. The database increments the row's version and each write names
+# the version it expects. A mismatch means another worker wrote the campaign, as in a
+# rolling deploy where old and new workers both hold connections for a while: the actor
+# re-reads the row, and the actor that started last owns the campaign (each row records
+# its writer's start time). The owner takes the stored version over and writes again; an
+# older actor stops serving the campaign, answering further commands with a request to
+# reconnect, and the registry replaces it on the next connection. A new actor restores
+# the row before running its first command, so a deploy, crash or the last player
+# disconnecting loses at most one interval of a fight; ending the encounter deletes the row.
+import asyncio
+import time
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.exc import StaleDataError
+
+from app.core.config import settings
+from app.crud import crud_campaign_session, crud_catalog, crud_encounter_checkpoint
+from app.db.database import AsyncSessionLocal
+from app.models.campaign_session import CampaignSession
+from app.schemas.combat import DamageApplication, SavingThrow
+from app.schemas.movement import MapStatePatch
+from app.services import combat, movement
+from app.services.conditions import condition_tracker
+from app.services.encounter_pool import MonsterPool, encounter_pools
+
+Message = Dict[str, Any]
+Publisher = Callable[[Message, int], Awaitable[None]]
+Reply = Callable[[Message], Awaitable[None]]
+
+
+class ActorBusyError(Exception):
+    """The actor's inbox is full, or it retired before running the command; retrying may succeed."""
+
+
+class Command:
+    __slots__ = ("type", "payload", "reply", "enqueued_at", "future", "result", "deferred", "expected_version")
+
+    def __init__(self, command_type: str, payload: Dict[str, Any], reply: Optional[Reply] = None,
+                 future: Optional[asyncio.Future] = None, expected_version: Optional[int] = None):
+        self.type = command_type
+        self.payload = payload
+        self.reply = reply # Where errors go (the sender's socket)
+        self.enqueued_at = time.perf_counter()
+        self.future = future # Set by call(): resolved with the handler's result, or its exception
+        self.result: Any = None # What a handler hands back to call()
+        self.deferred = False # The future is resolved later in the batch (map patches, at the write)
+        self.expected_version = expected_version # If-Match version of the session, for map patches
+
+    def resolve(self, result: Any = None, error: Optional[BaseException] = None) -> None:
+        if self.future is None or self.future.done():
+            return
+        if error is not None:
+            self.future.set_exception(error)
+        else:
+            self.future.set_result(result)
+
+
+_RETIRE = Command("_retire", {})
+
+CommandHandler = Callable[["CampaignActor", "Batch", Dict[str, Any]], Awaitable[List[Message]]]
+
+COMMAND_HANDLERS: Dict[str, CommandHandler] = {}
+CHECKPOINTED_COMMANDS = set() # Command types that change state kept in the encounter checkpoint
+
+
+def command(*command_types: str, checkpoint: bool = False) -> Callable[[CommandHandler], CommandHandler]:
+    def register(handler: CommandHandler) -> CommandHandler:
+        for command_type in command_types:
+            COMMAND_HANDLERS[command_type] = handler
+            if checkpoint:
+                CHECKPOINTED_COMMANDS.add(command_type)
+        return handler
+    return register
+
+
+class Batch:
+    """What the commands of one batch share: the session and the not yet written map."""
+
+    def __init__(self, db: AsyncSession, actor: "CampaignActor"):
+        self.db = db
+        self.actor = actor
+        self.command: Optional[Command] = None
+        self._session: Optional[CampaignSession] = None
+        self._session_loaded = False
+        self.map_state: Optional[Dict[str, Any]] = None # Patched, unsaved map_state
+        self.map_commands: List[Command] = []
+        self.changed = False # A checkpointed command succeeded
+
+    async def session(self) -> CampaignSession:
+        if not self._session_loaded:
+            self._session = await crud_campaign_session.get_active_session_for_campaign(self.db, campaign_id=self.actor.campaign_id)
+            self._session_loaded = True
+        if self._session is None:
+            raise ValueError("No active session for this campaign.")
+        return self._session
+
+    async def rollback(self) -> None:
+        """Rolls back and forgets the loaded session row (rollback expires it)."""
+        await self.db.rollback()
+        self._session, self._session_loaded = None, False
+
+    async def current_map_state(self) -> Optional[Dict[str, Any]]:
+        if self.map_state is not None:
+            return self.map_state
+        try:
+            return (await self.session()).map_state
+        except ValueError:
+            return None
+
+
+class CampaignActor:
+    def __init__(self, campaign_id: int, publish: Publisher, inbox_size: int = 1000, max_batch: int = 50,
+                 previous: Optional["CampaignActor"] = None, checkpoint_interval_seconds: float = 2.0):
+        self.campaign_id = campaign_id
+        self.publish = publish
+        self.max_batch = max_batch
+        self.inbox: "asyncio.Queue[Command]" = asyncio.Queue(maxsize=inbox_size)
+        self.encounter_state: Dict[str, Any] = {}
+        self.checkpoint_interval_seconds = checkpoint_interval_seconds
+        self.checkpoint_version = 0 # Version of the stored row as this actor last saw it; 0: none
+        self.checkpoint_pending = False # Changed since the last checkpoint write
+        self.checkpoint_written_at = float("-inf")
+        self.checkpoint_writes = 0
+        self.checkpoint_conflicts = 0
+        self.started_at = time.time() # Wall clock, compared across workers to pick the campaign's owner
+        self.superseded = False # A newer actor on another worker owns the campaign
+        self.restored = asyncio.Event() # Set once the checkpoint (if any) is loaded
+        self._previous = previous # A retired actor for the campaign that may still be finishing
+        self._task: Optional[asyncio.Task] = None
+        # Profiling: per command type [count, total seconds, max seconds]; inbox wait and batch sizes.
+        self.timings: Dict[str, List[float]] = {}
+        self.batches = 0
+        self.max_batch_seen = 0
+        self.max_wait_seconds = 0.0
+        self.rejected = 0
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run(), name=f"campaign-actor-{self.campaign_id}")
+
+    def submit(self, command_type: str, payload: Dict[str, Any], reply: Optional[Reply] = None) -> bool:
+        """Queues a command; never blocks. False if the inbox is full (the command is dropped)."""
+        try:
+            self.inbox.put_nowait(Command(command_type, payload, reply))
+            return True
+        except asyncio.QueueFull:
+            self.rejected += 1
+            return False
+
+    async def call(self, command_type: str, payload: Dict[str, Any], expected_version: Optional[int] = None) -> Any:
+        """
+        Queues a command and waits for its result, for callers outside a socket (HTTP routes).
+        Re-raises the handler's exception; ActorBusyError if the command couldn't be queued or run.
+        """
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self.inbox.put_nowait(Command(command_type, payload, future=future, expected_version=expected_version))
+        except asyncio.QueueFull:
+            self.rejected += 1
+            raise ActorBusyError("The campaign is busy; please retry.")
+        return await future
+
+    def retire(self) -> None:
+        """Stops the actor once the commands already queued have run."""
+        try:
+            self.inbox.put_nowait(_RETIRE)
+        except asyncio.QueueFull:
+            if self._task is not None:
+                self._task.cancel()
+
+    async def stop(self) -> None:
+        self.retire()
+        if self._task is not None:
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _reply(self, cmd: Command, text: str) -> None:
+        if cmd.reply is not None:
+            try:
+                await cmd.reply({"type": "error", "payload": text})
+            except Exception:
+                pass # The sender has gone; nothing to tell
+
+    async def _run_command(self, batch: Batch, cmd: Command) -> None:
+        if self.superseded:
+            await self._reply(cmd, "This campaign is now run by another server; please reconnect.")
+            cmd.resolve(error=ActorBusyError("The campaign moved to another server; please retry."))
+            return
+        handler = COMMAND_HANDLERS.get(cmd.type)
+        if handler is None:
+            await self._reply(cmd, f"Unknown command '{cmd.type}'.")
+            return
+        started = time.perf_counter()
+        self.max_wait_seconds = max(self.max_wait_seconds, started - cmd.enqueued_at)
+        batch.command = cmd
+        try:
+            messages = await handler(self, batch, cmd.payload)
+            batch.changed = batch.changed or cmd.type in CHECKPOINTED_COMMANDS
+            if not cmd.deferred:
+                cmd.resolve(cmd.result)
+        except StaleDataError as e:
+            await batch.rollback()
+            await self._reply(cmd, "The record was changed concurrently; refresh and retry.")
+            cmd.resolve(error=e)
+            messages = []
+        except (ValidationError, ValueError, KeyError, TypeError) as e:
+            await batch.rollback()
+            await self._reply(cmd, str(e))
+            cmd.resolve(error=e)
+            messages = []
+        except Exception as e:
+            await batch.rollback()
+            await self._reply(cmd, f"Failed to run {cmd.type}: {e}")
+            cmd.resolve(error=e)
+            messages = []
+        for message in messages:
+            await self.publish(message, self.campaign_id)
+        elapsed = time.perf_counter() - started
+        timing = self.timings.setdefault(cmd.type, [0, 0.0, 0.0])
+        timing[0] += 1
+        timing[1] += elapsed
+        timing[2] = max(timing[2], elapsed)
+
+    async def _flush_map(self, batch: Batch) -> None:
+        """Writes the batch's merged map patches with one versioned UPDATE."""
+        if batch.map_state is None:
+            return
+        try:
+            session = await crud_campaign_session.save_map_state(batch.db, await batch.session(), batch.map_state)
+        except StaleDataError as e:
+            await batch.rollback()
+            for cmd in batch.map_commands:
+                await self._reply(cmd, "The map was changed concurrently; please retry.")
+                cmd.resolve(error=e)
+            return
+        for cmd in batch.map_commands:
+            cmd.resolve(session.version_id)
+        await self.publish({"type": "map_update", "payload": session.map_state}, self.campaign_id)
+
+    async def _restore(self) -> None:
+        """Loads the campaign's checkpoint into the encounter state, monster pool and condition tracker."""
+        try:
+            if self._previous is not None:
+                # Its final checkpoint write must land before this actor reads the row.
+                await self._previous.finished()
+                self._previous = None
+            # Anything a cancelled predecessor left behind is superseded by the checkpoint.
+            encounter_pools.drop(self.campaign_id)
+            condition_tracker.drop(self.campaign_id)
+            async with AsyncSessionLocal() as db:
+                checkpoint = await crud_encounter_checkpoint.get_checkpoint(db, campaign_id=self.campaign_id)
+            if checkpoint is None:
+                return
+            state = checkpoint.state or {}
+            self.checkpoint_version = checkpoint.version
+            self.encounter_state = state.get("encounter") or {}
+            if state.get("monster_pool"):
+                templates = {}
+                for monster_id in state["monster_pool"].get("template_ids", []):
+                    monster = await crud_catalog.monsters.get(monster_id)
+                    if monster is not None:
+                        templates[monster_id] = monster
+                encounter_pools.put(self.campaign_id, MonsterPool.from_checkpoint(state["monster_pool"], templates))
+            if state.get("conditions"):
+                elapsed = (datetime.now(timezone.utc) - checkpoint.updated_at).total_seconds()
+                condition_tracker.restore(self.campaign_id, state["conditions"], elapsed_seconds=max(elapsed, 0.0))
+            print(f"Campaign actor {self.campaign_id}: restored encounter checkpoint v{checkpoint.version}.")
+        except Exception as e:
+            print(f"Campaign actor {self.campaign_id}: could not restore checkpoint: {e}")
+        finally:
+            self.restored.set()
+
+    def _checkpoint_wait(self) -> Optional[float]:
+        """Seconds until a pending checkpoint is due; None when nothing is pending."""
+        if not self.checkpoint_pending:
+            return None
+        return max(self.checkpoint_written_at + self.checkpoint_interval_seconds - time.monotonic(), 0.0)
+
+    async def _checkpoint(self) -> None:
+        """Saves the pending encounter changes; a finished encounter deletes its row."""
+        self.checkpoint_pending = False
+        self.checkpoint_written_at = time.monotonic()
+        if self.superseded:
+            return
+        pool = encounter_pools.get(self.campaign_id)
+        conditions = condition_tracker.checkpoint(self.campaign_id)
+        try:
+            async with AsyncSessionLocal() as db:
+                for _attempt in range(2): # Once more after taking a conflicting row over
+                    if not self.encounter_state.get("is_active") and not pool and not conditions:
+                        if not self.checkpoint_version:
+                            return
+                        if await crud_encounter_checkpoint.delete_checkpoint(db, campaign_id=self.campaign_id, expected_version=self.checkpoint_version):
+                            self.checkpoint_version = 0
+                            return
+                    else:
+                        state = {
+                            "encounter": self.encounter_state,
+                            "monster_pool": pool.checkpoint() if pool else None,
+                            "conditions": conditions,
+                            "owner_started_at": self.started_at,
+                        }
+                        version = await crud_encounter_checkpoint.write_checkpoint(
+                            db, campaign_id=self.campaign_id, expected_version=self.checkpoint_version, state=state
+                        )
+                        if version is not None:
+                            self.checkpoint_version = version
+                            self.checkpoint_writes += 1
+                            return
+                    if not await self._checkpoint_conflict(db):
+                        return
+                self.checkpoint_pending = True # Written over again at the next interval
+        except Exception as e:
+            self.checkpoint_pending = True # Retried at the next interval
+            print(f"Campaign actor {self.campaign_id}: checkpoint failed: {e}")
+
+    async def _checkpoint_conflict(self, db: AsyncSession) -> bool:
+        """
+        Someone else wrote the row since checkpoint_version. Re-reads it: True if this actor
+        owns the campaign and took the stored version over, False if it stopped serving it.
+        """
+        self.checkpoint_conflicts += 1
+        stored = await crud_encounter_checkpoint.get_checkpoint(db, campaign_id=self.campaign_id)
+        owner_started_at = (stored.state or {}).get("owner_started_at", 0.0) if stored is not None else 0.0
+        if owner_started_at > self.started_at:
+            self.superseded = True
+            self.checkpoint_pending = False
+            print(f"Campaign actor {self.campaign_id}: encounter checkpoint v{stored.version} was written by a newer actor; "
+                  "this one stops serving the campaign.")
+            await self.publish({"type": "error", "payload": "This campaign is now run by another server; please reconnect."}, self.campaign_id)
+            return False
+        print(f"Campaign actor {self.campaign_id}: encounter checkpoint changed elsewhere since v{self.checkpoint_version}; "
+              f"taking over v{stored.version if stored is not None else 0}.")
+        self.checkpoint_version = stored.version if stored is not None else 0
+        return True
+
+    async def finished(self) -> None:
+        """Waits for the actor's task to end (after retire or stop)."""
+        if self._task is not None:
+            try:
+                await asyncio.shield(self._task)
+            except asyncio.CancelledError:
+                pass
+
+    async def _run(self) -> None:
+        await self._restore()
+        while True:
+            try:
+                first = await asyncio.wait_for(self.inbox.get(), timeout=self._checkpoint_wait())
+            except asyncio.TimeoutError:
+                await self._checkpoint()
+                continue
+            batch_commands = [first]
+            while len(batch_commands) < self.max_batch and not self.inbox.empty():
+                batch_commands.append(self.inbox.get_nowait())
+            retiring = any(cmd is _RETIRE for cmd in batch_commands)
+            self.batches += 1
+            self.max_batch_seen = max(self.max_batch_seen, len(batch_commands))
+            try:
+                async with AsyncSessionLocal() as db:
+                    batch = Batch(db, self)
+                    for cmd in batch_commands:
+                        if cmd is not _RETIRE:
+                            await self._run_command(batch, cmd)
+                    await self._flush_map(batch)
+                    self.checkpoint_pending = self.checkpoint_pending or batch.changed
+            except Exception as e:
+                print(f"Campaign actor {self.campaign_id}: batch failed: {e}")
+            for cmd in batch_commands: # A failed map write must not leave a caller waiting
+                cmd.resolve(error=RuntimeError(f"The campaign's {cmd.type} batch failed."))
+            if self.checkpoint_pending and (retiring or self._checkpoint_wait() == 0.0):
+                await self._checkpoint()
+            if retiring:
+                # Commands queued behind the retirement have no actor to run them.
+                while not self.inbox.empty():
+                    cmd = self.inbox.get_nowait()
+                    await self._reply(cmd, "The campaign was closing; please retry.")
+                    cmd.resolve(error=ActorBusyError("The campaign was closing; please retry."))
+                # The checkpoint keeps the encounter; a later actor restores it.
+                encounter_pools.drop(self.campaign_id)
+                condition_tracker.drop(self.campaign_id)
+                return
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "campaign_id": self.campaign_id,
+            "inbox": self.inbox.qsize(),
+            "batches": self.batches,
+            "max_batch": self.max_batch_seen,
+            "max_wait_ms": round(self.max_wait_seconds * 1000, 3),
+            "rejected": self.rejected,
+            "checkpoint_version": self.checkpoint_version,
+            "checkpoint_pending": self.checkpoint_pending,
+            "checkpoint_writes": self.checkpoint_writes,
+            "checkpoint_conflicts": self.checkpoint_conflicts,
+            "superseded": self.superseded,
+            "commands": {
+                command_type: {"count": count, "total_ms": round(total * 1000, 3), "max_ms": round(longest * 1000, 3)}
+                for command_type, (count, total, longest) in self.timings.items()
+            },
+        }
+
+
+class CampaignActors:
+    def __init__(self, inbox_size: int = 1000, max_batch: int = 50, checkpoint_interval_seconds: float = 2.0):
+        self.inbox_size = inbox_size
+        self.max_batch = max_batch
+        self.checkpoint_interval_seconds = checkpoint_interval_seconds
+        self.publish: Optional[Publisher] = None
+        self._actors: Dict[int, CampaignActor] = {}
+        self._retiring: Dict[int, CampaignActor] = {} # Retired, possibly still running their last batch
+
+    def get(self, campaign_id: int) -> Optional[CampaignActor]:
+        return self._actors.get(campaign_id)
+
+    def get_or_start(self, campaign_id: int) -> CampaignActor:
+        actor = self._actors.get(campaign_id)
+        if actor is not None and actor.superseded:
+            # A new connection takes the campaign back: the next actor restores the newer owner's row.
+            self.retire(campaign_id)
+            actor = None
+        if actor is None:
+            actor = self._actors[campaign_id] = CampaignActor(
+                campaign_id, self.publish, self.inbox_size, self.max_batch, previous=self._retiring.pop(campaign_id, None),
+                checkpoint_interval_seconds=self.checkpoint_interval_seconds
+            )
+            actor.start()
+        return actor
+
+    def retire(self, campaign_id: int) -> None:
+        """The campaign's last connection closed: its actor finishes what is queued and exits."""
+        actor = self._actors.pop(campaign_id, None)
+        if actor is not None:
+            actor.retire()
+            self._retiring[campaign_id] = actor
+            actor._task.add_done_callback(lambda _task: self._forget_retired(campaign_id, actor))
+
+    def _forget_retired(self, campaign_id: int, actor: CampaignActor) -> None:
+        if self._retiring.get(campaign_id) is actor:
+            del self._retiring[campaign_id]
+
+    def stats(self) -> List[Dict[str, Any]]:
+        return [actor.stats() for actor in self._actors.values()]
+
+    async def stop_all(self) -> None:
+        actors, self._actors = list(self._actors.values()), {}
+        for actor in actors:
+            await actor.stop()
+        for actor in list(self._retiring.values()):
+            await actor.finished()
+
+
+campaign_actors = CampaignActors(
+    inbox_size=settings.CAMPAIGN_INBOX_SIZE, max_batch=settings.CAMPAIGN_ACTOR_MAX_BATCH,
+    checkpoint_interval_seconds=settings.ENCOUNTER_CHECKPOINT_INTERVAL_SECONDS
+)
+
+
+def _submit_expiry(campaign_id: int, effect_ids: List[int]) -> bool:
+    actor = campaign_actors.get(campaign_id)
+    return actor is not None and actor.submit("expire_conditions", {"ids": effect_ids})
+
+
+condition_tracker.submit_expiry = _submit_expiry
+
+
+# --- Command handlers ---
+
+def build_encounter_payload(encounter_state: Dict[str, Any]) -> Dict[str, Any]:
+    """Safely builds the encounter payload for the frontend."""
+    if not encounter_state or not encounter_state.get('is_active'):
+        return {"is_active": False, "order": [], "active_entry_id": None}
+
+    # The order is already sorted when it's created
+    order_with_names = []
+    for entry in encounter_state.get('order', []):
+        order_with_names.append({
+            "id": entry.get('id'),
+            "name": entry.get('name', 'Unknown'),
+            "roll": entry.get('roll')
+        })
+
+    return {
+        "is_active": True,
+        "turn_index": encounter_state.get('turn_index', 0),
+        "order": order_with_names,
+        "active_entry_id": encounter_state.get('active_entry_id')
+    }
+
+
+@command("start_encounter", checkpoint=True)
+async def start_encounter(actor: CampaignActor, batch: Batch, payload: Any) -> List[Message]:
+    sorted_list = sorted(payload or [], key=lambda x: x.get('roll', 0), reverse=True)
+    active_entry = sorted_list[0] if sorted_list else None
+    actor.encounter_state = {
+        "is_active": True,
+        "turn_index": 0,
+        "initiative_entries": sorted_list,
+        "active_initiative_entry_id": active_entry['id'] if active_entry else None
+    }
+    return [{"type": "encounter_update", "payload": actor.encounter_state}]
+
+
+@command("next_turn", checkpoint=True)
+async def next_turn(actor: CampaignActor, batch: Batch, payload: Dict[str, Any]) -> List[Message]:
+    session = await batch.session()
+    next_active_entry = await crud_campaign_session.advance_turn(batch.db, session_id=session.id)
+    next_active_id = next_active_entry.id if next_active_entry else None
+    await actor.publish({"type": "turn_update", "payload": {"active_entry_id": next_active_id}}, actor.campaign_id)
+    # Expiries and turn triggers follow the turn change they belong to.
+    await condition_tracker.on_turn_advanced(actor.campaign_id, next_active_id)
+    return []
+
+
+@command("end_encounter", checkpoint=True)
+async def end_encounter(actor: CampaignActor, batch: Batch, payload: Dict[str, Any]) -> List[Message]:
+    encounter_pools.drop(actor.campaign_id)
+    condition_tracker.drop(actor.campaign_id)
+    actor.encounter_state = {"is_active": False, "order": [], "turn_index": -1, "active_entry_id": None}
+    return [{"type": "encounter_update", "payload": actor.encounter_state}]
+
+
+@command("map_patch")
+async def map_patch(actor: CampaignActor, batch: Batch, payload: Dict[str, Any]) -> List[Message]:
+    # Merged now, written once when the batch ends (Batch.map_state, CampaignActor._flush_map).
+    session = await batch.session() # No active session: the sender gets the error now, not at flush time
+    expected = batch.command.expected_version
+    if expected is not None and (session.version_id != expected or batch.map_state is not None):
+        raise StaleDataError(f"The map has been modified (current version {session.version_id}).")
+    # WebSocket patches get the same validation the HTTP route's MapStatePatch body does.
+    patch = MapStatePatch.model_validate(payload or {}).model_dump(exclude_unset=True)
+    batch.map_state = movement.apply_map_patch(await batch.current_map_state(), patch)
+    batch.map_commands.append(batch.command)
+    batch.command.deferred = True
+    return []
+
+
+@command("apply_hit_points")
+async def apply_hit_points(actor: CampaignActor, batch: Batch, payload: Dict[str, Any]) -> List[Message]:
+    session = await batch.session()
+    application = DamageApplication.model_validate(payload or {})
+    hp_update = await combat.apply_hit_point_changes(batch.db, session_id=session.id, application=application)
+    batch.command.result = hp_update
+    return [{"type": "hp_update", "payload": hp_update.model_dump()}]
+
+
+@command("spawn_monsters", "remove_monsters", "monster_area_effect", "monster_conditions", "move_monsters", checkpoint=True)
+async def monster_pool_command(actor: CampaignActor, batch: Batch, payload: Dict[str, Any]) -> List[Message]:
+    """Applies a DM's monster pool command and returns the message to broadcast."""
+    message_type = batch.command.type
+    campaign_id = actor.campaign_id
+    if message_type == "spawn_monsters":
+        monster = await crud_catalog.monsters.get(int(payload.get("monster_id", 0)))
+        if monster is None:
+            raise ValueError("Monster not found.")
+        count = int(payload.get("count", 1))
+        if not 1 <= count <= 500:
+            raise ValueError("count must be between 1 and 500.")
+        pool = encounter_pools.get_or_create(campaign_id)
+        pool.spawn(monster, count, positions=payload.get("positions"), roll_hp=bool(payload.get("roll_hp")))
+        return [{"type": "monster_pool", "payload": pool.snapshot()}]
+
+    pool = encounter_pools.get(campaign_id)
+    if pool is None:
+        raise ValueError("No monsters have been spawned in this encounter.")
+    if message_type == "remove_monsters":
+        pool.remove(payload.get("ids") or [])
+        return [{"type": "monster_pool", "payload": pool.snapshot()}]
+
+    if "center" in payload:
+        grid = (await batch.current_map_state() or {}).get("grid") or {}
+        cell_size_ft = float(grid.get("cell_size_ft", movement.DEFAULT_CELL_SIZE_FT)) or movement.DEFAULT_CELL_SIZE_FT
+        slots = pool.slots_in_radius(payload["center"], float(payload.get("radius_ft", 0)) / cell_size_ft)
+    else:
+        slots = pool.slots_for(payload.get("ids") or [])
+
+    if message_type == "monster_area_effect":
+        save = SavingThrow.model_validate(payload["save"]) if payload.get("save") else None
+        delta = pool.apply_hit_points(
+            slots, amount=int(payload.get("amount", 0)), kind=payload.get("kind", "damage"),
+            damage_type=payload.get("damage_type"), save=save
+        )
+    elif message_type == "monster_conditions":
+        delta = pool.set_condition(slots, payload.get("condition", ""), present=payload.get("present", True))
+    else:
+        delta = pool.move(slots, int(payload.get("dx", 0)), int(payload.get("dy", 0)))
+    return [{"type": "monster_pool_delta", "payload": {"op": message_type, **delta}}]
+
+
+@command("apply_condition", "remove_condition", "end_concentration", "expire_conditions", checkpoint=True)
+async def condition_command(actor: CampaignActor, batch: Batch, payload: Dict[str, Any]) -> List[Message]:
+    # The tracker publishes its own condition_* messages.
+    if batch.command.type == "apply_condition":
+        order_ids, active_entry_id = [], None
+        try:
+            session = await batch.session()
+        except ValueError:
+            session = None
+        if session is not None:
+            order_ids = [entry.id for entry in await crud_campaign_session.get_initiative_order(batch.db, session_id=session.id)]
+            active_entry_id = session.active_initiative_entry_id
+        await condition_tracker.apply(actor.campaign_id, payload, order_ids, active_entry_id)
+    elif batch.command.type == "remove_condition":
+        await condition_tracker.remove(actor.campaign_id, payload.get("ids") or [])
+    elif batch.command.type == "expire_conditions":
+        # Sent by the tracker's seconds clock; only effects that are really due end.
+        await condition_tracker.expire(actor.campaign_id, payload.get("ids") or [])
+    else:
+        await condition_tracker.end_concentration(actor.campaign_id, int(payload["source_entry_id"]))
+    return []
@@ -0,0 +1,197 @@
+# Path: api/app/services/catalog_overlays.py
+# Campaign homebrew on top of the global spell, item and monster catalogs.
+#
+# A campaign stores only its delta (campaign_catalog_entries): entries it adds, fields
+# it overrides on global entries and global entries it hides. Lookups inside a campaign
+# go through a CampaignCatalogView, which answers from the small delta first and falls
+# through to the shared crud_catalog cache; nothing copies the global catalog per
+# campaign. Deltas are cached per campaign and rebuilt when the campaign's overlay is
+# written (in this process), when the global catalogs change, or after
+# CATALOG_OVERLAY_CACHE_SECONDS (for writes made through other workers).
+#
+# Added entries get negative ids (-row id) so they can never collide with global ones.
+# The catalog tables' foreign keys only reach global rows, so homebrew entries can be
+# looked up and listed but not put in a character's inventory or spell list.
+import itertools
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Set, Type
+
+from fastapi import Request, Response
+from pydantic import BaseModel
+
+from app.core.compression import CatalogBlobCache
+from app.core.config import settings
+from app.core.responses import dump_json
+from app.crud import crud_catalog, crud_catalog_overlay
+from app.crud.crud_catalog import CatalogCache
+from app.db.database import ReadSessionLocal
+from app.models.campaign_catalog_entry import CatalogOverlayActionEnum
+from app.schemas.catalog_overlay import CatalogOverlayEntryCreate
+from app.schemas.item import Item as ItemSchema, ItemCreate
+from app.schemas.monster import Monster as MonsterSchema, MonsterCreate, MonsterPublic
+from app.schemas.spell import Spell as SpellSchema, SpellCreate
+
+
+def _field(entry: Any, name: str) -> Any:
+    return entry[name] if isinstance(entry, dict) else getattr(entry, name)
+
+
+class OverlayCatalog:
+    def __init__(self, cache: CatalogCache, schema: Type[BaseModel], create_schema: Type[BaseModel],
+                 public_schema: Type[BaseModel], sort_key: Callable[[Any], Any]):
+        self.cache = cache
+        self.schema = schema # Full entry, used to merge overrides
+        self.create_schema = create_schema # Validates added entries and merged overrides
+        self.public_schema = public_schema # What campaign listings return
+        self.sort_key = sort_key # Same order as the global listing
+
+
+CATALOGS: Dict[str, OverlayCatalog] = {
+    "spells": OverlayCatalog(crud_catalog.spells, SpellSchema, SpellCreate, SpellSchema,
+                             lambda entry: (_field(entry, "level"), _field(entry, "name"))),
+    "items": OverlayCatalog(crud_catalog.items, ItemSchema, ItemCreate, ItemSchema,
+                            lambda entry: _field(entry, "name")),
+    "monsters": OverlayCatalog(crud_catalog.monsters, MonsterSchema, MonsterCreate, MonsterPublic,
+                               lambda entry: _field(entry, "name")),
+}
+
+
+class _CatalogDelta:
+    def __init__(self):
+        self.added: Dict[int, Dict[str, Any]] = {} # -row id -> entry
+        self.overridden: Dict[int, Dict[str, Any]] = {} # global id -> merged entry
+        self.hidden: Set[int] = set()
+
+
+class CampaignCatalogView:
+    """One catalog as seen from inside a campaign. Entries are ORM rows or dicts; read them, don't modify them."""
+
+    def __init__(self, catalog: OverlayCatalog, delta: _CatalogDelta):
+        self.catalog = catalog
+        self.delta = delta
+
+    async def get(self, entry_id: int) -> Optional[Any]:
+        if entry_id < 0:
+            return self.delta.added.get(entry_id)
+        if entry_id in self.delta.hidden:
+            return None
+        if entry_id in self.delta.overridden:
+            return self.delta.overridden[entry_id]
+        return await self.catalog.cache.get(entry_id)
+
+    async def all(self) -> List[Any]:
+        delta = self.delta
+        entries: List[Any] = [
+            delta.overridden.get(entry.id, entry)
+            for entry in await self.catalog.cache.all() if entry.id not in delta.hidden
+        ]
+        entries.extend(delta.added.values())
+        entries.sort(key=self.catalog.sort_key)
+        return entries
+
+
+class CampaignOverlay:
+    _versions = itertools.count(1)
+
+    def __init__(self, catalog_version: int):
+        self.version = next(self._versions) # Identifies this build, for the response blob cache
+        self.catalog_version = catalog_version
+        self.loaded_at = time.monotonic()
+        self.deltas: Dict[str, _CatalogDelta] = {name: _CatalogDelta() for name in CATALOGS}
+
+    def view(self, catalog: str) -> CampaignCatalogView:
+        return CampaignCatalogView(CATALOGS[catalog], self.deltas[catalog])
+
+
+def _merge_override(catalog: OverlayCatalog, base: Any, changes: Dict[str, Any]) -> Dict[str, Any]:
+    return {**catalog.schema.model_validate(base, from_attributes=True).model_dump(mode="json"), **changes, "id": base.id}
+
+
+class CampaignOverlayCache:
+    def __init__(self, ttl_seconds: float = 30.0, max_campaigns: int = 512):
+        self.ttl_seconds = ttl_seconds
+        self.max_campaigns = max_campaigns
+        self._overlays: "OrderedDict[int, CampaignOverlay]" = OrderedDict()
+
+    async def _build(self, campaign_id: int) -> CampaignOverlay:
+        overlay = CampaignOverlay(await crud_catalog.current_version())
+        # Own session, like the global catalog cache: the result outlives the request.
+        async with ReadSessionLocal() as session:
+            entries = await crud_catalog_overlay.get_overlay_entries(session, campaign_id=campaign_id)
+        for entry in entries:
+            catalog, delta = CATALOGS.get(entry.catalog), overlay.deltas.get(entry.catalog)
+            if catalog is None:
+                continue
+            if entry.action == CatalogOverlayActionEnum.ADD.value:
+                delta.added[-entry.id] = {**(entry.data or {}), "id": -entry.id}
+            elif entry.action == CatalogOverlayActionEnum.HIDE.value:
+                delta.hidden.add(entry.base_id)
+            elif entry.action == CatalogOverlayActionEnum.OVERRIDE.value:
+                base = await catalog.cache.get(entry.base_id)
+                if base is not None: # The global entry may have been removed since
+                    delta.overridden[entry.base_id] = _merge_override(catalog, base, entry.data or {})
+        return overlay
+
+    async def get(self, campaign_id: int) -> CampaignOverlay:
+        overlay = self._overlays.get(campaign_id)
+        if (
+            overlay is None
+            or overlay.catalog_version != await crud_catalog.current_version()
+            or time.monotonic() - overlay.loaded_at > self.ttl_seconds
+        ):
+            overlay = await self._build(campaign_id)
+            self._overlays[campaign_id] = overlay
+            if len(self._overlays) > self.max_campaigns:
+                self._overlays.popitem(last=False)
+        self._overlays.move_to_end(campaign_id)
+        return overlay
+
+    def invalidate(self, campaign_id: int) -> None:
+        self._overlays.pop(campaign_id, None)
+
+
+overlay_cache = CampaignOverlayCache(ttl_seconds=settings.CATALOG_OVERLAY_CACHE_SECONDS)
+# Separate from the global catalog_blobs so campaign listings can't evict those.
+overlay_blobs = CatalogBlobCache(gzip_level=6, zstd_level=3, max_entries=256)
+
+
+async def campaign_catalog(campaign_id: int, catalog: str) -> CampaignCatalogView:
+    return (await overlay_cache.get(campaign_id)).view(catalog)
+
+
+async def list_response(request: Request, campaign_id: int, catalog: str) -> Response:
+    """The campaign's merged listing, serialized and compressed once per overlay build."""
+    overlay = await overlay_cache.get(campaign_id)
+
+    async def build() -> bytes:
+        return dump_json(await overlay.view(catalog).all(), CATALOGS[catalog].public_schema)
+    return await overlay_blobs.response(request, (campaign_id, catalog), (overlay.catalog_version, overlay.version), build)
+
+
+async def validate_overlay_entry(catalog: str, entry_in: CatalogOverlayEntryCreate) -> Optional[Dict[str, Any]]:
+    """Checks an overlay entry against the catalog and returns the data to store. Raises ValueError."""
+    spec = CATALOGS[catalog]
+    if entry_in.action == CatalogOverlayActionEnum.ADD:
+        if entry_in.base_id is not None:
+            raise ValueError("Added entries are new; leave base_id empty (use 'override' to change a global entry).")
+        if not entry_in.data:
+            raise ValueError("An added entry needs its data.")
+        return spec.create_schema.model_validate(entry_in.data).model_dump(mode="json")
+
+    if entry_in.base_id is None:
+        raise ValueError(f"'{entry_in.action.value}' needs the base_id of the global entry.")
+    base = await spec.cache.get(entry_in.base_id)
+    if base is None:
+        raise ValueError(f"No global {catalog} entry with id {entry_in.base_id}.")
+    if entry_in.action == CatalogOverlayActionEnum.HIDE:
+        return None
+
+    if not entry_in.data:
+        raise ValueError("An override needs the fields to change.")
+    unknown = set(entry_in.data) - set(spec.create_schema.model_fields)
+    if unknown:
+        raise ValueError(f"Unknown field(s) for {catalog}: {', '.join(sorted(unknown))}.")
+    merged = _merge_override(spec, base, entry_in.data)
+    validated = spec.create_schema.model_validate(merged).model_dump(mode="json")
+    return {name: validated[name] for name in entry_in.data}
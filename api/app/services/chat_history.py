@@ -0,0 +1,157 @@
+# Path: api/app/services/chat_history.py
+# Persists campaign chat and dice rolls without slowing the WebSocket loop.
+#
+# The socket handler calls chat_writer.record(), which only appends to an in-memory
+# queue. A background task drains the queue and writes whole batches with one
+# executemany, so a busy table costs one round trip per batch instead of one per
+# message. If the database falls behind and the queue fills, new messages are
+# dropped from history (they were still broadcast) rather than blocking players.
+#
+# Monthly partitions are created as writes need them. Expired ones are dropped at
+# startup only in development (settings.run_ddl_on_startup); in production run
+# `python -m app.cli prune-chat` from a scheduler instead of every worker doing DDL.
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.crud import crud_chat_message
+from app.db.database import AsyncSessionLocal
+
+PARTITION_MONTHS_AHEAD = 2 # Current month plus the next, so the rollover never finds a missing partition
+_STOP: Dict[str, Any] = {} # Queued by stop(): write the current batch and exit
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def message_text(message_type: str, payload: Dict[str, Any]) -> str:
+    """The searchable text of a chat message or dice roll."""
+    if message_type == "dice_roll":
+        rolls = payload.get("rolls") or []
+        return f"rolled {payload.get('count', len(rolls))}d{payload.get('sides', '?')}: {rolls} = {payload.get('total')}"
+    return str(payload.get("text") or "")
+
+
+class ChatHistoryWriter:
+    def __init__(self, batch_size: int = 200, flush_interval_seconds: float = 0.5, max_queue: int = 10000):
+        self.batch_size = batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self._queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue(maxsize=max_queue)
+        self._task: Optional[asyncio.Task] = None
+        self._partitions: Set[Tuple[int, int]] = set() # (year, month) partitions known to exist
+        self.dropped = 0
+
+    def record(self, *, campaign_id: int, user_id: Optional[int], sender_name: str,
+               message_type: str, payload: Dict[str, Any]) -> None:
+        """Queues one message for persistence. Never blocks and never raises."""
+        try:
+            self._queue.put_nowait({
+                "campaign_id": campaign_id,
+                "user_id": user_id,
+                "sender_name": sender_name[:255],
+                "message_type": message_type,
+                "text": message_text(message_type, payload),
+                "payload": payload,
+                "created_at": _utcnow(),
+            })
+        except asyncio.QueueFull:
+            self.dropped += 1
+            if self.dropped % 1000 == 1:
+                print(f"Chat history: queue full, {self.dropped} message(s) not persisted so far.")
+
+    async def _ensure_partitions(self, db, moments: List[datetime]) -> None:
+        missing = sorted({(m.year, m.month) for m in moments} - self._partitions)
+        if not missing:
+            return
+        year, month = missing[0]
+        start = datetime(year, month, 1, tzinfo=timezone.utc)
+        months = (missing[-1][0] - year) * 12 + missing[-1][1] - month + PARTITION_MONTHS_AHEAD
+        await crud_chat_message.ensure_partitions(db, start=start, months=months)
+        for offset in range(months):
+            month_index = year * 12 + month - 1 + offset
+            self._partitions.add((month_index // 12, month_index % 12 + 1))
+
+    async def _write(self, batch: List[Dict[str, Any]]) -> None:
+        try:
+            async with AsyncSessionLocal() as db:
+                await self._ensure_partitions(db, [message["created_at"] for message in batch])
+                await crud_chat_message.add_messages(db, messages=batch)
+        except Exception as e:
+            print(f"Chat history: failed to write {len(batch)} message(s): {e}")
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            batch = []
+            first = await self._queue.get()
+            if first is _STOP:
+                return
+            batch.append(first)
+            deadline = loop.time() + self.flush_interval_seconds
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    message = await asyncio.wait_for(self._queue.get(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    break
+                if message is _STOP:
+                    stopping = True
+                    break
+                batch.append(message)
+            await self._write(batch)
+
+    async def flush(self) -> None:
+        """Writes everything still queued (used at shutdown)."""
+        batch = []
+        while not self._queue.empty():
+            message = self._queue.get_nowait()
+            if message is _STOP:
+                continue
+            batch.append(message)
+            if len(batch) >= self.batch_size:
+                await self._write(batch)
+                batch = []
+        if batch:
+            await self._write(batch)
+
+    async def start(self) -> None:
+        if settings.run_ddl_on_startup:
+            async with AsyncSessionLocal() as db:
+                now = _utcnow()
+                await self._ensure_partitions(db, [now])
+                await prune_expired_partitions(db, now=now)
+        self._task = asyncio.create_task(self._run(), name="chat-history-writer")
+
+    async def stop(self) -> None:
+        """Lets the writer finish the batch it holds (a cancel would lose it), then writes the rest."""
+        if self._task is not None:
+            if not self._task.done():
+                await self._queue.put(_STOP) # Waits for room if the queue is full; the writer is draining it
+            try:
+                await self._task
+            except Exception as e:
+                print(f"Chat history: writer task failed: {e}")
+            self._task = None
+        await self.flush()
+
+
+async def prune_expired_partitions(db, now: Optional[datetime] = None) -> List[str]:
+    """Drops the monthly partitions older than CHAT_RETENTION_DAYS (0 keeps everything)."""
+    if settings.CHAT_RETENTION_DAYS <= 0:
+        return []
+    cutoff = (now or _utcnow()) - timedelta(days=settings.CHAT_RETENTION_DAYS)
+    dropped = await crud_chat_message.drop_partitions_before(db, before=cutoff)
+    if dropped:
+        print(f"Chat history: dropped expired partitions {', '.join(dropped)}.")
+    return dropped
+
+
+chat_writer = ChatHistoryWriter(
+    batch_size=settings.CHAT_WRITER_BATCH_SIZE,
+    flush_interval_seconds=settings.CHAT_WRITER_FLUSH_INTERVAL_SECONDS,
+)
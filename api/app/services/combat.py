@@ -0,0 +1,133 @@
+# Path: api/app/services/combat.py
+# Area damage and healing: one application, many targets, one transaction.
+#
+# The targets' saving throws are rolled together, their HP changes are computed in a
+# single pass, and crud_campaign_session.write_hit_points stores every character and
+# monster change with one executemany per table. Callers broadcast the returned
+# HitPointUpdate once, so clients see the whole fireball land at the same time.
+import random
+from typing import Any, List, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud import crud_campaign_session
+from app.schemas.combat import DamageApplication, HitPointChange, HitPointUpdate, SaveResult
+
+SAVE_ABBREVIATIONS = {
+    "strength": "STR", "dexterity": "DEX", "constitution": "CON",
+    "intelligence": "INT", "wisdom": "WIS", "charisma": "CHA",
+}
+
+
+def ability_modifier(score: Optional[int]) -> int:
+    return (score - 10) // 2 if score is not None else 0
+
+
+def proficiency_bonus(level: int) -> int:
+    return (max(level, 1) - 1) // 4 + 2
+
+
+def save_bonus(entry: Any, ability: str) -> int:
+    """A combatant's bonus to a saving throw: character sheet or monster stat block."""
+    if entry.character is not None:
+        character = entry.character
+        bonus = ability_modifier(getattr(character, ability))
+        if getattr(character, f"st_prof_{ability}", False):
+            bonus += proficiency_bonus(character.level)
+        return bonus
+    if entry.monster is not None:
+        return monster_save_bonus(entry.monster, ability)
+    return 0
+
+
+def monster_save_bonus(monster: Any, ability: str) -> int:
+    label = f"Saving Throw: {SAVE_ABBREVIATIONS[ability]}"
+    for proficiency in monster.proficiencies or []:
+        if (proficiency.get("proficiency") or {}).get("name") == label:
+            return int(proficiency.get("value") or 0)
+    return ability_modifier(getattr(monster, ability))
+
+
+def _mentions(damage_type: str, entries: Optional[List[str]]) -> bool:
+    # Stat blocks say things like "bludgeoning, piercing, and slashing from nonmagical attacks".
+    return any(damage_type in str(entry).lower() for entry in entries or [])
+
+
+def damage_modifier(entry: Any, damage_type: Optional[str]) -> Tuple[float, Optional[str]]:
+    """(multiplier, label) from the entry's monster's immunities, resistances and vulnerabilities."""
+    return monster_damage_modifier(entry.monster, damage_type)
+
+
+def monster_damage_modifier(monster: Any, damage_type: Optional[str]) -> Tuple[float, Optional[str]]:
+    if monster is None or not damage_type:
+        return 1.0, None
+    damage_type = damage_type.lower()
+    if _mentions(damage_type, monster.damage_immunities):
+        return 0.0, "immune"
+    resistant = _mentions(damage_type, monster.damage_resistances)
+    vulnerable = _mentions(damage_type, monster.damage_vulnerabilities)
+    if resistant and not vulnerable:
+        return 0.5, "resistant"
+    if vulnerable and not resistant:
+        return 2.0, "vulnerable"
+    return 1.0, None
+
+
+def roll_saves(bonuses: List[int], dc: int) -> List[SaveResult]:
+    rolls = [random.randint(1, 20) for _ in bonuses]
+    return [SaveResult(roll=roll, total=roll + bonus, success=roll + bonus >= dc) for roll, bonus in zip(rolls, bonuses)]
+
+
+async def apply_hit_point_changes(db: AsyncSession, session_id: int, application: DamageApplication) -> HitPointUpdate:
+    """
+    Applies damage or healing to every target at once. Raises ValueError for unknown targets
+    and for a combatant (or character) listed twice, whose changes would otherwise overwrite each other.
+    """
+    entry_ids = [target.entry_id for target in application.targets]
+    repeated = sorted({entry_id for entry_id in entry_ids if entry_ids.count(entry_id) > 1})
+    if repeated:
+        raise ValueError(f"Targets listed more than once: {repeated}.")
+    entries = await crud_campaign_session.get_combatants_for_update(db, session_id=session_id, entry_ids=entry_ids)
+    missing = set(entry_ids) - entries.keys()
+    if missing:
+        raise ValueError(f"Not in this session's initiative: {sorted(missing)}.")
+    character_ids = [entry.character_id for entry in entries.values() if entry.character_id is not None]
+    if len(character_ids) != len(set(character_ids)):
+        raise ValueError("A character is targeted through more than one initiative entry.")
+
+    targets = [(target, entries[target.entry_id]) for target in application.targets]
+    saves: List[Optional[SaveResult]] = [None] * len(targets)
+    if application.kind == "damage" and application.save is not None:
+        saves = roll_saves([save_bonus(entry, application.save.ability) for _, entry in targets], application.save.dc)
+
+    character_hp, entry_hp, changes = {}, {}, []
+    for (target, entry), save in zip(targets, saves):
+        amount = application.amount if target.amount is None else target.amount
+        modifier = None
+        if application.kind == "damage":
+            if save is not None and save.success:
+                amount = amount // 2 if application.save.on_success == "half" else 0
+            multiplier, modifier = damage_modifier(entry, application.damage_type)
+            amount = int(amount * multiplier)
+
+        holder = entry.character if entry.character is not None else entry
+        current, maximum = holder.hit_points_current, holder.hit_points_max
+        if current is None:
+            current = maximum or 0
+        if application.kind == "damage":
+            new_current = max(current - amount, 0)
+        else:
+            new_current = current + amount if maximum is None else min(current + amount, maximum)
+        if entry.character is not None:
+            character_hp[entry.character.id] = (new_current, current == 0 and new_current > 0)
+        else:
+            entry_hp[entry.id] = new_current
+        changes.append(HitPointChange(
+            entry_id=entry.id, character_id=entry.character_id,
+            name=entry.character.name if entry.character is not None else entry.monster_name,
+            amount=new_current - current, hit_points_current=new_current, hit_points_max=maximum,
+            save=save, modifier=modifier
+        ))
+
+    await crud_campaign_session.write_hit_points(db, character_hp=character_hp, entry_hp=entry_hp)
+    return HitPointUpdate(session_id=session_id, kind=application.kind, damage_type=application.damage_type, changes=changes)
@@ -0,0 +1,384 @@
+# Path: api/app/services/conditions.py
+# Active conditions on combatants and characters, with expiry and turn triggers.
+#
+# An effect (a catalog condition on one target) can last a number of rounds, a number
+# of seconds, or until removed. Round durations become a number of initiative turns and
+# go on the campaign's turn wheel, which advances one tick per turn; second durations go
+# on a shared wheel ticked once a second. Either way expiry costs O(effects due), not a
+# scan of every combatant (see timing_wheel.py). Start/end-of-turn triggers are indexed
+# by target, so a turn change only looks at the two combatants whose turns changed.
+#
+# Concentration effects are linked to their source combatant: a new concentration effect,
+# an incapacitating condition on the source, or end_concentration ends all of them.
+#
+# Targets are "entry:<initiative entry id>", "pool:<monster pool instance id>" or
+# "character:<id>" (outside combat; second durations only). State is per process and in
+# memory, like the encounter state, and is dropped with it; the campaign actor checkpoints
+# it (checkpoint/restore) along with the rest of the encounter. Every change runs inside the
+# campaign's actor: the seconds clock doesn't end effects itself but hands what came due to
+# `submit_expiry` (campaign_actors queues an expire_conditions command), so expiries are
+# ordered with the DM's commands and mark the encounter for checkpointing. Changes are
+# pushed through `publish` (the campaign WebSocket broadcast).
+import asyncio
+import itertools
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from app.services.encounter_pool import CONDITION_BITS, encounter_pools
+from app.services.timing_wheel import Timer, TimingWheel
+
+TURN_TRIGGERS = ("start_of_turn", "end_of_turn")
+TARGET_KINDS = ("entry", "pool", "character")
+# Conditions that end the affected creature's concentration (each includes incapacitated).
+INCAPACITATING = {"incapacitated", "paralyzed", "petrified", "stunned", "unconscious"}
+
+Publisher = Callable[[Dict[str, Any], int], Awaitable[None]]
+ExpirySubmitter = Callable[[int, List[int]], bool] # (campaign_id, effect ids) -> queued?
+
+
+class ActiveCondition:
+    __slots__ = ("id", "campaign_id", "condition", "target", "source_entry_id", "concentration",
+                 "expires", "triggers", "timer")
+
+    def __init__(self, effect_id: int, campaign_id: int, condition: str, target: str, source_entry_id: Optional[int],
+                 concentration: bool, expires: Optional[Dict[str, Any]], triggers: List[Dict[str, Any]]):
+        self.id = effect_id
+        self.campaign_id = campaign_id
+        self.condition = condition
+        self.target = target
+        self.source_entry_id = source_entry_id
+        self.concentration = concentration
+        self.expires = expires # As requested, e.g. {"rounds": 1, "ends": "end_of_turn", "anchor_entry_id": 4}
+        self.triggers = triggers # [{"when": "end_of_turn", "note": "WIS save DC 15 to end"}]
+        self.timer: Optional[Timer] = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id, "condition": self.condition, "target": self.target,
+            "source_entry_id": self.source_entry_id, "concentration": self.concentration,
+            "expires": self.expires, "triggers": self.triggers,
+        }
+
+
+class CampaignConditions:
+    def __init__(self):
+        self.turn_wheel = TimingWheel(slots=32, levels=3)
+        self.effects: Dict[int, ActiveCondition] = {}
+        self.by_target: Dict[str, Set[int]] = {}
+        self.by_concentration: Dict[int, Set[int]] = {} # source entry id -> effect ids
+        self.active_entry_id: Optional[int] = None
+
+
+def _as_int(value: Any, name: str) -> int:
+    if isinstance(value, bool):
+        raise ValueError(f"{name} must be an integer.")
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} must be an integer.")
+
+
+def parse_target(target: Dict[str, Any]) -> str:
+    if not isinstance(target, dict):
+        raise ValueError("Each target must be an object with an entry_id, pool_id or character_id.")
+    for kind in TARGET_KINDS:
+        if target.get(f"{kind}_id") is not None:
+            return f"{kind}:{_as_int(target[f'{kind}_id'], f'{kind}_id')}"
+    raise ValueError("Each target needs an entry_id, pool_id or character_id.")
+
+
+def turns_until(order_ids: List[int], active_entry_id: Optional[int], anchor_entry_id: int,
+                rounds: int, ends: str) -> int:
+    """Turn advances until the start or end of the anchor's turn, `rounds` turns of it from now."""
+    if anchor_entry_id not in order_ids:
+        raise ValueError(f"Initiative entry {anchor_entry_id} is not in the initiative order.")
+    count = len(order_ids)
+    anchor = order_ids.index(anchor_entry_id)
+    if active_entry_id == anchor_entry_id:
+        to_start, to_end = count, 1 # Its current turn has already started
+    else:
+        current = order_ids.index(active_entry_id) if active_entry_id in order_ids else -1
+        to_start = (anchor - current) % count if current >= 0 else anchor + 1
+        to_end = to_start + 1
+    return (to_start if ends == "start_of_turn" else to_end) + (rounds - 1) * count
+
+
+class ConditionTracker:
+    def __init__(self, publish: Optional[Publisher] = None, submit_expiry: Optional[ExpirySubmitter] = None):
+        self.publish = publish
+        self.submit_expiry = submit_expiry
+        self.clock = TimingWheel(slots=64, levels=4) # One tick per second, shared by all campaigns
+        self._campaigns: Dict[int, CampaignConditions] = {}
+        self._ids = itertools.count(1)
+        self._started_at = time.monotonic()
+        self._task: Optional[asyncio.Task] = None
+
+    def _state(self, campaign_id: int) -> CampaignConditions:
+        state = self._campaigns.get(campaign_id)
+        if state is None:
+            state = self._campaigns[campaign_id] = CampaignConditions()
+        return state
+
+    async def _publish(self, campaign_id: int, message: Dict[str, Any]) -> None:
+        if self.publish is not None:
+            await self.publish(message, campaign_id)
+
+    def snapshot(self, campaign_id: int) -> List[Dict[str, Any]]:
+        state = self._campaigns.get(campaign_id)
+        return [effect.as_dict() for effect in state.effects.values()] if state else []
+
+    def drop(self, campaign_id: int) -> None:
+        state = self._campaigns.pop(campaign_id, None)
+        if state:
+            for effect in state.effects.values():
+                if effect.timer is not None:
+                    effect.timer.cancel()
+
+    def checkpoint(self, campaign_id: int) -> Optional[Dict[str, Any]]:
+        """The campaign's effects with the turns or seconds each has left, for an encounter checkpoint."""
+        state = self._campaigns.get(campaign_id)
+        if not state or not state.effects:
+            return None
+        effects = []
+        for effect in state.effects.values():
+            saved = effect.as_dict()
+            if effect.timer is not None:
+                wheel = self.clock if isinstance(effect.timer.item, tuple) else state.turn_wheel
+                saved["remaining"] = effect.timer.deadline - wheel.now
+                saved["remaining_unit"] = "seconds" if wheel is self.clock else "turns"
+            effects.append(saved)
+        return {"active_entry_id": state.active_entry_id, "effects": effects}
+
+    def restore(self, campaign_id: int, data: Dict[str, Any], elapsed_seconds: float = 0.0) -> None:
+        """
+        Replaces the campaign's effects with checkpointed ones. Second durations lose the time
+        the checkpoint sat in the database (anything overdue expires on the next tick); turn
+        durations resume where they were. Pool condition bits come back with the pool itself.
+        """
+        self.drop(campaign_id)
+        effects = data.get("effects") or []
+        if not effects:
+            return
+        state = self._state(campaign_id)
+        state.active_entry_id = data.get("active_entry_id")
+        # Effect ids are per process: keep new ones clear of the restored ids.
+        self._ids = itertools.count(max(next(self._ids), max(int(saved["id"]) for saved in effects) + 1))
+        for saved in effects:
+            effect = ActiveCondition(int(saved["id"]), campaign_id, saved["condition"], saved["target"],
+                                     saved.get("source_entry_id"), bool(saved.get("concentration")),
+                                     saved.get("expires"), saved.get("triggers") or [])
+            if saved.get("remaining_unit") == "turns":
+                effect.timer = state.turn_wheel.schedule(int(saved["remaining"]), effect.id)
+            elif saved.get("remaining_unit") == "seconds":
+                effect.timer = self.clock.schedule(int(saved["remaining"] - elapsed_seconds), (campaign_id, effect.id))
+            self._add(state, effect)
+
+    def _sync_pool_bit(self, state: CampaignConditions, campaign_id: int, target: str, condition: str) -> Optional[Dict[str, Any]]:
+        """Keeps a monster pool instance's condition bit in step with its effects."""
+        kind, _, target_id = target.partition(":")
+        pool = encounter_pools.get(campaign_id)
+        if kind != "pool" or pool is None or condition not in CONDITION_BITS:
+            return None
+        present = any(state.effects[effect_id].condition == condition for effect_id in state.by_target.get(target, ()))
+        return pool.set_condition(pool.slots_for([int(target_id)]), condition, present=present)
+
+    def _add(self, state: CampaignConditions, effect: ActiveCondition) -> None:
+        state.effects[effect.id] = effect
+        state.by_target.setdefault(effect.target, set()).add(effect.id)
+        if effect.concentration and effect.source_entry_id is not None:
+            state.by_concentration.setdefault(effect.source_entry_id, set()).add(effect.id)
+
+    def _discard(self, state: CampaignConditions, effect_id: int) -> Optional[ActiveCondition]:
+        effect = state.effects.pop(effect_id, None)
+        if effect is None:
+            return None
+        if effect.timer is not None:
+            effect.timer.cancel()
+        state.by_target.get(effect.target, set()).discard(effect_id)
+        if effect.concentration and effect.source_entry_id is not None:
+            state.by_concentration.get(effect.source_entry_id, set()).discard(effect_id)
+        return effect
+
+    async def _end(self, campaign_id: int, effect_ids: List[int], reason: str) -> List[Dict[str, Any]]:
+        state = self._campaigns.get(campaign_id)
+        if state is None:
+            return []
+        ended, pool_deltas = [], []
+        pending = list(effect_ids)
+        while pending:
+            effect = self._discard(state, pending.pop())
+            if effect is None:
+                continue
+            ended.append({**effect.as_dict(), "reason": reason})
+            delta = self._sync_pool_bit(state, campaign_id, effect.target, effect.condition)
+            if delta:
+                pool_deltas.append(delta)
+        if ended:
+            await self._publish(campaign_id, {"type": "condition_expired", "payload": {"conditions": ended}})
+        for delta in pool_deltas:
+            await self._publish(campaign_id, {"type": "monster_pool_delta", "payload": {"op": "monster_conditions", **delta}})
+        return ended
+
+    async def apply(self, campaign_id: int, payload: Dict[str, Any], order_ids: List[int],
+                    active_entry_id: Optional[int]) -> List[Dict[str, Any]]:
+        """
+        Applies one condition to every target in the payload. Everything (targets, triggers,
+        duration, each target's expiry) is parsed first: malformed input raises ValueError
+        before any effect is added or any concentration is ended.
+        """
+        if not isinstance(payload, dict):
+            raise ValueError("The payload must be an object.")
+        condition = str(payload.get("condition", "")).lower()
+        if condition not in CONDITION_BITS:
+            raise ValueError(f"Unknown condition '{payload.get('condition')}'.")
+        raw_targets = payload.get("targets") or []
+        if not isinstance(raw_targets, list):
+            raise ValueError("targets must be a list.")
+        targets = [parse_target(target) for target in raw_targets]
+        if not targets:
+            raise ValueError("No targets given.")
+        source_entry_id = payload.get("source_entry_id")
+        if source_entry_id is not None:
+            source_entry_id = _as_int(source_entry_id, "source_entry_id")
+        concentration = bool(payload.get("concentration"))
+        if concentration and source_entry_id is None:
+            raise ValueError("A concentration effect needs its source_entry_id.")
+        triggers = payload.get("triggers") or []
+        if not isinstance(triggers, list) or not all(isinstance(trigger, dict) for trigger in triggers):
+            raise ValueError("triggers must be a list of objects.")
+        if any(trigger.get("when") not in TURN_TRIGGERS for trigger in triggers):
+            raise ValueError(f"Trigger 'when' must be one of {', '.join(TURN_TRIGGERS)}.")
+
+        duration = payload.get("duration") or {}
+        if not isinstance(duration, dict):
+            raise ValueError("duration must be an object.")
+        rounds, seconds = duration.get("rounds"), duration.get("seconds")
+        rounds = None if rounds is None else max(_as_int(rounds, "duration.rounds"), 1)
+        seconds = None if seconds is None else max(_as_int(seconds, "duration.seconds"), 1)
+        anchor_entry_id = duration.get("anchor_entry_id")
+        if anchor_entry_id is not None:
+            anchor_entry_id = _as_int(anchor_entry_id, "duration.anchor_entry_id")
+        ends = duration.get("ends", "end_of_turn")
+        if ends not in TURN_TRIGGERS:
+            raise ValueError(f"Duration 'ends' must be one of {', '.join(TURN_TRIGGERS)}.")
+        if rounds is not None and any(not target.startswith("entry:") for target in targets) and anchor_entry_id is None:
+            raise ValueError("Round durations on targets outside initiative need an anchor_entry_id.")
+        if rounds is not None and not order_ids:
+            raise ValueError("Round durations need an initiative order.")
+        delays: List[Optional[int]] = [None] * len(targets)
+        if rounds is not None:
+            delays = [turns_until(order_ids, active_entry_id, anchor_entry_id if anchor_entry_id is not None else int(target.partition(":")[2]), rounds, ends)
+                      for target in targets]
+
+        state = self._state(campaign_id)
+        state.active_entry_id = active_entry_id
+        if concentration:
+            await self._end(campaign_id, list(state.by_concentration.get(source_entry_id, ())), "concentration_ended")
+
+        applied, pool_deltas = [], []
+        for target, delay in zip(targets, delays):
+            effect = ActiveCondition(next(self._ids), campaign_id, condition, target, source_entry_id,
+                                     concentration, duration or None, triggers)
+            if delay is not None:
+                effect.timer = state.turn_wheel.schedule(delay, effect.id)
+            elif seconds is not None:
+                effect.timer = self.clock.schedule(seconds, (campaign_id, effect.id))
+            self._add(state, effect)
+            applied.append(effect.as_dict())
+            delta = self._sync_pool_bit(state, campaign_id, target, condition)
+            if delta:
+                pool_deltas.append(delta)
+
+        await self._publish(campaign_id, {"type": "condition_applied", "payload": {"conditions": applied}})
+        for delta in pool_deltas:
+            await self._publish(campaign_id, {"type": "monster_pool_delta", "payload": {"op": "monster_conditions", **delta}})
+        if condition in INCAPACITATING:
+            # An incapacitated combatant can't keep concentrating.
+            for target in targets:
+                kind, _, target_id = target.partition(":")
+                if kind == "entry":
+                    await self.end_concentration(campaign_id, int(target_id))
+        return applied
+
+    async def expire(self, campaign_id: int, effect_ids: List[Any]) -> List[Dict[str, Any]]:
+        """Ends the given effects whose seconds timer has come due; others are left alone."""
+        if not isinstance(effect_ids, list):
+            raise ValueError("ids must be a list.")
+        effect_ids = [_as_int(effect_id, "ids") for effect_id in effect_ids]
+        state = self._campaigns.get(campaign_id)
+        if state is None:
+            return []
+        due = []
+        for effect_id in effect_ids:
+            effect = state.effects.get(effect_id)
+            if effect is not None and effect.timer is not None and isinstance(effect.timer.item, tuple) \
+                    and effect.timer.deadline <= self.clock.now:
+                due.append(effect_id)
+        return await self._end(campaign_id, due, "expired")
+
+    async def remove(self, campaign_id: int, effect_ids: List[int]) -> List[Dict[str, Any]]:
+        return await self._end(campaign_id, [int(effect_id) for effect_id in effect_ids], "removed")
+
+    async def end_concentration(self, campaign_id: int, source_entry_id: int) -> List[Dict[str, Any]]:
+        state = self._campaigns.get(campaign_id)
+        if state is None:
+            return []
+        return await self._end(campaign_id, list(state.by_concentration.get(source_entry_id, ())), "concentration_ended")
+
+    async def on_turn_advanced(self, campaign_id: int, new_active_entry_id: Optional[int]) -> None:
+        """One turn passed: expire what came due and fire the two combatants' turn triggers."""
+        state = self._campaigns.get(campaign_id)
+        if state is None:
+            return
+        previous_entry_id, state.active_entry_id = state.active_entry_id, new_active_entry_id
+        await self._end(campaign_id, state.turn_wheel.advance(1), "expired")
+
+        fired = []
+        for entry_id, when in ((previous_entry_id, "end_of_turn"), (new_active_entry_id, "start_of_turn")):
+            if entry_id is None:
+                continue
+            for effect_id in state.by_target.get(f"entry:{entry_id}", ()):
+                effect = state.effects[effect_id]
+                fired.extend({**trigger, "effect": effect.as_dict()} for trigger in effect.triggers if trigger.get("when") == when)
+        if fired:
+            await self._publish(campaign_id, {"type": "condition_trigger", "payload": {"triggers": fired}})
+
+    def _tick_seconds(self) -> None:
+        """Advances the clock and sends each campaign's due effects to its actor."""
+        due: List[Tuple[int, int]] = self.clock.advance(int(time.monotonic() - self._started_at) - self.clock.now)
+        by_campaign: Dict[int, List[int]] = {}
+        for campaign_id, effect_id in due:
+            by_campaign.setdefault(campaign_id, []).append(effect_id)
+        for campaign_id, effect_ids in by_campaign.items():
+            if self.submit_expiry is not None and self.submit_expiry(campaign_id, effect_ids):
+                continue
+            # No actor took them (inbox full, or between actors): try again next second.
+            state = self._campaigns.get(campaign_id)
+            for effect_id in effect_ids:
+                effect = state.effects.get(effect_id) if state else None
+                if effect is not None:
+                    effect.timer = self.clock.schedule(1, (campaign_id, effect_id))
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(1.0)
+            try:
+                self._tick_seconds()
+            except Exception as e:
+                print(f"Condition tracker error: {e}")
+
+    async def start(self) -> None:
+        self._started_at = time.monotonic() - self.clock.now
+        self._task = asyncio.create_task(self._run(), name="condition-tracker")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+condition_tracker = ConditionTracker()
@@ -0,0 +1,241 @@
+# Path: api/app/services/derived_stats.py
+# Derived character sheet: modifiers, saves, skills, passive perception, spellcasting,
+# weapon attacks, AC and carried weight, computed from the stored character and the
+# cached class/race/skill catalogs.
+#
+# compute_derived_stats() is pure. DerivedStatsCache memoizes it per character on a
+# version stamp built from everything the result depends on, so repeated dashboard
+# refreshes for an unchanged party cost a stamp comparison instead of a recompute.
+import re
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+
+from app.game_data.rogue_data import RoguishArchetypeEnum
+
+ABILITIES = ["strength", "dexterity", "constitution", "intelligence", "wisdom", "charisma"]
+ABILITY_ABBREVIATIONS = {ability[:3].upper(): ability for ability in ABILITIES}
+
+# Classes whose spellcasting ability is fixed by the class itself.
+CLASS_SPELLCASTING_ABILITY: Dict[str, str] = {
+    "bard": "charisma", "cleric": "wisdom", "druid": "wisdom", "paladin": "charisma",
+    "ranger": "wisdom", "sorcerer": "charisma", "warlock": "charisma", "wizard": "intelligence",
+}
+
+COIN_FIELDS = ["currency_pp", "currency_gp", "currency_ep", "currency_sp", "currency_cp"]
+COINS_PER_POUND = 50
+CARRYING_CAPACITY_PER_STRENGTH = 15
+DEFAULT_SPEED_FT = 30
+
+# Magic item text such as "+1 bonus to attack and damage rolls" or "+2 bonus to AC".
+_WEAPON_BONUS_RE = re.compile(r"\+(\d+) bonus to attack and damage rolls")
+_AC_BONUS_RE = re.compile(r"\+(\d+) bonus to AC")
+
+
+def ability_modifier(score: Optional[int]) -> int:
+    return (score - 10) // 2 if score is not None else 0
+
+
+def proficiency_bonus_for(level: int, dnd_class: Optional[Any] = None) -> int:
+    """Uses the class level table when available, else the standard 2 + (level - 1) // 4."""
+    if dnd_class is not None:
+        level_data = next((lvl for lvl in dnd_class.levels if lvl.level == level), None)
+        if level_data is not None and level_data.proficiency_bonus:
+            return level_data.proficiency_bonus
+    return 2 + (max(level, 1) - 1) // 4
+
+
+def spellcasting_ability_for(character: Any) -> Optional[str]:
+    class_name = (character.character_class or "").lower()
+    if class_name == "rogue" and character.roguish_archetype == RoguishArchetypeEnum.ARCANE_TRICKSTER:
+        return "intelligence"
+    return CLASS_SPELLCASTING_ABILITY.get(class_name)
+
+
+def _magic_bonus(properties: Dict[str, Any], pattern: "re.Pattern") -> int:
+    match = pattern.search(properties.get("effect") or "")
+    return int(match.group(1)) if match else 0
+
+
+def _enum_value(value: Any) -> Any:
+    return getattr(value, "value", value)
+
+
+def _armor_class(character: Any, modifiers: Dict[str, int], equipped: List[Any]) -> int:
+    armor = shield = None
+    ac_bonus = 0
+    for item in equipped:
+        item_type = _enum_value(item.item_type)
+        properties = item.properties or {}
+        if item_type == "armor" and "ac_base" in properties and armor is None:
+            armor = properties
+        elif item_type == "shield" and shield is None:
+            shield = properties
+        ac_bonus += _magic_bonus(properties, _AC_BONUS_RE)
+
+    dex = modifiers["dexterity"]
+    class_name = (character.character_class or "").lower()
+    if armor is not None:
+        if not armor.get("dex_bonus", True):
+            dex_part = 0
+        elif armor.get("armor_type") == "medium":
+            dex_part = min(dex, armor.get("dex_bonus_max", 2))
+        else:
+            dex_part = dex
+        ac = armor["ac_base"] + dex_part
+    elif class_name == "barbarian":
+        ac = 10 + dex + modifiers["constitution"]
+    elif class_name == "monk" and shield is None:
+        ac = 10 + dex + modifiers["wisdom"]
+    else:
+        ac = 10 + dex
+
+    if shield is not None:
+        ac += shield.get("ac_bonus", 2)
+    return ac + ac_bonus
+
+
+def _weapon_attacks(inventory_items: Sequence[Any], modifiers: Dict[str, int], proficiency_bonus: int) -> List[Dict[str, Any]]:
+    attacks = []
+    for character_item in inventory_items:
+        item = character_item.item_definition
+        if item is None or _enum_value(item.item_type) != "weapon":
+            continue
+        properties = item.properties or {}
+        weapon_properties = properties.get("properties") or []
+        weapon_type = properties.get("type") or ""
+        if "ranged" in weapon_type:
+            ability = "dexterity"
+        elif "finesse" in weapon_properties:
+            ability = "dexterity" if modifiers["dexterity"] >= modifiers["strength"] else "strength"
+        else:
+            ability = "strength"
+        magic_bonus = _magic_bonus(properties, _WEAPON_BONUS_RE)
+        # Weapon proficiencies aren't tracked per character yet, so every weapon counts as proficient.
+        attacks.append({
+            "character_item_id": character_item.id,
+            "name": item.name,
+            "ability": ability,
+            "attack_bonus": modifiers[ability] + proficiency_bonus + magic_bonus,
+            "damage": properties.get("damage") or None,
+            "damage_bonus": modifiers[ability] + magic_bonus,
+            "is_equipped": bool(character_item.is_equipped),
+        })
+    return attacks
+
+
+def compute_derived_stats(character: Any, dnd_class: Optional[Any], race: Optional[Any],
+                          skill_catalog: Sequence[Any]) -> Dict[str, Any]:
+    """
+    Builds the derived sheet as a plain dict matching schemas.derived_stats.DerivedStats.
+    The character must have skills and inventory_items (with their definitions) loaded.
+    Stored ability scores are treated as final; racial increases are applied when the
+    character is created, not here.
+    """
+    scores = {ability: getattr(character, ability) for ability in ABILITIES}
+    modifiers = {ability: ability_modifier(score) for ability, score in scores.items()}
+    proficiency_bonus = proficiency_bonus_for(character.level, dnd_class)
+
+    saving_throws = {}
+    for ability in ABILITIES:
+        proficient = bool(getattr(character, f"st_prof_{ability}", False))
+        saving_throws[ability] = {
+            "bonus": modifiers[ability] + (proficiency_bonus if proficient else 0),
+            "proficient": proficient,
+        }
+
+    character_skills = {character_skill.skill_id: character_skill for character_skill in character.skills}
+    skills = []
+    for skill in sorted(skill_catalog, key=lambda skill: skill.name):
+        ability = ABILITY_ABBREVIATIONS.get((skill.ability_modifier_name or "").upper(), "strength")
+        character_skill = character_skills.get(skill.id)
+        proficient = bool(character_skill and character_skill.is_proficient)
+        expertise = bool(character_skill and character_skill.has_expertise)
+        multiplier = 2 if expertise else 1 if proficient else 0
+        skills.append({
+            "skill_id": skill.id,
+            "name": skill.name,
+            "ability": ability,
+            "bonus": modifiers[ability] + proficiency_bonus * multiplier,
+            "proficient": proficient,
+            "expertise": expertise,
+        })
+    perception = next((skill for skill in skills if skill["name"] == "Perception"), None)
+    passive_perception = 10 + (perception["bonus"] if perception else modifiers["wisdom"])
+
+    spellcasting = None
+    spellcasting_ability = spellcasting_ability_for(character)
+    if spellcasting_ability:
+        spellcasting = {
+            "ability": spellcasting_ability,
+            "spell_save_dc": 8 + proficiency_bonus + modifiers[spellcasting_ability],
+            "spell_attack_bonus": proficiency_bonus + modifiers[spellcasting_ability],
+        }
+
+    inventory_items = [ci for ci in character.inventory_items if ci.item_definition is not None]
+    equipped = [ci.item_definition for ci in inventory_items if ci.is_equipped]
+
+    carried_weight = sum((ci.item_definition.weight or 0) * (ci.quantity or 0) for ci in inventory_items)
+    carried_weight += sum(getattr(character, field) or 0 for field in COIN_FIELDS) / COINS_PER_POUND
+    carrying_capacity = scores["strength"] * CARRYING_CAPACITY_PER_STRENGTH
+    if race is not None and (race.size or "").lower() in ("large", "huge", "gargantuan"):
+        carrying_capacity *= 2
+
+    return {
+        "character_id": character.id,
+        "name": character.name,
+        "level": character.level,
+        "proficiency_bonus": proficiency_bonus,
+        "abilities": {ability: {"score": scores[ability], "modifier": modifiers[ability]} for ability in ABILITIES},
+        "saving_throws": saving_throws,
+        "skills": skills,
+        "passive_perception": passive_perception,
+        "initiative": modifiers["dexterity"],
+        "armor_class": _armor_class(character, modifiers, equipped),
+        "speed_ft": race.speed if race is not None and race.speed else DEFAULT_SPEED_FT,
+        "hit_points_current": character.hit_points_current,
+        "hit_points_max": character.hit_points_max,
+        "spellcasting": spellcasting,
+        "attacks": _weapon_attacks(inventory_items, modifiers, proficiency_bonus),
+        "carrying": {
+            "carried_weight_lb": round(carried_weight, 2),
+            "carrying_capacity_lb": float(carrying_capacity),
+            "encumbered": carried_weight > carrying_capacity,
+        },
+    }
+
+
+def character_version_stamp(character: Any, catalog_version: int) -> Tuple[Hashable, ...]:
+    """Everything the derived sheet depends on that can change without changing the character id."""
+    return (
+        character.version_id,
+        catalog_version,
+        tuple(sorted((cs.skill_id, cs.is_proficient, cs.has_expertise) for cs in character.skills)),
+        tuple(sorted((ci.id, ci.item_id, ci.quantity, ci.is_equipped) for ci in character.inventory_items)),
+    )
+
+
+class DerivedStatsCache:
+    """LRU of derived sheets keyed by character id; an entry is reused only while its stamp matches."""
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[int, Tuple[Tuple[Hashable, ...], Dict[str, Any]]]" = OrderedDict()
+
+    def get(self, character_id: int, stamp: Tuple[Hashable, ...]) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(character_id)
+        if entry is None or entry[0] != stamp:
+            return None
+        self._entries.move_to_end(character_id)
+        return entry[1]
+
+    def put(self, character_id: int, stamp: Tuple[Hashable, ...], derived: Dict[str, Any]) -> None:
+        self._entries[character_id] = (stamp, derived)
+        self._entries.move_to_end(character_id)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, character_id: int) -> None:
+        self._entries.pop(character_id, None)
+
+
+derived_stats_cache = DerivedStatsCache()
@@ -0,0 +1,291 @@
+# Path: api/app/services/encounter_pool.py
+# Per-encounter monster instances stored column by column.
+#
+# A MonsterPool keeps one typed array per attribute (hit points, AC, initiative,
+# condition bits, grid position) with one slot per spawned monster, plus a small
+# table of the distinct templates. Instances point at their template by index; the
+# template is the shared crud_catalog.monsters row, never a copy. Two hundred goblins
+# cost a few kilobytes, and area effects run as one pass over the arrays instead of
+# touching an object per monster.
+#
+# Pools are in-memory and per process, owned by the campaign's actor: they live for the
+# encounter and are dropped when it ends or the last player disconnects. The actor
+# checkpoints them (checkpoint/from_checkpoint) so a restarted worker can restore them.
+import random
+import re
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from app.schemas.combat import SaveResult
+from app.services import combat
+
+# Bit per SRD condition, for the conditions column.
+CONDITIONS = [
+    "blinded", "charmed", "deafened", "exhaustion", "frightened", "grappled", "incapacitated", "invisible",
+    "paralyzed", "petrified", "poisoned", "prone", "restrained", "stunned", "unconscious",
+]
+CONDITION_BITS: Dict[str, int] = {name: 1 << index for index, name in enumerate(CONDITIONS)}
+
+HIT_DICE_RE = re.compile(r"^\s*(\d+)d(\d+)\s*(?:([+-])\s*(\d+))?")
+
+
+def condition_bit(name: str) -> int:
+    bit = CONDITION_BITS.get(name.lower())
+    if bit is None:
+        raise ValueError(f"Unknown condition '{name}'.")
+    return bit
+
+
+def condition_names(mask: int) -> List[str]:
+    return [name for name, bit in CONDITION_BITS.items() if mask & bit]
+
+
+def _column_values(typecode: str, values: Iterable[Any], name: str) -> array:
+    """values as a new array of the column's type; ValueError if one isn't an integer or doesn't fit."""
+    try:
+        return array(typecode, [int(value) for value in values])
+    except (TypeError, ValueError, OverflowError):
+        raise ValueError(f"{name} must be integers in the column's range.")
+
+
+def _positions(positions: Optional[Sequence[Sequence[int]]], count: int) -> List[Tuple[int, int]]:
+    """Validated (x, y) cells for `count` instances; missing ones are (-1, -1), not on the map."""
+    if positions is None:
+        positions = []
+    if not isinstance(positions, (list, tuple)):
+        raise ValueError("positions must be a list of [x, y] pairs.")
+    cells = []
+    for index in range(count):
+        if index >= len(positions):
+            cells.append((-1, -1))
+            continue
+        position = positions[index]
+        if not isinstance(position, (list, tuple)) or len(position) != 2:
+            raise ValueError("positions must be a list of [x, y] pairs.")
+        try:
+            cells.append((int(position[0]), int(position[1])))
+        except (TypeError, ValueError):
+            raise ValueError("positions must be a list of [x, y] pairs.")
+    return cells
+
+
+def roll_hit_points(monster: Any) -> int:
+    """Rolls the template's hit dice (e.g. "2d6" or "4d8+4"); falls back to its average HP."""
+    match = HIT_DICE_RE.match(monster.hit_dice or "")
+    if not match:
+        return monster.hit_points
+    count, sides = int(match.group(1)), int(match.group(2))
+    bonus = int(match.group(4) or 0) * (-1 if match.group(3) == "-" else 1)
+    return max(sum(random.randint(1, sides) for _ in range(count)) + bonus, 1)
+
+
+class MonsterPool:
+    def __init__(self):
+        self.templates: List[Any] = [] # Shared catalog rows
+        self._template_slots: Dict[int, int] = {} # monster id -> index in templates
+        self._next_id = 1
+        self._slot_by_id: Dict[int, int] = {}
+        # One slot per instance in every column.
+        self.ids = array("I")
+        self.template = array("H")
+        self.hp = array("i")
+        self.hp_max = array("i")
+        self.ac = array("h")
+        self.initiative = array("h")
+        self.conditions = array("I")
+        self.x = array("i")
+        self.y = array("i")
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _columns(self) -> Tuple[array, ...]:
+        return (self.ids, self.template, self.hp, self.hp_max, self.ac, self.initiative, self.conditions, self.x, self.y)
+
+    def _template_slot(self, monster: Any) -> int:
+        slot = self._template_slots.get(monster.id)
+        if slot is None:
+            slot = len(self.templates)
+            self.templates.append(monster)
+            self._template_slots[monster.id] = slot
+        return slot
+
+    def spawn(self, monster: Any, count: int, positions: Optional[Sequence[Sequence[int]]] = None,
+              roll_hp: bool = False) -> List[int]:
+        """
+        Adds `count` instances of a template; returns their instance ids. Every value is built
+        and checked against its column first, so a bad input raises ValueError and changes nothing.
+        """
+        try:
+            count = int(count)
+        except (TypeError, ValueError):
+            raise ValueError("count must be an integer.")
+        if count < 0:
+            raise ValueError("count must not be negative.")
+        cells = _positions(positions, count)
+        template_slot = self._template_slots.get(monster.id, len(self.templates))
+        dexterity_bonus = combat.ability_modifier(monster.dexterity)
+        hit_points = [roll_hit_points(monster) if roll_hp else monster.hit_points for _ in range(count)]
+        new_ids = list(range(self._next_id, self._next_id + count))
+        rows = (
+            new_ids, [template_slot] * count, hit_points, hit_points, [monster.armor_class] * count,
+            [random.randint(1, 20) + dexterity_bonus for _ in range(count)], [0] * count,
+            [x for x, _ in cells], [y for _, y in cells],
+        )
+        new_columns = [_column_values(column.typecode, values, name)
+                       for column, values, name in zip(self._columns(), rows, CHECKPOINT_COLUMNS)]
+
+        self._template_slot(monster)
+        first_slot = len(self.ids)
+        for column, values in zip(self._columns(), new_columns):
+            column.extend(values)
+        for offset, instance_id in enumerate(new_ids):
+            self._slot_by_id[instance_id] = first_slot + offset
+        self._next_id += count
+        return new_ids
+
+    def remove(self, instance_ids: Iterable[int]) -> List[int]:
+        """Removes instances (swap with the last slot, then shrink). Returns the ids that existed."""
+        removed = []
+        for instance_id in instance_ids:
+            slot = self._slot_by_id.pop(instance_id, None)
+            if slot is None:
+                continue
+            last = len(self.ids) - 1
+            for column in self._columns():
+                column[slot] = column[last]
+                column.pop()
+            if slot != last:
+                self._slot_by_id[self.ids[slot]] = slot
+            removed.append(instance_id)
+        return removed
+
+    def slots_for(self, instance_ids: Iterable[int]) -> List[int]:
+        return [self._slot_by_id[instance_id] for instance_id in instance_ids if instance_id in self._slot_by_id]
+
+    def slots_in_radius(self, center: Sequence[int], radius_cells: float) -> List[int]:
+        """Slots of the placed instances within radius (in cells, Euclidean) of a cell."""
+        cx, cy = center
+        limit = radius_cells * radius_cells
+        xs, ys = self.x, self.y
+        return [slot for slot in range(len(self.ids)) if xs[slot] >= 0 and (xs[slot] - cx) ** 2 + (ys[slot] - cy) ** 2 <= limit]
+
+    def apply_hit_points(self, slots: List[int], amount: int, kind: str = "damage",
+                         damage_type: Optional[str] = None, save: Optional[Any] = None) -> Dict[str, List[Any]]:
+        """
+        Damages or heals the given slots in one pass. Saves, resistances and save bonuses are
+        worked out once per template, not per instance. Returns the changed columns for a broadcast.
+        Raises ValueError for a negative amount or a kind other than "damage" or "healing".
+        """
+        if kind not in ("damage", "healing"):
+            raise ValueError(f"Unknown kind '{kind}'; expected 'damage' or 'healing'.")
+        if isinstance(amount, bool) or not isinstance(amount, int) or amount < 0:
+            raise ValueError("amount must be a non-negative integer.")
+        multipliers = [combat.monster_damage_modifier(template, damage_type)[0] for template in self.templates]
+        saves: List[Optional[SaveResult]] = [None] * len(slots)
+        if kind == "damage" and save is not None:
+            bonuses = [combat.monster_save_bonus(template, save.ability) for template in self.templates]
+            saves = combat.roll_saves([bonuses[self.template[slot]] for slot in slots], save.dc)
+
+        hp, hp_max, template = self.hp, self.hp_max, self.template
+        for index, slot in enumerate(slots):
+            if kind == "damage":
+                taken = amount
+                if saves[index] is not None and saves[index].success:
+                    taken = amount // 2 if save.on_success == "half" else 0
+                hp[slot] = max(hp[slot] - int(taken * multipliers[template[slot]]), 0)
+            else:
+                hp[slot] = min(hp[slot] + amount, hp_max[slot])
+        return {
+            "ids": [self.ids[slot] for slot in slots],
+            "hp": [hp[slot] for slot in slots],
+            "saves": [result.model_dump() if result is not None else None for result in saves],
+        }
+
+    def set_condition(self, slots: List[int], condition: str, present: bool = True) -> Dict[str, List[int]]:
+        bit = condition_bit(condition)
+        conditions = self.conditions
+        for slot in slots:
+            conditions[slot] = conditions[slot] | bit if present else conditions[slot] & ~bit
+        return {"ids": [self.ids[slot] for slot in slots], "conditions": [conditions[slot] for slot in slots]}
+
+    def move(self, slots: List[int], dx: int, dy: int) -> Dict[str, List[int]]:
+        """Shifts the given slots; all new positions are checked before any is stored."""
+        try:
+            dx, dy = int(dx), int(dy)
+        except (TypeError, ValueError):
+            raise ValueError("dx and dy must be integers.")
+        new_x = _column_values(self.x.typecode, (self.x[slot] + dx for slot in slots), "x")
+        new_y = _column_values(self.y.typecode, (self.y[slot] + dy for slot in slots), "y")
+        for slot, x, y in zip(slots, new_x, new_y):
+            self.x[slot] = x
+            self.y[slot] = y
+        return {"ids": [self.ids[slot] for slot in slots], "x": [self.x[slot] for slot in slots], "y": [self.y[slot] for slot in slots]}
+
+    def snapshot(self) -> Dict[str, Any]:
+        """The whole pool, column by column (what a client needs to draw it)."""
+        return {
+            "templates": [{"id": template.id, "name": template.name, "size": template.size} for template in self.templates],
+            "condition_names": CONDITIONS,
+            "ids": self.ids.tolist(),
+            "template": self.template.tolist(),
+            "hp": self.hp.tolist(),
+            "hp_max": self.hp_max.tolist(),
+            "ac": self.ac.tolist(),
+            "initiative": self.initiative.tolist(),
+            "conditions": self.conditions.tolist(),
+            "x": self.x.tolist(),
+            "y": self.y.tolist(),
+        }
+
+    def checkpoint(self) -> Dict[str, Any]:
+        """The pool as plain data (templates by monster id), for an encounter checkpoint."""
+        return {
+            "next_id": self._next_id,
+            "template_ids": [template.id for template in self.templates],
+            **{name: column.tolist() for name, column in zip(CHECKPOINT_COLUMNS, self._columns())},
+        }
+
+    @classmethod
+    def from_checkpoint(cls, data: Dict[str, Any], templates: Dict[int, Any]) -> "MonsterPool":
+        """Rebuilds a checkpointed pool; instances whose template is gone from the catalog are left out."""
+        pool = cls()
+        pool._next_id = int(data.get("next_id", 1))
+        saved_slots = [pool._template_slot(templates[monster_id]) if monster_id in templates else None
+                       for monster_id in data.get("template_ids", [])]
+        rows = zip(*(data.get(name, []) for name in CHECKPOINT_COLUMNS))
+        for row in rows:
+            template_slot = saved_slots[row[1]] if row[1] < len(saved_slots) else None
+            if template_slot is None:
+                continue
+            pool._slot_by_id[row[0]] = len(pool.ids)
+            for column, value in zip(pool._columns(), (row[0], template_slot) + row[2:]):
+                column.append(value)
+        return pool
+
+
+# Column names in MonsterPool._columns() order.
+CHECKPOINT_COLUMNS = ("ids", "template", "hp", "hp_max", "ac", "initiative", "conditions", "x", "y")
+
+
+class EncounterPools:
+    def __init__(self):
+        self._pools: Dict[int, MonsterPool] = {}
+
+    def get(self, campaign_id: int) -> Optional[MonsterPool]:
+        return self._pools.get(campaign_id)
+
+    def get_or_create(self, campaign_id: int) -> MonsterPool:
+        pool = self._pools.get(campaign_id)
+        if pool is None:
+            pool = self._pools[campaign_id] = MonsterPool()
+        return pool
+
+    def put(self, campaign_id: int, pool: MonsterPool) -> None:
+        self._pools[campaign_id] = pool
+
+    def drop(self, campaign_id: int) -> None:
+        self._pools.pop(campaign_id, None)
+
+
+encounter_pools = EncounterPools()
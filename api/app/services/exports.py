@@ -0,0 +1,92 @@
+# Path: api/app/services/exports.py
+# Full data exports streamed as NDJSON.
+#
+# Every line is {"type": <record type>, "data": <row>}; the first line describes the
+# export. Each section is read through a server-side cursor (yield_per) and written out
+# one batch at a time, so memory stays flat however big the campaign is and the client
+# gets its first bytes as soon as the first batch is fetched. Rows are plain table
+# columns (Core rows, no ORM objects or relationships), which is also the shape an
+# import would need.
+#
+# The generator opens its own session: a StreamingResponse body runs after the
+# request's dependencies have been torn down, so the route's session can't be used.
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, List, Tuple
+
+from sqlalchemy import Table, select
+from sqlalchemy.sql import Select
+
+from app.core.config import settings
+from app.core.responses import json_bytes
+from app.db.database import ReadSessionLocal
+from app.models.campaign import Campaign as CampaignModel
+from app.models.campaign_member import CampaignMember as CampaignMemberModel
+from app.models.campaign_session import CampaignSession as CampaignSessionModel
+from app.models.character import Character as CharacterModel
+from app.models.character_item import CharacterItem as CharacterItemModel
+from app.models.character_skill import CharacterSkill as CharacterSkillModel
+from app.models.character_spell import CharacterSpell as CharacterSpellModel
+from app.models.initiative_entry import InitiativeEntry as InitiativeEntryModel
+
+EXPORT_FORMAT_VERSION = 1
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# (record type, statement); statements select whole table rows in primary-key order.
+ExportSection = Tuple[str, Select]
+
+
+def _table(model) -> Table:
+    return model.__table__
+
+
+def _character_sections(character_ids: Select) -> List[ExportSection]:
+    """The characters matched by `character_ids` (a select of ids) and their inventory, skills and spells."""
+    characters, items = _table(CharacterModel), _table(CharacterItemModel)
+    skills, spells = _table(CharacterSkillModel), _table(CharacterSpellModel)
+    return [
+        ("character", select(characters).where(characters.c.id.in_(character_ids)).order_by(characters.c.id)),
+        ("character_item", select(items).where(items.c.character_id.in_(character_ids)).order_by(items.c.id)),
+        ("character_skill", select(skills).where(skills.c.character_id.in_(character_ids)).order_by(skills.c.id)),
+        ("character_spell", select(spells).where(spells.c.character_id.in_(character_ids)).order_by(spells.c.id)),
+    ]
+
+
+def user_export_sections(user_id: int) -> List[ExportSection]:
+    characters = _table(CharacterModel)
+    return _character_sections(select(characters.c.id).where(characters.c.user_id == user_id))
+
+
+def campaign_export_sections(campaign_id: int) -> List[ExportSection]:
+    campaigns, members = _table(CampaignModel), _table(CampaignMemberModel)
+    sessions, initiative = _table(CampaignSessionModel), _table(InitiativeEntryModel)
+    member_character_ids = select(members.c.character_id).where(
+        members.c.campaign_id == campaign_id, members.c.character_id.is_not(None)
+    )
+    session_ids = select(sessions.c.id).where(sessions.c.campaign_id == campaign_id)
+    return [
+        ("campaign", select(campaigns).where(campaigns.c.id == campaign_id)),
+        ("campaign_member", select(members).where(members.c.campaign_id == campaign_id).order_by(members.c.id)),
+        *_character_sections(member_character_ids),
+        ("campaign_session", select(sessions).where(sessions.c.campaign_id == campaign_id).order_by(sessions.c.id)),
+        ("initiative_entry", select(initiative).where(initiative.c.session_id.in_(session_ids)).order_by(initiative.c.id)),
+    ]
+
+
+def ndjson_line(record_type: str, data: Dict[str, Any]) -> bytes:
+    return json_bytes({"type": record_type, "data": data}) + b"\n"
+
+
+async def stream_ndjson(header: Dict[str, Any], sections: List[ExportSection]) -> AsyncIterator[bytes]:
+    """Yields the header line, then each section's rows in batches of EXPORT_BATCH_SIZE lines."""
+    yield ndjson_line("export", {
+        **header,
+        "format_version": EXPORT_FORMAT_VERSION,
+        "exported_at": datetime.now(timezone.utc),
+    })
+    async with ReadSessionLocal() as db:
+        # One REPEATABLE READ transaction, so every section sees the same snapshot.
+        await db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+        for record_type, statement in sections:
+            result = await db.stream(statement.execution_options(yield_per=settings.EXPORT_BATCH_SIZE))
+            async for rows in result.mappings().partitions():
+                yield b"".join(ndjson_line(record_type, dict(row)) for row in rows)
@@ -0,0 +1,53 @@
+# Path: api/app/services/job_handlers.py
+# Handlers for background jobs (see app/services/jobs.py). Each one gets its own
+# session, the job's payload and the job's id, and returns a small JSON-able result
+# for GET /jobs/{id}. Writes are committed together with crud_job.mark_job_applied,
+# so a job that runs twice applies them once.
+from typing import Any, Dict
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud import crud_campaign, crud_job
+from app.services.jobs import job_handler, PermanentJobError
+from app.services.session_reminders import reminder_scheduler
+
+@job_handler("campaign.delete")
+async def delete_campaign_job(db: AsyncSession, payload: Dict[str, Any], job_id: int) -> Dict[str, Any]:
+    deleted = await crud_campaign.delete_campaign(
+        db=db, campaign_id=payload["campaign_id"], dm_user_id=payload["dm_user_id"], commit=False
+    )
+    if not await crud_job.mark_job_applied(db, job_id=job_id):
+        await db.rollback()
+        return {"deleted_campaign_id": payload["campaign_id"], "already_applied": True}
+    if deleted is None:
+        await db.rollback()
+        raise PermanentJobError("Campaign not found or not authorized to delete")
+    await db.commit()
+    # Only reaches this process's scheduler (a no-op in `python -m app.cli worker`). Schedulers
+    # elsewhere drop the campaign when the delete's notification arrives, and _fire re-reads the
+    # campaign before sending, so a deleted campaign is never reminded either way.
+    reminder_scheduler.unschedule_campaign(payload["campaign_id"])
+    return {"deleted_campaign_id": payload["campaign_id"]}
+
+@job_handler("campaign.award_xp")
+async def award_xp_job(db: AsyncSession, payload: Dict[str, Any], job_id: int) -> Dict[str, Any]:
+    campaign = await crud_campaign.get_campaign(db=db, campaign_id=payload["campaign_id"])
+    if campaign is None:
+        raise PermanentJobError("Campaign not found")
+    try:
+        characters = await crud_campaign.award_xp_to_characters(
+            db=db, campaign=campaign, character_ids=payload["character_ids"], xp_to_add=payload["amount"], commit=False
+        )
+    except ValueError as e:
+        await db.rollback()
+        raise PermanentJobError(str(e))
+    summary = [
+        {"id": character.id, "experience_points": character.experience_points, "level": character.level}
+        for character in characters
+    ]
+    if not await crud_job.mark_job_applied(db, job_id=job_id):
+        # An earlier attempt committed this award; undo the repeat.
+        await db.rollback()
+        return {"characters": [], "already_applied": True}
+    await db.commit()
+    return {"characters": summary}
@@ -0,0 +1,169 @@
+# Path: api/app/services/jobs.py
+# Background jobs: heavy, non-interactive work that request handlers hand off.
+#
+# A handler is an async function (db, payload, job_id) -> result dict, registered under a
+# kind with @job_handler("kind"). Routes enqueue a Job row and answer 202 at once; workers
+# claim rows with SELECT ... FOR UPDATE SKIP LOCKED (crud_job.claim_next_job), run the
+# handler in a fresh session and record the result. A handler that raises is retried
+# with exponential backoff until max_attempts; raising PermanentJobError fails it at once.
+#
+# A job can run more than once (a retry after a commit whose acknowledgement was lost, or
+# a re-claim after its worker went quiet), so a handler with non-idempotent writes commits
+# them together with crud_job.mark_job_applied and skips them when that reports False.
+# While a handler runs its worker refreshes locked_at every JOB_HEARTBEAT_SECONDS, and the
+# outcome is only recorded if the claim is still this worker's.
+#
+# Workers run inside the API process (JOB_WORKERS_IN_PROCESS) or on their own with
+# `python -m app.cli worker`; any number of either can share the queue.
+import asyncio
+import os
+import socket
+import traceback
+from datetime import timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.crud import crud_job
+from app.db.database import AsyncSessionLocal
+
+JobHandler = Callable[[AsyncSession, Dict[str, Any], int], Awaitable[Optional[Dict[str, Any]]]]
+
+JOB_HANDLERS: Dict[str, JobHandler] = {}
+
+
+class PermanentJobError(Exception):
+    """Raised by a handler when retrying can't help (e.g. the target row is gone)."""
+
+
+def job_handler(kind: str) -> Callable[[JobHandler], JobHandler]:
+    def register(func: JobHandler) -> JobHandler:
+        JOB_HANDLERS[kind] = func
+        return func
+    return register
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """Exponential backoff: base, 2x base, 4x base... capped."""
+    seconds = settings.JOB_RETRY_BASE_SECONDS * (2 ** max(attempts - 1, 0))
+    return timedelta(seconds=min(seconds, settings.JOB_RETRY_MAX_SECONDS))
+
+
+class JobWorker:
+    def __init__(self, concurrency: int = 2, poll_interval_seconds: float = 1.0, worker_id: Optional[str] = None,
+                 heartbeat_seconds: float = 60.0):
+        self.concurrency = concurrency
+        self.poll_interval_seconds = poll_interval_seconds
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.stale_after = timedelta(seconds=settings.JOB_STALE_AFTER_SECONDS)
+        self.heartbeat_seconds = heartbeat_seconds
+        self._wakeup = asyncio.Event()
+        self._tasks: List[asyncio.Task] = []
+
+    def notify(self) -> None:
+        """Wakes idle loops now instead of at the next poll (called after enqueueing in-process)."""
+        self._wakeup.set()
+
+    async def _heartbeat(self, job_id: int, attempts: int) -> None:
+        """Keeps the claim fresh while the handler runs; stops once the claim is lost."""
+        while True:
+            await asyncio.sleep(self.heartbeat_seconds)
+            try:
+                async with AsyncSessionLocal() as db:
+                    held = await crud_job.heartbeat_job(db, job_id=job_id, worker_id=self.worker_id, attempts=attempts)
+            except Exception as e:
+                print(f"Job {job_id}: heartbeat failed: {e}")
+                continue
+            if not held:
+                print(f"Job {job_id}: lock lost to another worker (attempt {attempts}).")
+                return
+
+    async def run_one(self) -> bool:
+        """Claims and runs a single job. Returns False when nothing was due."""
+        async with AsyncSessionLocal() as db:
+            job = await crud_job.claim_next_job(db, worker_id=self.worker_id, stale_after=self.stale_after)
+            if job is None:
+                return False
+            handler = JOB_HANDLERS.get(job.kind)
+            if handler is None:
+                await crud_job.mark_job_failed(db, job=job, error=f"No handler registered for job kind '{job.kind}'.", retry_delay=None)
+                return True
+            job_id, kind, attempts, payload = job.id, job.kind, job.attempts, dict(job.payload or {})
+
+        # The handler gets its own session, so its commits and rollbacks can't touch the job row.
+        error: Optional[str] = None
+        delay: Optional[timedelta] = None
+        result: Optional[Dict[str, Any]] = None
+        heartbeat = asyncio.create_task(self._heartbeat(job_id, attempts), name=f"job-heartbeat-{job_id}")
+        try:
+            async with AsyncSessionLocal() as work_db:
+                result = await handler(work_db, payload, job_id)
+        except PermanentJobError as e:
+            error = str(e)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}\n{traceback.format_exc(limit=5)}"
+            delay = retry_delay(attempts)
+        finally:
+            heartbeat.cancel()
+            await asyncio.gather(heartbeat, return_exceptions=True)
+
+        async with AsyncSessionLocal() as db:
+            job = await crud_job.get_claimed_job(db, job_id=job_id, worker_id=self.worker_id, attempts=attempts)
+            if job is None:
+                # Re-claimed (or finished) by another worker meanwhile; its run records the outcome.
+                print(f"Job {job_id} ({kind}) attempt {attempts} finished after losing its lock; outcome not recorded.")
+            elif error is None:
+                await crud_job.mark_job_succeeded(db, job=job, result=result)
+                print(f"Job {job_id} ({kind}) succeeded on attempt {attempts}.")
+            else:
+                job = await crud_job.mark_job_failed(db, job=job, error=error, retry_delay=delay)
+                print(f"Job {job_id} ({kind}) failed on attempt {attempts}; now {job.status}.")
+        return True
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                ran = await self.run_one()
+            except Exception as e:
+                print(f"Job worker error: {e}")
+                ran = False
+            if ran:
+                continue
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+
+    async def start(self) -> None:
+        from app.services import job_handlers # noqa: F401  Registers the handlers
+        self._tasks = [asyncio.create_task(self._loop(), name=f"job-worker-{i}") for i in range(self.concurrency)]
+        print(f"Job worker {self.worker_id}: {self.concurrency} loop(s) for {', '.join(sorted(JOB_HANDLERS))}.")
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+
+job_worker = JobWorker(
+    concurrency=settings.JOB_WORKER_CONCURRENCY,
+    poll_interval_seconds=settings.JOB_POLL_INTERVAL_SECONDS,
+    heartbeat_seconds=settings.JOB_HEARTBEAT_SECONDS,
+)
+
+
+async def enqueue(db: AsyncSession, kind: str, payload: Dict[str, Any], created_by_user_id: Optional[int] = None):
+    """Queues a job and wakes this process's worker loops. Returns the Job row."""
+    if kind not in JOB_HANDLERS:
+        from app.services import job_handlers # noqa: F401
+    if kind not in JOB_HANDLERS:
+        raise ValueError(f"Unknown job kind '{kind}'.")
+    job = await crud_job.enqueue_job(
+        db, kind=kind, payload=payload, created_by_user_id=created_by_user_id,
+        max_attempts=settings.JOB_MAX_ATTEMPTS
+    )
+    job_worker.notify()
+    return job
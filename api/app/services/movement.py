@@ -0,0 +1,276 @@
+# Path: api/app/services/movement.py
+# Movement-range search for tokens on a session's battle map.
+#
+# The battle map lives in CampaignSession.map_state. The keys used here are:
+#   {
+#     "version": 3,                                    # bumped on every map patch
+#     "grid": {"width": 30, "height": 20, "cell_size_ft": 5, "diagonal_rule": "5e"},
+#     "terrain": {"4,7": 2, "5,7": "wall"},            # cost multiplier per cell, "wall" = impassable
+#     "tokens": {"char_12": {"x": 3, "y": 4, "character_id": 12, "side": "party"},
+#                "goblin_1": {"x": 9, "y": 4, "monster_id": 1, "side": "enemies"}}
+#   }
+# Any other keys (map URL, fog of war, ...) are left untouched by this module.
+import heapq
+import re
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+Cell = Tuple[int, int]
+
+DEFAULT_GRID_WIDTH = 50
+DEFAULT_GRID_HEIGHT = 50
+DEFAULT_CELL_SIZE_FT = 5
+DEFAULT_WALKING_SPEED_FT = 30
+IMPASSABLE_TERRAIN = {"wall", "blocked", "impassable"}
+
+# "5e": every diagonal step costs one square (PHB default).
+# "alternate": 5-10-5, every second diagonal step costs two squares (DMG variant).
+# "none": orthogonal movement only.
+DIAGONAL_RULES = {"5e", "alternate", "none"}
+
+ORTHOGONAL_STEPS = [(1, 0), (-1, 0), (0, 1), (0, -1)]
+DIAGONAL_STEPS = [(1, 1), (1, -1), (-1, 1), (-1, -1)]
+
+
+def cell_key(cell: Cell) -> str:
+    return f"{cell[0]},{cell[1]}"
+
+
+def parse_cell_key(key: str) -> Cell:
+    x, y = key.split(",")
+    return int(x), int(y)
+
+
+def _coordinate(value: Any, name: str) -> int:
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        raise ValueError(f"{name} must be a whole number.")
+    try:
+        return int(value)
+    except (ValueError, OverflowError):
+        raise ValueError(f"{name} must be a whole number.")
+
+
+def parse_target_cell(target: Any) -> Cell:
+    """An [x, y] target from a movement query. Raises ValueError for anything else."""
+    if not isinstance(target, (list, tuple)) or len(target) != 2:
+        raise ValueError("Each target must be an [x, y] pair.")
+    return _coordinate(target[0], "Target x"), _coordinate(target[1], "Target y")
+
+
+def parse_speed_ft(speed: Any) -> int:
+    """Parses a speed value such as 30, "30 ft." or Monster.speed's {"walk": "30 ft."} into feet."""
+    if speed is None:
+        return DEFAULT_WALKING_SPEED_FT
+    if isinstance(speed, dict):
+        return parse_speed_ft(speed.get("walk"))
+    if isinstance(speed, (int, float)):
+        return int(speed)
+    match = re.search(r"\d+", str(speed))
+    return int(match.group()) if match else DEFAULT_WALKING_SPEED_FT
+
+
+class BattleMap:
+    """Read-only view over a map_state dict with the lookups the search needs."""
+
+    def __init__(self, map_state: Optional[Dict[str, Any]]):
+        map_state = map_state or {}
+        grid = map_state.get("grid") or {}
+        self.version: int = int(map_state.get("version", 0))
+        self.width: int = int(grid.get("width", DEFAULT_GRID_WIDTH))
+        self.height: int = int(grid.get("height", DEFAULT_GRID_HEIGHT))
+        self.cell_size_ft: int = int(grid.get("cell_size_ft", DEFAULT_CELL_SIZE_FT))
+        self.diagonal_rule: str = grid.get("diagonal_rule", "5e")
+        if self.diagonal_rule not in DIAGONAL_RULES:
+            raise ValueError(f"Unknown diagonal rule '{self.diagonal_rule}'.")
+
+        self.terrain: Dict[Cell, Optional[float]] = {}
+        for key, value in (map_state.get("terrain") or {}).items():
+            self.terrain[parse_cell_key(key)] = None if value in IMPASSABLE_TERRAIN else float(value)
+
+        self.tokens: Dict[str, Dict[str, Any]] = map_state.get("tokens") or {}
+
+    def in_bounds(self, cell: Cell) -> bool:
+        return 0 <= cell[0] < self.width and 0 <= cell[1] < self.height
+
+    def cost_multiplier(self, cell: Cell) -> Optional[float]:
+        """Returns the terrain multiplier for a cell, or None if it cannot be entered."""
+        return self.terrain.get(cell, 1.0)
+
+    def token_position(self, token_id: str) -> Cell:
+        """The token's cell. Raises ValueError if it is missing or has no valid x/y."""
+        if not isinstance(token_id, str):
+            raise ValueError("token_id must be a string.")
+        token = self.tokens.get(token_id)
+        if token is None:
+            raise ValueError(f"Token '{token_id}' is not on the map.")
+        if not isinstance(token, dict) or "x" not in token or "y" not in token:
+            raise ValueError(f"Token '{token_id}' has no position on the map.")
+        return _coordinate(token["x"], f"Token '{token_id}' x"), _coordinate(token["y"], f"Token '{token_id}' y")
+
+    def occupancy_for(self, token_id: str) -> Tuple[frozenset, frozenset]:
+        """
+        Splits the cells held by other tokens into (blocking, passable) for the moving token.
+        Creatures on the same side can be moved through but not ended on; anyone else blocks.
+        """
+        mover_side = self.tokens.get(token_id, {}).get("side")
+        blocking, passable = set(), set()
+        for other_id, token in self.tokens.items():
+            if other_id == token_id:
+                continue
+            try:
+                cell = self.token_position(other_id)
+            except ValueError:
+                continue # Not placed (or placed badly): it holds no cell
+            if mover_side is not None and token.get("side") == mover_side:
+                passable.add(cell)
+            else:
+                blocking.add(cell)
+        return frozenset(blocking), frozenset(passable)
+
+
+class MovementResult:
+    """Shortest-path tree from a token's position, bounded by its speed."""
+
+    def __init__(self, origin: Cell, best: Dict[Tuple[Cell, int], int],
+                 previous: Dict[Tuple[Cell, int], Tuple[Cell, int]], occupied: frozenset):
+        self.origin = origin
+        self.previous = previous
+        self.occupied = occupied
+        # Collapse parity states down to the cheapest way of reaching each cell.
+        self.costs: Dict[Cell, int] = {}
+        self._best_state: Dict[Cell, Tuple[Cell, int]] = {}
+        for state, cost in best.items():
+            cell = state[0]
+            if cell not in self.costs or cost < self.costs[cell]:
+                self.costs[cell] = cost
+                self._best_state[cell] = state
+
+    def reachable_cells(self) -> List[Tuple[Cell, int]]:
+        """Cells the token can end its move on, with the cost in feet to get there."""
+        return [(cell, cost) for cell, cost in self.costs.items() if cell not in self.occupied]
+
+    def path_to(self, target: Cell) -> Optional[List[Cell]]:
+        if target not in self.costs or target in self.occupied:
+            return None
+        state = self._best_state[target]
+        path = [target]
+        while state[0] != self.origin or state[1] != 0:
+            state = self.previous[state]
+            path.append(state[0])
+        path.reverse()
+        return path
+
+
+def compute_movement(battle_map: BattleMap, token_id: str, speed_ft: int) -> MovementResult:
+    """
+    Dijkstra over grid cells. Each step costs cell_size_ft times the destination's terrain
+    multiplier; under the "alternate" rule the search state also tracks diagonal parity.
+    """
+    origin = battle_map.token_position(token_id)
+    blocking, passable = battle_map.occupancy_for(token_id)
+    steps = ORTHOGONAL_STEPS if battle_map.diagonal_rule == "none" else ORTHOGONAL_STEPS + DIAGONAL_STEPS
+    alternate = battle_map.diagonal_rule == "alternate"
+
+    # State is (cell, parity); parity only changes under the alternate diagonal rule.
+    best: Dict[Tuple[Cell, int], int] = {(origin, 0): 0}
+    state_previous: Dict[Tuple[Cell, int], Tuple[Cell, int]] = {}
+    heap: List[Tuple[int, Cell, int]] = [(0, origin, 0)]
+
+    while heap:
+        cost, cell, parity = heapq.heappop(heap)
+        if cost > best.get((cell, parity), cost):
+            continue
+        for dx, dy in steps:
+            nxt = (cell[0] + dx, cell[1] + dy)
+            if not battle_map.in_bounds(nxt) or nxt in blocking:
+                continue
+            multiplier = battle_map.cost_multiplier(nxt)
+            if multiplier is None:
+                continue
+            squares, next_parity = 1, parity
+            if dx and dy and alternate:
+                squares = 2 if parity else 1
+                next_parity = 1 - parity
+            step_cost = int(round(battle_map.cell_size_ft * squares * multiplier))
+            next_cost = cost + step_cost
+            if next_cost > speed_ft:
+                continue
+            state = (nxt, next_parity)
+            if next_cost < best.get(state, next_cost + 1):
+                best[state] = next_cost
+                state_previous[state] = (cell, parity)
+                heapq.heappush(heap, (next_cost, nxt, next_parity))
+
+    return MovementResult(origin=origin, best=best, previous=state_previous, occupied=passable)
+
+
+class MovementCache:
+    """
+    LRU cache of movement results keyed by (session, map version, token, position, speed).
+    The version in the key makes stale entries unreachable; invalidate_session() also
+    drops them eagerly when a map patch lands so memory doesn't fill with dead versions.
+    """
+
+    def __init__(self, max_entries: int = 2048):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple, MovementResult]" = OrderedDict()
+        # Latest map_state seen per session, so hover queries don't have to re-read the row.
+        self._maps: Dict[int, Dict[str, Any]] = {}
+
+    def remember_map(self, session_id: int, map_state: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Stores map_state for a session unless a newer version is already known; returns the newest."""
+        map_state = map_state or {}
+        known = self._maps.get(session_id)
+        if known is None or int(map_state.get("version", 0)) >= int(known.get("version", 0)):
+            self._maps[session_id] = map_state
+            return map_state
+        return known
+
+    def get_or_compute(self, session_id: int, battle_map: BattleMap, token_id: str, speed_ft: int) -> MovementResult:
+        key = (session_id, battle_map.version, token_id, battle_map.token_position(token_id), speed_ft)
+        result = self._entries.get(key)
+        if result is not None:
+            self._entries.move_to_end(key)
+            return result
+        result = compute_movement(battle_map, token_id, speed_ft)
+        self._entries[key] = result
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return result
+
+    def invalidate_session(self, session_id: int, map_state: Optional[Dict[str, Any]] = None) -> None:
+        if map_state is not None:
+            self._maps[session_id] = map_state
+        else:
+            self._maps.pop(session_id, None)
+        for key in [key for key in self._entries if key[0] == session_id]:
+            del self._entries[key]
+
+
+movement_cache = MovementCache()
+
+
+def apply_map_patch(map_state: Optional[Dict[str, Any]], patch: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Returns a new map_state with the patch merged in and the version bumped.
+    "terrain" and "tokens" are merged key by key (a null value removes the entry);
+    every other top-level key is replaced wholesale.
+    """
+    new_state = dict(map_state or {})
+    for key, value in patch.items():
+        if key == "version":
+            continue
+        if key in ("terrain", "tokens") and isinstance(value, dict):
+            merged = dict(new_state.get(key) or {})
+            for entry_key, entry_value in value.items():
+                if entry_value is None:
+                    merged.pop(entry_key, None)
+                elif key == "tokens" and isinstance(merged.get(entry_key), dict):
+                    merged[entry_key] = {**merged[entry_key], **entry_value}
+                else:
+                    merged[entry_key] = entry_value
+            new_state[key] = merged
+        else:
+            new_state[key] = value
+    new_state["version"] = int(new_state.get("version", 0)) + 1
+    return new_state
@@ -0,0 +1,339 @@
+# Path: api/app/services/resources.py
+# Spell slots and limited-use class resources (ki, rage, channel divinity, ...).
+#
+# Maxima come from per-class tables compiled once from the class catalog: for each class a
+# tuple of resource names and, per class level, a tuple of maxima in the same order. The
+# ClassLevel.spellcasting JSON only lists what changes at a level, so it is folded forward
+# here once instead of on every lookup. Tables are rebuilt when catalog_version changes.
+#
+# What has been spent lives in ResourceLedger: one in-memory sheet per character with its
+# maxima and used counts. Spending is a dict update (no I/O); the changes are written
+# behind in batches by a background task as deltas (used = used + change), so a spend can
+# be lost only if the process dies within RESOURCE_FLUSH_INTERVAL_SECONDS, and a flush
+# never overwrites spends or rests made through another worker. Rests for a whole party are
+# one statement each. Sheets re-read their used counts after a flush, after a rest and once
+# they are RESOURCE_SHEET_RELOAD_SECONDS old, so another worker's changes show up within
+# that long; until then this worker may allow a spend the other has already made.
+import asyncio
+import time
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+from app.core.config import settings
+from app.crud import crud_catalog, crud_character_resource
+from app.db.database import AsyncSessionLocal
+from app.game_data.class_resources import CLASS_RESOURCES, UNLIMITED
+from app.game_data.sorcerer_progression import SORCERER_SPELL_SLOTS_TABLE, SORCERER_SPELLS_KNOWN_TABLE
+from app.schemas.resources import CharacterResources, ResourceState, RestedCharacter, RestResult
+from app.services.derived_stats import ability_modifier
+
+MAX_LEVEL = 20
+SPELL_LEVELS = range(1, 10)
+
+
+class ClassResourceTable:
+    __slots__ = ("names", "maxima", "short_rest", "abilities", "cantrips_known", "spells_known", "max_spell_level")
+
+    def __init__(self, names: Tuple[str, ...], maxima: List[Tuple[int, ...]], short_rest: List[FrozenSet[str]],
+                 abilities: Dict[str, str], cantrips_known: List[int], spells_known: List[Optional[int]],
+                 max_spell_level: List[int]):
+        self.names = names # Column order of every maxima row
+        self.maxima = maxima # Indexed by class level, 0..20; UNLIMITED = -1
+        self.short_rest = short_rest # Indexed by class level: the names a short rest recovers
+        self.abilities = abilities # resource -> ability whose modifier is added to its uses
+        # Spell progression, also indexed by class level. spells_known is None for classes
+        # that prepare spells instead of knowing a fixed number.
+        self.cantrips_known = cantrips_known
+        self.spells_known = spells_known
+        self.max_spell_level = max_spell_level
+
+
+def _fold_forward(uses: Dict[int, int]) -> List[int]:
+    values, current = [], 0
+    for level in range(MAX_LEVEL + 1):
+        current = uses.get(level, current)
+        values.append(current)
+    return values
+
+
+def _slot_columns(dnd_class: Any) -> Dict[str, List[int]]:
+    """resource -> uses per level (0..20) for the class's spell slots."""
+    if dnd_class.name == "Sorcerer":
+        # The progression module has the complete table; the seeded JSON is sparse.
+        return {f"spell_slot_{spell_level}": [SORCERER_SPELL_SLOTS_TABLE.get(level, {}).get(spell_level, 0) for level in range(MAX_LEVEL + 1)]
+                for spell_level in SPELL_LEVELS}
+    deltas: Dict[str, Dict[int, int]] = {}
+    for class_level in dnd_class.levels:
+        for key, value in (class_level.spellcasting or {}).items():
+            if key.startswith("spell_slots_level_"):
+                deltas.setdefault(f"spell_slot_{key.rsplit('_', 1)[1]}", {})[class_level.level] = value
+            elif key == "spell_slots": # Warlock Pact Magic: all slots share one level and recover on a short rest
+                deltas.setdefault("pact_slot", {})[class_level.level] = value
+    return {resource: _fold_forward(uses) for resource, uses in deltas.items()}
+
+
+def _spell_progression(dnd_class: Any, slot_columns: Dict[str, List[int]]) -> Tuple[List[int], List[Optional[int]], List[int]]:
+    """(cantrips known, spells known, highest castable spell level) per level (0..20)."""
+    levels = range(MAX_LEVEL + 1)
+    max_spell_level = [max((n for n in SPELL_LEVELS if slot_columns.get(f"spell_slot_{n}", [0] * len(levels))[level]), default=0)
+                       for level in levels]
+    if dnd_class.name == "Sorcerer":
+        known = [SORCERER_SPELLS_KNOWN_TABLE.get(level, (0, 0)) for level in levels]
+        return [cantrips for cantrips, _ in known], [spells for _, spells in known], max_spell_level
+    deltas: Dict[str, Dict[int, int]] = {}
+    for class_level in dnd_class.levels:
+        for key in ("cantrips_known", "spells_known", "slot_level"):
+            if key in (class_level.spellcasting or {}):
+                deltas.setdefault(key, {})[class_level.level] = class_level.spellcasting[key]
+    if "slot_level" in deltas: # Pact Magic slots
+        max_spell_level = [max(a, b) for a, b in zip(max_spell_level, _fold_forward(deltas["slot_level"]))]
+    spells_known = _fold_forward(deltas["spells_known"]) if "spells_known" in deltas else [None] * len(levels)
+    return _fold_forward(deltas.get("cantrips_known", {})), spells_known, max_spell_level
+
+
+def compile_class_table(dnd_class: Any) -> ClassResourceTable:
+    slot_columns = _slot_columns(dnd_class)
+    columns = {resource: uses for resource, uses in sorted(slot_columns.items()) if any(uses)}
+    short_rest_from: Dict[str, int] = {"pact_slot": 1} if "pact_slot" in columns else {}
+    abilities: Dict[str, str] = {}
+    for spec in CLASS_RESOURCES.get(dnd_class.name, []):
+        columns[spec["resource"]] = _fold_forward(spec["uses"])
+        if spec["recovery"] == "short" or "short_rest_from_level" in spec:
+            short_rest_from[spec["resource"]] = spec.get("short_rest_from_level", 1)
+        if "ability" in spec:
+            abilities[spec["resource"]] = spec["ability"]
+    names = tuple(columns)
+    cantrips_known, spells_known, max_spell_level = _spell_progression(dnd_class, slot_columns)
+    return ClassResourceTable(
+        names=names,
+        maxima=[tuple(columns[name][level] for name in names) for level in range(MAX_LEVEL + 1)],
+        short_rest=[frozenset(name for name, first in short_rest_from.items() if level >= first) for level in range(MAX_LEVEL + 1)],
+        abilities=abilities,
+        cantrips_known=cantrips_known,
+        spells_known=spells_known,
+        max_spell_level=max_spell_level,
+    )
+
+
+class ClassResourceTables:
+    def __init__(self):
+        self._tables: Dict[str, ClassResourceTable] = {}
+        self._version: Optional[int] = None
+
+    async def get(self, class_name: Optional[str]) -> Optional[ClassResourceTable]:
+        version = await crud_catalog.current_version()
+        if self._version != version:
+            classes = await crud_catalog.dnd_classes.all()
+            self._tables = {dnd_class.name.lower(): compile_class_table(dnd_class) for dnd_class in classes}
+            if classes:
+                self._version = version
+        return self._tables.get((class_name or "").lower())
+
+
+class_tables = ClassResourceTables()
+
+
+class ResourceSheet:
+    __slots__ = ("character_id", "user_id", "stamp", "maxima", "short_rest", "used", "touched", "loaded_at")
+
+    def __init__(self, character_id: int, user_id: int):
+        self.character_id = character_id
+        self.user_id = user_id
+        self.stamp: Optional[Tuple[Any, ...]] = None
+        self.maxima: Dict[str, int] = {}
+        self.short_rest: FrozenSet[str] = frozenset()
+        self.used: Dict[str, int] = {}
+        self.touched = time.monotonic()
+        self.loaded_at = self.touched # When used was last read from the database
+
+    def state(self) -> CharacterResources:
+        resources = []
+        for resource, maximum in self.maxima.items():
+            used = self.used.get(resource, 0)
+            unlimited = maximum == UNLIMITED
+            resources.append(ResourceState(
+                resource=resource, maximum=None if unlimited else maximum, used=used,
+                remaining=None if unlimited else max(maximum - used, 0),
+                recovery="short" if resource in self.short_rest else "long",
+            ))
+        return CharacterResources(character_id=self.character_id, resources=resources)
+
+
+class ResourceLedger:
+    def __init__(self, flush_interval_seconds: float = 2.0, idle_seconds: float = 1800.0, reload_seconds: float = 30.0):
+        self.flush_interval_seconds = flush_interval_seconds
+        self.idle_seconds = idle_seconds
+        self.reload_seconds = reload_seconds
+        self._sheets: Dict[int, ResourceSheet] = {}
+        self._pending: Dict[Tuple[int, str], int] = {} # Changes in used not yet written
+        self._lock = asyncio.Lock() # Orders flushes, reloads and rests, so none of them reads a half-applied state
+        self._task: Optional[asyncio.Task] = None
+
+    def sheet(self, character_id: int) -> Optional[ResourceSheet]:
+        return self._sheets.get(character_id)
+
+    def fresh_sheet(self, character_id: int) -> Optional[ResourceSheet]:
+        """The cached sheet if its counts were read within reload_seconds; None means load() it."""
+        sheet = self._sheets.get(character_id)
+        if sheet is None or sheet.loaded_at < time.monotonic() - self.reload_seconds:
+            return None
+        return sheet
+
+    async def _refresh(self, sheet: ResourceSheet, character: Any) -> None:
+        """Recomputes the maxima when the character's class, level or charisma changed."""
+        stamp = (character.character_class, character.level, character.charisma, await crud_catalog.current_version())
+        if sheet.stamp == stamp:
+            return
+        table = await class_tables.get(character.character_class)
+        sheet.maxima, sheet.short_rest = {}, frozenset()
+        if table is not None:
+            level = min(max(character.level or 1, 1), MAX_LEVEL)
+            for name, maximum in zip(table.names, table.maxima[level]):
+                ability = table.abilities.get(name)
+                if ability is not None:
+                    maximum = max(maximum + ability_modifier(getattr(character, ability)), 1)
+                if maximum != 0:
+                    sheet.maxima[name] = maximum
+            sheet.short_rest = table.short_rest[level]
+        sheet.stamp = stamp
+
+    def _set_used(self, sheet: ResourceSheet, stored: Dict[str, int]) -> None:
+        """The stored counts plus this worker's unwritten changes."""
+        used = dict(stored)
+        for (character_id, resource), delta in self._pending.items():
+            if character_id == sheet.character_id:
+                used[resource] = max(used.get(resource, 0) + delta, 0)
+        sheet.used = {resource: count for resource, count in used.items() if count > 0}
+        sheet.loaded_at = time.monotonic()
+
+    async def _reload(self, db, character_ids: List[int]) -> None:
+        async with self._lock:
+            stored = await crud_character_resource.get_used(db, character_ids=character_ids)
+            for character_id, used in stored.items():
+                sheet = self._sheets.get(character_id)
+                if sheet is not None:
+                    self._set_used(sheet, used)
+
+    async def load(self, db, characters: List[Any]) -> List[ResourceSheet]:
+        """
+        Sheets for the given characters. The used counts of new sheets, and of sheets older than
+        reload_seconds, are read in one query.
+        """
+        stale_before = time.monotonic() - self.reload_seconds
+        for character in characters:
+            if character.id not in self._sheets:
+                sheet = self._sheets[character.id] = ResourceSheet(character.id, character.user_id)
+                sheet.loaded_at = float("-inf")
+        reload_ids = [character.id for character in characters if self._sheets[character.id].loaded_at < stale_before]
+        if reload_ids:
+            await self._reload(db, reload_ids)
+        sheets = []
+        for character in characters:
+            sheet = self._sheets[character.id]
+            await self._refresh(sheet, character)
+            sheet.touched = time.monotonic()
+            sheets.append(sheet)
+        return sheets
+
+    def spend(self, character_id: int, resource: str, amount: int = 1) -> ResourceSheet:
+        """Spends (or, with a negative amount, regains) uses in memory. Raises ValueError."""
+        sheet = self._sheets.get(character_id)
+        if sheet is None:
+            raise ValueError("Character resources are not loaded.")
+        maximum = sheet.maxima.get(resource)
+        if maximum is None:
+            raise ValueError(f"The character has no '{resource}' resource.")
+        current = sheet.used.get(resource, 0)
+        used = current + amount
+        if maximum != UNLIMITED and used > maximum:
+            raise ValueError(f"Not enough {resource} left ({max(maximum - current, 0)} of {maximum}).")
+        used = max(used, 0)
+        sheet.used[resource] = used
+        sheet.touched = time.monotonic()
+        key = (character_id, resource)
+        self._pending[key] = self._pending.get(key, 0) + used - current
+        return sheet
+
+    async def rest(self, db, characters: List[Any], kind: str) -> RestResult:
+        """A short or long rest for several characters: one statement, whatever the party size."""
+        sheets = await self.load(db, characters)
+        async with self._lock:
+            restored = []
+            if kind == "long":
+                character_ids = [sheet.character_id for sheet in sheets]
+                rested = set(character_ids)
+                self._pending = {key: delta for key, delta in self._pending.items() if key[0] not in rested}
+                hit_points = await crud_character_resource.long_rest(db, character_ids=character_ids)
+                restored = [RestedCharacter(character_id=character_id, hit_points_current=hp, hit_dice_remaining=hit_dice)
+                            for character_id, (hp, hit_dice) in hit_points.items()]
+            else:
+                recovered = []
+                for sheet in sheets:
+                    for resource in sheet.short_rest:
+                        self._pending.pop((sheet.character_id, resource), None)
+                        recovered.append((sheet.character_id, resource))
+                await crud_character_resource.short_rest(db, recovered=recovered)
+            # Re-read rather than clear in memory: picks up whatever other workers wrote meanwhile.
+            stored = await crud_character_resource.get_used(db, character_ids=[sheet.character_id for sheet in sheets])
+            for sheet in sheets:
+                self._set_used(sheet, stored.get(sheet.character_id, {}))
+        return RestResult(kind=kind, resources=[sheet.state() for sheet in sheets], restored=restored)
+
+    def forget(self, character_id: int) -> None:
+        self._sheets.pop(character_id, None)
+        self._pending = {key: delta for key, delta in self._pending.items() if key[0] != character_id}
+
+    async def flush(self) -> None:
+        async with self._lock:
+            if not self._pending:
+                return
+            deltas, self._pending = self._pending, {}
+            try:
+                async with AsyncSessionLocal() as db:
+                    counts = await crud_character_resource.add_used(db, deltas=deltas)
+            except Exception as e:
+                for key, delta in deltas.items(): # Retried with the next flush
+                    self._pending[key] = self._pending.get(key, 0) + delta
+                print(f"Resource ledger: failed to write {len(deltas)} resource change(s): {e}")
+                return
+            # The stored counts include other workers' spends; add what was spent here during the write.
+            for (character_id, resource), count in counts.items():
+                sheet = self._sheets.get(character_id)
+                if sheet is None:
+                    continue
+                used = max(count + self._pending.get((character_id, resource), 0), 0)
+                if used:
+                    sheet.used[resource] = used
+                else:
+                    sheet.used.pop(resource, None)
+
+    def _evict_idle(self) -> None:
+        cutoff = time.monotonic() - self.idle_seconds
+        dirty_ids = {character_id for character_id, _ in self._pending}
+        for character_id in [cid for cid, sheet in self._sheets.items() if sheet.touched < cutoff and cid not in dirty_ids]:
+            del self._sheets[character_id]
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval_seconds)
+            await self.flush()
+            self._evict_idle()
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._run(), name="resource-ledger")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+
+resource_ledger = ResourceLedger(
+    flush_interval_seconds=settings.RESOURCE_FLUSH_INTERVAL_SECONDS,
+    idle_seconds=settings.RESOURCE_LEDGER_IDLE_SECONDS,
+    reload_seconds=settings.RESOURCE_SHEET_RELOAD_SECONDS,
+)
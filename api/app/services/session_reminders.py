@@ -0,0 +1,263 @@
+# Path: api/app/services/session_reminders.py
+# Session reminders driven by Campaign.next_session_utc.
+#
+# Every upcoming reminder (a campaign's next session minus each configured offset)
+# sits in a min-heap ordered by fire time, so the runner only ever sleeps until the
+# head is due; nothing polls the campaigns table. The heap is rebuilt from the
+# database at startup and kept current by the campaign routes through
+# schedule_campaign()/unschedule_campaign(). Rescheduling doesn't search the heap:
+# the campaign's current session time is tracked separately and entries for any
+# other time are dropped when they reach the head.
+#
+# With several API workers each one holds the same heap. Before dispatching, a worker
+# re-reads the campaign (another worker may have moved the session) and inserts the
+# reminder's lease row; only the worker whose insert succeeds notifies anyone, so a
+# reminder is sent once however many workers have it queued. Changes made through
+# another worker (or the CLI job worker) arrive as Postgres notifications: the campaign
+# create/update/delete paths NOTIFY crud_session_reminder.SCHEDULE_CHANNEL with the
+# campaign id in their own transaction, and each scheduler LISTENs on a dedicated
+# connection and re-reads just those campaigns. Notifications sent while a scheduler
+# isn't listening are lost, so the heap is rebuilt whenever the listener (re)connects.
+import abc
+import asyncio
+import heapq
+import itertools
+import json
+import os
+import socket
+import urllib.request
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from app.core.config import settings
+from app.crud import crud_campaign, crud_session_reminder
+from app.db.database import AsyncSessionLocal, engine
+
+# Reminders that came due while no worker was running (e.g. during a deploy) are still
+# sent if they are at most this late; older ones are skipped.
+MISSED_REMINDER_GRACE = timedelta(minutes=15)
+# Lease rows are kept this long after their session so late duplicates still lose the race.
+LEASE_RETENTION = timedelta(days=7)
+# Wait before reconnecting a lost notification listener.
+LISTEN_RETRY_SECONDS = 5.0
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _local_time(moment: datetime, tz_name: str) -> str:
+    try:
+        zone = ZoneInfo(tz_name)
+    except (ZoneInfoNotFoundError, ValueError):
+        zone = timezone.utc
+    return moment.astimezone(zone).isoformat()
+
+
+class ReminderNotifier(abc.ABC):
+    """Delivers one reminder to its recipients."""
+
+    @abc.abstractmethod
+    async def notify(self, reminder: Dict[str, Any], recipients: List[Dict[str, Any]]) -> None:
+        ...
+
+
+class LogNotifier(ReminderNotifier):
+    async def notify(self, reminder: Dict[str, Any], recipients: List[Dict[str, Any]]) -> None:
+        for recipient in recipients:
+            print(
+                f"Session reminder: '{reminder['campaign_title']}' starts in {reminder['minutes_before']} min "
+                f"({recipient['session_local']}) -> {recipient['username']} <{recipient['email']}>"
+            )
+
+
+class WebhookNotifier(ReminderNotifier):
+    """POSTs each reminder as JSON to a webhook (a mailer or push gateway sits behind it)."""
+
+    def __init__(self, url: str, timeout_seconds: float = 10.0):
+        self.url = url
+        self.timeout_seconds = timeout_seconds
+
+    def _post(self, payload: bytes) -> None:
+        request = urllib.request.Request(self.url, data=payload, headers={"Content-Type": "application/json"}, method="POST")
+        with urllib.request.urlopen(request, timeout=self.timeout_seconds) as response:
+            response.read()
+
+    async def notify(self, reminder: Dict[str, Any], recipients: List[Dict[str, Any]]) -> None:
+        payload = json.dumps({**reminder, "recipients": recipients}).encode("utf-8")
+        await asyncio.to_thread(self._post, payload)
+
+
+def build_notifier() -> ReminderNotifier:
+    if settings.SESSION_REMINDER_NOTIFIER == "webhook":
+        if not settings.SESSION_REMINDER_WEBHOOK_URL:
+            raise ValueError("SESSION_REMINDER_WEBHOOK_URL must be set when SESSION_REMINDER_NOTIFIER is 'webhook'.")
+        return WebhookNotifier(settings.SESSION_REMINDER_WEBHOOK_URL)
+    return LogNotifier()
+
+
+# (fire_at, tie-breaker, campaign_id, session_utc, offset_minutes)
+_HeapEntry = Tuple[datetime, int, int, datetime, int]
+
+
+class SessionReminderScheduler:
+    def __init__(self, offsets_minutes: Sequence[int], notifier: Optional[ReminderNotifier] = None,
+                 worker_id: Optional[str] = None):
+        self.offsets_minutes = sorted(set(offsets_minutes), reverse=True)
+        self.notifier = notifier
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self._heap: List[_HeapEntry] = []
+        self._sessions: Dict[int, datetime] = {} # campaign_id -> session time its heap entries are for
+        self._counter = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._changed: "asyncio.Queue[Optional[int]]" = asyncio.Queue() # Notified campaign ids; None: connection lost
+        self._task: Optional[asyncio.Task] = None
+        self._listener: Optional[asyncio.Task] = None
+
+    def schedule_campaign(self, campaign_id: int, next_session_utc: Optional[datetime]) -> None:
+        """(Re)schedules a campaign's reminders; None cancels them."""
+        if next_session_utc is None:
+            self.unschedule_campaign(campaign_id)
+            return
+        if next_session_utc.tzinfo is None:
+            next_session_utc = next_session_utc.replace(tzinfo=timezone.utc)
+        if self._sessions.get(campaign_id) == next_session_utc:
+            return
+        self._sessions[campaign_id] = next_session_utc
+        earliest = _utcnow() - MISSED_REMINDER_GRACE
+        for offset in self.offsets_minutes:
+            fire_at = next_session_utc - timedelta(minutes=offset)
+            if fire_at >= earliest:
+                heapq.heappush(self._heap, (fire_at, next(self._counter), campaign_id, next_session_utc, offset))
+        self._wakeup.set()
+
+    def unschedule_campaign(self, campaign_id: int) -> None:
+        if self._sessions.pop(campaign_id, None) is not None:
+            self._wakeup.set()
+
+    def _is_current(self, entry: _HeapEntry) -> bool:
+        return self._sessions.get(entry[2]) == entry[3]
+
+    def _drop_stale_head(self) -> None:
+        while self._heap and not self._is_current(self._heap[0]):
+            heapq.heappop(self._heap)
+
+    def _lease_cutoff(self) -> datetime:
+        longest_offset = timedelta(minutes=max(self.offsets_minutes, default=0))
+        return _utcnow() - longest_offset - LEASE_RETENTION
+
+    async def rebuild(self) -> None:
+        """Replaces the heap with every upcoming session in the database."""
+        async with AsyncSessionLocal() as db:
+            sessions = await crud_session_reminder.get_upcoming_sessions(db, after=_utcnow() - MISSED_REMINDER_GRACE)
+            removed = await crud_session_reminder.delete_reminder_leases_before(db, before=self._lease_cutoff())
+        self._heap = []
+        self._sessions = {}
+        for campaign_id, session_utc in sessions:
+            self.schedule_campaign(campaign_id, session_utc)
+        print(f"Session reminders: scheduled {len(self._heap)} reminder(s) for {len(sessions)} campaign(s); "
+              f"removed {removed} old lease(s).")
+
+    async def start(self) -> None:
+        if self.notifier is None:
+            self.notifier = build_notifier()
+        self._listener = asyncio.create_task(self._listen(), name="session-reminders-listener")
+        self._task = asyncio.create_task(self._run(), name="session-reminders")
+
+    async def stop(self) -> None:
+        for task in (self._listener, self._task):
+            if task is not None:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._listener = self._task = None
+
+    def _on_notification(self, connection: Any, pid: int, channel: str, payload: str) -> None:
+        try:
+            self._changed.put_nowait(int(payload))
+        except ValueError:
+            print(f"Session reminders: ignoring notification {payload!r}")
+
+    async def _listen(self) -> None:
+        """Keeps a LISTEN connection open and applies the campaigns it reports; rebuilds on every (re)connect."""
+        while True:
+            try:
+                async with engine.connect() as conn:
+                    try:
+                        driver_connection = (await conn.get_raw_connection()).driver_connection
+                        driver_connection.add_termination_listener(lambda _connection: self._changed.put_nowait(None))
+                        await driver_connection.add_listener(crud_session_reminder.SCHEDULE_CHANNEL, self._on_notification)
+                        await self.rebuild() # Anything changed while nobody was listening
+                        while True:
+                            campaign_ids = {await self._changed.get()}
+                            while not self._changed.empty():
+                                campaign_ids.add(self._changed.get_nowait())
+                            if None in campaign_ids:
+                                break # The rebuild after reconnecting covers these too
+                            await self._apply_changes(campaign_ids)
+                    finally:
+                        await conn.invalidate() # Still LISTENing: never hand it back to the pool
+                print("Session reminders: notification connection lost; reconnecting.")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Session reminders: notification listener failed: {e}")
+            await asyncio.sleep(LISTEN_RETRY_SECONDS)
+
+    async def _apply_changes(self, campaign_ids: Set[int]) -> None:
+        async with AsyncSessionLocal() as db:
+            sessions = await crud_session_reminder.get_session_times(db, campaign_ids=list(campaign_ids))
+        for campaign_id in campaign_ids:
+            self.schedule_campaign(campaign_id, sessions.get(campaign_id)) # Missing: deleted
+
+    async def _run(self) -> None:
+        while True:
+            self._wakeup.clear()
+            self._drop_stale_head()
+            if not self._heap:
+                await self._wakeup.wait()
+                continue
+            delay = (self._heap[0][0] - _utcnow()).total_seconds()
+            if delay > 0:
+                # Sleep until the head is due or a reschedule changes what the head is.
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            _, _, campaign_id, session_utc, offset = heapq.heappop(self._heap)
+            try:
+                await self._fire(campaign_id, session_utc, offset)
+            except Exception as e:
+                print(f"Session reminders: failed to send reminder for campaign {campaign_id}: {e}")
+
+    async def _fire(self, campaign_id: int, session_utc: datetime, offset_minutes: int) -> None:
+        async with AsyncSessionLocal() as db:
+            campaign = await crud_campaign.get_campaign_summary(db=db, campaign_id=campaign_id)
+            if campaign is None or campaign.next_session_utc != session_utc:
+                return # Deleted or rescheduled through another worker
+            claimed = await crud_session_reminder.claim_reminder(
+                db, campaign_id=campaign_id, session_utc=session_utc,
+                offset_minutes=offset_minutes, worker_id=self.worker_id
+            )
+            if not claimed:
+                return # Another worker is sending this one
+            # Leases only grow here, so this is where the old ones go.
+            await crud_session_reminder.delete_reminder_leases_before(db, before=self._lease_cutoff())
+            recipients = await crud_session_reminder.get_reminder_recipients(db, campaign_id=campaign_id)
+        reminder = {
+            "type": "session_reminder",
+            "campaign_id": campaign_id,
+            "campaign_title": campaign.title,
+            "session_utc": session_utc.isoformat(),
+            "minutes_before": offset_minutes,
+        }
+        for recipient in recipients:
+            recipient["session_local"] = _local_time(session_utc, recipient["timezone"])
+        await self.notifier.notify(reminder, recipients)
+
+
+reminder_scheduler = SessionReminderScheduler(settings.SESSION_REMINDER_OFFSETS_MINUTES)
@@ -0,0 +1,72 @@
+# Path: api/app/services/timing_wheel.py
+# Hierarchical timing wheel.
+#
+# Level 0 has one bucket per tick for the next `slots` ticks; level k buckets each
+# cover slots**k ticks. A timer sits in the lowest level whose range reaches its
+# deadline and is moved down a level when the wheel reaches its bucket, so advancing
+# one tick only touches the timers due in that tick plus, every slots**k ticks, one
+# bucket of level k. Scheduling and cancelling are O(1); nothing is ever scanned.
+#
+# Ticks are abstract: the condition tracker runs one wheel per campaign ticked by
+# initiative turns and one shared wheel ticked by seconds.
+from typing import Any, List
+
+
+class Timer:
+    __slots__ = ("deadline", "item", "cancelled")
+
+    def __init__(self, deadline: int, item: Any):
+        self.deadline = deadline
+        self.item = item
+        self.cancelled = False
+
+    def cancel(self) -> None:
+        """Lazy: the timer stays in its bucket and is dropped when the wheel reaches it."""
+        self.cancelled = True
+
+
+class TimingWheel:
+    def __init__(self, slots: int = 64, levels: int = 4):
+        self.slots = slots
+        self.levels = levels
+        self.now = 0
+        self._spans = [slots ** level for level in range(levels)]
+        self._buckets: List[List[List[Timer]]] = [[[] for _ in range(slots)] for _ in range(levels)]
+
+    def _place(self, timer: Timer) -> None:
+        delay = timer.deadline - self.now
+        for level in range(self.levels):
+            if delay < self._spans[level] * self.slots or level == self.levels - 1:
+                self._buckets[level][(timer.deadline // self._spans[level]) % self.slots].append(timer)
+                return
+
+    def schedule(self, delay: int, item: Any) -> Timer:
+        """Fires `item` after `delay` ticks (at least one)."""
+        timer = Timer(self.now + max(int(delay), 1), item)
+        self._place(timer)
+        return timer
+
+    def advance(self, ticks: int = 1) -> List[Any]:
+        """Moves the wheel forward; returns the items that came due, in deadline order."""
+        due: List[Any] = []
+        for _ in range(ticks):
+            self.now += 1
+            # Bring the higher-level buckets that start at this tick down a level.
+            for level in range(1, self.levels):
+                if self.now % self._spans[level]:
+                    break
+                index = (self.now // self._spans[level]) % self.slots
+                bucket, self._buckets[level][index] = self._buckets[level][index], []
+                for timer in bucket:
+                    if not timer.cancelled:
+                        self._place(timer)
+            index = self.now % self.slots
+            bucket, self._buckets[0][index] = self._buckets[0][index], []
+            for timer in bucket:
+                if timer.cancelled:
+                    continue
+                if timer.deadline <= self.now:
+                    due.append(timer.item)
+                else:
+                    self._place(timer) # Top-level overflow that wrapped around
+        return due
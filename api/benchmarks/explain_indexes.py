@@ -0,0 +1,98 @@
+# Path: api/benchmarks/explain_indexes.py
+# Checks that the hot filter paths are served by their indexes.
+#
+# Run from the api/ directory against a migrated database:
+#   python -m benchmarks.explain_indexes
+#
+# Each query is EXPLAINed with sequential scans disabled, so the check works
+# even on a nearly empty dev database where the planner would otherwise
+# (correctly) prefer a seq scan. It fails if the plan doesn't use the
+# expected index, which is what happens when an index is missing or can't
+# serve the query's predicate.
+import asyncio
+import json
+import sys
+from typing import Any, Dict, Iterator, List, Tuple
+
+from sqlalchemy import text
+
+from app.db.database import engine
+
+# (description, expected index, SQL). Parameters are literal so EXPLAIN can plan them.
+HOT_QUERIES: List[Tuple[str, str, str]] = [
+    (
+        "campaign members by status",
+        "ix_campaign_members_campaign_status_joined",
+        "SELECT * FROM campaign_members WHERE campaign_id = 1 AND status = 'PENDING_APPROVAL' "
+        "ORDER BY joined_at",
+    ),
+    (
+        "user memberships by status",
+        "ix_campaign_members_user_status_joined",
+        "SELECT * FROM campaign_members WHERE user_id = 1 AND status = 'ACTIVE' ORDER BY joined_at DESC",
+    ),
+    (
+        "active session for campaign",
+        "uq_campaign_sessions_one_active_per_campaign",
+        "SELECT * FROM campaign_sessions WHERE campaign_id = 1 AND is_active",
+    ),
+    (
+        "characters for user",
+        "ix_characters_user_id_name",
+        "SELECT * FROM characters WHERE user_id = 1 ORDER BY name",
+    ),
+    (
+        "discoverable campaigns",
+        "ix_campaigns_open_for_recruitment_updated_at",
+        "SELECT * FROM campaigns WHERE is_open_for_recruitment ORDER BY updated_at DESC LIMIT 20",
+    ),
+    (
+        "character item lookup",
+        "_character_item_uc",
+        "SELECT * FROM character_items WHERE character_id = 1 AND item_id = 1",
+    ),
+    (
+        "character skill lookup",
+        "_character_skill_uc",
+        "SELECT * FROM character_skills WHERE character_id = 1 AND skill_id = 1",
+    ),
+]
+
+
+def _walk_plan(node: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    yield node
+    for child in node.get("Plans", []):
+        yield from _walk_plan(child)
+
+
+async def explain_hot_queries() -> List[Dict[str, Any]]:
+    results = []
+    async with engine.connect() as conn:
+        await conn.execute(text("SET enable_seqscan = off"))
+        for description, expected_index, sql in HOT_QUERIES:
+            raw = (await conn.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"))).scalar_one()
+            plan = (json.loads(raw) if isinstance(raw, str) else raw)[0]["Plan"]
+            used = sorted({node["Index Name"] for node in _walk_plan(plan) if "Index Name" in node})
+            results.append({
+                "query": description,
+                "expected_index": expected_index,
+                "indexes_used": used,
+                "ok": expected_index in used,
+                "total_cost": plan.get("Total Cost"),
+            })
+        await conn.rollback()
+    await engine.dispose()
+    return results
+
+
+def main() -> int:
+    results = asyncio.run(explain_hot_queries())
+    for result in results:
+        status = "OK  " if result["ok"] else "FAIL"
+        used = ", ".join(result["indexes_used"]) or "no index"
+        print(f"{status} {result['query']:<32} expected {result['expected_index']} -> used {used}")
+    return 0 if all(result["ok"] for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,139 @@
+# Path: api/benchmarks/serialization.py
+# Compares per-route response serialization cost: FastAPI's response_model path
+# against app.core.responses.model_response.
+#
+# Run from the api/ directory (no database needed):
+#   python -m benchmarks.serialization [--repeat 200]
+#
+# Payloads are synthetic ORM-like objects shaped like each route's response model, sized
+# like a busy table (a campaign with a full party, a user's characters, the spell list).
+# "response_model" is what FastAPI does for a returned ORM object: validate it, dump it to
+# Python data in JSON mode, then json.dumps() that in JSONResponse.render().
+# "model_response" validates once and has pydantic-core write the bytes directly.
+import argparse
+import enum
+import time
+from datetime import date, datetime, timezone
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Tuple, Type, Union, get_args, get_origin
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, EmailStr
+
+from app.core.responses import _adapter, model_response
+from app.schemas.campaign import Campaign as CampaignSchema, CampaignMember as CampaignMemberSchema
+from app.schemas.character import Character as CharacterSchema
+from app.schemas.spell import Spell as SpellSchema
+
+LIST_LENGTH = 8 # Items per nested list (skills, inventory, known spells...)
+
+
+def _bounds(metadata: List[Any]) -> Dict[str, Any]:
+    """Collects the ge/gt/le/lt/min_length/max_length constraints on a field."""
+    bounds: Dict[str, Any] = {}
+    for constraint in metadata:
+        for name in ("ge", "gt", "le", "lt", "min_length", "max_length"):
+            value = getattr(constraint, name, None)
+            if value is not None:
+                bounds[name] = value
+    return bounds
+
+
+def _sample_number(value: Union[int, float], bounds: Dict[str, Any]) -> Union[int, float]:
+    step = 1 if isinstance(value, int) else 0.5
+    if "ge" in bounds:
+        value = max(value, bounds["ge"])
+    if "gt" in bounds:
+        value = max(value, bounds["gt"] + step)
+    if "le" in bounds:
+        value = min(value, bounds["le"])
+    if "lt" in bounds:
+        value = min(value, bounds["lt"] - step)
+    return value
+
+
+def _sample_value(annotation: Any, depth: int, metadata: List[Any] = ()) -> Any:
+    bounds = _bounds(metadata)
+    origin = get_origin(annotation)
+    if origin is Union:
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        return _sample_value(args[0], depth, metadata) if args else None
+    if origin in (list, List):
+        (item,) = get_args(annotation) or (str,)
+        if isinstance(item, type) and issubclass(item, BaseModel) and depth > 2:
+            return []
+        return [_sample_value(item, depth + 1) for _ in range(min(LIST_LENGTH, bounds.get("max_length", LIST_LENGTH)))]
+    if origin in (dict, Dict):
+        return {"key": "value"}
+    if annotation is EmailStr:
+        return "adventurer@example.com"
+    if isinstance(annotation, type):
+        if issubclass(annotation, BaseModel):
+            # Single nested objects (a member's user, a skill's definition) are usually
+            # required, so they are built one level deeper than nested lists.
+            return sample_object(annotation, depth + 1) if depth <= 3 else None
+        if issubclass(annotation, enum.Enum):
+            return next(iter(annotation))
+        if issubclass(annotation, bool):
+            return True
+        if issubclass(annotation, int):
+            return _sample_number(12, bounds)
+        if issubclass(annotation, float):
+            return _sample_number(12.5, bounds)
+        if issubclass(annotation, datetime):
+            return datetime(2024, 1, 1, tzinfo=timezone.utc)
+        if issubclass(annotation, date):
+            return date(2024, 1, 1)
+    text = "Lorem ipsum dolor sit amet, consectetur adipiscing elit."
+    return text[:bounds.get("max_length", len(text))]
+
+
+def sample_object(schema: Type[BaseModel], depth: int = 0) -> SimpleNamespace:
+    """An attribute bag shaped like `schema` and within its field constraints, standing in for a loaded ORM row."""
+    return SimpleNamespace(**{
+        name: _sample_value(field.annotation, depth, field.metadata) for name, field in schema.model_fields.items()
+    })
+
+
+def response_model_path(objects: Any, schema: Type[BaseModel]) -> bytes:
+    adapter = _adapter(schema, isinstance(objects, list))
+    content = adapter.dump_python(adapter.validate_python(objects, from_attributes=True), mode="json")
+    return JSONResponse(content=content).body
+
+
+def model_response_path(objects: Any, schema: Type[BaseModel]) -> bytes:
+    return model_response(objects, schema).body
+
+
+ROUTES: List[Tuple[str, Type[BaseModel], Callable[[], Any]]] = [
+    ("GET /campaigns/{id}/", CampaignSchema, lambda: sample_object(CampaignSchema)),
+    ("GET /campaigns/{id}/members", CampaignMemberSchema, lambda: [sample_object(CampaignMemberSchema) for _ in range(6)]),
+    ("GET /characters/", CharacterSchema, lambda: [sample_object(CharacterSchema) for _ in range(20)]),
+    ("GET /spells/", SpellSchema, lambda: [sample_object(SpellSchema) for _ in range(320)]),
+]
+
+
+def _time_per_call(func: Callable[[], Any], repeat: int) -> float:
+    func() # Warm up (builds the cached TypeAdapter)
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - started) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare response serialization cost per route.")
+    parser.add_argument("--repeat", type=int, default=200, help="Calls per route and path (default 200)")
+    args = parser.parse_args()
+
+    print(f"{'route':<30} {'bytes':>9} {'response_model':>15} {'model_response':>15} {'speedup':>8}")
+    for route, schema, build in ROUTES:
+        objects = build()
+        size = len(model_response_path(objects, schema))
+        baseline = _time_per_call(lambda: response_model_path(objects, schema), args.repeat)
+        fast = _time_per_call(lambda: model_response_path(objects, schema), args.repeat)
+        print(f"{route:<30} {size:>9} {baseline * 1000:>12.3f} ms {fast * 1000:>12.3f} ms {baseline / fast:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+# Path: api/benchmarks/ws_frames.py
+# Compares campaign socket framing: frame size and encode cost per broadcast.
+#
+# Run from the api/ directory (no database needed):
+#   python -m benchmarks.ws_frames [--repeat 2000] [--subscribers 6]
+#
+# "per recipient" is the old send_json loop (json.dumps once per subscriber);
+# "json" and "msgpack" encode once per broadcast with app.core.ws_protocol and reuse
+# the frame for every subscriber. msgpack is skipped when the package isn't installed.
+import argparse
+import json
+import random
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+from app.core import ws_protocol
+
+
+def token_drag() -> Dict[str, Any]:
+    return {"type": "map_patch", "payload": {"tokens": {"char_12": {"x": 14, "y": 9}}}}
+
+
+def map_update() -> Dict[str, Any]:
+    tokens = {f"tok_{index}": {"x": random.randint(0, 40), "y": random.randint(0, 30), "character_id": index, "size": "Medium"}
+              for index in range(40)}
+    terrain = {f"{x},{y}": "difficult" for x in range(10) for y in range(10)}
+    return {"type": "map_update", "payload": {"version": 42, "grid": {"cell_size_ft": 5}, "tokens": tokens, "terrain": terrain}}
+
+
+def monster_pool_delta() -> Dict[str, Any]:
+    ids = list(range(1, 201))
+    return {"type": "monster_pool_delta", "payload": {
+        "op": "move_monsters", "ids": ids, "x": [random.randint(0, 40) for _ in ids], "y": [random.randint(0, 30) for _ in ids],
+    }}
+
+
+MESSAGES: List[Tuple[str, Callable[[], Dict[str, Any]]]] = [
+    ("token drag (map_patch)", token_drag),
+    ("map_update, 40 tokens", map_update),
+    ("move 200 monsters", monster_pool_delta),
+]
+
+
+def _time_per_call(func: Callable[[], Any], repeat: int) -> float:
+    func()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - started) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare WebSocket frame size and encode cost per broadcast.")
+    parser.add_argument("--repeat", type=int, default=2000, help="Broadcasts per message and codec (default 2000)")
+    parser.add_argument("--subscribers", type=int, default=6, help="Sockets per campaign (default 6)")
+    args = parser.parse_args()
+
+    codecs = [ws_protocol.CODECS[name] for name in (ws_protocol.SUBPROTOCOL_JSON, ws_protocol.SUBPROTOCOL_MSGPACK) if name in ws_protocol.CODECS]
+    if len(codecs) == 1:
+        print("msgpack is not installed; comparing JSON framings only.")
+
+    print(f"{'message':<26} {'framing':<16} {'bytes':>7} {'per broadcast':>15}")
+    for label, build in MESSAGES:
+        message = build()
+        per_recipient = lambda: [json.dumps(message) for _ in range(args.subscribers)]
+        print(f"{label:<26} {'per recipient':<16} {len(json.dumps(message)):>7} {_time_per_call(per_recipient, args.repeat) * 1e6:>12.1f} us")
+        for codec in codecs:
+            size = len(codec.encode(message))
+            cost = _time_per_call(lambda: codec.encode(message), args.repeat)
+            print(f"{'':<26} {codec.subprotocol.split('.')[1]:<16} {size:>7} {cost * 1e6:>12.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,4 @@
+# Path: api/tests/conftest.py
+# Run from the api/ directory: python -m pytest tests
+# These tests need no database; anything that would query one is replaced per test.
+import app.db.base # noqa: F401  Configures every model's mappers before services import them
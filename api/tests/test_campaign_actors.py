@@ -0,0 +1,298 @@
+# Path: api/tests/test_campaign_actors.py
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.orm.exc import StaleDataError
+
+from app.services import campaign_actors
+from app.services.campaign_actors import COMMAND_HANDLERS, CampaignActor
+
+
+class FakeSession:
+    """Stands in for the campaign's active CampaignSession row."""
+
+    def __init__(self):
+        self.id = 1
+        self.version_id = 1
+        self.map_state = {"tokens": {}}
+        self.active_initiative_entry_id = None
+
+
+@pytest.fixture
+def campaign(monkeypatch):
+    """An actor for campaign 7 with its database calls replaced; records what it writes and publishes."""
+    state = SimpleNamespace(session=FakeSession(), saves=[], published=[])
+
+    @asynccontextmanager
+    async def session_local():
+        async def rollback():
+            pass
+        yield SimpleNamespace(rollback=rollback)
+
+    async def get_active_session(db, campaign_id):
+        return state.session
+
+    async def save_map_state(db, session, map_state):
+        state.saves.append(map_state)
+        session.map_state = map_state
+        session.version_id += 1
+        return session
+
+    async def get_checkpoint(db, campaign_id):
+        return None
+
+    async def publish(message, campaign_id):
+        state.published.append(message)
+
+    monkeypatch.setattr(campaign_actors, "AsyncSessionLocal", session_local)
+    monkeypatch.setattr(campaign_actors.crud_campaign_session, "get_active_session_for_campaign", get_active_session)
+    monkeypatch.setattr(campaign_actors.crud_campaign_session, "save_map_state", save_map_state)
+    monkeypatch.setattr(campaign_actors.crud_encounter_checkpoint, "get_checkpoint", get_checkpoint)
+    state.publish = publish
+    return state
+
+
+def test_commands_run_in_submission_order(campaign, monkeypatch):
+    ran = []
+
+    async def record(actor, batch, payload):
+        await asyncio.sleep(0) # Let the other senders run; the actor must still keep the order
+        ran.append(payload["n"])
+        return []
+
+    monkeypatch.setitem(COMMAND_HANDLERS, "record", record)
+
+    async def scenario():
+        actor = CampaignActor(7, campaign.publish, max_batch=4)
+        actor.start()
+
+        async def sender(start):
+            for n in range(start, start + 10):
+                assert actor.submit("record", {"n": n})
+                await asyncio.sleep(0)
+
+        await asyncio.gather(sender(0), sender(100))
+        await actor.stop()
+        return actor
+
+    actor = asyncio.run(scenario())
+    assert sorted(ran) == list(range(10)) + list(range(100, 110))
+    assert [n for n in ran if n < 100] == list(range(10))
+    assert [n for n in ran if n >= 100] == list(range(100, 110))
+    assert actor.max_batch_seen <= 4
+
+
+def test_map_patches_in_a_batch_are_merged_and_written_once(campaign):
+    async def scenario():
+        actor = CampaignActor(7, campaign.publish)
+        # Queued before the task starts, so all three land in its first batch.
+        actor.submit("map_patch", {"tokens": {"a": {"x": 1, "y": 1}}})
+        actor.submit("map_patch", {"tokens": {"b": {"x": 2, "y": 2}}})
+        actor.submit("map_patch", {"tokens": {"a": {"x": 5, "y": 6}}})
+        actor.start()
+        await actor.stop()
+
+    asyncio.run(scenario())
+    assert len(campaign.saves) == 1
+    assert campaign.saves[0]["tokens"]["a"] == {"x": 5, "y": 6}
+    assert campaign.saves[0]["tokens"]["b"] == {"x": 2, "y": 2}
+    assert [message["type"] for message in campaign.published] == ["map_update"]
+
+
+def test_call_returns_the_written_version_and_reports_a_stale_if_match(campaign):
+    async def scenario():
+        actor = CampaignActor(7, campaign.publish)
+        actor.start()
+        version = await actor.call("map_patch", {"tokens": {"a": {"x": 1, "y": 1}}}, expected_version=1)
+        with pytest.raises(StaleDataError):
+            await actor.call("map_patch", {"tokens": {"a": {"x": 2, "y": 2}}}, expected_version=1)
+        await actor.stop()
+        return version
+
+    assert asyncio.run(scenario()) == 2
+    assert len(campaign.saves) == 1
+
+
+def test_call_raises_the_handler_error_and_the_actor_keeps_going(campaign, monkeypatch):
+    async def fail(actor, batch, payload):
+        raise ValueError("bad payload")
+
+    async def succeed(actor, batch, payload):
+        batch.command.result = "done"
+        return []
+
+    monkeypatch.setitem(COMMAND_HANDLERS, "fail", fail)
+    monkeypatch.setitem(COMMAND_HANDLERS, "succeed", succeed)
+
+    async def scenario():
+        actor = CampaignActor(7, campaign.publish)
+        actor.start()
+        with pytest.raises(ValueError, match="bad payload"):
+            await actor.call("fail", {})
+        result = await actor.call("succeed", {})
+        await actor.stop()
+        return result
+
+    assert asyncio.run(scenario()) == "done"
+
+
+def test_checkpoints_are_debounced_and_written_again_at_retire(campaign, monkeypatch):
+    writes = []
+
+    async def write_checkpoint(db, campaign_id, expected_version, state):
+        writes.append(expected_version)
+        return expected_version + 1
+
+    monkeypatch.setattr(campaign_actors.crud_encounter_checkpoint, "write_checkpoint", write_checkpoint)
+
+    async def scenario():
+        actor = CampaignActor(7, campaign.publish, checkpoint_interval_seconds=60.0)
+        actor.start()
+        for roll in range(5):
+            await actor.call("start_encounter", [{"id": 1, "roll": roll}])
+        assert actor.checkpoint_pending
+        await actor.stop()
+        return actor
+
+    actor = asyncio.run(scenario())
+    # The first change is saved at once, the other four together when the actor retires.
+    assert writes == [0, 1]
+    assert actor.checkpoint_version == 2
+    assert not actor.checkpoint_pending
+
+
+def test_after_a_conflict_the_owner_takes_the_row_over_and_keeps_saving(campaign, monkeypatch):
+    # Another (older) worker wrote v5 behind this actor's back, as in a rolling deploy.
+    stored = SimpleNamespace(version=5, state={"owner_started_at": 0.0})
+    writes = []
+
+    async def get_checkpoint(db, campaign_id):
+        return stored
+
+    async def write_checkpoint(db, campaign_id, expected_version, state):
+        writes.append((expected_version, state["encounter"]["initiative_entries"][0]["roll"]))
+        if expected_version != stored.version:
+            return None
+        stored.version += 1
+        return stored.version
+
+    monkeypatch.setattr(campaign_actors.crud_encounter_checkpoint, "write_checkpoint", write_checkpoint)
+
+    async def scenario():
+        actor = CampaignActor(7, campaign.publish, checkpoint_interval_seconds=60.0)
+        actor.start()
+        await actor.restored.wait()
+        monkeypatch.setattr(campaign_actors.crud_encounter_checkpoint, "get_checkpoint", get_checkpoint)
+        await actor.call("start_encounter", [{"id": 1, "roll": 12}])
+        await actor.call("start_encounter", [{"id": 1, "roll": 15}])
+        await actor.stop()
+        return actor
+
+    actor = asyncio.run(scenario())
+    assert actor.checkpoint_conflicts == 1
+    assert not actor.superseded
+    # The conflicting write is retried on the stored version; the later change is saved at retire.
+    assert writes == [(0, 12), (5, 12), (6, 15)]
+    assert actor.checkpoint_version == 7
+
+
+def test_after_a_conflict_with_a_newer_actor_this_one_stops_serving(campaign, monkeypatch):
+    writes = []
+
+    async def write_checkpoint(db, campaign_id, expected_version, state):
+        writes.append(expected_version)
+        return None
+
+    async def scenario():
+        actor = CampaignActor(7, campaign.publish)
+        stored = SimpleNamespace(version=3, state={"owner_started_at": actor.started_at + 60})
+
+        async def get_checkpoint(db, campaign_id):
+            return stored
+
+        actor.start()
+        await actor.restored.wait()
+        monkeypatch.setattr(campaign_actors.crud_encounter_checkpoint, "get_checkpoint", get_checkpoint)
+        monkeypatch.setattr(campaign_actors.crud_encounter_checkpoint, "write_checkpoint", write_checkpoint)
+        await actor.call("start_encounter", [{"id": 1, "roll": 12}])
+        with pytest.raises(campaign_actors.ActorBusyError):
+            await actor.call("next_turn", {})
+        await actor.stop()
+        return actor
+
+    actor = asyncio.run(scenario())
+    assert actor.superseded
+    assert writes == [0] # Neither retried nor written again at retire
+    assert campaign.published[-1]["type"] == "error"
+
+
+def test_restored_is_set_even_if_waiting_for_the_previous_actor_fails(campaign):
+    class BrokenPrevious:
+        async def finished(self):
+            raise RuntimeError("boom")
+
+    async def scenario():
+        actor = CampaignActor(7, campaign.publish, previous=BrokenPrevious())
+        actor.start()
+        await asyncio.wait_for(actor.restored.wait(), timeout=1)
+        await actor.stop()
+
+    asyncio.run(scenario())
+
+
+def test_seconds_expiries_run_in_the_actor_and_are_checkpointed(campaign, monkeypatch):
+    writes, deletes = [], []
+
+    async def get_initiative_order(db, session_id):
+        return []
+
+    async def write_checkpoint(db, campaign_id, expected_version, state):
+        writes.append(state["conditions"])
+        return expected_version + 1
+
+    async def delete_checkpoint(db, campaign_id, expected_version):
+        deletes.append(expected_version)
+        return True
+
+    monkeypatch.setattr(campaign_actors.crud_campaign_session, "get_initiative_order", get_initiative_order)
+    monkeypatch.setattr(campaign_actors.crud_encounter_checkpoint, "write_checkpoint", write_checkpoint)
+    monkeypatch.setattr(campaign_actors.crud_encounter_checkpoint, "delete_checkpoint", delete_checkpoint)
+    tracker = campaign_actors.condition_tracker
+    monkeypatch.setattr(tracker, "publish", campaign.publish)
+
+    async def scenario():
+        actor = CampaignActor(7, campaign.publish, checkpoint_interval_seconds=60.0)
+        monkeypatch.setitem(campaign_actors.campaign_actors._actors, 7, actor)
+        actor.start()
+        await actor.call("apply_condition", {"condition": "poisoned", "targets": [{"character_id": 5}], "duration": {"seconds": 1}})
+        monkeypatch.setattr(tracker, "_started_at", time.monotonic() - tracker.clock.now - 1) # One second passes
+        tracker._tick_seconds()
+        assert tracker.snapshot(7) # Still there: the clock only queued the expiry
+        await actor.stop()
+        return actor
+
+    asyncio.run(scenario())
+    assert [message["type"] for message in campaign.published] == ["condition_applied", "condition_expired"]
+    assert len(writes) == 1 and writes[0]["effects"][0]["condition"] == "poisoned"
+    assert deletes == [1] # The expiry was checkpointed: nothing left, so the row goes
+
+
+def test_a_malformed_websocket_map_patch_is_rejected_before_merging(campaign):
+    replies = []
+
+    async def reply(message):
+        replies.append(message)
+
+    async def scenario():
+        actor = CampaignActor(7, campaign.publish)
+        actor.submit("map_patch", {"tokens": ["goblin_1"]}, reply=reply)
+        actor.submit("map_patch", {"tokens": {"a": {"x": 1, "y": 1}}})
+        actor.start()
+        await actor.stop()
+
+    asyncio.run(scenario())
+    assert [message["type"] for message in replies] == ["error"]
+    assert campaign.saves == [{"tokens": {"a": {"x": 1, "y": 1}}, "version": 1}]
@@ -0,0 +1,28 @@
+# Path: api/tests/test_movement.py
+import pytest
+
+from app.services import movement
+
+
+def test_token_position_rejects_tokens_without_a_valid_position():
+    battle_map = movement.BattleMap({"tokens": {
+        "ok": {"x": 1, "y": "2"}, "no_y": {"x": 1}, "not_a_dict": "goblin", "bad_x": {"x": "left", "y": 1},
+    }})
+    assert battle_map.token_position("ok") == (1, 2)
+    for token_id in ("no_y", "not_a_dict", "bad_x", "missing"):
+        with pytest.raises(ValueError):
+            battle_map.token_position(token_id)
+    with pytest.raises(ValueError):
+        battle_map.token_position(["ok"])
+    # A malformed token elsewhere on the map is skipped by the search, not fatal to it.
+    assert movement.compute_movement(battle_map, "ok", 5).origin == (1, 2)
+
+
+@pytest.mark.parametrize("target", [[1], [1, 2, 3], "1,2", [1, None], [1, "x"], {"x": 1, "y": 2}])
+def test_parse_target_cell_rejects_malformed_targets(target):
+    with pytest.raises(ValueError):
+        movement.parse_target_cell(target)
+
+
+def test_parse_target_cell_accepts_an_xy_pair():
+    assert movement.parse_target_cell([3, "4"]) == (3, 4)
@@ -0,0 +1,129 @@
+# Path: api/tests/test_ws_protocol.py
+import asyncio
+import json
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from app.core import ws_protocol
+from app.core.ws_protocol import FrameError, JSONCodec, MESSAGE_TYPE_CODES
+
+msgpack = pytest.importorskip("msgpack")
+
+
+class FakeWebSocket:
+    """Just what negotiate/accept/receive touch."""
+
+    def __init__(self, subprotocols=None, events=None):
+        self.scope = {"subprotocols": subprotocols or []}
+        self.state = SimpleNamespace()
+        self.accepted_subprotocol = "not accepted"
+        self._events = list(events or [])
+
+    async def accept(self, subprotocol=None):
+        self.accepted_subprotocol = subprotocol
+
+    async def receive(self):
+        return self._events.pop(0)
+
+
+MESSAGES = [
+    {"type": "map_patch", "payload": {"tokens": {"char_12": {"x": 14, "y": 9}}}},
+    {"type": "monster_pool_delta", "payload": {"op": "move_monsters", "ids": [1, 2, 3], "x": [4, 5, 6], "y": [-1, 0, 1]}},
+    {"type": "conditions", "payload": {"conditions": []}},
+    {"type": "not_in_the_table", "payload": None}, # Sent by name instead of by code
+]
+
+
+@pytest.mark.parametrize("message", MESSAGES)
+def test_msgpack_round_trip(message):
+    codec = ws_protocol.CODECS[ws_protocol.SUBPROTOCOL_MSGPACK]
+    frame = codec.encode(message)
+    assert isinstance(frame, bytes)
+    assert codec.decode(frame) == message
+
+
+@pytest.mark.parametrize("message", MESSAGES)
+def test_json_round_trip(message):
+    codec = JSONCodec()
+    frame = codec.encode(message)
+    assert isinstance(frame, str)
+    assert codec.decode(frame) == message
+
+
+def test_msgpack_frames_use_type_codes_and_keep_the_sender():
+    codec = ws_protocol.CODECS[ws_protocol.SUBPROTOCOL_MSGPACK]
+    frame = codec.encode({"type": "chat", "payload": {"text": "hi"}, "sender": "Ayla"})
+    assert msgpack.unpackb(frame, raw=False) == [MESSAGE_TYPE_CODES["chat"], {"text": "hi"}, "Ayla"]
+
+
+def test_msgpack_encodes_datetimes_like_json():
+    when = datetime(2026, 10, 19, 12, 0, tzinfo=timezone.utc)
+    message = {"type": "chat", "payload": {"at": when}}
+    decoded = ws_protocol.CODECS[ws_protocol.SUBPROTOCOL_MSGPACK].decode(
+        ws_protocol.CODECS[ws_protocol.SUBPROTOCOL_MSGPACK].encode(message)
+    )
+    assert decoded["payload"]["at"] == json.loads(JSONCodec().encode(message))["payload"]["at"] == when.isoformat()
+
+
+@pytest.mark.parametrize("frame", [
+    b"\xc1", # Never-used byte: FormatError
+    msgpack.packb([1, {}]) + b"\x01", # ExtraData
+    msgpack.packb({"type": "chat"}), # Not an array
+    msgpack.packb([]),
+    msgpack.packb([0, {}]), # Code out of range
+    msgpack.packb([len(ws_protocol.MESSAGE_TYPES) + 1, {}]),
+    msgpack.packb([None, {}]),
+    b"",
+])
+def test_msgpack_decode_errors_are_frame_errors(frame):
+    with pytest.raises(FrameError):
+        ws_protocol.CODECS[ws_protocol.SUBPROTOCOL_MSGPACK].decode(frame)
+
+
+@pytest.mark.parametrize("frame", ["{", "[]", '{"payload": 1}', '{"type": 3}'])
+def test_json_decode_errors_are_frame_errors(frame):
+    with pytest.raises(FrameError):
+        JSONCodec().decode(frame)
+
+
+@pytest.mark.parametrize("offered, expected", [
+    ([ws_protocol.SUBPROTOCOL_MSGPACK, ws_protocol.SUBPROTOCOL_JSON], ws_protocol.SUBPROTOCOL_MSGPACK),
+    ([ws_protocol.SUBPROTOCOL_JSON, ws_protocol.SUBPROTOCOL_MSGPACK], ws_protocol.SUBPROTOCOL_JSON),
+    (["something.else", ws_protocol.SUBPROTOCOL_MSGPACK], ws_protocol.SUBPROTOCOL_MSGPACK),
+    (["something.else"], None),
+    ([], None),
+])
+def test_negotiate_picks_the_first_supported_offer(offered, expected):
+    assert ws_protocol.negotiate(FakeWebSocket(offered)) == expected
+
+
+def test_msgpack_offer_falls_back_to_json_without_the_package(monkeypatch):
+    monkeypatch.delitem(ws_protocol.CODECS, ws_protocol.SUBPROTOCOL_MSGPACK)
+    websocket = FakeWebSocket([ws_protocol.SUBPROTOCOL_MSGPACK])
+    asyncio.run(ws_protocol.accept(websocket))
+    assert websocket.accepted_subprotocol is None
+    assert ws_protocol.codec_for(websocket) is ws_protocol.JSON_CODEC
+
+
+def test_receive_decodes_binary_with_the_socket_codec_and_text_as_json():
+    binary = ws_protocol.CODECS[ws_protocol.SUBPROTOCOL_MSGPACK].encode({"type": "next_turn", "payload": {}})
+    websocket = FakeWebSocket([ws_protocol.SUBPROTOCOL_MSGPACK], events=[
+        {"type": "websocket.receive", "bytes": binary},
+        {"type": "websocket.receive", "text": '{"type": "chat", "payload": {"text": "hi"}}'},
+        {"type": "websocket.receive", "bytes": b"\xc1"},
+    ])
+
+    async def scenario():
+        await ws_protocol.accept(websocket)
+        first = await ws_protocol.receive(websocket)
+        second = await ws_protocol.receive(websocket)
+        with pytest.raises(FrameError):
+            await ws_protocol.receive(websocket)
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert websocket.accepted_subprotocol == ws_protocol.SUBPROTOCOL_MSGPACK
+    assert first == {"type": "next_turn", "payload": {}}
+    assert second == {"type": "chat", "payload": {"text": "hi"}}